@@ -31,6 +31,7 @@ from azext_aks_preview._consts import (
     CONST_PERISCOPE_RELEASE_TAG,
     CONST_PERISCOPE_IMAGE_VERSION,
     CONST_PERISCOPE_NAMESPACE,
+    CONST_PERISCOPE_DIAGNOSTIC_NAME_PREFIX,
 )
 
 from azext_aks_preview._helpers import which, print_or_merge_credentials
@@ -404,65 +405,47 @@ def _display_diagnostics_report(temp_kubeconfig_path):   # pylint: disable=too-m
         logger.warning(
             'No nodes are ready in the current cluster. Diagnostics info might not be available.')
 
-    network_config_array = []
-    network_status_array = []
-    apds_created = False
+    network_configs = {}
+    network_statuses = {}
 
     max_retry = 10
     for retry in range(0, max_retry):
-        if not apds_created:
-            apd = subprocess.check_output(
-                ["kubectl", "--kubeconfig", temp_kubeconfig_path, "get",
-                    "apd", "-n", CONST_PERISCOPE_NAMESPACE, "--no-headers"],
-                universal_newlines=True
-            )
-            apd_lines = apd.splitlines()
-            if apd_lines and 'No resources found' in apd_lines[0]:
-                apd_lines.pop(0)
-
-            print("Got {} diagnostic results for {} ready nodes{}\r".format(len(apd_lines),
-                                                                            len(ready_nodes),
-                                                                            '.' * retry), end='')
-            if len(apd_lines) < len(ready_nodes):
-                time.sleep(3)
-            else:
-                apds_created = True
-                print()
+        # one request for the diagnostic results of all the nodes, only the nodes not reported yet are looked at
+        diagnostics = _get_node_diagnostics(temp_kubeconfig_path)
+        print("Got {} diagnostic results for {} ready nodes{}\r".format(len(diagnostics),
+                                                                        len(ready_nodes),
+                                                                        '.' * retry), end='')
+        pending_nodes = []
+        for node_name in ready_nodes:
+            if node_name in network_statuses:
+                continue
+            spec = diagnostics.get(node_name) or {}
+            network_config = spec.get("networkconfig")
+            network_status = spec.get("networkoutbound")
+            logger.debug('Dns status for node %s is %s', node_name, network_config)
+            logger.debug('Network status for node %s is %s', node_name, network_status)
+            if not network_config or not network_status:
+                pending_nodes.append(node_name)
+                continue
+            network_configs[node_name] = _load_diag_results(network_config)
+            network_statuses[node_name] = _format_diag_status(_load_diag_results(network_status))
+
+        if not pending_nodes:
+            print()
+            break
+        if retry == max_retry - 1:
+            break
+        if len(diagnostics) < len(ready_nodes):
+            time.sleep(3)
         else:
-            for node_name in ready_nodes:
-                if ready_nodes[node_name]:
-                    continue
-                apdName = "aks-periscope-diagnostic-" + node_name
-                try:
-                    network_config = subprocess.check_output(
-                        ["kubectl", "--kubeconfig", temp_kubeconfig_path,
-                         "get", "apd", apdName, "-n",
-                         CONST_PERISCOPE_NAMESPACE, "-o=jsonpath={.spec.networkconfig}"],
-                        universal_newlines=True)
-                    logger.debug('Dns status for node %s is %s',
-                                 node_name, network_config)
-                    network_status = subprocess.check_output(
-                        ["kubectl", "--kubeconfig", temp_kubeconfig_path,
-                         "get", "apd", apdName, "-n",
-                         CONST_PERISCOPE_NAMESPACE, "-o=jsonpath={.spec.networkoutbound}"],
-                        universal_newlines=True)
-                    logger.debug('Network status for node %s is %s',
-                                 node_name, network_status)
-
-                    if not network_config or not network_status:
-                        print("The diagnostics information for node {} is not ready yet. "
-                              "Will try again in 10 seconds.".format(node_name))
-                        time.sleep(10)
-                        break
-
-                    network_config_array += json.loads(
-                        '[' + network_config + ']')
-                    network_status_object = json.loads(network_status)
-                    network_status_array += _format_diag_status(
-                        network_status_object)
-                    ready_nodes[node_name] = True
-                except subprocess.CalledProcessError as err:
-                    raise CLIError(err.output)
+            print()
+            print("The diagnostics information for node{} {} is not ready yet. "
+                  "Will try again in 10 seconds.".format("s" if len(pending_nodes) > 1 else "",
+                                                         ", ".join(pending_nodes)))
+            time.sleep(10)
+
+    network_config_array = [config for node_name in ready_nodes for config in network_configs.get(node_name, [])]
+    network_status_array = [status for node_name in ready_nodes for status in network_statuses.get(node_name, [])]
 
     print()
     if network_config_array:
@@ -502,6 +485,33 @@ def _format_bright(msg):
     return f'\033[1m{colorama.Style.BRIGHT}{msg}{colorama.Style.RESET_ALL}'
 
 
+def _get_node_diagnostics(temp_kubeconfig_path):
+    """
+    Returns the spec of the diagnostic result of every node, by node name.
+    """
+    try:
+        apds = subprocess.check_output(
+            ["kubectl", "--kubeconfig", temp_kubeconfig_path, "get",
+             "apd", "-n", CONST_PERISCOPE_NAMESPACE, "-o", "json"],
+            universal_newlines=True)
+    except subprocess.CalledProcessError as err:
+        raise CLIError(err.output)
+
+    diagnostics = {}
+    for apd in json.loads(apds).get("items") or []:
+        apd_name = (apd.get("metadata") or {}).get("name", "")
+        if apd_name.startswith(CONST_PERISCOPE_DIAGNOSTIC_NAME_PREFIX):
+            diagnostics[apd_name[len(CONST_PERISCOPE_DIAGNOSTIC_NAME_PREFIX):]] = apd.get("spec") or {}
+    return diagnostics
+
+
+def _load_diag_results(results):
+    # the results are serialized as json strings, a single result or a list of them
+    if isinstance(results, str):
+        results = json.loads(results)
+    return results if isinstance(results, list) else [results]
+
+
 def _format_diag_status(diag_status):
     for diag in diag_status:
         if diag["Status"]:
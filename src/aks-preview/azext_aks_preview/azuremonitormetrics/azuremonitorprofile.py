@@ -2,6 +2,7 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
+import functools
 from azext_aks_preview.azuremonitormetrics.addonput import addon_put
 from azext_aks_preview.azuremonitormetrics.amg.link import link_grafana_instance
 from azext_aks_preview.azuremonitormetrics.amw.helper import get_azure_monitor_workspace_resource
@@ -9,7 +10,7 @@ from azext_aks_preview.azuremonitormetrics.dc.dce_api import create_dce
 from azext_aks_preview.azuremonitormetrics.dc.dcr_api import create_dcr
 from azext_aks_preview.azuremonitormetrics.dc.dcra_api import create_dcra
 from azext_aks_preview.azuremonitormetrics.dc.delete import delete_dc_objects_if_prometheus_enabled, get_dc_objects_list
-from azext_aks_preview.azuremonitormetrics.helper import check_azuremonitormetrics_profile, rp_registrations
+from azext_aks_preview.azuremonitormetrics.helper import check_azuremonitormetrics_profile, rp_registrations, run_concurrently
 from azext_aks_preview.azuremonitormetrics.recordingrules.create import create_rules
 from azext_aks_preview.azuremonitormetrics.recordingrules.delete import delete_rules
 from knack.util import CLIError
@@ -28,16 +29,23 @@ def link_azure_monitor_profile_artifacts(
 ):
     # MAC creation if required
     azure_monitor_workspace_resource_id, azure_monitor_workspace_location = get_azure_monitor_workspace_resource(cmd, cluster_subscription, cluster_region, raw_parameters)
-    # DCE creation
-    dce_resource_id = create_dce(cmd, cluster_subscription, cluster_resource_group_name, cluster_name, azure_monitor_workspace_location)
-    # DCR creation
-    dcr_resource_id = create_dcr(cmd, azure_monitor_workspace_location, azure_monitor_workspace_resource_id, cluster_subscription, cluster_resource_group_name, cluster_name, dce_resource_id)
-    # DCRA creation
-    create_dcra(cmd, cluster_region, cluster_subscription, cluster_resource_group_name, cluster_name, dcr_resource_id)
-    # Link grafana
-    link_grafana_instance(cmd, raw_parameters, azure_monitor_workspace_resource_id)
-    # create recording rules and alerts
-    create_rules(cmd, cluster_subscription, cluster_resource_group_name, cluster_name, azure_monitor_workspace_resource_id, azure_monitor_workspace_location, raw_parameters)
+
+    def create_data_collection_objects():
+        # DCE creation
+        dce_resource_id = create_dce(cmd, cluster_subscription, cluster_resource_group_name, cluster_name, azure_monitor_workspace_location)
+        # DCR creation
+        dcr_resource_id = create_dcr(cmd, azure_monitor_workspace_location, azure_monitor_workspace_resource_id, cluster_subscription, cluster_resource_group_name, cluster_name, dce_resource_id)
+        # DCRA creation
+        create_dcra(cmd, cluster_region, cluster_subscription, cluster_resource_group_name, cluster_name, dcr_resource_id)
+
+    # DC* objects, grafana link and recording rules only depend on the workspace and are created concurrently
+    run_concurrently([
+        ("data collection objects", create_data_collection_objects),
+        # Link grafana
+        ("grafana link", functools.partial(link_grafana_instance, cmd, raw_parameters, azure_monitor_workspace_resource_id)),
+        # create recording rules and alerts
+        ("recording rules", functools.partial(create_rules, cmd, cluster_subscription, cluster_resource_group_name, cluster_name, azure_monitor_workspace_resource_id, azure_monitor_workspace_location, raw_parameters)),
+    ], "link the Azure Monitor metrics artifacts")
     # if aks cluster create flow -> do a PUT on the AKS cluster to enable the addon
     if create_flow:
         addon_put(cmd, cluster_subscription, cluster_resource_group_name, cluster_name)
@@ -47,10 +55,12 @@ def link_azure_monitor_profile_artifacts(
 def unlink_azure_monitor_profile_artifacts(cmd, cluster_subscription, cluster_resource_group_name, cluster_name):
     # Remove DC* if prometheus is enabled
     dc_objects_list = get_dc_objects_list(cmd, cluster_subscription, cluster_resource_group_name, cluster_name)
-    delete_dc_objects_if_prometheus_enabled(cmd, dc_objects_list, cluster_subscription, cluster_resource_group_name, cluster_name)
-    # Delete rules (Conflict({"error":{"code":"InvalidResourceLocation","message":"The resource 'NodeRecordingRulesRuleGroup-<clustername>' already exists in location 'eastus2' in resource group '<clustername>'.
-    # A resource with the same name cannot be created in location 'eastus'. Please select a new resource name."}})
-    delete_rules(cmd, cluster_subscription, cluster_resource_group_name, cluster_name)
+    run_concurrently([
+        ("data collection objects", functools.partial(delete_dc_objects_if_prometheus_enabled, cmd, dc_objects_list, cluster_subscription, cluster_resource_group_name, cluster_name)),
+        # Delete rules (Conflict({"error":{"code":"InvalidResourceLocation","message":"The resource 'NodeRecordingRulesRuleGroup-<clustername>' already exists in location 'eastus2' in resource group '<clustername>'.
+        # A resource with the same name cannot be created in location 'eastus'. Please select a new resource name."}})
+        ("recording rules", functools.partial(delete_rules, cmd, cluster_subscription, cluster_resource_group_name, cluster_name)),
+    ], "unlink the Azure Monitor metrics artifacts")
 
 
 # pylint: disable=too-many-locals,too-many-branches,too-many-statements,line-too-long
@@ -17,6 +17,11 @@ RP_API = "2021-04-01"
 ALERTS_API = "2023-01-01-preview"
 RP_LOCATION_API = "2022-01-01"
 
+# ARM requests are retried with jittered exponential backoff, independent requests are sent concurrently
+REQUEST_RETRY_ATTEMPTS = 3
+REQUEST_RETRY_BACKOFF_SECONDS = 1
+MAX_CONCURRENT_REQUESTS = 4
+
 
 MapToClosestMACRegion = {
     "australiacentral": "eastus",
@@ -6,11 +6,11 @@ import json
 from azext_aks_preview.azuremonitormetrics.constants import DC_API
 from azext_aks_preview.azuremonitormetrics.dc.defaults import get_default_dce_name
 from azext_aks_preview.azuremonitormetrics.constants import DC_API
+from azext_aks_preview.azuremonitormetrics.helper import send_raw_request_with_retry
 from knack.util import CLIError
 
 
 def create_dce(cmd, cluster_subscription, cluster_resource_group_name, cluster_name, mac_region):
-    from azure.cli.core.util import send_raw_request
     dce_name = get_default_dce_name(cmd, mac_region, cluster_name)
     dce_resource_id = "/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.Insights/dataCollectionEndpoints/{2}".format(cluster_subscription, cluster_resource_group_name, dce_name)
     try:
@@ -21,8 +21,7 @@ def create_dce(cmd, cluster_subscription, cluster_resource_group_name, cluster_n
                                         "kind": "Linux",
                                         "properties": {}})
         headers = ['User-Agent=azuremonitormetrics.create_dce']
-        send_raw_request(cmd.cli_ctx, "PUT",
-                         dce_url, body=dce_creation_body, headers=headers)
+        send_raw_request_with_retry(cmd, "PUT", dce_url, body=dce_creation_body, headers=headers)
         return dce_resource_id
     except CLIError as error:
         raise error
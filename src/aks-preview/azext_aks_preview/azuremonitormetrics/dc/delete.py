@@ -2,8 +2,10 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
+import functools
 import json
 from azext_aks_preview.azuremonitormetrics.constants import DC_API
+from azext_aks_preview.azuremonitormetrics.helper import run_concurrently, send_raw_request_with_retry
 from knack.util import CLIError
 
 
@@ -44,33 +46,37 @@ def get_dc_objects_list(cmd, cluster_subscription, cluster_resource_group_name,
 
 
 def delete_dc_objects_if_prometheus_enabled(cmd, dc_objects_list, cluster_subscription, cluster_resource_group_name, cluster_name):
-    from azure.cli.core.util import send_raw_request
     cluster_resource_id = "/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.ContainerService/managedClusters/{2}".format(
         cluster_subscription,
         cluster_resource_group_name,
         cluster_name
     )
-    for item in dc_objects_list:
-        armendpoint = cmd.cli_ctx.cloud.endpoints.resource_manager
-        association_url = f"{armendpoint}{item['dataCollectionRuleId']}?api-version={DC_API}"
-        try:
-            headers = ['User-Agent=azuremonitormetrics.get_dcr_if_prometheus_enabled']
-            r = send_raw_request(cmd.cli_ctx, "GET", association_url, headers=headers)
-            data = json.loads(r.text)
-            if 'microsoft-prometheusmetrics' in [stream.lower() for stream in data['properties']['dataFlows'][0]['streams']]:
-                # delete DCRA
-                armendpoint = cmd.cli_ctx.cloud.endpoints.resource_manager
-                url = f"{armendpoint}{cluster_resource_id}/providers/Microsoft.Insights/dataCollectionRuleAssociations/{item['name']}?api-version={DC_API}"
-                headers = ['User-Agent=azuremonitormetrics.delete_dcra']
-                send_raw_request(cmd.cli_ctx, "DELETE", url, headers=headers)
-                # delete DCR
-                url = f"{armendpoint}{item['dataCollectionRuleId']}?api-version={DC_API}"
-                headers = ['User-Agent=azuremonitormetrics.delete_dcr']
-                send_raw_request(cmd.cli_ctx, "DELETE", url, headers=headers)
-                # delete DCE
-                url = f"{armendpoint}{item['dceId']}?api-version={DC_API}"
-                headers = ['User-Agent=azuremonitormetrics.delete_dce']
-                send_raw_request(cmd.cli_ctx, "DELETE", url, headers=headers)
-        except CLIError as e:
-            error = e
-            raise CLIError(error)
+    # the DC* objects of each association are deleted in order, the associations independently of each other
+    run_concurrently([(item['name'], functools.partial(delete_dc_objects_of_association, cmd, item, cluster_resource_id))
+                      for item in dc_objects_list], "delete the data collection objects")
+
+
+def delete_dc_objects_of_association(cmd, item, cluster_resource_id):
+    from azure.cli.core.util import send_raw_request
+    armendpoint = cmd.cli_ctx.cloud.endpoints.resource_manager
+    association_url = f"{armendpoint}{item['dataCollectionRuleId']}?api-version={DC_API}"
+    try:
+        headers = ['User-Agent=azuremonitormetrics.get_dcr_if_prometheus_enabled']
+        r = send_raw_request(cmd.cli_ctx, "GET", association_url, headers=headers)
+        data = json.loads(r.text)
+        if 'microsoft-prometheusmetrics' in [stream.lower() for stream in data['properties']['dataFlows'][0]['streams']]:
+            # delete DCRA
+            url = f"{armendpoint}{cluster_resource_id}/providers/Microsoft.Insights/dataCollectionRuleAssociations/{item['name']}?api-version={DC_API}"
+            headers = ['User-Agent=azuremonitormetrics.delete_dcra']
+            send_raw_request_with_retry(cmd, "DELETE", url, headers=headers)
+            # delete DCR
+            url = f"{armendpoint}{item['dataCollectionRuleId']}?api-version={DC_API}"
+            headers = ['User-Agent=azuremonitormetrics.delete_dcr']
+            send_raw_request_with_retry(cmd, "DELETE", url, headers=headers)
+            # delete DCE
+            url = f"{armendpoint}{item['dceId']}?api-version={DC_API}"
+            headers = ['User-Agent=azuremonitormetrics.delete_dce']
+            send_raw_request_with_retry(cmd, "DELETE", url, headers=headers)
+    except CLIError as e:
+        error = e
+        raise CLIError(error)
@@ -3,15 +3,24 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from knack.log import get_logger
 from knack.util import CLIError
 from azure.cli.core.azclierror import (
     UnknownError
 )
 from azext_aks_preview.azuremonitormetrics.constants import (
     RP_API,
-    AKS_CLUSTER_API
+    AKS_CLUSTER_API,
+    MAX_CONCURRENT_REQUESTS,
+    REQUEST_RETRY_ATTEMPTS,
+    REQUEST_RETRY_BACKOFF_SECONDS
 )
 
+logger = get_logger(__name__)
+
 
 def sanitize_resource_id(resource_id):
     resource_id = resource_id.strip()
@@ -22,6 +31,48 @@ def sanitize_resource_id(resource_id):
     return resource_id.lower()
 
 
+def _is_retryable(error):
+    # client errors other than timeouts, conflicts and throttling fail the same way when sent again
+    status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code is None or status_code >= 500 or status_code in (408, 409, 429)
+
+
+def send_raw_request_with_retry(cmd, method, url, body=None, headers=None):
+    from azure.cli.core.util import send_raw_request
+    for attempt in range(REQUEST_RETRY_ATTEMPTS):
+        try:
+            return send_raw_request(cmd.cli_ctx, method, url, body=body, headers=headers)
+        except CLIError as e:
+            if attempt == REQUEST_RETRY_ATTEMPTS - 1 or not _is_retryable(e):
+                raise
+            delay = random.uniform(0, REQUEST_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+            logger.info("%s %s failed, retrying in %.1f seconds: %s", method, url, delay, e)
+            time.sleep(delay)
+
+
+def run_concurrently(tasks, operation):
+    """
+    Runs the (name, function) tasks side by side and returns their results by name. Every task runs to completion,
+    the errors of all the tasks that failed are reported together.
+    """
+    if not tasks:
+        return {}
+    results = {}
+    errors = []
+    with ThreadPoolExecutor(max_workers=min(len(tasks), MAX_CONCURRENT_REQUESTS)) as executor:
+        futures = [(name, executor.submit(task)) for name, task in tasks]
+        for name, future in futures:
+            try:
+                results[name] = future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append((name, e))
+    if len(errors) == 1:
+        raise errors[0][1]
+    if errors:
+        raise CLIError("Failed to {0}:\n{1}".format(operation, "\n".join(f"{name}: {e}" for name, e in errors)))
+    return results
+
+
 def post_request(cmd, subscription_id, rp_name, headers):
     from azure.cli.core.util import send_raw_request
     armendpoint = cmd.cli_ctx.cloud.endpoints.resource_manager
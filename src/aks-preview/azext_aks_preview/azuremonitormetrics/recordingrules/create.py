@@ -2,9 +2,10 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
+import functools
 import json
 from azext_aks_preview.azuremonitormetrics.constants import ALERTS_API, RULES_API
-from knack.util import CLIError
+from azext_aks_preview.azuremonitormetrics.helper import run_concurrently, send_raw_request_with_retry
 
 
 # pylint: disable=line-too-long
@@ -20,7 +21,6 @@ def get_recording_rules_template(cmd, azure_monitor_workspace_resource_id):
 
 # pylint: disable=line-too-long
 def put_rules(cmd, default_rule_group_id, default_rule_group_name, mac_region, azure_monitor_workspace_resource_id, cluster_name, default_rules_template, url, enable_rules, i):
-    from azure.cli.core.util import send_raw_request
     body = json.dumps({
         "id": default_rule_group_id,
         "name": default_rule_group_name,
@@ -36,16 +36,8 @@ def put_rules(cmd, default_rule_group_id, default_rule_group_name, mac_region, a
             "rules": default_rules_template[i]["properties"]["rulesArmTemplate"]["resources"][0]["properties"]["rules"]
         }
     })
-    for _ in range(3):
-        try:
-            headers = ['User-Agent=azuremonitormetrics.put_rules.' + default_rule_group_name]
-            send_raw_request(cmd.cli_ctx, "PUT", url,
-                             body=body, headers=headers)
-            break
-        except CLIError as e:
-            error = e
-    else:
-        raise error
+    headers = ['User-Agent=azuremonitormetrics.put_rules.' + default_rule_group_name]
+    send_raw_request_with_retry(cmd, "PUT", url, body=body, headers=headers)
 
 
 # pylint: disable=line-too-long
@@ -53,59 +45,32 @@ def create_rules(cmd, cluster_subscription, cluster_resource_group_name, cluster
     # with urllib.request.urlopen("https://defaultrulessc.blob.core.windows.net/defaultrules/ManagedPrometheusDefaultRecordingRules.json") as url:
     #     default_rules_template = json.loads(url.read().decode())
     default_rules_template = get_recording_rules_template(cmd, azure_monitor_workspace_resource_id)
-    default_rule_group_name = "NodeRecordingRulesRuleGroup-{0}".format(cluster_name)
-    default_rule_group_id = "/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.AlertsManagement/prometheusRuleGroups/{2}".format(
-        cluster_subscription,
-        cluster_resource_group_name,
-        default_rule_group_name
-    )
-    url = "{0}{1}?api-version={2}".format(
-        cmd.cli_ctx.cloud.endpoints.resource_manager,
-        default_rule_group_id,
-        RULES_API
-    )
-    put_rules(cmd, default_rule_group_id, default_rule_group_name, mac_region, azure_monitor_workspace_resource_id, cluster_name, default_rules_template, url, True, 0)
-
-    default_rule_group_name = "KubernetesRecordingRulesRuleGroup-{0}".format(cluster_name)
-    default_rule_group_id = "/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.AlertsManagement/prometheusRuleGroups/{2}".format(
-        cluster_subscription,
-        cluster_resource_group_name,
-        default_rule_group_name
-    )
-    url = "{0}{1}?api-version={2}".format(
-        cmd.cli_ctx.cloud.endpoints.resource_manager,
-        default_rule_group_id,
-        RULES_API
-    )
-    put_rules(cmd, default_rule_group_id, default_rule_group_name, mac_region, azure_monitor_workspace_resource_id, cluster_name, default_rules_template, url, True, 1)
 
     enable_windows_recording_rules = raw_parameters.get("enable_windows_recording_rules")
 
     if enable_windows_recording_rules is not True:
         enable_windows_recording_rules = False
 
-    default_rule_group_name = "NodeRecordingRulesRuleGroup-Win-{0}".format(cluster_name)
-    default_rule_group_id = "/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.AlertsManagement/prometheusRuleGroups/{2}".format(
-        cluster_subscription,
-        cluster_resource_group_name,
-        default_rule_group_name
-    )
-    url = "{0}{1}?api-version={2}".format(
-        cmd.cli_ctx.cloud.endpoints.resource_manager,
-        default_rule_group_id,
-        RULES_API
-    )
-    put_rules(cmd, default_rule_group_id, default_rule_group_name, mac_region, azure_monitor_workspace_resource_id, cluster_name, default_rules_template, url, enable_windows_recording_rules, 2)
-
-    default_rule_group_name = "NodeAndKubernetesRecordingRulesRuleGroup-Win-{0}".format(cluster_name)
-    default_rule_group_id = "/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.AlertsManagement/prometheusRuleGroups/{2}".format(
-        cluster_subscription,
-        cluster_resource_group_name,
-        default_rule_group_name
-    )
-    url = "{0}{1}?api-version={2}".format(
-        cmd.cli_ctx.cloud.endpoints.resource_manager,
-        default_rule_group_id,
-        RULES_API
-    )
-    put_rules(cmd, default_rule_group_id, default_rule_group_name, mac_region, azure_monitor_workspace_resource_id, cluster_name, default_rules_template, url, enable_windows_recording_rules, 3)
+    rule_groups = [
+        ("NodeRecordingRulesRuleGroup-{0}", True),
+        ("KubernetesRecordingRulesRuleGroup-{0}", True),
+        ("NodeRecordingRulesRuleGroup-Win-{0}", enable_windows_recording_rules),
+        ("NodeAndKubernetesRecordingRulesRuleGroup-Win-{0}", enable_windows_recording_rules),
+    ]
+    # the rule groups are independent of each other
+    tasks = []
+    for i, (rule_group_name_format, enable_rules) in enumerate(rule_groups):
+        default_rule_group_name = rule_group_name_format.format(cluster_name)
+        default_rule_group_id = "/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.AlertsManagement/prometheusRuleGroups/{2}".format(
+            cluster_subscription,
+            cluster_resource_group_name,
+            default_rule_group_name
+        )
+        url = "{0}{1}?api-version={2}".format(
+            cmd.cli_ctx.cloud.endpoints.resource_manager,
+            default_rule_group_id,
+            RULES_API
+        )
+        tasks.append((default_rule_group_name, functools.partial(
+            put_rules, cmd, default_rule_group_id, default_rule_group_name, mac_region, azure_monitor_workspace_resource_id, cluster_name, default_rules_template, url, enable_rules, i)))
+    run_concurrently(tasks, "create the recording rule groups")
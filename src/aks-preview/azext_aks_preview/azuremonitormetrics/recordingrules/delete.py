@@ -2,11 +2,12 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
+import functools
 from azext_aks_preview.azuremonitormetrics.constants import RULES_API
+from azext_aks_preview.azuremonitormetrics.helper import run_concurrently, send_raw_request_with_retry
 
 
 def delete_rule(cmd, cluster_subscription, cluster_resource_group_name, default_rule_group_name):
-    from azure.cli.core.util import send_raw_request
     default_rule_group_id = "/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.AlertsManagement/prometheusRuleGroups/{2}".format(
         cluster_subscription,
         cluster_resource_group_name,
@@ -18,11 +19,15 @@ def delete_rule(cmd, cluster_subscription, cluster_resource_group_name, default_
         default_rule_group_id,
         RULES_API
     )
-    send_raw_request(cmd.cli_ctx, "DELETE", url, headers=headers)
+    send_raw_request_with_retry(cmd, "DELETE", url, headers=headers)
 
 
 def delete_rules(cmd, cluster_subscription, cluster_resource_group_name, cluster_name):
-    delete_rule(cmd, cluster_subscription, cluster_resource_group_name, "NodeRecordingRulesRuleGroup-{0}".format(cluster_name))
-    delete_rule(cmd, cluster_subscription, cluster_resource_group_name, "KubernetesRecordingRulesRuleGroup-{0}".format(cluster_name))
-    delete_rule(cmd, cluster_subscription, cluster_resource_group_name, "NodeRecordingRulesRuleGroup-Win-{0}".format(cluster_name))
-    delete_rule(cmd, cluster_subscription, cluster_resource_group_name, "NodeAndKubernetesRecordingRulesRuleGroup-Win-{0}".format(cluster_name))
+    rule_group_names = [
+        "NodeRecordingRulesRuleGroup-{0}".format(cluster_name),
+        "KubernetesRecordingRulesRuleGroup-{0}".format(cluster_name),
+        "NodeRecordingRulesRuleGroup-Win-{0}".format(cluster_name),
+        "NodeAndKubernetesRecordingRulesRuleGroup-Win-{0}".format(cluster_name),
+    ]
+    run_concurrently([(name, functools.partial(delete_rule, cmd, cluster_subscription, cluster_resource_group_name, name))
+                      for name in rule_group_names], "delete the recording rule groups")
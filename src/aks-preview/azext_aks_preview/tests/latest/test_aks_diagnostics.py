@@ -3,7 +3,10 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import json
 import unittest
+from unittest import mock
+
 import azext_aks_preview.aks_diagnostics as commands
 
 
@@ -27,5 +30,63 @@ class TestGenerateContainerName(unittest.TestCase):
         self.assertEqual(expected_container_name, trim_container_name)
 
 
+class TestDisplayDiagnosticsReport(unittest.TestCase):
+    def setUp(self):
+        self.nodes = ["aks-nodepool1-0", "aks-nodepool1-1", "aks-nodepool1-2"]
+        self.polls = []
+        self.kubectl_calls = []
+        mock.patch("azext_aks_preview.aks_diagnostics.which", return_value="kubectl").start()
+        mock.patch("azext_aks_preview.aks_diagnostics.time.sleep").start()
+        mock.patch("azext_aks_preview.aks_diagnostics.subprocess.check_output", side_effect=self._kubectl).start()
+        self.printed = []
+        mock.patch("builtins.print",
+                   side_effect=lambda *args, **kwargs: self.printed.append(" ".join(map(str, args)))).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _kubectl(self, args, **kwargs):
+        self.kubectl_calls.append(args)
+        if args[4] == "node":
+            return "\n".join("{} Ready agent 1d v1.26.6".format(node) for node in self.nodes) + "\n"
+        ready = self.polls.pop(0) if self.polls else self.nodes
+        items = []
+        for node in ready:
+            spec = {
+                "networkconfig": json.dumps({"HostName": node, "NetworkPlugin": "azure"}),
+                # results may also come back as objects
+                "networkoutbound": [{"Type": "DNS", "Status": "Connected", "Start": "2023-01-01T00:00:00Z",
+                                     "Error": "", "Hostname": node}],
+            }
+            items.append({"metadata": {"name": "aks-periscope-diagnostic-" + node}, "spec": spec})
+        items.append({"metadata": {"name": "aks-periscope-diagnostic-aks-nodepool1-3"}, "spec": {}})
+        return json.dumps({"items": items})
+
+    def test_single_call_per_poll(self):
+        commands._display_diagnostics_report("kubeconfig")
+        self.assertEqual(2, len(self.kubectl_calls))
+        self.assertEqual(["get", "apd", "-n", "aks-periscope", "-o", "json"], self.kubectl_calls[1][3:])
+        output = "\n".join(self.printed)
+        for node in self.nodes:
+            self.assertIn(node, output)
+
+    def test_only_nodes_not_reported_are_retried(self):
+        self.polls = [[], ["aks-nodepool1-2"], ["aks-nodepool1-0", "aks-nodepool1-1"]]
+        with mock.patch("azext_aks_preview.aks_diagnostics._format_diag_status",
+                        side_effect=commands._format_diag_status) as format_diag_status:
+            commands._display_diagnostics_report("kubeconfig")
+        # the node list and one call for each of the 3 polls, instead of 2 calls for every node on each poll
+        self.assertEqual(4, len(self.kubectl_calls))
+        self.assertEqual(3, format_diag_status.call_count)
+        # the report keeps the order of the nodes
+        config_table = [line for line in self.printed if "azure" in line]
+        self.assertEqual(self.nodes, [line.split()[0] for line in config_table[0].splitlines()[2:]])
+
+    def test_gives_up_after_max_retry(self):
+        self.polls = [[]] * 10
+        with mock.patch("azext_aks_preview.aks_diagnostics.logger") as logger:
+            commands._display_diagnostics_report("kubeconfig")
+        self.assertEqual(11, len(self.kubectl_calls))
+        self.assertEqual(2, logger.warning.call_count)
+
+
 if __name__ == "__main__":
     unittest.main()
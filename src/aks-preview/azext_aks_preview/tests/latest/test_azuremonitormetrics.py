@@ -0,0 +1,109 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+
+from knack.util import CLIError
+
+from azext_aks_preview.azuremonitormetrics.helper import run_concurrently, send_raw_request_with_retry
+from azext_aks_preview.azuremonitormetrics.recordingrules.create import create_rules
+from azext_aks_preview.azuremonitormetrics.recordingrules.delete import delete_rules
+
+
+class FakeArm(object):
+    """ Answers ARM requests after a delay, failing the requests to the urls in failures the given number of times """
+
+    def __init__(self, delay=0.2, failures=None):
+        self.delay = delay
+        self.failures = failures or {}
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def send_raw_request(self, cli_ctx, method, url, body=None, headers=None):
+        with self.lock:
+            self.requests.append((method, url))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        if "alertRuleRecommendations" in url:
+            rules = {"properties": {"rulesArmTemplate": {"resources": [{"properties": {"rules": []}}]}}}
+            return mock.Mock(text=json.dumps({"value": [rules] * 4}))
+        with self.lock:
+            for name, (status_code, count) in self.failures.items():
+                if name in url and count:
+                    self.failures[name] = (status_code, count - 1)
+                    error = CLIError("{} failed".format(name))
+                    error.response = mock.Mock(status_code=status_code)
+                    raise error
+        return mock.Mock(text="{}")
+
+
+class TestAzureMonitorMetricsRequests(unittest.TestCase):
+    def setUp(self):
+        self.cmd = mock.Mock()
+        self.cmd.cli_ctx.cloud.endpoints.resource_manager = "https://management.azure.com"
+        self.sleep = mock.patch("azext_aks_preview.azuremonitormetrics.helper.time").start().sleep
+        self.addCleanup(mock.patch.stopall)
+
+    def _use(self, arm):
+        mock.patch("azure.cli.core.util.send_raw_request", side_effect=arm.send_raw_request).start()
+
+    def test_rule_groups_are_created_concurrently(self):
+        arm = FakeArm()
+        self._use(arm)
+        create_rules(self.cmd, "sub", "rg", "cluster", "/subscriptions/sub/amw", "eastus", {})
+
+        self.assertEqual(5, len(arm.requests))
+        # the 4 rule groups are created side by side after the template is fetched
+        self.assertEqual(4, arm.max_in_flight)
+
+    def test_transient_errors_are_retried_with_backoff(self):
+        arm = FakeArm(delay=0, failures={"KubernetesRecordingRulesRuleGroup-cluster": (503, 2)})
+        self._use(arm)
+        with mock.patch("azext_aks_preview.azuremonitormetrics.helper.random.uniform",
+                        side_effect=lambda low, high: high):
+            delete_rules(self.cmd, "sub", "rg", "cluster")
+        self.assertEqual(6, len(arm.requests))
+        self.assertEqual([mock.call(1), mock.call(2)], self.sleep.call_args_list)
+
+    def test_client_errors_are_not_retried(self):
+        arm = FakeArm(delay=0, failures={"rule": (400, 3)})
+        self._use(arm)
+        with self.assertRaises(CLIError):
+            send_raw_request_with_retry(self.cmd, "PUT", "https://management.azure.com/rule")
+        self.assertEqual(1, len(arm.requests))
+        self.sleep.assert_not_called()
+
+    def test_errors_are_reported_together(self):
+        arm = FakeArm(delay=0, failures={"Win-cluster": (400, 2)})
+        self._use(arm)
+        with self.assertRaises(CLIError) as cm:
+            delete_rules(self.cmd, "sub", "rg", "cluster")
+        # the other rule groups were still deleted
+        self.assertEqual(4, len(arm.requests))
+        self.assertIn("NodeRecordingRulesRuleGroup-Win-cluster: Win-cluster failed", str(cm.exception))
+        self.assertIn("NodeAndKubernetesRecordingRulesRuleGroup-Win-cluster: Win-cluster failed", str(cm.exception))
+
+    def test_single_error_is_raised_as_is(self):
+        error = ValueError("bad value")
+
+        def fail():
+            raise error
+
+        with self.assertRaises(ValueError) as cm:
+            run_concurrently([("ok", lambda: 1), ("fail", fail)], "run")
+        self.assertIs(error, cm.exception)
+        self.assertEqual({"a": 1, "b": 2}, run_concurrently([("a", lambda: 1), ("b", lambda: 2)], "run"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ from azure.cli.core._environment import get_config_dir
 GLOBAL_CONFIG_DIR = get_config_dir()
 ALIAS_FILE_NAME = 'alias'
 ALIAS_HASH_FILE_NAME = 'alias.sha1'
+ALIAS_INDEX_FILE_NAME = 'alias.index.json'
 COLLIDED_ALIAS_FILE_NAME = 'collided_alias'
 ALIAS_TAB_COMP_TABLE_FILE_NAME = 'alias_tab_completion'
 GLOBAL_ALIAS_TAB_COMP_TABLE_PATH = os.path.join(GLOBAL_CONFIG_DIR, ALIAS_TAB_COMP_TABLE_FILE_NAME)
@@ -18,12 +18,14 @@ from azext_alias._const import (
     GLOBAL_CONFIG_DIR,
     ALIAS_FILE_NAME,
     ALIAS_HASH_FILE_NAME,
+    ALIAS_INDEX_FILE_NAME,
     COLLIDED_ALIAS_FILE_NAME,
     CONFIG_PARSING_ERROR,
     DEBUG_MSG,
     COLLISION_CHECK_LEVEL_DEPTH,
     POS_ARG_DEBUG_MSG
 )
+from azext_alias.alias_index import AliasIndex
 from azext_alias.argument import build_pos_args_table, render_template
 from azext_alias.util import (
     is_alias_command,
@@ -36,6 +38,7 @@ from azext_alias.util import (
 GLOBAL_ALIAS_PATH = os.path.join(GLOBAL_CONFIG_DIR, ALIAS_FILE_NAME)
 GLOBAL_ALIAS_HASH_PATH = os.path.join(GLOBAL_CONFIG_DIR, ALIAS_HASH_FILE_NAME)
 GLOBAL_COLLIDED_ALIAS_PATH = os.path.join(GLOBAL_CONFIG_DIR, COLLIDED_ALIAS_FILE_NAME)
+GLOBAL_ALIAS_INDEX_PATH = os.path.join(GLOBAL_CONFIG_DIR, ALIAS_INDEX_FILE_NAME)
 
 logger = get_logger(__name__)
 
@@ -48,18 +51,36 @@ class AliasManager(object):
         self.collided_alias = defaultdict(list)
         self.alias_config_str = ''
         self.alias_config_hash = ''
+        self.alias_config_stat = None
+        self.alias_config_changed = False
+        self.alias_index = None
+        self.alias_index_outdated = True
         self.load_alias_table()
         self.load_alias_hash()
+        if self.alias_index is None:
+            self.alias_index = AliasIndex.from_alias_table(self.alias_table)
 
     def load_alias_table(self):
         """
         Load (create, if not exist) the alias config file.
+        Use the compiled alias index instead of parsing the file if the file has not changed since it was compiled.
         """
         try:
+            if os.path.exists(GLOBAL_ALIAS_PATH):
+                # Stat before reading so a concurrent change makes the compiled index outdated instead of stale
+                self.alias_config_stat = os.stat(GLOBAL_ALIAS_PATH)
+                self.alias_index = AliasIndex.load(GLOBAL_ALIAS_INDEX_PATH, GLOBAL_ALIAS_PATH, self.alias_config_stat)
+                if self.alias_index is not None:
+                    self.alias_index_outdated = False
+                    telemetry.set_number_of_aliases_registered(len(self.alias_index))
+                    return
+
             # w+ creates the alias config file if it does not exist
             open_mode = 'r+' if os.path.exists(GLOBAL_ALIAS_PATH) else 'w+'
             with open(GLOBAL_ALIAS_PATH, open_mode) as alias_config_file:
                 self.alias_config_str = alias_config_file.read()
+            if self.alias_config_stat is None:
+                self.alias_config_stat = os.stat(GLOBAL_ALIAS_PATH)
             self.alias_table.read(GLOBAL_ALIAS_PATH)
             telemetry.set_number_of_aliases_registered(len(self.alias_table.sections()))
         except Exception as exception:  # pylint: disable=broad-except
@@ -71,6 +92,10 @@ class AliasManager(object):
         """
         Load (create, if not exist) the alias hash file.
         """
+        if not self.alias_index_outdated:
+            self.alias_config_hash = self.alias_index.alias_config_hash
+            return
+
         # w+ creates the alias hash file if it does not exist
         open_mode = 'r+' if os.path.exists(GLOBAL_ALIAS_HASH_PATH) else 'w+'
         with open(GLOBAL_ALIAS_HASH_PATH, open_mode) as alias_config_hash_file:
@@ -80,6 +105,10 @@ class AliasManager(object):
         """
         Load (create, if not exist) the collided alias file.
         """
+        if not self.alias_index_outdated:
+            self.collided_alias = self.alias_index.collided_alias
+            return
+
         # w+ creates the alias config file if it does not exist
         open_mode = 'r+' if os.path.exists(GLOBAL_COLLIDED_ALIAS_PATH) else 'w+'
         with open(GLOBAL_COLLIDED_ALIAS_PATH, open_mode) as collided_alias_file:
@@ -101,10 +130,15 @@ class AliasManager(object):
         if self.parse_error():
             return False
 
+        # The compiled alias index is only up to date if the alias config file has not changed
+        if not self.alias_index_outdated:
+            return False
+
         alias_config_sha1 = hashlib.sha1(self.alias_config_str.encode('utf-8')).hexdigest()
         if alias_config_sha1 != self.alias_config_hash:
             # Overwrite the old hash with the new one
             self.alias_config_hash = alias_config_sha1
+            self.alias_config_changed = True
             return True
         return False
 
@@ -146,13 +180,20 @@ class AliasManager(object):
 
             full_alias = self.get_full_alias(alias)
 
-            if self.alias_table.has_option(full_alias, 'command'):
-                cmd_derived_from_alias = self.alias_table.get(full_alias, 'command')
+            cmd_derived_from_alias = self.alias_index.get_command(full_alias)
+            if cmd_derived_from_alias is not None:
                 telemetry.set_alias_hit(full_alias)
             else:
                 transformed_commands.append(alias)
                 continue
 
+            cmd_tokens = self.alias_index.get_tokens(full_alias)
+            if cmd_tokens is not None:
+                # No positional arguments, the command was tokenized when the alias index was compiled
+                logger.debug(DEBUG_MSG, full_alias, cmd_derived_from_alias)
+                transformed_commands += cmd_tokens
+                continue
+
             pos_args_table = build_pos_args_table(full_alias, args, alias_index)
             if pos_args_table:
                 logger.debug(POS_ARG_DEBUG_MSG, full_alias, cmd_derived_from_alias, pos_args_table)
@@ -177,10 +218,7 @@ class AliasManager(object):
         Returns:
             The full alias (with the placeholders, if any).
         """
-        if query in self.alias_table.sections():
-            return query
-
-        return next((section for section in self.alias_table.sections() if section.split()[0] == query), '')
+        return self.alias_index.get_full_alias(query)
 
     def load_full_command_table(self):
         """
@@ -192,7 +230,8 @@ class AliasManager(object):
 
     def post_transform(self, args):
         """
-        Inject environment variables, and write hash to alias hash file after transforming alias to commands.
+        Inject environment variables after transforming alias to commands. Write the alias hash, the collided
+        aliases and the compiled alias index only if they have changed since the last run.
 
         Args:
             args: A list of args to post-transform.
@@ -208,8 +247,12 @@ class AliasManager(object):
             else:
                 post_transform_commands.append(os.path.expandvars(arg))
 
-        AliasManager.write_alias_config_hash(self.alias_config_hash)
-        AliasManager.write_collided_alias(self.collided_alias)
+        if self.alias_config_changed:
+            AliasManager.write_alias_config_hash(self.alias_config_hash)
+            AliasManager.write_collided_alias(self.collided_alias)
+
+        if self.alias_index_outdated and self.alias_config_stat is not None:
+            self.write_alias_index()
 
         return post_transform_commands
 
@@ -271,6 +314,22 @@ class AliasManager(object):
         with open(GLOBAL_ALIAS_HASH_PATH, 'w') as alias_config_hash_file:
             alias_config_hash_file.write('' if empty_hash else alias_config_hash)
 
+    def write_alias_index(self):
+        """
+        Compile the alias table, the alias hash and the collided aliases into the alias index file.
+        """
+        source = AliasIndex.get_source(GLOBAL_ALIAS_PATH, self.alias_config_stat)
+        AliasIndex(self.alias_index.aliases, self.alias_config_hash, self.collided_alias, source,
+                   self.alias_index.tokens).save(GLOBAL_ALIAS_INDEX_PATH)
+        self.alias_index_outdated = False
+
+    @staticmethod
+    def remove_alias_index():
+        """
+        Remove the compiled alias index so the next run compiles it again from the alias config file.
+        """
+        AliasIndex.remove(GLOBAL_ALIAS_INDEX_PATH)
+
     @staticmethod
     def write_collided_alias(collided_alias_dict):
         """
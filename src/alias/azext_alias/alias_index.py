@@ -0,0 +1,171 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import json
+import shlex
+import tempfile
+
+from knack.log import get_logger
+from knack.util import CLIError
+
+from azext_alias.argument import get_placeholders
+
+# Bump this if the layout of the compiled index changes
+ALIAS_INDEX_FORMAT_VERSION = 1
+
+logger = get_logger(__name__)
+
+
+class AliasIndex(object):
+    """
+    A compiled form of the alias configuration file.
+
+    The index is persisted next to the alias configuration file so that the common case (the alias
+    configuration has not changed since the last run) does not need to parse the INI file, read the
+    hash file or read the collided alias file. It is only trusted if the modification time and the
+    size of the alias configuration file are the same as when the index was compiled.
+    """
+
+    def __init__(self, aliases, alias_config_hash='', collided_alias=None, source=None, tokens=None):
+        """
+        Args:
+            aliases: An ordered list of (full alias, command) tuples. The command is None if the alias has none.
+            alias_config_hash: The sha1 of the alias configuration file the index was compiled from.
+            collided_alias: The collision table of the aliases.
+            source: The path, modification time and size of the alias configuration file.
+            tokens: The pre-tokenized commands, keyed by full alias. Tokenized on demand if missing.
+        """
+        self.aliases = [(full_alias, command) for full_alias, command in aliases]
+        self.alias_config_hash = alias_config_hash
+        self.collided_alias = collided_alias or {}
+        self.source = source
+        self.tokens = tokens or {}
+
+        self.commands = {}
+        self.first_words = {}
+        for full_alias, command in self.aliases:
+            self.commands.setdefault(full_alias, command)
+            words = full_alias.split()
+            if words:
+                # Same as a linear scan, the first alias in the file wins
+                self.first_words.setdefault(words[0], full_alias)
+
+    def __len__(self):
+        return len(self.aliases)
+
+    @staticmethod
+    def tokenize(full_alias, command):
+        """
+        Pre-tokenize the command of an alias without positional arguments.
+
+        Returns:
+            The tokenized command, or None if the command has to be rendered (or fails to
+            tokenize) at transformation time.
+        """
+        try:
+            if get_placeholders(full_alias):
+                return None
+            return shlex.split(command)
+        except (CLIError, ValueError):
+            # Let the transformation raise the error so the user sees the same message as before
+            return None
+
+    @staticmethod
+    def from_alias_table(alias_table, alias_config_hash='', collided_alias=None, source=None):
+        aliases = []
+        for full_alias in alias_table.sections():
+            command = alias_table.get(full_alias, 'command') if alias_table.has_option(full_alias, 'command') else None
+            aliases.append((full_alias, command))
+        return AliasIndex(aliases, alias_config_hash, collided_alias, source)
+
+    @staticmethod
+    def get_source(alias_path, alias_stat):
+        return {
+            'path': os.path.abspath(alias_path),
+            'mtime_ns': alias_stat.st_mtime_ns,
+            'size': alias_stat.st_size
+        }
+
+    def get_full_alias(self, query):
+        """
+        Get the full alias given a search query.
+
+        Returns:
+            The full alias (with the placeholders, if any).
+        """
+        if query in self.commands:
+            return query
+        return self.first_words.get(query, '')
+
+    def get_command(self, full_alias):
+        return self.commands.get(full_alias)
+
+    def get_tokens(self, full_alias):
+        """
+        Returns:
+            A copy of the pre-tokenized command of the alias, or None if it needs to be rendered.
+        """
+        if full_alias not in self.tokens:
+            command = self.commands.get(full_alias)
+            self.tokens[full_alias] = AliasIndex.tokenize(full_alias, command) if command is not None else None
+        tokens = self.tokens[full_alias]
+        return list(tokens) if tokens is not None else None
+
+    @staticmethod
+    def load(index_path, alias_path, alias_stat):
+        """
+        Load the compiled index if it is still up to date with the alias configuration file.
+
+        Returns:
+            The compiled index, or None if it does not exist, is corrupted or is outdated.
+        """
+        try:
+            with open(index_path, 'r') as index_file:
+                index = json.load(index_file)
+            if index.get('version') != ALIAS_INDEX_FORMAT_VERSION or \
+                    index.get('source') != AliasIndex.get_source(alias_path, alias_stat):
+                return None
+            return AliasIndex([tuple(alias) for alias in index['aliases']],
+                              index['alias_config_hash'],
+                              index['collided_alias'],
+                              index['source'],
+                              index['tokens'])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def save(self, index_path):
+        """
+        Write the compiled index next to the alias configuration file.
+        """
+        for full_alias, _ in self.aliases:
+            self.get_tokens(full_alias)
+        index = {
+            'version': ALIAS_INDEX_FORMAT_VERSION,
+            'source': self.source,
+            'alias_config_hash': self.alias_config_hash,
+            'collided_alias': self.collided_alias,
+            'aliases': self.aliases,
+            'tokens': self.tokens
+        }
+        temp_path = None
+        try:
+            # Write to a temp file and rename it so a concurrent run never reads a partial index
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(index_path), suffix='.tmp')
+            with os.fdopen(fd, 'w') as index_file:
+                json.dump(index, index_file)
+            os.replace(temp_path, index_path)
+        except OSError as exception:
+            # The index is only an optimization, the next run will compile it again
+            logger.debug('Alias Manager: Unable to write the compiled alias index: %s', exception)
+            if temp_path:
+                AliasIndex.remove(temp_path)
+
+    @staticmethod
+    def remove(index_path):
+        try:
+            os.remove(index_path)
+        except OSError:
+            pass
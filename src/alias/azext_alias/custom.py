@@ -135,6 +135,7 @@ def _commit_change(alias_table, export_path=None, post_commit=True):
             alias_config_file.seek(0)
             alias_config_hash = hashlib.sha1(alias_config_file.read().encode('utf-8')).hexdigest()
             AliasManager.write_alias_config_hash(alias_config_hash)
+            AliasManager.remove_alias_index()
             collided_alias = AliasManager.build_collision_table(alias_table.sections())
             AliasManager.write_collided_alias(collided_alias)
             build_tab_completion_table(alias_table)
@@ -135,8 +135,9 @@ def _transform_cur_commands(cur_commands, alias_table=None):
     """
     transformed = []
     alias_table = alias_table if alias_table else get_alias_table()
+    aliases = set(alias_table.sections())
     for cmd in cur_commands:
-        if cmd in alias_table.sections() and alias_table.has_option(cmd, 'command'):
+        if cmd in aliases and alias_table.has_option(cmd, 'command'):
             transformed += alias_table.get(cmd, 'command').split()
         else:
             transformed.append(cmd)
@@ -148,13 +148,17 @@ TEST_FN = {
 class TestAlias(unittest.TestCase):
 
     def setUp(self):
-        azext_alias.alias.AliasManager.write_alias_config_hash = Mock()
-        azext_alias.alias.AliasManager.write_collided_alias = Mock()
-        self.patcher = patch('azext_alias.cached_reserved_commands', TEST_RESERVED_COMMANDS)
-        self.patcher.start()
+        self.patchers = [
+            patch.object(azext_alias.alias.AliasManager, 'write_alias_config_hash', Mock()),
+            patch.object(azext_alias.alias.AliasManager, 'write_collided_alias', Mock()),
+            patch('azext_alias.cached_reserved_commands', TEST_RESERVED_COMMANDS)
+        ]
+        for patcher in self.patchers:
+            patcher.start()
 
     def tearDown(self):
-        self.patcher.stop()
+        for patcher in self.patchers:
+            patcher.stop()
 
     def test_build_empty_collision_table(self):
         alias_manager = self.get_alias_manager(DEFAULT_MOCK_ALIAS_STRING)
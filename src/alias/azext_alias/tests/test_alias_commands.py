@@ -16,6 +16,7 @@ from azext_alias import alias
 from azext_alias._const import (
     ALIAS_FILE_NAME,
     ALIAS_HASH_FILE_NAME,
+    ALIAS_INDEX_FILE_NAME,
     COLLIDED_ALIAS_FILE_NAME,
     ALIAS_TAB_COMP_TABLE_FILE_NAME
 )
@@ -30,6 +31,7 @@ class AliasTests(ScenarioTest):
         self.patchers.append(mock.patch('azext_alias.alias.GLOBAL_ALIAS_PATH', os.path.join(self.mock_config_dir, ALIAS_FILE_NAME)))
         self.patchers.append(mock.patch('azext_alias.alias.GLOBAL_ALIAS_HASH_PATH', os.path.join(self.mock_config_dir, ALIAS_HASH_FILE_NAME)))
         self.patchers.append(mock.patch('azext_alias.alias.GLOBAL_COLLIDED_ALIAS_PATH', os.path.join(self.mock_config_dir, COLLIDED_ALIAS_FILE_NAME)))
+        self.patchers.append(mock.patch('azext_alias.alias.GLOBAL_ALIAS_INDEX_PATH', os.path.join(self.mock_config_dir, ALIAS_INDEX_FILE_NAME)))
         self.patchers.append(mock.patch('azext_alias.util.GLOBAL_ALIAS_TAB_COMP_TABLE_PATH', os.path.join(self.mock_config_dir, ALIAS_TAB_COMP_TABLE_FILE_NAME)))
         self.patchers.append(mock.patch('azext_alias.custom.GLOBAL_ALIAS_PATH', os.path.join(self.mock_config_dir, ALIAS_FILE_NAME)))
         os.makedirs(os.path.join(self.mock_config_dir, 'export'))
@@ -0,0 +1,122 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+# pylint: disable=line-too-long
+
+import configparser
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from azext_alias.alias import AliasManager
+from azext_alias._const import (
+    ALIAS_FILE_NAME,
+    ALIAS_HASH_FILE_NAME,
+    ALIAS_INDEX_FILE_NAME,
+    COLLIDED_ALIAS_FILE_NAME,
+    ALIAS_TAB_COMP_TABLE_FILE_NAME
+)
+from azext_alias.tests._const import TEST_RESERVED_COMMANDS
+
+ALIAS_COUNT = 1500
+INVOCATIONS = 3
+
+
+def build_alias_config(count):
+    aliases = ['[ac]\ncommand = account\n', '[cp {{ arg_1 }} {{ arg_2 }}]\ncommand = storage blob copy start --source-uri {{ arg_1 }} --destination-container {{ arg_2 }}\n']
+    for i in range(count):
+        aliases.append('[alias{0}]\ncommand = group show -n group{0} --query "[?name==\'x\']"\n'.format(i))
+    return '\n'.join(aliases)
+
+
+class TestAliasIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_config_dir = tempfile.mkdtemp()
+        self.alias_path = os.path.join(self.mock_config_dir, ALIAS_FILE_NAME)
+        self.patchers = [
+            patch('azext_alias.alias.GLOBAL_ALIAS_PATH', self.alias_path),
+            patch('azext_alias.alias.GLOBAL_ALIAS_HASH_PATH', os.path.join(self.mock_config_dir, ALIAS_HASH_FILE_NAME)),
+            patch('azext_alias.alias.GLOBAL_COLLIDED_ALIAS_PATH', os.path.join(self.mock_config_dir, COLLIDED_ALIAS_FILE_NAME)),
+            patch('azext_alias.alias.GLOBAL_ALIAS_INDEX_PATH', os.path.join(self.mock_config_dir, ALIAS_INDEX_FILE_NAME)),
+            patch('azext_alias.util.GLOBAL_ALIAS_TAB_COMP_TABLE_PATH', os.path.join(self.mock_config_dir, ALIAS_TAB_COMP_TABLE_FILE_NAME)),
+            patch('azext_alias.cached_reserved_commands', TEST_RESERVED_COMMANDS)
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        with open(self.alias_path, 'w') as alias_config_file:
+            alias_config_file.write(build_alias_config(ALIAS_COUNT))
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        shutil.rmtree(self.mock_config_dir)
+
+    def get_mtimes(self):
+        return {name: os.stat(os.path.join(self.mock_config_dir, name)).st_mtime_ns for name in os.listdir(self.mock_config_dir)}
+
+    def transform(self, args):
+        return AliasManager().transform(list(args))
+
+    def test_transform_with_compiled_index(self):
+        args = ['alias{}'.format(ALIAS_COUNT - 1), '-o', 'tsv']
+        expected = ['group', 'show', '-n', 'group{}'.format(ALIAS_COUNT - 1), '--query', "[?name=='x']", '-o', 'tsv']
+        self.assertEqual(expected, self.transform(args))
+        self.assertTrue(os.path.exists(os.path.join(self.mock_config_dir, ALIAS_INDEX_FILE_NAME)))
+
+        alias_manager = AliasManager()
+        self.assertFalse(alias_manager.alias_index_outdated)
+        self.assertEqual(0, len(alias_manager.alias_table.sections()))
+        self.assertEqual(expected, alias_manager.transform(list(args)))
+        self.assertEqual(['storage', 'blob', 'copy', 'start', '--source-uri', 'a', '--destination-container', 'b'], self.transform(['cp', 'a', 'b']))
+        self.assertEqual(['account', 'list'], self.transform(['ac', 'list']))
+
+    def test_no_writes_when_unchanged(self):
+        self.transform(['ac'])
+        self.transform(['ac'])
+        mtimes = self.get_mtimes()
+        time.sleep(0.01)
+        self.transform(['ac'])
+        self.assertEqual(mtimes, self.get_mtimes())
+
+    def test_outdated_index_is_recompiled(self):
+        self.transform(['ac'])
+        with open(self.alias_path, 'a') as alias_config_file:
+            alias_config_file.write('\n[new-alias]\ncommand = group list\n')
+
+        alias_manager = AliasManager()
+        self.assertTrue(alias_manager.alias_index_outdated)
+        self.assertEqual(['group', 'list'], alias_manager.transform(['new-alias']))
+        self.assertTrue(alias_manager.alias_config_changed)
+        self.assertFalse(AliasManager().alias_index_outdated)
+
+    def test_corrupted_index_is_ignored(self):
+        self.transform(['ac'])
+        with open(os.path.join(self.mock_config_dir, ALIAS_INDEX_FILE_NAME), 'w') as index_file:
+            index_file.write('{"version": 1, "aliases": ')
+        self.assertTrue(AliasManager().alias_index_outdated)
+        self.assertEqual(['account'], self.transform(['ac']))
+        self.assertFalse(AliasManager().alias_index_outdated)
+
+    def test_config_is_not_parsed_with_compiled_index(self):
+        args = ['alias{}'.format(ALIAS_COUNT - 1), '-g', 'test']
+        self.transform(args)
+        with patch('configparser.ConfigParser.read', autospec=True, side_effect=configparser.ConfigParser.read) as read:
+            for _ in range(INVOCATIONS):
+                self.transform(args)
+            self.assertEqual(0, read.call_count)
+
+            # Without an up to date index, the INI file is parsed on every invocation
+            with patch('azext_alias.alias.AliasIndex.load', return_value=None):
+                for _ in range(INVOCATIONS):
+                    self.transform(args)
+            self.assertEqual(INVOCATIONS, read.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Per invocation overhead of transforming an alias with the compiled alias index, compared to parsing the alias
+configuration file on every invocation. Not part of the unit tests, run it from src/alias with the extension
+installed in development mode:
+
+    python benchmarks/benchmark_alias_index.py
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from azext_alias.alias import AliasManager
+from azext_alias._const import (
+    ALIAS_FILE_NAME,
+    ALIAS_HASH_FILE_NAME,
+    ALIAS_INDEX_FILE_NAME,
+    COLLIDED_ALIAS_FILE_NAME,
+    ALIAS_TAB_COMP_TABLE_FILE_NAME
+)
+from azext_alias.tests._const import TEST_RESERVED_COMMANDS
+from azext_alias.tests.test_alias_index import ALIAS_COUNT, build_alias_config
+
+INVOCATIONS = 20
+
+
+def measure(args):
+    start = time.perf_counter()
+    for _ in range(INVOCATIONS):
+        AliasManager().transform(list(args))
+    return (time.perf_counter() - start) / INVOCATIONS * 1000
+
+
+def main():
+    config_dir = tempfile.mkdtemp()
+    alias_path = os.path.join(config_dir, ALIAS_FILE_NAME)
+    try:
+        with ExitStack() as stack:
+            stack.enter_context(patch('azext_alias.alias.GLOBAL_ALIAS_PATH', alias_path))
+            stack.enter_context(patch('azext_alias.alias.GLOBAL_ALIAS_HASH_PATH',
+                                      os.path.join(config_dir, ALIAS_HASH_FILE_NAME)))
+            stack.enter_context(patch('azext_alias.alias.GLOBAL_COLLIDED_ALIAS_PATH',
+                                      os.path.join(config_dir, COLLIDED_ALIAS_FILE_NAME)))
+            stack.enter_context(patch('azext_alias.alias.GLOBAL_ALIAS_INDEX_PATH',
+                                      os.path.join(config_dir, ALIAS_INDEX_FILE_NAME)))
+            stack.enter_context(patch('azext_alias.util.GLOBAL_ALIAS_TAB_COMP_TABLE_PATH',
+                                      os.path.join(config_dir, ALIAS_TAB_COMP_TABLE_FILE_NAME)))
+            stack.enter_context(patch('azext_alias.cached_reserved_commands', TEST_RESERVED_COMMANDS))
+            with open(alias_path, 'w') as alias_config_file:
+                alias_config_file.write(build_alias_config(ALIAS_COUNT))
+
+            args = ['alias{}'.format(ALIAS_COUNT - 1), '-g', 'test']
+            # Parse the INI file on every invocation, which is what happens without an up to date index
+            with patch('azext_alias.alias.AliasIndex.load', return_value=None):
+                AliasManager().transform(list(args))
+                uncompiled = measure(args)
+            AliasManager().transform(list(args))
+            compiled = measure(args)
+        print('{} aliases: {:.2f}ms per invocation without the compiled index, {:.2f}ms with it'.format(
+            ALIAS_COUNT, uncompiled, compiled))
+    finally:
+        shutil.rmtree(config_dir)
+
+
+if __name__ == '__main__':
+    main()
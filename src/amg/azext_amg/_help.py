@@ -43,6 +43,9 @@ helps['grafana backup'] = """
         - name: backup dashboards and skip a few folders
           text: |
             az grafana backup -g MyResourceGroup -n MyGrafana -d c:\\temp  --folders-to-exclude General "Azure Monitor" --components datasources dashboards folders
+        - name: backup only what changed since the latest backup in the directory
+          text: |
+            az grafana backup -g MyResourceGroup -n MyGrafana -d c:\\temp --incremental
 
 """
 
@@ -58,6 +58,8 @@ def load_arguments(self, _):
 
     with self.argument_context("grafana backup") as c:
         c.argument("directory", options_list=["-d", "--directory"], help="directory to backup Grafana artifacts")
+        c.argument("incremental", arg_type=get_three_state_flag(),
+                   help="only backup what changed since the latest backup in the directory. Restoring the new archive also restores the unchanged artifacts from the earlier archives, which must be kept next to it")
 
     with self.argument_context("grafana restore") as c:
         c.argument("archive_file", options_list=["-a", "--archive-file"], help="archive to restore Grafana artifacts from")
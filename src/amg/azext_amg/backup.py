@@ -5,11 +5,12 @@
 
 import datetime
 from glob import glob
+import gzip
+import hashlib
+import io
 import json
 import os
-import random
 import shutil
-import string
 import re
 import tarfile
 import time
@@ -22,11 +23,14 @@ from .utils import search_snapshot, get_snapshot
 from .utils import search_folders, get_folder, get_folder_permissions
 from .utils import search_datasource
 from .utils import search_annotations
+from .utils import run_concurrently
 
 logger = get_logger(__name__)
 
+MANIFEST_FILE = 'manifest.json'
 
-def backup(grafana_name, grafana_url, backup_dir, components, http_headers, **kwargs):
+
+def backup(grafana_name, grafana_url, backup_dir, components, http_headers, incremental=False, **kwargs):
     backup_functions = {'dashboards': _save_dashboards,
                         'library_panels': _save_library_panels,
                         'folders': _save_folders,
@@ -35,6 +39,17 @@ def backup(grafana_name, grafana_url, backup_dir, components, http_headers, **kw
                         'datasources': _save_datasources}
 
     timestamp = datetime.datetime.today().strftime('%Y%m%d%H%M')
+    archive_name = f'{grafana_name}-{timestamp}.tar.gz'
+    previous_manifest = _load_latest_manifest(grafana_name, backup_dir, archive_name) if incremental else None
+    # what each item of the backup is, and which archive of the chain holds it
+    manifest = {
+        'archive': archive_name,
+        'base': previous_manifest['archive'] if previous_manifest else None,
+        'items': {},
+        'deleted': {}
+    }
+    kwargs.update(manifest=manifest, previous_manifest=previous_manifest)
+
     if components:
         # Backup only the components that provided via an argument
         if 'dashboards' in components:  # dashboards won't load if linked library panels don't exist
@@ -46,10 +61,104 @@ def backup(grafana_name, grafana_url, backup_dir, components, http_headers, **kw
         for backup_function in backup_functions.values():
             backup_function(grafana_url, backup_dir, timestamp, http_headers, **kwargs)
 
-    _archive(grafana_name, backup_dir, timestamp)
+    if previous_manifest:
+        # the components left out this time are still restored from the earlier archives
+        for component, items in previous_manifest['items'].items():
+            manifest['items'].setdefault(component, items)
+
+    _archive(grafana_name, backup_dir, timestamp, manifest)
+
+
+def _load_latest_manifest(grafana_name, backup_dir, archive_name):
+    # the backup directory can be shared with other instances, "prod-*" also matches the archives of "prod-eu"
+    archive_pattern = re.compile(re.escape(grafana_name) + r'-\d{12}\.tar\.gz')
+    archives = sorted(archive for archive in glob(f'{backup_dir}/{grafana_name}-*.tar.gz')
+                      if archive_pattern.fullmatch(os.path.basename(archive)))
+    if not archives:
+        logger.warning('No earlier backup of %s in %s, backing up everything', grafana_name, backup_dir)
+        return None
+    latest = archives[-1]
+    if os.path.basename(latest) == archive_name:
+        logger.warning('%s would be overwritten by this backup, backing up everything', latest)
+        return None
+    manifest = read_manifest(latest)
+    if manifest is None:
+        logger.warning('%s has no manifest, backing up everything', latest)
+        return None
+    logger.warning('Backing up the changes since %s', latest)
+    return manifest
+
+
+def read_manifest(archive_file):
+    # the manifest is the first member, the rest of the archive isn't read
+    with tarfile.open(name=archive_file, mode='r|gz') as tar:
+        member = tar.next()
+        if member is not None and member.name == MANIFEST_FILE:
+            return json.loads(tar.extractfile(member).read())
+    return None
+
+
+def _hash(*contents):
+    return hashlib.sha256(json.dumps(contents, sort_keys=True).encode()).hexdigest()
+
+
+def _start_component(component, **kwargs):
+    kwargs['manifest']['items'][component] = {}
+
+
+def _unchanged(component, uid, version=None, content_hash=None, **kwargs):
+    # an item with the same version, or else the same content, as in the previous backup stays in the earlier archive
+    previous_manifest = kwargs.get('previous_manifest')
+    if not previous_manifest:
+        return False
+    previous = previous_manifest['items'].get(component, {}).get(uid)
+    if previous is None:
+        return False
+    if (version is not None and version == previous['version']) or \
+            (content_hash is not None and content_hash == previous['hash']):
+        kwargs['manifest']['items'][component][uid] = dict(previous, version=version or previous['version'])
+        return True
+    return False
+
+
+def _record_saved(component, uid, version, content_hash, file_paths, **kwargs):
+    manifest = kwargs['manifest']
+    manifest['items'][component][uid] = {
+        'version': version,
+        'hash': content_hash,
+        'archive': manifest['archive'],
+        'files': [os.path.basename(file_path) for file_path in file_paths]
+    }
+
+
+def _finish_component(component, seen_uids, **kwargs):
+    # items gone from Grafana are recorded as deleted, the ones filtered out or missing from a failed listing are kept
+    previous_manifest = kwargs.get('previous_manifest')
+    if not previous_manifest:
+        return
+    items = kwargs['manifest']['items'][component]
+    deleted = []
+    for uid, previous in previous_manifest['items'].get(component, {}).items():
+        if uid in items:
+            continue
+        if seen_uids is None or uid in seen_uids:
+            items[uid] = previous
+        else:
+            deleted.append(uid)
+    if deleted:
+        logger.warning("%s %s deleted since the previous backup", len(deleted), component)
+        kwargs['manifest']['deleted'][component] = deleted
+
 
+def _reset_tarinfo(tarinfo, mtime):
+    # the same backup gives the same archive, whoever ran it and whenever the files were written
+    tarinfo.uid = tarinfo.gid = 0
+    tarinfo.uname = tarinfo.gname = ''
+    tarinfo.mtime = mtime
+    return tarinfo
 
-def _archive(grafana_name, backup_dir, timestamp):
+
+def _archive(grafana_name, backup_dir, timestamp, manifest):
     archive_file = f'{backup_dir}/{grafana_name}-{timestamp}.tar.gz'
     backup_files = []
 
@@ -64,12 +173,18 @@ def _archive(grafana_name, backup_dir, timestamp):
     if os.path.exists(archive_file):
         os.remove(archive_file)
 
-    with tarfile.open(archive_file, "w:gz") as tar:
+    mtime = int(time.mktime(datetime.datetime.strptime(timestamp, '%Y%m%d%H%M').timetuple()))
+    with open(archive_file, 'wb') as f, \
+            gzip.GzipFile(filename=os.path.basename(archive_file), mode='wb', fileobj=f, mtime=mtime) as gz, \
+            tarfile.open(fileobj=gz, mode='w') as tar:
+        manifest_data = json.dumps(manifest, sort_keys=True, indent=4).encode()
+        manifest_info = _reset_tarinfo(tarfile.TarInfo(MANIFEST_FILE), mtime)
+        manifest_info.size = len(manifest_data)
+        tar.addfile(manifest_info, io.BytesIO(manifest_data))
         for file_path in backup_files:
-            tar.add(file_path)
+            tar.add(file_path, filter=lambda tarinfo: _reset_tarinfo(tarinfo, mtime))
             if not os.environ.get("AMG_DEBUG", False):
                 shutil.rmtree(os.path.abspath(os.path.join(file_path, os.pardir)))
-    tar.close()
     logger.warning('Created archive at: %s', archive_file)
 
 
@@ -81,10 +196,16 @@ def _save_dashboards(grafana_url, backup_dir, timestamp, http_headers, **kwargs)
     if not os.path.exists(folder_path):
         os.makedirs(folder_path)
 
+    _start_component('dashboards', **kwargs)
+    seen_uids = set()
     limit = 5000  # limit is 5000 above V6.2+
     current_page = 1
     while True:
         dashboards = _get_all_dashboards_in_grafana(current_page, limit, grafana_url, http_headers)
+        if dashboards is None:
+            seen_uids = None
+            break
+        seen_uids.update(d['uid'] for d in dashboards)
 
         # only include what users want
         folders_to_include = kwargs.get('folders_to_include')
@@ -105,9 +226,12 @@ def _save_dashboards(grafana_url, backup_dir, timestamp, http_headers, **kwargs)
         if len(dashboards) == 0:
             break
         current_page += 1
-        _get_individual_dashboard_setting_and_save(dashboards, folder_path, log_file, grafana_url, http_headers)
+        _get_individual_dashboard_setting_and_save(dashboards, folder_path, log_file, grafana_url, http_headers,
+                                                   **kwargs)
         _print_an_empty_line()
 
+    _finish_component('dashboards', seen_uids, **kwargs)
+
 
 def _get_all_dashboards_in_grafana(page, limit, grafana_url, http_headers):
     (status, content) = search_dashboard(page,
@@ -121,51 +245,77 @@ def _get_all_dashboards_in_grafana(page, limit, grafana_url, http_headers):
             logger.info('name: %s', board['title'])
         return dashboards
     logger.warning("Get dashboards FAILED, status: %s, msg: %s", status, content)
-    return []
+    return None
 
 
 def _save_dashboard_setting(dashboard_name, file_name, dashboard_settings, folder_path):
     file_path = _save_json(file_name, dashboard_settings, folder_path, 'dashboard')
     logger.warning("Dashboard: \"%s\" is saved", dashboard_name)
     logger.info("    -> %s", file_path)
+    return file_path
 
 
-def _get_individual_dashboard_setting_and_save(dashboards, folder_path, log_file, grafana_url, http_headers):
+def _get_individual_dashboard_setting_and_save(dashboards, folder_path, log_file, grafana_url, http_headers,
+                                               **kwargs):
     file_path = folder_path + '/' + log_file
+
+    def get_and_save(board):
+        board_uri = "uid/" + board['uid']
+        # when the search results carry the version, unchanged dashboards aren't even fetched
+        if _unchanged('dashboards', board['uid'], version=board.get('version'), **kwargs):
+            return False
+
+        (status, content) = get_dashboard(board_uri, grafana_url, http_headers)
+        if status != 200:
+            return False
+        version = content['dashboard'].get('version')
+        content_hash = _hash(content['dashboard'])
+        if _unchanged('dashboards', board['uid'], version=version, content_hash=content_hash, **kwargs):
+            return False
+        dashboard_path = _save_dashboard_setting(
+            board['title'],
+            board_uri,
+            content,
+            folder_path)
+        _record_saved('dashboards', board['uid'], version, content_hash, [dashboard_path], **kwargs)
+        return True
+
     if dashboards:
         with open(file_path, 'w', encoding="utf8") as f:
-            for board in dashboards:
-                board_uri = "uid/" + board['uid']
-
-                (status, content) = get_dashboard(board_uri, grafana_url, http_headers)
-                if status == 200:
-                    _save_dashboard_setting(
-                        board['title'],
-                        board_uri,
-                        content,
-                        folder_path)
-                    f.write(board_uri + '\t' + board['title'] + '\n')
+            # dashboards are fetched side by side and saved as they arrive, the log keeps the search order
+            for board, saved in zip(dashboards, run_concurrently(get_and_save, dashboards)):
+                if saved:
+                    f.write("uid/" + board['uid'] + '\t' + board['title'] + '\n')
 
 
 # Save library panels
-def _save_library_panels(grafana_url, backup_dir, timestamp, http_headers, **kwargs):  # pylint: disable=unused-argument
+def _save_library_panels(grafana_url, backup_dir, timestamp, http_headers, **kwargs):
     folder_path = f'{backup_dir}/library_panels/{timestamp}'
     log_file = f'library_panels_{timestamp}.txt'
 
     if not os.path.exists(folder_path):
         os.makedirs(folder_path)
 
+    _start_component('library_panels', **kwargs)
+    seen_uids = set()
     current_page = 1
     while True:
         panels = _get_all_library_panels_in_grafana(current_page, grafana_url, http_headers)
+        if panels is None:
+            seen_uids = None
+            break
+        seen_uids.update(p['uid'] for p in panels)
 
         _print_an_empty_line()
         if len(panels) == 0:
             break
         current_page += 1
-        _get_individual_library_panel_setting_and_save(panels, folder_path, log_file, grafana_url, http_headers)
+        _get_individual_library_panel_setting_and_save(panels, folder_path, log_file, grafana_url, http_headers,
+                                                       **kwargs)
         _print_an_empty_line()
 
+    _finish_component('library_panels', seen_uids, **kwargs)
+
 
 def _get_all_library_panels_in_grafana(page, grafana_url, http_headers):
     (status, content) = search_library_panels(page, grafana_url, http_headers)
@@ -176,70 +326,95 @@ def _get_all_library_panels_in_grafana(page, grafana_url, http_headers):
             logger.info('name: %s', panel['name'])
         return library_panels
     logger.warning("Get library panel FAILED, status: %s, msg: %s", status, content)
-    return []
+    return None
 
 
 def _save_library_panel_setting(panel_name, file_name, library_panel_settings, folder_path):
     file_path = _save_json(file_name, library_panel_settings, folder_path, 'library_panel')
     logger.warning("Library Panel: \"%s\" is saved", panel_name)
     logger.info("    -> %s", file_path)
+    return file_path
 
 
-def _get_individual_library_panel_setting_and_save(panels, folder_path, log_file, grafana_url, http_headers):
+def _get_individual_library_panel_setting_and_save(panels, folder_path, log_file, grafana_url, http_headers,
+                                                   **kwargs):
     file_path = folder_path + '/' + log_file
+
+    def get_and_save(panel):
+        if _unchanged('library_panels', panel['uid'], version=panel.get('version'), **kwargs):
+            return False
+
+        (status, content) = get_library_panel(panel['uid'], grafana_url, http_headers)
+        if status != 200:
+            return False
+        panel_path = _save_library_panel_setting(
+            panel['name'],
+            panel['uid'],
+            content['result'],
+            folder_path)
+        _record_saved('library_panels', panel['uid'], content['result'].get('version'), _hash(content['result']),
+                      [panel_path], **kwargs)
+        return True
+
     if panels:
         with open(file_path, 'w', encoding="utf8") as f:
-            for panel in panels:
-                panel_uri = panel['uid']
-
-                (status, content) = get_library_panel(panel_uri, grafana_url, http_headers)
-                if status == 200:
-                    _save_library_panel_setting(
-                        panel['name'],
-                        panel_uri,
-                        content['result'],
-                        folder_path)
-                    f.write(panel_uri + '\t' + panel['name'] + '\n')
+            for panel, saved in zip(panels, run_concurrently(get_and_save, panels)):
+                if saved:
+                    f.write(panel['uid'] + '\t' + panel['name'] + '\n')
 
 
 # Save snapshots
-def _save_snapshots(grafana_url, backup_dir, timestamp, http_headers, **kwargs):  # pylint: disable=unused-argument
+def _save_snapshots(grafana_url, backup_dir, timestamp, http_headers, **kwargs):
     folder_path = f'{backup_dir}/snapshots/{timestamp}'
 
     if not os.path.exists(folder_path):
         os.makedirs(folder_path)
 
-    _get_all_snapshots_and_save(folder_path, grafana_url, http_get_headers=http_headers)
+    _get_all_snapshots_and_save(folder_path, grafana_url, http_get_headers=http_headers, **kwargs)
     _print_an_empty_line()
 
 
-def _save_snapshot(file_name, snapshot_setting, folder_path):
+def _save_snapshot(file_name, snapshot_key, snapshot_setting, folder_path):
     file_name = file_name.replace('/', '_')
-    random_suffix = "".join(random.choice(string.ascii_letters) for _ in range(6))
-    file_path = _save_json(file_name + "_" + random_suffix, snapshot_setting, folder_path, 'snapshot')
+    # snapshots can share a name, the key tells them apart and keeps the file name stable between backups
+    file_path = _save_json(file_name + "_" + snapshot_key, snapshot_setting, folder_path, 'snapshot')
     logger.warning("Snapshot: \"%s\" is saved", snapshot_setting.get('dashboard', {}).get("title"))
     logger.info("    -> %s", file_path)
+    return file_path
 
 
-def _get_single_snapshot_and_save(snapshot, grafana_url, http_get_headers, folder_path):
+def _get_single_snapshot_and_save(snapshot, grafana_url, http_get_headers, folder_path, **kwargs):
+    if _unchanged('snapshots', snapshot['key'], version=snapshot.get('updated'), **kwargs):
+        return
     (status, content) = get_snapshot(snapshot['key'], grafana_url, http_get_headers)
     if status == 200:
-        _save_snapshot(snapshot['name'], content, folder_path)
+        snapshot_path = _save_snapshot(snapshot['name'], snapshot['key'], content, folder_path)
+        _record_saved('snapshots', snapshot['key'], snapshot.get('updated'), _hash(content), [snapshot_path],
+                      **kwargs)
     else:
         logger.warning("Getting snapshot %s FAILED, status: %s, msg: %s", snapshot['name'], status, content)
 
 
-def _get_all_snapshots_and_save(folder_path, grafana_url, http_get_headers):
+def _get_all_snapshots_and_save(folder_path, grafana_url, http_get_headers, **kwargs):
+    _start_component('snapshots', **kwargs)
+    seen_uids = None
     status_code_and_content = search_snapshot(grafana_url, http_get_headers)
     if status_code_and_content[0] == 200:
         snapshots = status_code_and_content[1]
         logger.info("There are %s snapshots:", len(snapshots))
         for snapshot in snapshots:
             logger.info(snapshot)
-            _get_single_snapshot_and_save(snapshot, grafana_url, http_get_headers, folder_path)
+
+        def get_and_save(snapshot):
+            _get_single_snapshot_and_save(snapshot, grafana_url, http_get_headers, folder_path, **kwargs)
+
+        for _ in run_concurrently(get_and_save, snapshots):
+            pass
+        seen_uids = {snapshot['key'] for snapshot in snapshots}
     else:
         logger.warning("Query snapshot failed, status: %s, msg: %s", status_code_and_content[0],
                        status_code_and_content[1])
+    _finish_component('snapshots', seen_uids, **kwargs)
 
 
 # Save folders
@@ -250,7 +425,10 @@ def _save_folders(grafana_url, backup_dir, timestamp, http_headers, **kwargs):
     if not os.path.exists(folder_path):
         os.makedirs(folder_path)
 
+    _start_component('folders', **kwargs)
     folders = _get_all_folders_in_grafana(grafana_url, http_get_headers=http_headers)
+    seen_uids = {f['uid'] for f in folders} if folders is not None else None
+    folders = folders or []
 
     # only include what users want
     folders_to_include = kwargs.get('folders_to_include')
@@ -263,8 +441,10 @@ def _save_folders(grafana_url, backup_dir, timestamp, http_headers, **kwargs):
         folders = [f for f in folders if f.get('title', '').lower() not in folders_to_exclude]
 
     _print_an_empty_line()
-    _get_individual_folder_setting_and_save(folders, folder_path, log_file, grafana_url, http_get_headers=http_headers)
+    _get_individual_folder_setting_and_save(folders, folder_path, log_file, grafana_url, http_get_headers=http_headers,
+                                            **kwargs)
     _print_an_empty_line()
+    _finish_component('folders', seen_uids, **kwargs)
 
 
 def _get_all_folders_in_grafana(grafana_url, http_get_headers):
@@ -278,47 +458,60 @@ def _get_all_folders_in_grafana(grafana_url, http_get_headers):
             logger.info("name: %s", folder['title'])
         return folders
     logger.warning("Get folders FAILED, status: %s, msg: %s", status, content)
-    return []
+    return None
 
 
 def _save_folder_setting(folder_name, file_name, folder_settings, folder_permissions, folder_path):
     file_path = _save_json(file_name, folder_settings, folder_path, 'folder')
     logger.warning("Folder: \"%s\" is saved", folder_name)
     logger.info("    -> %s", file_path)
-    file_path = _save_json(file_name, folder_permissions, folder_path, 'folder_permission')
+    permissions_file_path = _save_json(file_name, folder_permissions, folder_path, 'folder_permission')
     logger.warning("Folder permissions: %s are saved", folder_name)
-    logger.info("    -> %s", file_path)
+    logger.info("    -> %s", permissions_file_path)
+    return [file_path, permissions_file_path]
 
 
-def _get_individual_folder_setting_and_save(folders, folder_path, log_file, grafana_url, http_get_headers):
+def _get_individual_folder_setting_and_save(folders, folder_path, log_file, grafana_url, http_get_headers, **kwargs):
     file_path = folder_path + '/' + log_file
-    with open(file_path, 'w+', encoding="utf8") as f:
-        for folder in folders:
-            folder_uri = "uid/" + folder['uid']
 
-            (status_folder_settings, content_folder_settings) = get_folder(folder['uid'], grafana_url, http_get_headers)
-            (status_folder_permissions, content_folder_permissions) = get_folder_permissions(folder['uid'],
-                                                                                             grafana_url,
-                                                                                             http_get_headers)
+    def get_and_save(folder):
+        folder_uri = "uid/" + folder['uid']
+
+        (status_folder_settings, content_folder_settings) = get_folder(folder['uid'], grafana_url, http_get_headers)
+        (status_folder_permissions, content_folder_permissions) = get_folder_permissions(folder['uid'],
+                                                                                         grafana_url,
+                                                                                         http_get_headers)
+
+        if status_folder_settings == 200 and status_folder_permissions == 200:
+            # changing the permissions doesn't bump the version of a folder, so the content is compared instead
+            content_hash = _hash(content_folder_settings, content_folder_permissions)
+            if _unchanged('folders', folder['uid'], content_hash=content_hash, **kwargs):
+                return False
+            file_paths = _save_folder_setting(
+                folder['title'],
+                folder_uri,
+                content_folder_settings,
+                content_folder_permissions,
+                folder_path)
+            _record_saved('folders', folder['uid'], content_folder_settings.get('version'), content_hash, file_paths,
+                          **kwargs)
+            return True
+        return False
 
-            if status_folder_settings == 200 and status_folder_permissions == 200:
-                _save_folder_setting(
-                    folder['title'],
-                    folder_uri,
-                    content_folder_settings,
-                    content_folder_permissions,
-                    folder_path)
-                f.write(folder_uri + '\t' + folder['title'] + '\n')
+    with open(file_path, 'w+', encoding="utf8") as f:
+        for folder, saved in zip(folders, run_concurrently(get_and_save, folders)):
+            if saved:
+                f.write("uid/" + folder['uid'] + '\t' + folder['title'] + '\n')
 
 
 # Save annotations
-def _save_annotations(grafana_url, backup_dir, timestamp, http_headers, **kwargs):  # pylint: disable=unused-argument
+def _save_annotations(grafana_url, backup_dir, timestamp, http_headers, **kwargs):
     folder_path = f'{backup_dir}/annotations/{timestamp}'
 
     if not os.path.exists(folder_path):
         os.makedirs(folder_path)
 
-    _get_all_annotations_and_save(folder_path, grafana_url, http_get_headers=http_headers)
+    _get_all_annotations_and_save(folder_path, grafana_url, http_get_headers=http_headers, **kwargs)
     _print_an_empty_line()
 
 
@@ -326,9 +519,10 @@ def _save_annotation(file_name, annotation_setting, folder_path):
     file_path = _save_json(file_name, annotation_setting, folder_path, 'annotation')
     logger.warning("Annotation: \"%s\" is saved", annotation_setting.get('text'))
     logger.info("    -> %s", file_path)
+    return file_path
 
 
-def _get_all_annotations_and_save(folder_path, grafana_url, http_get_headers):
+def _get_all_annotations_and_save(folder_path, grafana_url, http_get_headers, **kwargs):
     now = int(round(time.time() * 1000))
     one_month_in_ms = 31 * 24 * 60 * 60 * 1000
 
@@ -336,6 +530,8 @@ def _get_all_annotations_and_save(folder_path, grafana_url, http_get_headers):
     ts_from = now - one_month_in_ms
     thirteen_months_retention = (now - (13 * one_month_in_ms))
 
+    _start_component('annotations', **kwargs)
+    seen_uids = set()
     while ts_from > thirteen_months_retention:
         status_code_and_content = search_annotations(grafana_url, ts_from, ts_to, http_get_headers)
         if status_code_and_content[0] == 200:
@@ -343,23 +539,32 @@ def _get_all_annotations_and_save(folder_path, grafana_url, http_get_headers):
             logger.info("There are %s annotations:", len(annotations_batch))
             for annotation in annotations_batch:
                 logger.info(annotation)
-                _save_annotation(str(annotation['id']), annotation, folder_path)
+                annotation_id = str(annotation['id'])
+                seen_uids.add(annotation_id)
+                content_hash = _hash(annotation)
+                if _unchanged('annotations', annotation_id, content_hash=content_hash, **kwargs):
+                    continue
+                annotation_path = _save_annotation(annotation_id, annotation, folder_path)
+                _record_saved('annotations', annotation_id, None, content_hash, [annotation_path], **kwargs)
         else:
             logger.warning("Query annotation FAILED, status: %s, msg: %s", status_code_and_content[0],
                            status_code_and_content[1])
+            seen_uids = None
 
         ts_to = ts_from
         ts_from = ts_from - one_month_in_ms
 
+    _finish_component('annotations', seen_uids, **kwargs)
+
 
 # Save data sources
-def _save_datasources(grafana_url, backup_dir, timestamp, http_headers, **kwargs):  # pylint: disable=unused-argument
+def _save_datasources(grafana_url, backup_dir, timestamp, http_headers, **kwargs):
     folder_path = f'{backup_dir}/datasources/{timestamp}'
 
     if not os.path.exists(folder_path):
         os.makedirs(folder_path)
 
-    _get_all_datasources_and_save(folder_path, grafana_url, http_get_headers=http_headers)
+    _get_all_datasources_and_save(folder_path, grafana_url, http_get_headers=http_headers, **kwargs)
     _print_an_empty_line()
 
 
@@ -367,9 +572,12 @@ def _save_datasource(file_name, datasource_setting, folder_path):
     file_path = _save_json(file_name, datasource_setting, folder_path, 'datasource')
     logger.warning("Datasource: \"%s\" is saved", datasource_setting['name'])
     logger.info("    -> %s", file_path)
+    return file_path
 
 
-def _get_all_datasources_and_save(folder_path, grafana_url, http_get_headers):
+def _get_all_datasources_and_save(folder_path, grafana_url, http_get_headers, **kwargs):
+    _start_component('datasources', **kwargs)
+    seen_uids = None
     status_code_and_content = search_datasource(grafana_url, http_get_headers)
     if status_code_and_content[0] == 200:
         datasources = status_code_and_content[1]
@@ -377,10 +585,17 @@ def _get_all_datasources_and_save(folder_path, grafana_url, http_get_headers):
         for datasource in datasources:
             logger.info(datasource)
             datasource_name = datasource['uid']
-            _save_datasource(datasource_name, datasource, folder_path)
+            content_hash = _hash(datasource)
+            if _unchanged('datasources', datasource_name, content_hash=content_hash, **kwargs):
+                continue
+            datasource_path = _save_datasource(datasource_name, datasource, folder_path)
+            _record_saved('datasources', datasource_name, datasource.get('version'), content_hash, [datasource_path],
+                          **kwargs)
+        seen_uids = {datasource['uid'] for datasource in datasources}
     else:
         logger.info("Query datasource FAILED, status: %s, msg: %s", status_code_and_content[0],
                     status_code_and_content[1])
+    _finish_component('datasources', seen_uids, **kwargs)
 
 
 def _save_json(file_name, data, folder_path, extension, pretty_print=None):
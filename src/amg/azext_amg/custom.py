@@ -236,7 +236,7 @@ def delete_grafana(cmd, grafana_name, resource_group_name=None):
 
 
 def backup_grafana(cmd, grafana_name, components=None, directory=None, folders_to_include=None,
-                   folders_to_exclude=None, resource_group_name=None):
+                   folders_to_exclude=None, incremental=None, resource_group_name=None):
     import os
     from pathlib import Path
     from .backup import backup
@@ -253,6 +253,7 @@ def backup_grafana(cmd, grafana_name, components=None, directory=None, folders_t
            backup_dir=directory or os.path.join(Path.cwd(), "_backup"),
            components=components,
            http_headers=headers,
+           incremental=incremental,
            folders_to_include=folders_to_include,
            folders_to_exclude=folders_to_exclude)
 
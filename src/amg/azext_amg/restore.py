@@ -5,19 +5,23 @@
 
 import collections
 import json
-from glob import glob
+import os
+import shutil
 import tarfile
 import tempfile
+import time
 
 from azure.cli.core.azclierror import ArgumentUsageError
 from knack.log import get_logger
 
-from .utils import (get_folder_id, send_grafana_post, send_grafana_patch,
-                    send_grafana_get, create_datasource_mapping, remap_datasource_uids)
+from .backup import read_manifest
+from .utils import (get_folder_uid, get_folder_id_by_uid, send_grafana_post, send_grafana_patch,
+                    send_grafana_get, create_datasource_mapping, remap_datasource_uids, run_concurrently)
 
 logger = get_logger(__name__)
 
 uid_mapping = {}
+folder_ids = {}
 
 
 def restore(grafana_url, archive_file, components, http_headers, destination_datasources=None):
@@ -34,15 +38,55 @@ def restore(grafana_url, archive_file, components, http_headers, destination_dat
     restore_functions['annotation'] = _create_annotation
     restore_functions['datasource'] = _create_datasource
 
-    with tarfile.open(name=archive_file, mode='r:gz') as tar:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tar.extractall(tmpdir)
-            tar.close()
-            _restore_components(grafana_url, restore_functions, tmpdir, components, http_headers,
-                                destination_datasources=destination_datasources)
+    _restore_components(grafana_url, restore_functions, archive_file, components, http_headers,
+                        destination_datasources=destination_datasources)
 
 
-def _restore_components(grafana_url, restore_functions, tmpdir, components, http_headers, destination_datasources=None):
+def _read_archive(archive_file, exts, spool_dir, file_names=None, backups=None):
+    # a single pass over the compressed stream, the members are spooled to files of their own so the memory used
+    # doesn't grow with the backup, and each item is only loaded when it's restored
+    backups = collections.defaultdict(list) if backups is None else backups
+    with tarfile.open(name=archive_file, mode='r|gz') as tar:
+        for member in tar:
+            ext = os.path.splitext(member.name)[1][1:]
+            if member.isfile() and ext in exts and (file_names is None or os.path.basename(member.name) in file_names):
+                spool_file = os.path.join(spool_dir, f'{len(backups[ext])}.{ext}')
+                with open(spool_file, 'wb') as f:
+                    shutil.copyfileobj(tar.extractfile(member), f)
+                backups[ext].append((member.name, spool_file))
+    return backups
+
+
+def _load_spooled(spool_file):
+    with open(spool_file, 'rb') as f:
+        return json.load(f)
+
+
+def _read_backup_chain(archive_file, exts, spool_dir):
+    manifest = read_manifest(archive_file)
+    if not manifest or not manifest.get('base'):
+        return _read_archive(archive_file, exts, spool_dir)
+
+    # an incremental backup holds the changed items, the manifest tells which earlier archive holds each other item
+    file_names = collections.defaultdict(set)
+    for items in manifest['items'].values():
+        for item in items.values():
+            file_names[item['archive']].update(item['files'])
+
+    backups = collections.defaultdict(list)
+    for archive, names in sorted(file_names.items()):
+        archive_path = os.path.join(os.path.dirname(archive_file), archive)
+        if not os.path.exists(archive_path):
+            raise ArgumentUsageError(f"{archive} of the backup chain of {archive_file} isn't found next to it")
+        logger.info('Reading %s item(s) from %s', len(names), archive_path)
+        _read_archive(archive_path, exts, spool_dir, names, backups)
+    for component, deleted in manifest['deleted'].items():
+        logger.info('%s %s deleted since %s are left out', len(deleted), component, manifest['base'])
+    return backups
+
+
+def _restore_components(grafana_url, restore_functions, archive_file, components, http_headers,
+                        destination_datasources=None):
 
     if components:
         exts = [c[:-1] for c in components]
@@ -53,19 +97,6 @@ def _restore_components(grafana_url, restore_functions, tmpdir, components, http
     if destination_datasources:
         if "datasource" in exts:  # first let us skip datasource restoration
             exts.pop(exts.index("datasource"))
-        datasource_backups = glob(f'{tmpdir}/**/*.datasource', recursive=True)
-        if not datasource_backups:
-            logger.warning('"remap data source" is on, but data sources info wasn\'t archived to transform dashboards')
-
-        source_datasources = []
-        for file_path in datasource_backups:
-            with open(file_path, 'r', encoding="utf8") as f:
-                data = f.read()
-            datasource = json.loads(data)
-            source_datasources.append(datasource)
-
-        global uid_mapping  # pylint: disable=global-statement
-        uid_mapping = create_datasource_mapping(source_datasources, destination_datasources)
 
     if "dashboard" in exts:  # dashboard restoration can't work if linked library panels don't exist
         exts.insert(0, "library_panel")
@@ -73,23 +104,63 @@ def _restore_components(grafana_url, restore_functions, tmpdir, components, http
     if "folder" in exts:  # make "folder" be the first to restore, so dashboards can be positioned under a right folder
         exts.insert(0, exts.pop(exts.index("folder")))
 
-    for ext in exts:
-        for file_path in glob(f'{tmpdir}/**/*.{ext}', recursive=True):
-            logger.info('Restoring %s: %s', ext, file_path)
-            restore_functions[ext](grafana_url, file_path, http_headers)
+    with tempfile.TemporaryDirectory() as spool_dir:
+        backups = _read_backup_chain(archive_file, set(exts) | ({'datasource'} if destination_datasources else set()),
+                                     spool_dir)
 
+        if destination_datasources:
+            datasource_backups = backups['datasource']
+            if not datasource_backups:
+                logger.warning('"remap data source" is on, but data sources info wasn\'t archived to transform '
+                               'dashboards')
 
-# Restore dashboards
-def _create_dashboard(grafana_url, file_path, http_headers):
-    with open(file_path, 'r', encoding="utf8") as f:
-        data = f.read()
+            source_datasources = []
+            for _, spool_file in datasource_backups:
+                datasource = _load_spooled(spool_file)
+                source_datasources.append(datasource)
+
+            global uid_mapping  # pylint: disable=global-statement
+            uid_mapping = create_datasource_mapping(source_datasources, destination_datasources)
+
+        folder_ids.clear()
+        # the phases run one after another, the items of a phase are restored side by side
+        for ext in dict.fromkeys(exts):
+            _restore_phase(grafana_url, ext, restore_functions[ext], backups.pop(ext, []), http_headers)
 
-    content = json.loads(data)
+
+def _restore_phase(grafana_url, ext, restore_function, items, http_headers):
+    start = time.perf_counter()
+    if ext in ['dashboard', 'library_panel']:
+        _resolve_folder_ids(grafana_url, (get_folder_uid(_load_spooled(spool_file)) for _, spool_file in items),
+                            http_headers)
+
+    def restore_item(item):
+        file_name, spool_file = item
+        logger.info('Restoring %s: %s', ext, file_name)
+        return restore_function(grafana_url, _load_spooled(spool_file), http_headers)
+
+    restored = sum(run_concurrently(restore_item, items))
+    elapsed = time.perf_counter() - start
+    if items:
+        logger.warning("Restored %s of %s %s(s) in %.1f seconds, %.1f per second", restored, len(items), ext,
+                       elapsed, len(items) / elapsed)
+
+
+def _resolve_folder_ids(grafana_url, folder_uids, http_headers):
+    # thousands of dashboards can share a handful of folders, so each folder id is looked up only once
+    folder_uids = [uid for uid in dict.fromkeys(folder_uids) if uid not in folder_ids]
+    ids = run_concurrently(lambda folder_uid: get_folder_id_by_uid(folder_uid, grafana_url, http_headers),
+                           folder_uids)
+    folder_ids.update(zip(folder_uids, ids))
+
+
+# Restore dashboards
+def _create_dashboard(grafana_url, content, http_headers):
     content['dashboard']['id'] = None
 
     payload = {
         'dashboard': content['dashboard'],
-        'folderId': get_folder_id(content, grafana_url, http_post_headers=http_headers),
+        'folderId': folder_ids[get_folder_uid(content)],
         'overwrite': True
     }
 
@@ -100,16 +171,13 @@ def _create_dashboard(grafana_url, file_path, http_headers):
     dashboard_title = content['dashboard'].get('title', '')
     logger.warning("Create dashboard \"%s\". %s", dashboard_title, "SUCCESS" if result[0] == 200 else "FAILURE")
     logger.info("status: %s, msg: %s", result[0], result[1])
+    return result[0] == 200
 
 
 # Restore Library Panel
-def _create_library_panel(grafana_url, file_path, http_headers):
-    with open(file_path, 'r', encoding="utf8") as f:
-        data = f.read()
-
-    payload = json.loads(data)
+def _create_library_panel(grafana_url, payload, http_headers):
     payload['id'] = None
-    payload['folderId'] = get_folder_id(payload, grafana_url, http_post_headers=http_headers)
+    payload['folderId'] = folder_ids[get_folder_uid(payload)]
 
     datasources_missed = set()
     remap_datasource_uids(payload, uid_mapping, datasources_missed)
@@ -132,14 +200,11 @@ def _create_library_panel(grafana_url, file_path, http_headers):
                                                    json.dumps(patch_payload), http_headers)
     logger.warning("Create library panel \"%s\". %s", panel_name, "SUCCESS" if status == 200 else "FAILURE")
     logger.info("status: %s, msg: %s", status, content)
+    return status == 200
 
 
 # Restore snapshots
-def _create_snapshot(grafana_url, file_path, http_headers):
-    with open(file_path, 'r', encoding="utf8") as f:
-        data = f.read()
-
-    snapshot = json.loads(data)
+def _create_snapshot(grafana_url, snapshot, http_headers):
     try:
         snapshot['name'] = snapshot['dashboard']['title']
     except KeyError:
@@ -148,38 +213,33 @@ def _create_snapshot(grafana_url, file_path, http_headers):
     (status, content) = send_grafana_post(f'{grafana_url}/api/snapshots', json.dumps(snapshot), http_headers)
     logger.warning("Create snapshot \"%s\". %s", snapshot['name'], "SUCCESS" if status == 200 else "FAILURE")
     logger.info("status: %s, msg: %s", status, content)
+    return status == 200
 
 
 # Restore folders
-def _create_folder(grafana_url, file_path, http_headers):
-    with open(file_path, 'r', encoding="utf8") as f:
-        data = f.read()
-
-    folder = json.loads(data)
+def _create_folder(grafana_url, folder, http_headers):
     result = send_grafana_post(f'{grafana_url}/api/folders', json.dumps(folder), http_headers)
+    if result[0] == 200 and isinstance(result[1], dict) and 'id' in result[1]:
+        # the id of a folder just created is known without looking it up
+        folder_ids[result[1]['uid']] = result[1]['id']
     # 412 means the folder has existed
     logger.warning("Create folder \"%s\". %s", folder.get('title', ''),
                    "SUCCESS" if result[0] in [200, 412] else "FAILURE")
     logger.info("status: %s, msg: %s", result[0], result[1])
+    return result[0] in [200, 412]
 
 
 # Restore annotations
-def _create_annotation(grafana_url, file_path, http_headers):
-    with open(file_path, 'r', encoding="utf8") as f:
-        data = f.read()
-
-    annotation = json.loads(data)
+def _create_annotation(grafana_url, annotation, http_headers):
     result = send_grafana_post(f'{grafana_url}/api/annotations', json.dumps(annotation), http_headers)
     logger.warning("Create annotation \"%s\". %s", annotation['id'], "SUCCESS" if result[0] == 200 else "FAILURE")
     logger.info("status: %s, msg: %s", result[0], result[1])
+    return result[0] == 200
 
 
 # Restore data sources
-def _create_datasource(grafana_url, file_path, http_headers):
-    with open(file_path, 'r', encoding="utf8") as f:
-        data = f.read()
-
-    datasource = json.loads(data)
+def _create_datasource(grafana_url, datasource, http_headers):
     result = send_grafana_post(f'{grafana_url}/api/datasources', json.dumps(datasource), http_headers)
     logger.warning("Create datasource \"%s\". %s", datasource['name'], "SUCCESS" if result[0] == 200 else "FAILURE")
     logger.info("status: %s, msg: %s", result[0], result[1])
+    return result[0] == 200
@@ -0,0 +1,298 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import datetime
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from azure.cli.core.azclierror import ArgumentUsageError
+
+from azext_amg import utils
+from azext_amg.backup import backup, read_manifest
+from azext_amg.restore import restore
+
+TIMESTAMP = '202310011200'
+
+
+class MockGrafana(object):
+    """
+    A Grafana serving some folders, dashboards, library panels and snapshots, each request taking delay seconds.
+    The items restored to it are recorded in created.
+    """
+
+    def __init__(self, dashboards=40, folders=4, delay=0.02):
+        self.delay = delay
+        self.folders = [{'uid': 'folder{}'.format(i), 'id': i + 1, 'title': 'Folder {}'.format(i)}
+                        for i in range(folders)]
+        self.dashboards = [{'uid': 'dash{}'.format(i), 'title': 'Dashboard {}'.format(i),
+                            'folderUid': self.folders[i % folders]['uid'],
+                            'folderTitle': self.folders[i % folders]['title'], 'version': 1} for i in range(dashboards)]
+        self.panels = [{'uid': 'panel{}'.format(i), 'name': 'Panel {}'.format(i), 'version': 1} for i in range(8)]
+        # the search results of older Grafana versions don't carry the version of the dashboards
+        self.search_versions = True
+        self.snapshots = [{'key': 'key{}'.format(i), 'name': 'Snapshot'} for i in range(8)]
+        self.requests = 0
+        self.paths = []
+        self.created = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.server.daemon_threads = True
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        grafana = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with grafana.lock:
+                    grafana.connections += 1
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                self._respond('GET')
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                self._respond('POST')
+
+            def _respond(self, method):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                with grafana.lock:
+                    grafana.requests += 1
+                    grafana.paths.append((method, self.path))
+                    grafana.in_flight += 1
+                    grafana.max_in_flight = max(grafana.max_in_flight, grafana.in_flight)
+                time.sleep(grafana.delay)
+                with grafana.lock:
+                    grafana.in_flight -= 1
+                if method == 'GET':
+                    status, content = 200, grafana.get(self.path)
+                else:
+                    status, content = grafana.post(self.path, json.loads(body))
+                body = json.dumps(content).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                pass
+
+        return Handler
+
+    def get(self, path):
+        url = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = url.path.strip('/').split('/')
+        if parts[:2] == ['api', 'search']:
+            if query['type'] == 'dash-folder':
+                return self.folders
+            if query['page'] != '1':
+                return []
+            return [{k: v for k, v in b.items() if k != 'version' or self.search_versions} for b in self.dashboards]
+        if parts[:3] == ['api', 'dashboards', 'uid']:
+            board = next(b for b in self.dashboards if b['uid'] == parts[3])
+            return {'dashboard': {'uid': board['uid'], 'title': board['title'], 'version': board['version']},
+                    'meta': {'folderUid': board['folderUid']}}
+        if parts[:2] == ['api', 'library-elements']:
+            if len(parts) == 2:
+                return {'result': {'elements': self.panels if query['page'] == '1' else []}}
+            return {'result': {'uid': parts[2], 'name': parts[2], 'kind': 1, 'model': {'type': 'graph'}, 'version': 1,
+                               'meta': {'folderUid': 'folder0'}}}
+        if parts[:3] == ['api', 'dashboard', 'snapshots']:
+            return self.snapshots
+        if parts[:2] == ['api', 'snapshots']:
+            return {'dashboard': {'title': 'Snapshot'}, 'meta': {'key': parts[2]}}
+        if parts[:2] == ['api', 'folders']:
+            if len(parts) == 4:
+                return [{'role': 'Viewer', 'permission': 1}]
+            return next(f for f in self.folders if f['uid'] == parts[2])
+        return []
+
+    def post(self, path, body):
+        with self.lock:
+            self.created.append((path, body))
+            if path == '/api/folders':
+                if any(f['uid'] == body['uid'] for f in self.folders):
+                    return 412, {'message': 'a folder with the same uid already exists'}
+                folder = dict(body, id=len(self.folders) + 1)
+                self.folders.append(folder)
+                return 200, folder
+        return 200, {'status': 'success'}
+
+
+def fixed_datetime(timestamp=TIMESTAMP):
+    class FixedDatetime(datetime.datetime):
+        @classmethod
+        def today(cls):
+            return cls.strptime(timestamp, '%Y%m%d%H%M')
+
+    return SimpleNamespace(datetime=FixedDatetime)
+
+
+class TestAmgBackup(unittest.TestCase):
+    def setUp(self):
+        self.grafana = MockGrafana()
+        self.addCleanup(self.grafana.close)
+        self.backup_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.backup_dir)
+        mock.patch('azext_amg.backup.datetime', fixed_datetime()).start()
+        mock.patch('azext_amg.utils._session', None).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _backup(self, components=None):
+        backup('grafana', self.grafana.url, self.backup_dir, components, {})
+
+    def _archive_members(self):
+        with tarfile.open(os.path.join(self.backup_dir, 'grafana-{}.tar.gz'.format(TIMESTAMP))) as tar:
+            return {member.name: tar.extractfile(member).read() for member in tar.getmembers() if member.isfile()}
+
+    def test_concurrent_backup(self):
+        with mock.patch('azext_amg.utils.GRAFANA_MAX_WORKERS', 1), mock.patch('azext_amg.utils._session', None):
+            self._backup()
+        serial_requests = self.grafana.requests
+        serial_members = self._archive_members()
+        self.assertEqual(1, self.grafana.max_in_flight)
+
+        self.grafana.requests = self.grafana.connections = self.grafana.max_in_flight = 0
+        self._backup()
+
+        self.assertEqual(serial_requests, self.grafana.requests)
+        self.assertEqual(utils.GRAFANA_MAX_WORKERS, self.grafana.max_in_flight)
+        # connections are kept alive and reused instead of one per request
+        self.assertLessEqual(self.grafana.connections, utils.GRAFANA_MAX_WORKERS)
+        self.assertEqual(serial_members, self._archive_members())
+
+    def test_backup_content(self):
+        self._backup(['folders', 'dashboards', 'snapshots'])
+        members = self._archive_members()
+
+        prefix = self.backup_dir.lstrip('/')
+        log = members['{}/dashboards/{}/dashboards_{}.txt'.format(prefix, TIMESTAMP, TIMESTAMP)].decode()
+        # the log keeps the order of the search results
+        self.assertEqual(''.join('uid/{}\t{}\n'.format(b['uid'], b['title']) for b in self.grafana.dashboards), log)
+        self.assertEqual(len(self.grafana.dashboards), len([n for n in members if n.endswith('.dashboard')]))
+        self.assertEqual(len(self.grafana.panels), len([n for n in members if n.endswith('.library_panel')]))
+        self.assertEqual(4, len([n for n in members if n.endswith('.folder_permission')]))
+        # snapshots sharing a name are told apart by their key
+        self.assertIn('{}/snapshots/{}/Snapshot_key3.snapshot'.format(prefix, TIMESTAMP), members)
+        self.assertEqual(len(self.grafana.snapshots), len([n for n in members if n.endswith('.snapshot')]))
+
+    def test_archive_is_reproducible(self):
+        archive_file = os.path.join(self.backup_dir, 'grafana-{}.tar.gz'.format(TIMESTAMP))
+        self._backup()
+        with open(archive_file, 'rb') as f:
+            first = f.read()
+        # the files are written in another order and at another time
+        self.grafana.delay = 0
+        self._backup()
+        with open(archive_file, 'rb') as f:
+            self.assertEqual(first, f.read())
+        with tarfile.open(archive_file) as tar:
+            for member in tar.getmembers():
+                self.assertEqual((0, 0, '', ''), (member.uid, member.gid, member.uname, member.gname))
+
+
+class TestAmgIncrementalBackup(unittest.TestCase):
+    def setUp(self):
+        self.grafana = MockGrafana(delay=0)
+        self.addCleanup(self.grafana.close)
+        self.backup_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.backup_dir)
+        mock.patch('azext_amg.utils._session', None).start()
+        self.addCleanup(mock.patch.stopall)
+        self.archive_files = []
+        self._backup('202310011200')
+
+        # a dashboard is updated, one is deleted and one is added, a folder is renamed
+        self.grafana.dashboards[3].update(title='Dashboard 3 updated', version=2)
+        self.grafana.dashboards.pop(5)
+        self.grafana.dashboards.append(dict(self.grafana.dashboards[0], uid='dash-new', title='New'))
+        self.grafana.folders[1]['title'] = 'Folder 1 renamed'
+
+    def _backup(self, timestamp):
+        self.grafana.paths.clear()
+        with mock.patch('azext_amg.backup.datetime', fixed_datetime(timestamp)):
+            backup('grafana', self.grafana.url, self.backup_dir, None, {}, incremental=True)
+        self.archive_files.append(os.path.join(self.backup_dir, 'grafana-{}.tar.gz'.format(timestamp)))
+
+    def _members(self, ext):
+        with tarfile.open(self.archive_files[-1]) as tar:
+            return sorted(os.path.basename(n) for n in tar.getnames() if n.endswith(ext))
+
+    def _restored_dashboards(self):
+        destination = MockGrafana(dashboards=0, folders=0, delay=0)
+        self.addCleanup(destination.close)
+        restore(destination.url, self.archive_files[-1], None, {})
+        return {body['dashboard']['uid']: body['dashboard'] for path, body in destination.created
+                if path == '/api/dashboards/db'}
+
+    def test_only_changes_are_fetched(self):
+        self._backup('202310021200')
+        fetched = [path for method, path in self.grafana.paths if path.startswith('/api/dashboards/uid/')]
+        self.assertEqual(['/api/dashboards/uid/dash-new', '/api/dashboards/uid/dash3'], sorted(fetched))
+        self.assertFalse([path for method, path in self.grafana.paths if path.startswith('/api/library-elements/')])
+
+        self.assertEqual(['dash-new.dashboard', 'dash3.dashboard'], self._members('.dashboard'))
+        self.assertEqual(['folder1.folder'], self._members('.folder'))
+        self.assertEqual([], self._members('.library_panel'))
+        manifest = read_manifest(self.archive_files[-1])
+        self.assertEqual(os.path.basename(self.archive_files[0]), manifest['base'])
+        self.assertEqual({'dashboards': ['dash5']}, manifest['deleted'])
+        self.assertEqual(os.path.basename(self.archive_files[0]), manifest['items']['dashboards']['dash0']['archive'])
+
+    def test_archives_of_other_instances_are_not_the_base(self):
+        # "grafana-*" matches the later archive of the "grafana-eu" instance backed up to the same directory
+        with tarfile.open(os.path.join(self.backup_dir, 'grafana-eu-202310011300.tar.gz'), 'w:gz'):
+            pass
+        self._backup('202310021200')
+        self.assertEqual(os.path.basename(self.archive_files[0]), read_manifest(self.archive_files[-1])['base'])
+
+    def test_content_is_compared_without_search_versions(self):
+        self.grafana.search_versions = False
+        self._backup('202310021200')
+        # every dashboard is fetched, only the changed ones are saved
+        self.assertEqual(40, len([path for method, path in self.grafana.paths
+                                  if path.startswith('/api/dashboards/uid/')]))
+        self.assertEqual(['dash-new.dashboard', 'dash3.dashboard'], self._members('.dashboard'))
+
+    def test_chain_is_restored_in_full(self):
+        self._backup('202310021200')
+        self.grafana.dashboards[0].update(title='Dashboard 0 updated', version=2)
+        self._backup('202310031200')
+        self.assertEqual(['dash0.dashboard'], self._members('.dashboard'))
+
+        dashboards = self._restored_dashboards()
+        self.assertEqual(sorted(b['uid'] for b in self.grafana.dashboards), sorted(dashboards))
+        self.assertEqual('Dashboard 0 updated', dashboards['dash0']['title'])
+        self.assertEqual('Dashboard 3 updated', dashboards['dash3']['title'])
+
+        os.remove(self.archive_files[0])
+        with self.assertRaises(ArgumentUsageError):
+            self._restored_dashboards()
+
+
+if __name__ == '__main__':
+    unittest.main()
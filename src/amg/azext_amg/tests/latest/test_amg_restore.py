@@ -0,0 +1,93 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+from azext_amg import restore as restore_module
+from azext_amg import utils
+from azext_amg.backup import backup
+from azext_amg.restore import restore
+
+from .test_amg_backup import TIMESTAMP, MockGrafana, fixed_datetime
+
+
+class TestAmgRestore(unittest.TestCase):
+    def setUp(self):
+        self.backup_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.backup_dir)
+        mock.patch('azext_amg.backup.datetime', fixed_datetime()).start()
+        mock.patch('azext_amg.utils._session', None).start()
+        self.addCleanup(mock.patch.stopall)
+
+        source = MockGrafana(dashboards=60, delay=0)
+        backup('grafana', source.url, self.backup_dir, None, {})
+        source.close()
+        self.archive_file = os.path.join(self.backup_dir, 'grafana-{}.tar.gz'.format(TIMESTAMP))
+
+    def _restore(self, components=None):
+        # two of the four folders are in the destination already
+        destination = MockGrafana(dashboards=0, folders=2)
+        self.addCleanup(destination.close)
+        with mock.patch.object(tarfile.TarFile, 'extractall', side_effect=AssertionError('extracted to the disk')):
+            restore(destination.url, self.archive_file, components, {})
+        return destination
+
+    def test_concurrent_restore(self):
+        with mock.patch('azext_amg.utils.GRAFANA_MAX_WORKERS', 1), mock.patch('azext_amg.utils._session', None):
+            serial = self._restore()
+        destination = self._restore()
+
+        self.assertEqual(sorted(serial.paths), sorted(destination.paths))
+        self.assertEqual(1, serial.max_in_flight)
+        self.assertEqual(utils.GRAFANA_MAX_WORKERS, destination.max_in_flight)
+
+    def test_phases_and_folder_ids(self):
+        destination = self._restore(['dashboards', 'folders'])
+        paths = [path for path, _ in destination.created]
+
+        # folders, then library panels, then dashboards
+        self.assertEqual(['/api/folders'] * 4 + ['/api/library-elements'] * 8 + ['/api/dashboards/db'] * 60, paths)
+        # the ids of the two folders created are known, the ids of the two existing folders are looked up once
+        self.assertEqual([('GET', '/api/folders/folder0'), ('GET', '/api/folders/folder1')],
+                         [request for request in destination.paths if request[0] == 'GET'])
+        folder_ids = {f['uid']: f['id'] for f in destination.folders}
+        for path, body in destination.created:
+            if path == '/api/dashboards/db':
+                dashboard_number = int(body['dashboard']['uid'][len('dash'):])
+                self.assertEqual(folder_ids['folder{}'.format(dashboard_number % 4)], body['folderId'])
+
+    def test_items_are_spooled_to_the_disk(self):
+        spool_dirs = []
+        loaded = []
+        temporary_directory = tempfile.TemporaryDirectory
+        load_spooled = restore_module._load_spooled
+
+        def spool_dir():
+            spool_dirs.append(temporary_directory())
+            return spool_dirs[-1]
+
+        with mock.patch('azext_amg.restore.tempfile.TemporaryDirectory', side_effect=spool_dir), \
+                mock.patch('azext_amg.restore._load_spooled', side_effect=lambda f: loaded.append(f) or load_spooled(f)):
+            destination = self._restore(['dashboards', 'folders'])
+        # the items are read from the spooled files as they're restored, not held in memory for the whole restore
+        self.assertEqual(60, len([path for path, _ in destination.created if path == '/api/dashboards/db']))
+        self.assertTrue(loaded)
+        self.assertTrue(all(f.startswith(spool_dirs[0].name) for f in loaded))
+        self.assertFalse(os.path.exists(spool_dirs[0].name))
+
+    def test_throughput_is_reported(self):
+        with mock.patch('azext_amg.restore.logger') as logger:
+            self._restore(['snapshots'])
+        self.assertIn(mock.call("Restored %s of %s %s(s) in %.1f seconds, %.1f per second", 8, 8, 'snapshot',
+                                mock.ANY, mock.ANY), logger.warning.call_args_list)
+
+
+if __name__ == '__main__':
+    unittest.main()
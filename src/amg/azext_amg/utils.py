@@ -5,11 +5,39 @@
 
 import re
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from knack.log import get_logger
 
 logger = get_logger(__name__)
 
+# number of requests sent to Grafana side by side, also the size of the connection pool
+GRAFANA_MAX_WORKERS = 8
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    # all the requests to Grafana share one session so its connections are kept alive and reused
+    global _session  # pylint: disable=global-statement
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=GRAFANA_MAX_WORKERS)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+
+def run_concurrently(function, items, max_workers=None):
+    """
+    Calls function on each item with a bounded pool of workers, the results are yielded in the order of the items.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or GRAFANA_MAX_WORKERS) as executor:
+        yield from executor.map(function, items)
+
 
 def create_datasource_mapping(source_data_sources, destination_data_sources):
     uid_mapping = {}
@@ -120,16 +148,20 @@ def get_folder_permissions(uid, grafana_url, http_get_headers):
 
 
 def get_folder_id(dashboard, grafana_url, http_post_headers):
-    folder_uid = ""
+    return get_folder_id_by_uid(get_folder_uid(dashboard), grafana_url, http_post_headers)
+
+
+def get_folder_uid(dashboard):
     try:
-        folder_uid = dashboard['meta']['folderUid']
+        return dashboard['meta']['folderUid']
     except KeyError:
         matches = re.search('dashboards/f/(.*)/.*', dashboard['meta']['folderUrl'])
         if matches is not None:
-            folder_uid = matches.group(1)
-        else:
-            folder_uid = '0'
+            return matches.group(1)
+        return '0'
+
 
+def get_folder_id_by_uid(folder_uid, grafana_url, http_post_headers):
     if folder_uid != "":
         logger.debug("debug: quering with uid %s", folder_uid)
         response = get_folder(folder_uid, grafana_url, http_post_headers)
@@ -148,13 +180,13 @@ def get_folder_id(dashboard, grafana_url, http_post_headers):
 
 def send_grafana_get(url, http_get_headers):
 
-    r = requests.get(url, headers=http_get_headers)
+    r = get_session().get(url, headers=http_get_headers)
     log_response(r)
     return (r.status_code, r.json())
 
 
 def send_grafana_post(url, json_payload, http_post_headers):
-    r = requests.post(url, headers=http_post_headers, data=json_payload)
+    r = get_session().post(url, headers=http_post_headers, data=json_payload)
     log_response(r)
     try:
         return (r.status_code, r.json())
@@ -163,7 +195,7 @@ def send_grafana_post(url, json_payload, http_post_headers):
 
 
 def send_grafana_patch(url, json_payload, http_post_headers):
-    r = requests.patch(url, headers=http_post_headers, data=json_payload)
+    r = get_session().patch(url, headers=http_post_headers, data=json_payload)
     log_response(r)
     try:
         return (r.status_code, r.json())
@@ -172,6 +204,6 @@ def send_grafana_patch(url, json_payload, http_post_headers):
 
 
 def send_grafana_put(url, json_payload, http_post_headers):
-    r = requests.put(url, headers=http_post_headers, data=json_payload)
+    r = get_session().put(url, headers=http_post_headers, data=json_payload)
     log_response(r)
     return (r.status_code, r.json())
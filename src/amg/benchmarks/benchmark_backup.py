@@ -0,0 +1,48 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Wall clock time of backing up a local mock Grafana one request at a time and with concurrent requests over kept
+alive connections. Not part of the unit tests, run it from src/amg with the extension installed in development
+mode:
+
+    python benchmarks/benchmark_backup.py
+"""
+
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from azext_amg import utils
+from azext_amg.backup import backup
+from azext_amg.tests.latest.test_amg_backup import MockGrafana
+
+
+def _time_backup(grafana, backup_dir):
+    grafana.requests = grafana.connections = grafana.max_in_flight = 0
+    # a new session for every backup, so its connections are counted again
+    with mock.patch('azext_amg.utils._session', None):
+        start = time.perf_counter()
+        backup('grafana', grafana.url, backup_dir, None, {})
+        return time.perf_counter() - start
+
+
+def main():
+    grafana = MockGrafana()
+    backup_dir = tempfile.mkdtemp()
+    try:
+        with mock.patch('azext_amg.utils.GRAFANA_MAX_WORKERS', 1):
+            serial_time = _time_backup(grafana, backup_dir)
+        concurrent_time = _time_backup(grafana, backup_dir)
+        print("backup of {} requests: {:.3f}s one at a time, {:.3f}s with {} workers over {} connections".format(
+            grafana.requests, serial_time, concurrent_time, utils.GRAFANA_MAX_WORKERS, grafana.connections))
+    finally:
+        grafana.close()
+        shutil.rmtree(backup_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -81,6 +81,18 @@ helps[
           type: boolean
           short-summary: 'When enabled, the generated security policy is printed to the command line instead of injected into the input ARM Template'
 
+        - name: --max-workers
+          type: int
+          short-summary: 'Maximum number of images to pull and hash at the same time. Defaults to the number of CPUs, up to 8.'
+
+        - name: --no-cache
+          type: boolean
+          short-summary: 'When enabled, layer hashes are always calculated and the layer hash cache in the Azure CLI config directory is neither read nor updated.'
+
+        - name: --clear-cache
+          type: boolean
+          short-summary: 'When enabled, the layer hash cache in the Azure CLI config directory is deleted. If no input is given, the command exits after clearing the cache.'
+
     examples:
         - name: Input an ARM Template file to inject a base64 encoded Confidential Container Security Policy into the ARM Template
           text: az confcom acipolicygen --template-file "./template.json"
@@ -90,4 +102,8 @@ helps[
           text: az confcom acipolicygen --template-file "./template.json" -s "./output-file.txt" --print-policy
         - name: Input an ARM Template file and use a tar file as the image source instead of the Docker daemon
           text: az confcom acipolicygen --template-file "./template.json" --tar "./image.tar"
+        - name: Input an ARM Template file and pull and hash up to 4 images at a time
+          text: az confcom acipolicygen --template-file "./template.json" --max-workers 4
+        - name: Input an ARM Template file and calculate every layer hash instead of using cached values
+          text: az confcom acipolicygen --template-file "./template.json" --no-cache
 """
@@ -121,3 +121,24 @@ def load_arguments(self, _):
             required=False,
             help="Print the generated policy in the terminal",
         )
+        c.argument(
+            "max_workers",
+            options_list=("--max-workers",),
+            required=False,
+            type=int,
+            help="Maximum number of images to pull and hash at the same time",
+        )
+        c.argument(
+            "no_cache",
+            options_list=("--no-cache",),
+            required=False,
+            action="store_true",
+            help="Calculate all layer hashes without reading from or writing to the layer hash cache",
+        )
+        c.argument(
+            "clear_cache",
+            options_list=("--clear-cache",),
+            required=False,
+            action="store_true",
+            help="Delete the layer hash cache before generating the policy",
+        )
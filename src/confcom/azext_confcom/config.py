@@ -39,6 +39,8 @@ ACI_FIELD_CONTAINERS_ID = "id"
 
 ACI_FIELD_CONTAINERS_ARCHITECTURE_KEY = "Architecture"
 ACI_FIELD_CONTAINERS_ARCHITECTURE_VALUE = "amd64"
+ACI_FIELD_CONTAINERS_ROOTFS_KEY = "RootFS"
+ACI_FIELD_CONTAINERS_ROOTFS_LAYERS_KEY = "Layers"
 
 
 ACI_FIELD_CONTAINERS_EXEC_PROCESSES = "execProcesses"
@@ -157,6 +159,8 @@ SIDECAR_REGO_FILE = "./data/sidecar_rego_policy.txt"
 SIDECAR_REGO_FILE_PATH = f"{script_directory}/{SIDECAR_REGO_FILE}"
 SIDECAR_REGO_POLICY = os_util.load_str_from_file(SIDECAR_REGO_FILE_PATH)
 
+# number of images pulled and hashed at the same time during policy generation
+DEFAULT_MAX_WORKERS = min(8, os.cpu_count() or 1)
 # api version
 API_VERSION = _config["version_api"]
 # default containers to be added to all container groups
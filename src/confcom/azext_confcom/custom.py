@@ -12,6 +12,7 @@ from azext_confcom.config import DEFAULT_REGO_FRAGMENTS
 from azext_confcom import os_util
 from azext_confcom.template_util import pretty_print_func, print_func, str_to_sha256
 from azext_confcom.init_checks import run_initial_docker_checks
+from azext_confcom.layer_cache import LayerHashCache
 from azext_confcom.template_util import inject_policy_into_template, print_existing_policy_from_arm_template
 from azext_confcom import security_policy
 from azext_confcom.security_policy import OutputType
@@ -37,9 +38,14 @@ def acipolicygen_confcom(
     print_policy_to_terminal: bool = False,
     disable_stdio: bool = False,
     print_existing_policy: bool = False,
+    max_workers: int = None,
+    no_cache: bool = False,
+    clear_cache: bool = False,
 ):
 
-    if sum(map(bool, [input_path, arm_template, image_name])) != 1:
+    sources = sum(map(bool, [input_path, arm_template, image_name]))
+    # the cache can be cleared without generating a policy
+    if sources > 1 or (sources == 0 and not clear_cache):
         error_out("Can only generate CCE policy from one source at a time")
     if sum(map(bool, [print_policy_to_terminal, outraw, outraw_pretty_print])) > 1:
         error_out("Can only print in one format at a time")
@@ -51,6 +57,16 @@ def acipolicygen_confcom(
         )
     elif save_to_file and arm_template and not (print_policy_to_terminal or outraw or outraw_pretty_print):
         error_out("Must print policy to terminal when saving to file")
+    elif max_workers is not None and max_workers < 1:
+        error_out("--max-workers must be a positive integer")
+    elif no_cache and clear_cache:
+        error_out("Can only use one of --no-cache and --clear-cache")
+
+    if clear_cache:
+        LayerHashCache().clear()
+        logger.warning("Cleared the layer hash cache")
+        if not sources:
+            sys.exit(0)
 
     if print_existing_policy:
         print_existing_policy_from_arm_template(arm_template, arm_template_parameters)
@@ -65,6 +81,8 @@ def acipolicygen_confcom(
 
     output_type = get_output_type(outraw, outraw_pretty_print)
 
+    hash_cache = None if no_cache else LayerHashCache()
+
     container_group_policies = None
 
     # warn user that input infrastructure_svn is less than the configured default value
@@ -108,7 +126,8 @@ def acipolicygen_confcom(
 
     for count, policy in enumerate(container_group_policies):
         policy.populate_policy_content_for_all_images(
-            individual_image=bool(image_name), tar_mapping=tar_mapping
+            individual_image=bool(image_name), tar_mapping=tar_mapping, max_workers=max_workers,
+            hash_cache=hash_cache,
         )
 
         if validate_sidecar:
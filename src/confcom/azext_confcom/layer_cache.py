@@ -0,0 +1,155 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import re
+import json
+import shutil
+import tempfile
+import threading
+from hashlib import sha256
+from typing import List, Optional
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+# bump this if the format of the entries or the way roothashes are calculated changes
+CACHE_VERSION = "v2"
+DEFAULT_MAX_ENTRIES = 10000
+LAYER_ID_REGEX = re.compile(r"^sha256:[0-9a-f]{64}$")
+ROOTHASH_REGEX = re.compile(r"^[0-9a-f]{64}$")
+
+
+def get_default_cache_dir() -> str:
+    from azure.cli.core.api import get_config_dir
+    return os.path.join(get_config_dir(), "confcom", "layer_cache")
+
+
+def _entry_checksum(layer_id: str, tool_digest: str, roothash: str) -> str:
+    return sha256(f"{layer_id}\n{tool_digest}\n{roothash}".encode("utf-8")).hexdigest()
+
+
+class LayerHashCache:
+    """Persistent cache of dm-verity roothashes keyed by layer diff-id.
+
+    A diff-id is the sha256 of the uncompressed layer, so the roothash computed for it
+    never changes no matter which image or tag the layer shows up in. Each entry also records
+    the digest of the dmverity-vhd binary that computed it, since another version of the binary
+    may compute a different roothash for the same layer. Each layer is stored in its own small
+    file so concurrent runs never have to lock a shared index, and the least recently used
+    entries are evicted once there are more than ``max_entries``.
+    """
+
+    def __init__(self, cache_dir: str = None, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self._root = cache_dir or get_default_cache_dir()
+        self._dir = os.path.join(self._root, CACHE_VERSION)
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _entry_path(self, layer_id: str) -> str:
+        return os.path.join(self._dir, layer_id.split(":", 1)[1] + ".json")
+
+    def _read_entry(self, layer_id: str, tool_digest: str) -> Optional[str]:
+        path = self._entry_path(layer_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            entry = None
+
+        roothash = entry.get("roothash") if isinstance(entry, dict) else None
+        if (
+            not isinstance(entry, dict) or
+            entry.get("layer_id") != layer_id or
+            not isinstance(entry.get("tool"), str) or
+            not isinstance(roothash, str) or
+            not ROOTHASH_REGEX.match(roothash) or
+            entry.get("checksum") != _entry_checksum(layer_id, entry["tool"], roothash)
+        ):
+            logger.warning("Discarding corrupted layer cache entry for %s", layer_id)
+            self._remove(path)
+            return None
+        if entry["tool"] != tool_digest:
+            # hashed by another version of dmverity-vhd, the entry is overwritten once the layer is hashed again
+            logger.info("Layer cache entry for %s was computed by another dmverity-vhd binary", layer_id)
+            return None
+
+        # bump the modification time so eviction is least recently used instead of least recently written
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return roothash
+
+    def _write_entry(self, layer_id: str, tool_digest: str, roothash: str) -> None:
+        entry = {
+            "layer_id": layer_id,
+            "tool": tool_digest,
+            "roothash": roothash,
+            "checksum": _entry_checksum(layer_id, tool_digest, roothash),
+        }
+        # write to a temp file and rename it so readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, self._entry_path(layer_id))
+        except OSError:
+            self._remove(temp_path)
+            raise
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, layer_ids: List[str], tool_digest: str) -> Optional[List[str]]:
+        """Return the roothashes computed by the tool_digest binary for every layer, or None if any is not cached"""
+        if not layer_ids or not all(isinstance(i, str) and LAYER_ID_REGEX.match(i) for i in layer_ids):
+            return None
+        roothashes = []
+        for layer_id in layer_ids:
+            roothash = self._read_entry(layer_id, tool_digest)
+            if roothash is None:
+                return None
+            roothashes.append(roothash)
+        return roothashes
+
+    def put(self, layer_ids: List[str], roothashes: List[str], tool_digest: str) -> None:
+        if not layer_ids or len(layer_ids) != len(roothashes):
+            # without a one to one mapping we can't tell which hash goes with which layer
+            return
+        entries = [
+            (layer_id, roothash) for layer_id, roothash in zip(layer_ids, roothashes)
+            if isinstance(layer_id, str) and LAYER_ID_REGEX.match(layer_id) and ROOTHASH_REGEX.match(roothash)
+        ]
+        with self._lock:
+            try:
+                os.makedirs(self._dir, exist_ok=True)
+                for layer_id, roothash in entries:
+                    self._write_entry(layer_id, tool_digest, roothash)
+                self._evict()
+            except OSError as e:
+                # the cache is only an optimization, never fail policy generation because of it
+                logger.warning("Unable to write to the layer cache at %s: %s", self._dir, e)
+
+    def _evict(self) -> None:
+        entries = []
+        with os.scandir(self._dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    entries.append((entry.stat().st_mtime, entry.path))
+        if len(entries) <= self._max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self._max_entries]:
+            self._remove(path)
+
+    def clear(self) -> None:
+        shutil.rmtree(self._root, ignore_errors=True)
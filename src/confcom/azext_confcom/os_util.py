@@ -5,9 +5,11 @@
 
 import base64
 import binascii
+import copy
 import json
 import os
-from tarfile import TarFile
+import tarfile
+import threading
 from azext_confcom.errors import (
     eprint,
 )
@@ -87,47 +89,99 @@ def load_tar_mapping_from_file(path: str) -> dict:
     return raw_json
 
 
-def map_image_from_tar(image_name: str, tar: TarFile, tar_location: str):
-    tar_dir = os.path.dirname(tar_location)
-    # grab all files in the folder and only take the one that's named with hex values and a json extension
-    members = tar.getmembers()
-    info_file_name = [
-        file
-        for file in members
-        if file.name.endswith(".json") and not file.name.startswith("manifest")
-    ]
-    info_file = None
-    # if there's more than one image in the tarball, we need to do some more logic
-    if len(info_file_name) > 0:
-        # extract just the manifest file and see if any of the RepoTags match the image_name we're searching for
-        # the manifest.json should have a list of all the image tags
-        # and what json files they map to to get env vars, startup cmd, etc.
-        tar.extract("manifest.json", path=tar_dir)
-        manifest_path = os.path.join(tar_dir, "manifest.json")
-        manifest = load_json_from_file(manifest_path)
-        # if we match a RepoTag to the image, stop searching
-        for image in manifest:
-            if image_name in image.get("RepoTags"):
-                info_file = [
-                    item for item in info_file_name if item.name == image.get("Config")
-                ][0]
-                break
-        # remove the extracted manifest file to clean up
-        os.remove(manifest_path)
-    else:
-        eprint(f"Tarball at {tar_location} contains no images")
-
-    if not info_file:
+class TarImageIndex:
+    """Index of a "docker save" tarball, built with a single pass over the archive.
+
+    Only the member headers are read while walking the archive. The manifest and the image
+    config files it points to are then read straight out of the archive into memory, so
+    nothing is extracted to disk and every image in the tarball can be looked up without
+    opening or scanning the archive again.
+    """
+
+    def __init__(self, tar_location: str):
+        self.tar_location = tar_location
+        # repo tag -> parsed image config json
+        self.images = {}
+
+        with tarfile.open(tar_location) as tar:
+            json_members = {}
+            for member in tar:
+                if not member.isfile():
+                    continue
+                # image configs are either "<hex>.json" or "blobs/sha256/<hex>" for OCI layouts,
+                # so hold on to every small file that could be one
+                if member.name == "manifest.json" or member.name.endswith(".json") or member.name.startswith("blobs/"):
+                    json_members[member.name] = member
+
+            manifest_member = json_members.get("manifest.json")
+            if not manifest_member:
+                eprint(f"Tarball at {tar_location} contains no images")
+            manifest = self._read_json(tar, manifest_member)
+
+            configs = {}
+            for image in manifest:
+                config_name = image.get("Config")
+                if config_name not in configs and config_name in json_members:
+                    configs[config_name] = self._read_json(tar, json_members[config_name])
+                for repo_tag in image.get("RepoTags") or []:
+                    if config_name in configs:
+                        self.images.setdefault(repo_tag, configs[config_name])
+
+    @staticmethod
+    def _read_json(tar: tarfile.TarFile, member: tarfile.TarInfo):
+        try:
+            return json.load(tar.extractfile(member))
+        except json.decoder.JSONDecodeError:
+            eprint(f"Invalid json formatting in tarball member: {member.name}")
+        return None
+
+    def get_image_config(self, image_name: str) -> dict:
+        return self.images.get(image_name)
+
+
+_tar_indexes = {}
+_tar_index_locks = {}
+_tar_index_lock = threading.Lock()
+
+
+def get_tar_index(tar_location: str) -> TarImageIndex:
+    """Return the index for a tarball, building it the first time the tarball is seen in this run"""
+    try:
+        stat_result = os.stat(tar_location)
+    except OSError:
+        eprint(f"Tarball does not exist at path: {tar_location}")
+    # include the size and modification time so a rewritten tarball is indexed again
+    key = (os.path.abspath(tar_location), stat_result.st_size, stat_result.st_mtime_ns)
+    with _tar_index_lock:
+        lock = _tar_index_locks.setdefault(key, threading.Lock())
+    # building the index can take a while, so only hold the per-tarball lock for it
+    with lock:
+        index = _tar_indexes.get(key)
+        if index is None:
+            index = TarImageIndex(tar_location)
+            _tar_indexes[key] = index
+    return index
+
+
+def clear_tar_index_cache() -> None:
+    with _tar_index_lock:
+        _tar_indexes.clear()
+        _tar_index_locks.clear()
+
+
+def map_image_from_tar(image_name: str, tar_location: str):
+    # the manifest.json has a list of all the image tags in the tarball
+    # and what json files they map to to get env vars, startup cmd, etc.
+    image_info_raw = get_tar_index(tar_location).get_image_config(image_name)
+    if not image_info_raw:
         return None
-    tar.extract(info_file.name, path=tar_dir)
-
-    # get the path of the json file and read it in
-    image_info_file_path = os.path.join(tar_dir, info_file.name)
-    image_info_raw = load_json_from_file(image_info_file_path)
-    # delete the extracted json file to clean up
-    os.remove(image_info_file_path)
-    image_info = image_info_raw.get("config")
+
+    # copy so the cached config is never changed by the caller
+    image_info = copy.deepcopy(image_info_raw.get("config"))
     # importing the constant from config.py gives a circular dependency error
     image_info["Architecture"] = image_info_raw.get("architecture")
+    # use the same shape as "docker inspect" so both image sources can be read the same way
+    rootfs = image_info_raw.get("rootfs") or {}
+    image_info["RootFS"] = {"Type": rootfs.get("type"), "Layers": rootfs.get("diff_ids")}
 
     return image_info
@@ -9,6 +9,8 @@ from typing import List
 import os
 import sys
 import stat
+import threading
+from hashlib import sha256
 from pathlib import Path
 import platform
 import requests
@@ -24,6 +26,11 @@ logger = get_logger(__name__)
 class SecurityPolicyProxy:  # pylint: disable=too-few-public-methods
     # static variable to cache layer hashes between container groups
     layer_cache = {}
+    # images can be hashed from several worker threads at once. keep one lock per
+    # image so the same image is never hashed twice concurrently
+    _layer_cache_lock = threading.Lock()
+    _layer_locks = {}
+    _policy_bin_digest = None
 
     @staticmethod
     def download_binaries():
@@ -88,13 +95,44 @@ class SecurityPolicyProxy:  # pylint: disable=too-few-public-methods
             os.chmod(self.policy_bin, st.st_mode | stat.S_IXUSR)
 
     def get_policy_image_layers(
-        self, image: str, tag: str, tar_location: str = ""
+        self, image: str, tag: str, tar_location: str = "", layer_ids: List[str] = None, hash_cache=None
     ) -> List[str]:
         image_name = f"{image}:{tag}"
-        # populate layer info
-        if self.layer_cache.get(image_name):
-            return self.layer_cache.get(image_name)
+        with self._layer_cache_lock:
+            image_lock = self._layer_locks.setdefault(image_name, threading.Lock())
+
+        with image_lock:
+            # populate layer info
+            if self.layer_cache.get(image_name):
+                return self.layer_cache.get(image_name)
+
+            # the persistent cache is keyed by layer diff-id, so it only helps when every
+            # layer of this image has been hashed before, possibly as part of another image
+            output = None
+            if hash_cache:
+                policy_bin_digest = self._get_policy_bin_digest()
+                output = hash_cache.get(layer_ids, policy_bin_digest)
+            if output is None:
+                output = self._compute_policy_image_layers(image_name, tar_location)
+                if hash_cache:
+                    hash_cache.put(layer_ids, output, policy_bin_digest)
+
+            # cache output layers
+            self.layer_cache[image_name] = output
+        return output
 
+    def _get_policy_bin_digest(self) -> str:
+        # cached roothashes are only reused with the same dmverity-vhd binary that computed them
+        with self._layer_cache_lock:
+            if self._policy_bin_digest is None:
+                digest = sha256()
+                with open(self.policy_bin, "rb") as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(chunk)
+                self._policy_bin_digest = digest.hexdigest()
+            return self._policy_bin_digest
+
+    def _compute_policy_image_layers(self, image_name: str, tar_location: str) -> List[str]:
         policy_bin_str = str(self.policy_bin)
 
         arg_list = [
@@ -135,6 +173,4 @@ class SecurityPolicyProxy:  # pylint: disable=too-few-public-methods
                 "Could not get layer hashes"
             )
 
-        # cache output layers
-        self.layer_cache[image_name] = output
         return output
@@ -6,7 +6,6 @@
 import re
 import json
 import copy
-import tarfile
 from typing import Any, Tuple, Dict, List
 from hashlib import sha256
 import deepdiff
@@ -76,14 +75,12 @@ def get_image_info(progress, message_queue, tar_mapping, image):
         tar_location = get_tar_location_from_mapping(tar_mapping, image_name)
         # if we have a tar location, we can try to get the image info
         if tar_location:
-            with tarfile.open(tar_location) as tar:
-                # get all the info out of the tarfile
-                image_info = os_util.map_image_from_tar(
-                    image_name, tar, tar_location
-                )
-                if image_info is not None:
-                    tar = True
-                    message_queue.append(f"{image_name} read from local tar file")
+            # get all the info out of the tarfile. the tarball is only indexed once per run
+            # no matter how many images point at it
+            image_info = os_util.map_image_from_tar(image_name, tar_location)
+            if image_info is not None:
+                tar = True
+                message_queue.append(f"{image_name} read from local tar file")
 
     # see if we have the image locally so we can have a
     # 'clean-room'
@@ -145,7 +142,11 @@ def get_image_info(progress, message_queue, tar_mapping, image):
             + f"Only {config.ACI_FIELD_CONTAINERS_ARCHITECTURE_VALUE} is supported by Confidential ACI"
         )
 
-    return image_info, tar
+    # the diff-ids of the layers, used to look up previously calculated layer hashes
+    rootfs = (raw_image.attrs if raw_image else image_info or {}).get(config.ACI_FIELD_CONTAINERS_ROOTFS_KEY)
+    layer_ids = (rootfs or {}).get(config.ACI_FIELD_CONTAINERS_ROOTFS_LAYERS_KEY)
+
+    return image_info, tar, layer_ids
 
 
 def get_tar_location_from_mapping(tar_mapping: Any, image_name: str) -> str:
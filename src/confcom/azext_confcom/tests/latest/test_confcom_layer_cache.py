@@ -0,0 +1,151 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from azext_confcom.custom import acipolicygen_confcom
+from azext_confcom.layer_cache import LayerHashCache, CACHE_VERSION
+from azext_confcom.rootfs_proxy import SecurityPolicyProxy
+
+
+def _layer_id(i):
+    return f"sha256:{i:064x}"
+
+
+def _roothash(i):
+    return f"{i + 1000:064x}"
+
+
+# digests of two dmverity-vhd binaries
+TOOL = "a" * 64
+OTHER_TOOL = "b" * 64
+
+
+class LayerHashCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = LayerHashCache(self.cache_dir, max_entries=5)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        layer_ids = [_layer_id(i) for i in range(3)]
+        roothashes = [_roothash(i) for i in range(3)]
+        self.assertIsNone(self.cache.get(layer_ids, TOOL))
+        self.cache.put(layer_ids, roothashes, TOOL)
+        self.assertEqual(self.cache.get(layer_ids, TOOL), roothashes)
+        # a new cache object over the same directory sees the same entries
+        self.assertEqual(LayerHashCache(self.cache_dir).get(layer_ids[1:], TOOL), roothashes[1:])
+
+    def test_partial_hit_is_a_miss(self):
+        self.cache.put([_layer_id(0)], [_roothash(0)], TOOL)
+        self.assertIsNone(self.cache.get([_layer_id(0), _layer_id(1)], TOOL))
+
+    def test_mismatched_lengths_are_not_stored(self):
+        self.cache.put([_layer_id(0), _layer_id(1)], [_roothash(0)], TOOL)
+        self.assertIsNone(self.cache.get([_layer_id(0)], TOOL))
+
+    def test_tags_are_not_keys(self):
+        self.cache.put(["nginx:latest"], [_roothash(0)], TOOL)
+        self.assertIsNone(self.cache.get(["nginx:latest"], TOOL))
+
+    def test_other_binary_is_a_miss(self):
+        self.cache.put([_layer_id(0)], [_roothash(0)], TOOL)
+        self.assertIsNone(self.cache.get([_layer_id(0)], OTHER_TOOL))
+        # the roothash computed by the other binary replaces the entry
+        self.cache.put([_layer_id(0)], [_roothash(1)], OTHER_TOOL)
+        self.assertEqual(self.cache.get([_layer_id(0)], OTHER_TOOL), [_roothash(1)])
+        self.assertIsNone(self.cache.get([_layer_id(0)], TOOL))
+
+    def test_corrupted_entry_is_discarded(self):
+        self.cache.put([_layer_id(0)], [_roothash(0)], TOOL)
+        path = os.path.join(self.cache_dir, CACHE_VERSION, f"{0:064x}.json")
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        entry["roothash"] = _roothash(1)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+
+        self.assertIsNone(self.cache.get([_layer_id(0)], TOOL))
+        self.assertFalse(os.path.exists(path))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        for i in range(5):
+            self.cache.put([_layer_id(i)], [_roothash(i)], TOOL)
+            path = os.path.join(self.cache_dir, CACHE_VERSION, f"{i:064x}.json")
+            os.utime(path, (i, i))
+        # reading layer 0 makes it the most recently used
+        self.assertIsNotNone(self.cache.get([_layer_id(0)], TOOL))
+        self.cache.put([_layer_id(5)], [_roothash(5)], TOOL)
+
+        self.assertIsNotNone(self.cache.get([_layer_id(0)], TOOL))
+        self.assertIsNone(self.cache.get([_layer_id(1)], TOOL))
+        self.assertIsNotNone(self.cache.get([_layer_id(5)], TOOL))
+
+    def test_clear(self):
+        self.cache.put([_layer_id(0)], [_roothash(0)], TOOL)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get([_layer_id(0)], TOOL))
+
+    def test_invalid_arguments_do_not_clear_the_cache(self):
+        def generate(**kwargs):
+            arguments = dict(input_path=None, arm_template=None, arm_template_parameters=None, image_name=None,
+                             infrastructure_svn=None, tar_mapping_location=None)
+            arguments.update(kwargs)
+            with self.assertRaises(SystemExit) as context:
+                acipolicygen_confcom(**arguments)
+            return context.exception.code
+
+        with patch("azext_confcom.custom.LayerHashCache") as cache:
+            self.assertEqual(generate(image_name="nginx", no_cache=True, clear_cache=True), 1)
+            self.assertEqual(generate(input_path="policy.json", image_name="nginx", clear_cache=True), 1)
+            cache.return_value.clear.assert_not_called()
+
+            self.assertEqual(generate(clear_cache=True), 0)
+            cache.return_value.clear.assert_called_once_with()
+
+    def _proxy(self, binary_content):
+        proxy = SecurityPolicyProxy.__new__(SecurityPolicyProxy)
+        fd, proxy.policy_bin = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(binary_content)
+        return proxy
+
+    def test_proxy_skips_hashing_when_all_layers_are_cached(self):
+        layer_ids = [_layer_id(10), _layer_id(11)]
+        roothashes = [_roothash(10), _roothash(11)]
+        proxy = self._proxy(b"dmverity-vhd")
+        with patch.object(SecurityPolicyProxy, "_compute_policy_image_layers", return_value=roothashes) as compute:
+            self.assertEqual(
+                proxy.get_policy_image_layers("cache-test/first", "1.0", layer_ids=layer_ids, hash_cache=self.cache),
+                roothashes,
+            )
+            # a different tag with the same layers is found in the persistent cache
+            self.assertEqual(
+                proxy.get_policy_image_layers("cache-test/second", "1.0", layer_ids=layer_ids, hash_cache=self.cache),
+                roothashes,
+            )
+        self.assertEqual(compute.call_count, 1)
+
+    def test_proxy_hashes_again_with_another_binary(self):
+        layer_ids = [_layer_id(12)]
+        with patch.object(SecurityPolicyProxy, "_compute_policy_image_layers", return_value=[_roothash(12)]) as compute:
+            self._proxy(b"dmverity-vhd").get_policy_image_layers(
+                "cache-test/third", "1.0", layer_ids=layer_ids, hash_cache=self.cache
+            )
+            # the image was cached in memory by the first proxy, use another tag
+            self._proxy(b"dmverity-vhd updated").get_policy_image_layers(
+                "cache-test/fourth", "1.0", layer_ids=layer_ids, hash_cache=self.cache
+            )
+            self._proxy(b"dmverity-vhd").get_policy_image_layers(
+                "cache-test/fifth", "1.0", layer_ids=layer_ids, hash_cache=self.cache
+            )
+        self.assertEqual(compute.call_count, 3)
@@ -0,0 +1,120 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+import os
+import json
+import time
+import shutil
+import tarfile
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from azext_confcom.security_policy import (
+    AciPolicy,
+    OutputType,
+    load_policy_from_str,
+)
+
+# simulated time for a single "dmverity-vhd roothash" call, long enough for the calls to overlap
+HASH_SECONDS = 0.05
+
+
+def _add_json_member(tar, name, content):
+    data = json.dumps(content).encode("utf-8")
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+def make_image_tar(path, image_name, index):
+    # minimal "docker save" layout: a manifest pointing at an image config file
+    config_name = f"{index:064x}.json"
+    with tarfile.open(path, "w") as tar:
+        _add_json_member(tar, "manifest.json", [
+            {"Config": config_name, "RepoTags": [image_name], "Layers": []}
+        ])
+        _add_json_member(tar, config_name, {
+            "architecture": "amd64",
+            "config": {
+                "User": "",
+                "Env": [f"IMAGE_INDEX={index}"],
+                "Cmd": ["/bin/app", str(index)],
+                "WorkingDir": f"/app{index}",
+            },
+        })
+
+
+class FakeRootfsProxy:
+    """Stands in for SecurityPolicyProxy, which shells out to dmverity-vhd"""
+
+    def __init__(self, hash_seconds=None):
+        self.hash_seconds = HASH_SECONDS if hash_seconds is None else hash_seconds
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def get_policy_image_layers(self, image, tag, tar_location="", layer_ids=None, hash_cache=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.hash_seconds)
+        with self.lock:
+            self.active -= 1
+        return [f"{image}-{tag}-layer"]
+
+
+def generate_policy(temp_dir, image_count, max_workers, hash_seconds=None):
+    """Generate the policy of image_count images saved as tarballs in temp_dir, with FakeRootfsProxy hashing them"""
+    containers = []
+    tar_mapping = {}
+    for i in range(image_count):
+        image_name = f"bench/image{i}:1.0"
+        path = os.path.join(temp_dir, f"image{i}.tar")
+        if not os.path.exists(path):
+            make_image_tar(path, image_name, i)
+        tar_mapping[image_name] = path
+        containers.append({"containerImage": image_name, "environmentVariables": [], "command": []})
+
+    proxy = FakeRootfsProxy(hash_seconds)
+    policy = load_policy_from_str(json.dumps({"version": "1.0", "containers": containers}))
+    with patch.object(AciPolicy, "_get_rootfs_proxy", return_value=proxy):
+        policy.populate_policy_content_for_all_images(tar_mapping=tar_mapping, max_workers=max_workers)
+    return policy, proxy
+
+
+class PolicyGeneratingParallelTarFiles(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir)
+
+    def _generate(self, image_count, max_workers):
+        return generate_policy(self.temp_dir, image_count, max_workers)
+
+    def test_output_is_deterministic(self):
+        serial_policy, serial_proxy = self._generate(6, 1)
+        parallel_policy, parallel_proxy = self._generate(6, 6)
+
+        self.assertEqual(serial_proxy.max_active, 1)
+        self.assertGreater(parallel_proxy.max_active, 1)
+        self.assertEqual(
+            serial_policy.get_serialized_output(OutputType.RAW),
+            parallel_policy.get_serialized_output(OutputType.RAW),
+        )
+        for i, image in enumerate(parallel_policy.get_images()):
+            self.assertEqual(image.get_working_dir(), f"/app{i}")
+
+    def test_workers_are_bounded(self):
+        # the images are hashed side by side, never more at once than there are workers
+        for image_count, max_workers in [(4, 4), (16, 4)]:
+            _, proxy = self._generate(image_count, max_workers)
+            self.assertGreater(proxy.max_active, 1)
+            self.assertLessEqual(proxy.max_active, max_workers)
@@ -0,0 +1,76 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+import os
+import json
+import shutil
+import tarfile
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from azext_confcom import os_util
+
+IMAGE_COUNT = 20
+LAYER_SIZE = 2 * 1024 * 1024
+
+
+def _add_member(tar, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+def make_multi_image_tar(path, image_count):
+    # "docker save" layout with one config and one layer per image, manifest written last
+    manifest = []
+    with tarfile.open(path, "w") as tar:
+        for i in range(image_count):
+            config_name = f"{i:064x}.json"
+            layer_name = f"{i + image_count:064x}/layer.tar"
+            _add_member(tar, layer_name, os.urandom(LAYER_SIZE))
+            _add_member(tar, config_name, json.dumps({
+                "architecture": "amd64",
+                "config": {"User": "", "Env": [f"INDEX={i}"], "WorkingDir": f"/app{i}"},
+                "rootfs": {"type": "layers", "diff_ids": [f"sha256:{i:064x}"]},
+            }).encode("utf-8"))
+            manifest.append({"Config": config_name, "RepoTags": [f"bench/image{i}:1.0"], "Layers": [layer_name]})
+        _add_member(tar, "manifest.json", json.dumps(manifest).encode("utf-8"))
+
+
+class TarImageIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.tar_path = os.path.join(cls.temp_dir, "images.tar")
+        make_multi_image_tar(cls.tar_path, IMAGE_COUNT)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir)
+
+    def setUp(self):
+        os_util.clear_tar_index_cache()
+
+    def test_map_image_from_tar(self):
+        image_info = os_util.map_image_from_tar("bench/image3:1.0", self.tar_path)
+        self.assertEqual(image_info["WorkingDir"], "/app3")
+        self.assertEqual(image_info["Architecture"], "amd64")
+        self.assertEqual(image_info["RootFS"]["Layers"], [f"sha256:{3:064x}"])
+        self.assertIsNone(os_util.map_image_from_tar("bench/missing:1.0", self.tar_path))
+        # nothing is extracted next to the tarball
+        self.assertEqual(os.listdir(self.temp_dir), ["images.tar"])
+
+    def test_returned_info_does_not_change_the_index(self):
+        image_info = os_util.map_image_from_tar("bench/image0:1.0", self.tar_path)
+        image_info["Env"].append("CHANGED=1")
+        self.assertEqual(os_util.map_image_from_tar("bench/image0:1.0", self.tar_path)["Env"], ["INDEX=0"])
+
+    def test_archive_is_scanned_once(self):
+        with patch.object(os_util, "TarImageIndex", wraps=os_util.TarImageIndex) as index_class:
+            for i in range(IMAGE_COUNT):
+                self.assertIsNotNone(os_util.map_image_from_tar(f"bench/image{i}:1.0", self.tar_path))
+        self.assertEqual(index_class.call_count, 1)
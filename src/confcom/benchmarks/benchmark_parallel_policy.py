@@ -0,0 +1,43 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Wall clock time of generating the policy of several images one at a time and in parallel, with every
+"dmverity-vhd roothash" call simulated by a sleep. Not part of the unit tests, run it from src/confcom with the
+extension installed in development mode:
+
+    python benchmarks/benchmark_parallel_policy.py
+"""
+
+import shutil
+import tempfile
+import time
+
+from azext_confcom.tests.latest.test_confcom_parallel import generate_policy
+
+# simulated time for a single "dmverity-vhd roothash" call
+HASH_SECONDS = 0.2
+
+
+def _time_generate(temp_dir, image_count, max_workers):
+    start = time.perf_counter()
+    generate_policy(temp_dir, image_count, max_workers, hash_seconds=HASH_SECONDS)
+    return time.perf_counter() - start
+
+
+def main():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        # with enough workers, total time should stay roughly flat as the image count grows
+        for image_count in [4, 8, 16]:
+            serial = _time_generate(temp_dir, image_count, 1)
+            parallel = _time_generate(temp_dir, image_count, image_count)
+            print(f"{image_count} images: serial {serial:.2f}s, parallel {parallel:.2f}s")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -114,6 +114,8 @@ Upgrade_RG_Cluster_Name_Conflict = 'The provided cluster name and rg correspond
 Corresponding_CC_Resource_Deleted_Fault = 'CC resource corresponding to this cluster has been deleted by the customer'
 Kubernetes_Node_Type_Fetch_Fault_OS = 'Error while trying to find a linux node for scheduling pods'
 Kubernetes_Node_Type_Fetch_Fault_Arch = 'Error while trying to find an arm64 node for scheduling pods'
+# Number of nodes listed per request when scanning the nodes of the cluster
+Node_Scan_Page_Size = 500
 Linux_Node_Not_Exists = 'Kubernetes cluster doesnt have linux node'
 Operate_RG_Cluster_Name_Conflict = 'The provided cluster name and rg correspond to different cluster being operated on'
 Custom_Locations_Registration_Check_Fault_Type = "Error while checking resource provider registration of custom locations."
@@ -142,6 +144,7 @@ Fetch_Metadata_CR_Save_Failed_Fault_Type = "Exception occured while fetching met
 KAP_CR_Save_Failed_Fault_Type = "Error occured while fetching KAP CR snapshot"
 Fetch_KAP_CR_Save_Failed_Fault_Type = "Exception occured while fetching KAP CR snapshot"
 Fetch_Arc_Agent_Logs_Failed_Fault_Type = "Error occured in arc agents logger"
+Compress_Diagnostic_Logs_Failed_Fault_Type = "Error occured while compressing the diagnostic logs"
 Fetch_Arc_Agents_Events_Logs_Failed_Fault_Type = "Error occured in arc agents events logger"
 Fetch_Arc_Deployment_Logs_Failed_Fault_Type = "Error occured in deployments logger"
 Agent_State_Check_Fault_Type = "Error occured while performing the agent state check"
@@ -185,6 +188,10 @@ Arc_Agent_State_Check = "arc_agent_state_check"
 Arc_Agents_Logs = "arc_agents_logs"
 Arc_Deployment_Logs = "arc_deployment_logs"
 Arc_Diagnostic_Logs = "arc_diagnostic_logs"
+Arc_Diagnostic_Logs_Archive_Format = "zip"
+# The logs of the arc agents containers are fetched by a pool of workers and streamed to disk in chunks
+Arc_Agents_Logs_Max_Workers = 8
+Arc_Agents_Logs_Chunk_Size = 64 * 1024
 Pre_Onboarding_Check_Logs = "pre_onboarding_check_logs"
 Pre_Onboarding_Helm_Charts_Folder_Name = 'PreOnboardingChecksCharts'
 Pre_Onboarding_Helm_Charts_Release_Name = 'cluster-diagnostic-checks'
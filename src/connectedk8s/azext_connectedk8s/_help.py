@@ -130,4 +130,6 @@ helps['connectedk8s troubleshoot'] = """
   examples:
   - name: Perform diagnostic checks on an Arc enabled Kubernetes cluster.
     text: az connectedk8s troubleshoot -n clusterName -g resourceGroupName
+  - name: Perform diagnostic checks, collecting only the last hour and at most 10000 lines of the logs of each arc agent container.
+    text: az connectedk8s troubleshoot -n clusterName -g resourceGroupName --since 1h --tail 10000
 """
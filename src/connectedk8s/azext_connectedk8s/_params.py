@@ -12,7 +12,7 @@ from azure.cli.core.commands.validators import get_default_location_from_resourc
 from azext_connectedk8s._constants import Distribution_Enum_Values, Infrastructure_Enum_Values, Feature_Values, AHB_Enum_Values
 from knack.arguments import (CLIArgumentType, CaseInsensitiveList)
 
-from._validators import validate_private_link_properties
+from._validators import validate_private_link_properties, validate_troubleshoot_log_limits
 
 features_types = CLIArgumentType(
     nargs='+',
@@ -117,3 +117,5 @@ def load_arguments(self, _):
         c.argument('cluster_name', options_list=['--name', '-n'], help='The name of the connected cluster.')
         c.argument('kube_config', options_list=['--kube-config'], help='Path to the kube config file.')
         c.argument('kube_context', options_list=['--kube-context'], help='Kubconfig context from current machine.')
+        c.argument('since', options_list=['--since'], validator=validate_troubleshoot_log_limits, help='Only collect the arc agents logs newer than a relative duration like 30s, 15m or 2h. Defaults to all logs.')
+        c.argument('tail', options_list=['--tail'], type=int, help='Only collect the given number of most recent lines of the logs of each arc agent container. Defaults to all lines.')
@@ -13,6 +13,8 @@ import json
 import datetime
 from subprocess import Popen, PIPE, run, STDOUT, call, DEVNULL
 import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from knack.log import get_logger
 from azure.cli.core import telemetry
 import azext_connectedk8s._constants as consts
@@ -127,22 +129,23 @@ def fetch_connected_cluster_resource(filepath_with_timestamp, connected_cluster,
     return consts.Diagnostic_Check_Failed, storage_space_available
 
 
-def retrieve_arc_agents_logs(corev1_api_instance, filepath_with_timestamp, storage_space_available):
+def retrieve_arc_agents_logs(corev1_api_instance, filepath_with_timestamp, storage_space_available, since_seconds=None, tail_lines=None):
 
     global diagnoser_output
     try:
         if storage_space_available:
             # To retrieve all of the arc agents pods that are present in the Cluster
             arc_agents_pod_list = corev1_api_instance.list_namespaced_pod(namespace="azure-arc")
+            arc_agent_logs_path = os.path.join(filepath_with_timestamp, consts.Arc_Agents_Logs)
+            try:
+                os.mkdir(arc_agent_logs_path)
+            except FileExistsError:
+                pass
+            container_logs = []
             # Traversing through all agents
             for each_agent_pod in arc_agents_pod_list.items:
                 # Fetching the current Pod name and creating a folder with that name inside the timestamp folder
                 agent_name = each_agent_pod.metadata.name
-                arc_agent_logs_path = os.path.join(filepath_with_timestamp, consts.Arc_Agents_Logs)
-                try:
-                    os.mkdir(arc_agent_logs_path)
-                except FileExistsError:
-                    pass
                 agent_name_logs_path = os.path.join(arc_agent_logs_path, agent_name)
                 try:
                     os.mkdir(agent_name_logs_path)
@@ -151,16 +154,16 @@ def retrieve_arc_agents_logs(corev1_api_instance, filepath_with_timestamp, stora
                 # If the agent is not in Running state we wont be able to get logs of the containers
                 if(each_agent_pod.status.phase != "Running"):
                     continue
-                # Traversing through all of the containers present inside each pods
+                # Each container of the pod gets a text file with its name to add that containers logs in it
                 for each_container in each_agent_pod.spec.containers:
-                    # Fetching the Container name
-                    container_name = each_container.name
-                    # Creating a text file with the name of the container and adding that containers logs in it
-                    container_log = corev1_api_instance.read_namespaced_pod_log(name=agent_name, container=container_name, namespace="azure-arc")
-                    # Path to add the arc agents container logs.
-                    arc_agent_container_logs_path = os.path.join(agent_name_logs_path, container_name + ".txt")
-                    with open(arc_agent_container_logs_path, 'w+') as container_file:
-                        container_file.write(str(container_log))
+                    container_logs.append((agent_name, each_container.name, os.path.join(agent_name_logs_path, each_container.name + ".txt")))
+
+            # The logs of all the containers are fetched side by side
+            with ThreadPoolExecutor(max_workers=consts.Arc_Agents_Logs_Max_Workers) as executor:
+                futures = [executor.submit(save_container_log, corev1_api_instance, agent_name, container_name, container_logs_path, since_seconds, tail_lines)
+                           for agent_name, container_name, container_logs_path in container_logs]
+                for future in futures:
+                    future.result()
 
         return consts.Diagnostic_Check_Passed, storage_space_available
 
@@ -184,6 +187,22 @@ def retrieve_arc_agents_logs(corev1_api_instance, filepath_with_timestamp, stora
     return consts.Diagnostic_Check_Failed, storage_space_available
 
 
+def save_container_log(corev1_api_instance, pod_name, container_name, container_logs_path, since_seconds=None, tail_lines=None):
+    # The log is streamed to the file instead of being read into memory first
+    log_limits = {}
+    if since_seconds is not None:
+        log_limits["since_seconds"] = since_seconds
+    if tail_lines is not None:
+        log_limits["tail_lines"] = tail_lines
+    container_log = corev1_api_instance.read_namespaced_pod_log(name=pod_name, container=container_name, namespace="azure-arc", _preload_content=False, **log_limits)
+    try:
+        with open(container_logs_path, 'wb') as container_file:
+            for chunk in container_log.stream(consts.Arc_Agents_Logs_Chunk_Size):
+                container_file.write(chunk)
+    finally:
+        container_log.release_conn()
+
+
 def retrieve_arc_agents_event_logs(filepath_with_timestamp, storage_space_available, kubectl_client_location, kube_config, kube_context):
 
     global diagnoser_output
@@ -1136,3 +1155,26 @@ def fetching_cli_output_logs(filepath_with_timestamp, storage_space_available, f
         telemetry.set_exception(exception=e, fault_type=consts.Diagnoser_Result_Fault_Type, summary="Error while storing the diagnoser results")
 
     return consts.Diagnostic_Check_Failed
+
+
+def compress_diagnostic_logs(filepath_with_timestamp, storage_space_available):
+
+    archive_path = filepath_with_timestamp + "." + consts.Arc_Diagnostic_Logs_Archive_Format
+    try:
+        if storage_space_available:
+            # Every file is read once and compressed straight into the archive
+            with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                for root, _, files in os.walk(filepath_with_timestamp):
+                    for file_name in sorted(files):
+                        file_path = os.path.join(root, file_name)
+                        archive.write(file_path, os.path.relpath(file_path, os.path.dirname(filepath_with_timestamp)))
+            return archive_path
+
+    # The logs stay in the folder if they could not be compressed, also when there's no space left for the archive
+    except OSError as e:
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+        logger.warning("An exception has occured while trying to compress the diagnostic logs. Exception: {}".format(str(e)) + "\n")
+        telemetry.set_exception(exception=e, fault_type=consts.Compress_Diagnostic_Logs_Failed_Fault_Type, summary="Error occured while compressing the diagnostic logs")
+
+    return None
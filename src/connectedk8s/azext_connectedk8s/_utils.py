@@ -770,18 +770,6 @@ def can_create_clusterrolebindings():
         return "Unknown"
 
 
-def validate_node_api_response(api_instance, node_api_response):
-    if node_api_response is None:
-        try:
-            node_api_response = api_instance.list_node()
-            return node_api_response
-        except Exception as ex:
-            logger.debug("Error occcured while listing nodes on this kubernetes cluster: {}".format(str(ex)))
-            return None
-    else:
-        return node_api_response
-
-
 def az_cli(args_str):
     args = args_str.split()
     cli = get_default_cli()
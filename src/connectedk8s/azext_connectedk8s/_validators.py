@@ -5,8 +5,9 @@
 import azext_connectedk8s._constants as consts
 
 
+import re
 from os import name
-from azure.cli.core.azclierror import ArgumentUsageError
+from azure.cli.core.azclierror import ArgumentUsageError, InvalidArgumentValueError
 
 
 def example_name_or_id_validator(cmd, namespace):
@@ -36,3 +37,15 @@ def override_client_request_id_header(cmd, namespace):
         cmd.cli_ctx.data['headers'][consts.Client_Request_Id_Header] = namespace.correlation_id
     else:
         cmd.cli_ctx.data['headers'][consts.Client_Request_Id_Header] = consts.Default_Onboarding_Source_Tracking_Guid
+
+
+def validate_troubleshoot_log_limits(namespace):
+    if namespace.since is not None:
+        # Relative durations like kubectl logs --since, converted to seconds
+        match = re.fullmatch(r"(\d+)([smh]?)", str(namespace.since).strip())
+        if not match or int(match.group(1)) == 0:
+            raise InvalidArgumentValueError("The parameter '--since' should be a positive duration in seconds, minutes "
+                                            "or hours, for example 30s, 15m or 2h.")
+        namespace.since = int(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+    if namespace.tail is not None and namespace.tail < 1:
+        raise InvalidArgumentValueError("The parameter '--tail' should be a positive number of lines.")
@@ -151,10 +151,9 @@ def create_connectedk8s(cmd, client, resource_group_name, cluster_name, correlat
 
     utils.try_list_node_fix()
     api_instance = kube_client.CoreV1Api()
-    node_api_response = utils.validate_node_api_response(api_instance, None)
-    is_arm64_cluster = check_arm64_node(node_api_response)
+    is_arm64_cluster = check_arm64_node(api_instance)
 
-    required_node_exists = check_linux_node(node_api_response)
+    required_node_exists = check_linux_node(api_instance)
 
     # check if this is AKS_HCI
     aks_hci = False
@@ -245,16 +244,10 @@ def create_connectedk8s(cmd, client, resource_group_name, cluster_name, correlat
                                 summary="Your credentials doesn't have permission to create clusterrolebindings on this kubernetes cluster.")
         raise ValidationError("Your credentials doesn't have permission to create clusterrolebindings on this kubernetes cluster. Please check your permissions.")
 
-    # Get kubernetes cluster info
-    if distribution == 'generic':
-        kubernetes_distro = get_kubernetes_distro(node_api_response)  # (cluster heuristics)
-    else:
-        kubernetes_distro = distribution
-
-    if infrastructure == 'generic':
-        kubernetes_infra = get_kubernetes_infra(node_api_response)  # (cluster heuristics)
-    else:
-        kubernetes_infra = infrastructure
+    # Get kubernetes cluster info, the cluster heuristics are only used for the values not given
+    kubernetes_distro, kubernetes_infra = scan_nodes(api_instance,
+                                                     None if distribution == 'generic' else distribution,
+                                                     None if infrastructure == 'generic' else infrastructure)
 
     kubernetes_properties = {
         'Context.Default.AzureCLI.KubernetesVersion': kubernetes_version,
@@ -631,90 +624,103 @@ def get_private_key(key_pair):
     return PEM.encode(privKey_DER, "RSA PRIVATE KEY")
 
 
-def get_kubernetes_distro(api_response):  # Heuristic
-    if api_response is None:
-        return "generic"
-    try:
-        for node in api_response.items:
-            labels = node.metadata.labels
-            provider_id = str(node.spec.provider_id)
-            annotations = node.metadata.annotations
-            if labels.get("node.openshift.io/os_id"):
-                return "openshift"
-            if labels.get("kubernetes.azure.com/node-image-version"):
-                return "aks"
-            if labels.get("cloud.google.com/gke-nodepool") or labels.get("cloud.google.com/gke-os-distribution"):
-                return "gke"
-            if labels.get("eks.amazonaws.com/nodegroup"):
-                return "eks"
-            if labels.get("minikube.k8s.io/version"):
-                return "minikube"
-            if provider_id.startswith("kind://"):
-                return "kind"
-            if provider_id.startswith("k3s://"):
-                return "k3s"
-            if annotations.get("rke.cattle.io/external-ip") or annotations.get("rke.cattle.io/internal-ip"):
-                return "rancher_rke"
-        return "generic"
-    except Exception as e:  # pylint: disable=broad-except
-        logger.debug("Error occured while trying to fetch kubernetes distribution: " + str(e))
-        utils.kubernetes_exception_handler(e, consts.Get_Kubernetes_Distro_Fault_Type, 'Unable to fetch kubernetes distribution',
-                                           raise_error=False)
-        return "generic"
+def get_kubernetes_distro(node):  # Heuristic
+    labels, annotations, provider_id = get_node_properties(node)
+    if labels.get("node.openshift.io/os_id"):
+        return "openshift"
+    if labels.get("kubernetes.azure.com/node-image-version"):
+        return "aks"
+    if labels.get("cloud.google.com/gke-nodepool") or labels.get("cloud.google.com/gke-os-distribution"):
+        return "gke"
+    if labels.get("eks.amazonaws.com/nodegroup"):
+        return "eks"
+    if labels.get("minikube.k8s.io/version"):
+        return "minikube"
+    if provider_id.startswith("kind://"):
+        return "kind"
+    if provider_id.startswith("k3s://"):
+        return "k3s"
+    if annotations.get("rke.cattle.io/external-ip") or annotations.get("rke.cattle.io/internal-ip"):
+        return "rancher_rke"
+    # The distribution can't be told from this node
+    return None
 
 
-def get_kubernetes_infra(api_response):  # Heuristic
-    if api_response is None:
-        return "generic"
-    try:
-        for node in api_response.items:
-            provider_id = str(node.spec.provider_id)
-            infra = provider_id.split(':')[0]
-            if infra == "k3s" or infra == "kind":
-                return "generic"
-            if infra == "azure":
-                return "azure"
-            if infra == "gce":
-                return "gcp"
-            if infra == "aws":
-                return "aws"
-            k8s_infra = utils.validate_infrastructure_type(infra)
-            if k8s_infra is not None:
-                return k8s_infra
-        return "generic"
-    except Exception as e:  # pylint: disable=broad-except
-        logger.debug("Error occured while trying to fetch kubernetes infrastructure: " + str(e))
-        utils.kubernetes_exception_handler(e, consts.Get_Kubernetes_Infra_Fault_Type, 'Unable to fetch kubernetes infrastructure',
-                                           raise_error=False)
+def get_kubernetes_infra(node):  # Heuristic
+    _, _, provider_id = get_node_properties(node)
+    infra = provider_id.split(':')[0]
+    if infra == "k3s" or infra == "kind":
         return "generic"
+    if infra == "azure":
+        return "azure"
+    if infra == "gce":
+        return "gcp"
+    if infra == "aws":
+        return "aws"
+    # None if the infrastructure can't be told from this node
+    return utils.validate_infrastructure_type(infra)
+
 
+def get_node_properties(node):
+    # Nodes are read as plain json, only their labels, annotations and provider id are used
+    metadata = node.get("metadata") or {}
+    return metadata.get("labels") or {}, metadata.get("annotations") or {}, str((node.get("spec") or {}).get("providerID"))
 
-def check_linux_node(api_response):
+
+def scan_nodes(api_instance, kubernetes_distro=None, kubernetes_infra=None):
+    """
+    Returns the kubernetes distribution and infrastructure of the cluster, the ones not given are found by a paginated
+    scan of its nodes which stops once both are known. The pages are read as json instead of deserializing full V1Node
+    objects.
+    """
+    if kubernetes_distro is not None and kubernetes_infra is not None:
+        return kubernetes_distro, kubernetes_infra
+    start_time = time.time()
+    scanned_nodes = 0
     try:
-        for item in api_response.items:
-            node_os = item.metadata.labels.get("kubernetes.io/os")
-            if node_os == "linux":
-                return True
+        continue_token = None
+        while True:
+            list_options = {"_continue": continue_token} if continue_token else {}
+            response = api_instance.list_node(limit=consts.Node_Scan_Page_Size, _preload_content=False, **list_options)
+            node_list = json.loads(response.data)
+            for node in node_list.get("items") or []:
+                scanned_nodes += 1
+                if kubernetes_distro is None:
+                    kubernetes_distro = get_kubernetes_distro(node)
+                if kubernetes_infra is None:
+                    kubernetes_infra = get_kubernetes_infra(node)
+                if kubernetes_distro is not None and kubernetes_infra is not None:
+                    break
+            continue_token = (node_list.get("metadata") or {}).get("continue")
+            if (kubernetes_distro is not None and kubernetes_infra is not None) or not continue_token:
+                break
     except Exception as e:  # pylint: disable=broad-except
-        logger.debug("Error occured while trying to find a linux node: " + str(e))
-        utils.kubernetes_exception_handler(e, consts.Kubernetes_Node_Type_Fetch_Fault_OS, 'Unable to find a linux node',
+        logger.debug("Error occured while trying to fetch kubernetes distribution and infrastructure: " + str(e))
+        utils.kubernetes_exception_handler(e, consts.Get_Kubernetes_Distro_Fault_Type, 'Unable to fetch kubernetes distribution and infrastructure',
                                            raise_error=False)
-    return False
+    logger.info("Scanned {} nodes for the kubernetes distribution and infrastructure in {:.2f} seconds".format(scanned_nodes, time.time() - start_time))
+    return kubernetes_distro or "generic", kubernetes_infra or "generic"
 
 
-def check_arm64_node(api_response):
+def node_exists(api_instance, label_selector, fault_type, summary):
+    # The label selector is evaluated by the api server, at most one node is returned
     try:
-        for item in api_response.items:
-            node_arch = item.metadata.labels.get("kubernetes.io/arch")
-            if node_arch == "arm64":
-                return True
+        response = api_instance.list_node(label_selector=label_selector, limit=1, _preload_content=False)
+        return bool(json.loads(response.data).get("items"))
     except Exception as e:  # pylint: disable=broad-except
-        logger.debug("Error occured while trying to find an arm64 node: " + str(e))
-        utils.kubernetes_exception_handler(e, consts.Kubernetes_Node_Type_Fetch_Fault_Arch, 'Unable to find an arm64 node',
-                                           raise_error=False)
+        logger.debug("Error occured while trying to find a node with the labels {}: ".format(label_selector) + str(e))
+        utils.kubernetes_exception_handler(e, fault_type, summary, raise_error=False)
     return False
 
 
+def check_linux_node(api_instance):
+    return node_exists(api_instance, "kubernetes.io/os=linux", consts.Kubernetes_Node_Type_Fetch_Fault_OS, 'Unable to find a linux node')
+
+
+def check_arm64_node(api_instance):
+    return node_exists(api_instance, "kubernetes.io/arch=arm64", consts.Kubernetes_Node_Type_Fetch_Fault_Arch, 'Unable to find an arm64 node')
+
+
 def generate_request_payload(location, public_key, tags, kubernetes_distro, kubernetes_infra, enable_private_link, private_link_scope_resource_id, distribution_version, azure_hybrid_benefit):
     # Create connected cluster resource object
     identity = ConnectedClusterIdentity(
@@ -871,8 +877,7 @@ def delete_connectedk8s(cmd, client, resource_group_name, cluster_name,
 
     utils.try_list_node_fix()
     api_instance = kube_client.CoreV1Api()
-    node_api_response = utils.validate_node_api_response(api_instance, None)
-    is_arm64_cluster = check_arm64_node(node_api_response)
+    is_arm64_cluster = check_arm64_node(api_instance)
 
     # Check forced delete flag
     if(force_delete):
@@ -2205,7 +2210,7 @@ def custom_locations_oid_valid(cmd, cl_oid):
         return False
 
 
-def troubleshoot(cmd, client, resource_group_name, cluster_name, kube_config=None, kube_context=None, no_wait=False, tags=None):
+def troubleshoot(cmd, client, resource_group_name, cluster_name, kube_config=None, kube_context=None, no_wait=False, tags=None, since=None, tail=None):
 
     try:
 
@@ -2274,7 +2279,7 @@ def troubleshoot(cmd, client, resource_group_name, cluster_name, kube_config=Non
         if arc_agents_pod_list.items:
 
             # For storing all the agent logs using the CoreV1Api
-            diagnostic_checks[consts.Retrieve_Arc_Agents_Logs], storage_space_available = troubleshootutils.retrieve_arc_agents_logs(corev1_api_instance, filepath_with_timestamp, storage_space_available)
+            diagnostic_checks[consts.Retrieve_Arc_Agents_Logs], storage_space_available = troubleshootutils.retrieve_arc_agents_logs(corev1_api_instance, filepath_with_timestamp, storage_space_available, since, tail)
 
             # For storing all arc agents events logs
             diagnostic_checks[consts.Retrieve_Arc_Agents_Event_Logs], storage_space_available = troubleshootutils.retrieve_arc_agents_event_logs(filepath_with_timestamp, storage_space_available, kubectl_client_location, kube_config, kube_context)
@@ -2348,6 +2353,10 @@ def troubleshoot(cmd, client, resource_group_name, cluster_name, kube_config=Non
         # Adding cli output to the logs
         diagnostic_checks[consts.Storing_Diagnoser_Results_Logs] = troubleshootutils.fetching_cli_output_logs(filepath_with_timestamp, storage_space_available, 1)
 
+        # Compressing the diagnostic logs into a single archive that can be attached to a support ticket
+        archive_path = troubleshootutils.compress_diagnostic_logs(filepath_with_timestamp, storage_space_available)
+        saved_logs_path = archive_path if archive_path else filepath_with_timestamp
+
         # If all the checks passed then display no error found
         all_checks_passed = True
         for checks in diagnostic_checks:
@@ -2356,9 +2365,9 @@ def troubleshoot(cmd, client, resource_group_name, cluster_name, kube_config=Non
         if storage_space_available:
             # Depending on whether all tests passes we will give the output
             if (all_checks_passed):
-                logger.warning("The diagnoser didn't find any issues on the cluster.\nThe diagnoser logs have been saved at this path:" + filepath_with_timestamp + " .\nThese logs can be attached while filing a support ticket for further assistance.\n")
+                logger.warning("The diagnoser didn't find any issues on the cluster.\nThe diagnoser logs have been saved at this path:" + saved_logs_path + " .\nThese logs can be attached while filing a support ticket for further assistance.\n")
             else:
-                logger.warning("The diagnoser logs have been saved at this path:" + filepath_with_timestamp + " .\nThese logs can be attached while filing a support ticket for further assistance.\n")
+                logger.warning("The diagnoser logs have been saved at this path:" + saved_logs_path + " .\nThese logs can be attached while filing a support ticket for further assistance.\n")
         else:
             if (all_checks_passed):
                 logger.warning("The diagnoser didn't find any issues on the cluster.\n")
@@ -0,0 +1,81 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import unittest
+from types import SimpleNamespace
+
+from kubernetes.client.rest import ApiException
+
+from azext_connectedk8s.custom import check_arm64_node, check_linux_node, scan_nodes
+
+
+def _node(labels=None, provider_id=None):
+    return {"metadata": {"name": "node", "labels": labels or {}, "annotations": {}}, "spec": {"providerID": provider_id} if provider_id else {}}
+
+
+class FakeCoreV1Api(object):
+    """ Lists the nodes a page at a time, filtering them by label on the api server side """
+
+    def __init__(self, nodes, page_size=2):
+        self.nodes = nodes
+        self.page_size = page_size
+        self.requests = []
+
+    def list_node(self, limit=None, _continue=None, label_selector=None, _preload_content=True):
+        self.requests.append({"limit": limit, "_continue": _continue, "label_selector": label_selector})
+        nodes = self.nodes
+        if label_selector:
+            key, value = label_selector.split("=")
+            nodes = [node for node in nodes if node["metadata"]["labels"].get(key) == value]
+        start = int(_continue or 0)
+        end = start + min(limit or len(nodes), self.page_size)
+        node_list = {"items": nodes[start:end], "metadata": {"continue": str(end) if end < len(nodes) else None}}
+        return SimpleNamespace(data=json.dumps(node_list).encode())
+
+
+class TestConnectedk8sNodeScan(unittest.TestCase):
+    def test_scan_stops_once_distro_and_infra_are_known(self):
+        api_instance = FakeCoreV1Api([_node({"kubernetes.io/os": "linux"})] * 3 +
+                                     [_node({"kubernetes.azure.com/node-image-version": "AKSUbuntu"}, "azure:///subscriptions/sub")] +
+                                     [_node({"kubernetes.io/os": "linux"})] * 100)
+        self.assertEqual(("aks", "azure"), scan_nodes(api_instance))
+        # the two pages up to the aks node instead of the 104 nodes
+        self.assertEqual([None, "2"], [request["_continue"] for request in api_instance.requests])
+
+    def test_generic_cluster_is_scanned_to_the_end(self):
+        api_instance = FakeCoreV1Api([_node({"kubernetes.io/os": "linux"})] * 5)
+        self.assertEqual(("generic", "generic"), scan_nodes(api_instance))
+        self.assertEqual(3, len(api_instance.requests))
+
+    def test_first_node_with_an_answer_wins(self):
+        api_instance = FakeCoreV1Api([_node(provider_id="kind://docker/kind/kind-control-plane"),
+                                      _node({"eks.amazonaws.com/nodegroup": "ng"}, "aws:///us-east-1a/i-1")])
+        self.assertEqual(("kind", "generic"), scan_nodes(api_instance))
+
+    def test_given_values_are_not_scanned(self):
+        api_instance = FakeCoreV1Api([_node({"eks.amazonaws.com/nodegroup": "ng"}, "aws:///us-east-1a/i-1")])
+        self.assertEqual(("openshift", "aws"), scan_nodes(api_instance, kubernetes_distro="openshift"))
+        self.assertEqual(("openshift", "gcp"), scan_nodes(api_instance, "openshift", "gcp"))
+        self.assertEqual(1, len(api_instance.requests))
+
+    def test_scan_failure_is_generic(self):
+        api_instance = FakeCoreV1Api([])
+        api_instance.list_node = lambda **kwargs: (_ for _ in ()).throw(ApiException(status=403))
+        self.assertEqual(("generic", "generic"), scan_nodes(api_instance))
+        self.assertFalse(check_linux_node(api_instance))
+
+    def test_node_checks_use_label_selectors(self):
+        api_instance = FakeCoreV1Api([_node({"kubernetes.io/os": "windows", "kubernetes.io/arch": "amd64"})] * 50 +
+                                     [_node({"kubernetes.io/os": "linux", "kubernetes.io/arch": "arm64"})])
+        self.assertTrue(check_linux_node(api_instance))
+        self.assertTrue(check_arm64_node(api_instance))
+        self.assertFalse(check_arm64_node(FakeCoreV1Api([_node({"kubernetes.io/arch": "amd64"})])))
+        self.assertEqual([1, 1], [request["limit"] for request in api_instance.requests])
+        self.assertEqual(["kubernetes.io/os=linux", "kubernetes.io/arch=arm64"], [request["label_selector"] for request in api_instance.requests])
+
+
+if __name__ == '__main__':
+    unittest.main()
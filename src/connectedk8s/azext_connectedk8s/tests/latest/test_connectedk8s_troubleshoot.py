@@ -0,0 +1,154 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import zipfile
+from argparse import Namespace
+from types import SimpleNamespace
+
+from azure.cli.core.azclierror import InvalidArgumentValueError
+from azure.cli.core.mock import DummyCli
+
+import azext_connectedk8s._constants as consts
+from azext_connectedk8s import Connectedk8sCommandsLoader
+import azext_connectedk8s._troubleshootutils as troubleshootutils
+from azext_connectedk8s._validators import validate_troubleshoot_log_limits
+
+
+class FakeLogResponse(object):
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.released = False
+
+    def stream(self, amt):
+        for chunk in self.chunks:
+            yield chunk
+
+    def release_conn(self):
+        self.released = True
+
+
+class FakeCoreV1Api(object):
+    """ Serves the logs of the containers of some arc agents pods, each request taking delay seconds """
+
+    def __init__(self, pods, delay=0.2):
+        self.pods = pods
+        self.delay = delay
+        self.requests = []
+        self.responses = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def list_namespaced_pod(self, namespace):
+        items = [SimpleNamespace(metadata=SimpleNamespace(name=name), status=SimpleNamespace(phase=phase),
+                                 spec=SimpleNamespace(containers=[SimpleNamespace(name=container) for container in containers]))
+                 for name, phase, containers in self.pods]
+        return SimpleNamespace(items=items)
+
+    def read_namespaced_pod_log(self, name, container, namespace, **kwargs):
+        with self.lock:
+            self.requests.append((name, container, kwargs))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        response = FakeLogResponse([("{} {} line {}\n".format(name, container, i)).encode() for i in range(3)])
+        self.responses.append(response)
+        return response
+
+
+class TestTroubleshootLogCollection(unittest.TestCase):
+    def setUp(self):
+        self.filepath_with_timestamp = os.path.join(tempfile.mkdtemp(), "cluster-timestamp")
+        os.mkdir(self.filepath_with_timestamp)
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.filepath_with_timestamp))
+
+    def test_container_logs_are_collected_concurrently(self):
+        corev1_api_instance = FakeCoreV1Api([
+            ("clusterconnect-agent", "Running", ["clusterconnect-agent", "fluent-bit"]),
+            ("config-agent", "Running", ["config-agent", "fluent-bit"]),
+            ("extension-manager", "Running", ["manager", "fluent-bit"]),
+            ("kube-aad-proxy", "Pending", ["kube-aad-proxy"]),
+        ])
+        status, storage_space_available = troubleshootutils.retrieve_arc_agents_logs(corev1_api_instance, self.filepath_with_timestamp, True, 3600, 100)
+
+        self.assertEqual(consts.Diagnostic_Check_Passed, status)
+        self.assertTrue(storage_space_available)
+        self.assertEqual(6, len(corev1_api_instance.requests))
+        self.assertEqual(6, corev1_api_instance.max_in_flight)
+        for _, _, kwargs in corev1_api_instance.requests:
+            self.assertEqual({"_preload_content": False, "since_seconds": 3600, "tail_lines": 100}, kwargs)
+        self.assertTrue(all(response.released for response in corev1_api_instance.responses))
+
+        logs_path = os.path.join(self.filepath_with_timestamp, consts.Arc_Agents_Logs)
+        with open(os.path.join(logs_path, "config-agent", "fluent-bit.txt")) as container_file:
+            self.assertEqual("".join("config-agent fluent-bit line {}\n".format(i) for i in range(3)), container_file.read())
+        # the folder of a pod that is not running is still created
+        self.assertEqual([], os.listdir(os.path.join(logs_path, "kube-aad-proxy")))
+
+    def test_logs_are_compressed(self):
+        troubleshootutils.retrieve_arc_agents_logs(FakeCoreV1Api([("config-agent", "Running", ["config-agent"])], delay=0), self.filepath_with_timestamp, True)
+        archive_path = troubleshootutils.compress_diagnostic_logs(self.filepath_with_timestamp, True)
+
+        self.assertEqual(self.filepath_with_timestamp + ".zip", archive_path)
+        with zipfile.ZipFile(archive_path) as archive:
+            self.assertEqual(["cluster-timestamp/arc_agents_logs/config-agent/config-agent.txt"], archive.namelist())
+        self.assertIsNone(troubleshootutils.compress_diagnostic_logs(self.filepath_with_timestamp, False))
+
+    def test_log_limits_validation(self):
+        namespace = Namespace(since="15m", tail=None)
+        validate_troubleshoot_log_limits(namespace)
+        self.assertEqual(900, namespace.since)
+        namespace = Namespace(since="30", tail=10)
+        validate_troubleshoot_log_limits(namespace)
+        self.assertEqual(30, namespace.since)
+        for since, tail in (("0h", None), ("1d", None), ("soon", None), (None, 0)):
+            with self.assertRaises(InvalidArgumentValueError):
+                validate_troubleshoot_log_limits(Namespace(since=since, tail=tail))
+
+
+class TestTroubleshootArguments(unittest.TestCase):
+    def _parse(self, *args):
+        """ Parse the log limits arguments as registered for the troubleshoot command and run their validators """
+        command_name = "connectedk8s troubleshoot"
+        cli_ctx = DummyCli()
+        loader = Connectedk8sCommandsLoader(cli_ctx=cli_ctx)
+        cli_ctx.invocation = SimpleNamespace(data={"command_string": command_name}, commands_loader=loader)
+        loader.load_command_table(None)
+        loader.command_name = command_name
+        loader.command_table[command_name].load_arguments()
+        loader.load_arguments(command_name)
+        loader._update_command_definitions()  # pylint: disable=protected-access
+
+        parser = argparse.ArgumentParser()
+        validators = []
+        for name in ("since", "tail"):
+            settings = loader.command_table[command_name].arguments[name].type.settings
+            parser.add_argument(*settings["options_list"], dest=name, type=settings.get("type"))
+            if settings.get("validator"):
+                validators.append(settings["validator"])
+        namespace = parser.parse_args(args)
+        for validator in validators:
+            validator(namespace)
+        return namespace
+
+    def test_log_limits_are_converted(self):
+        namespace = self._parse("--since", "1h", "--tail", "10")
+        self.assertEqual(3600, namespace.since)
+        self.assertEqual(10, namespace.tail)
+        with self.assertRaises(InvalidArgumentValueError):
+            self._parse("--since", "1d")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -34,6 +34,13 @@ def handle_raw_exception(e):
 
     stringErr = str(e)
 
+    if "MissingSubscriptionRegistration" in stringErr or "SubscriptionNotRegistered" in stringErr:
+        # the cached provider registration is out of date
+        import re
+        from ._utils import clear_provider_registration_cache
+        namespace = re.search(r"namespace '([^']+)'", stringErr)
+        clear_provider_registration_cache(namespace.group(1) if namespace else None)
+
     if "WorkloadProfileNameRequired" in stringErr:
         raise CLIInternalError("Workload profile name is required. Please provide --workload-profile-name.")
 
@@ -4,7 +4,10 @@
 # --------------------------------------------------------------------------------------------
 # pylint: disable=line-too-long, super-with-arguments, too-many-instance-attributes, consider-using-f-string, no-else-return, no-self-use
 
+import heapq
+from abc import ABC, abstractmethod
 import json
+import random
 import time
 import sys
 
@@ -18,7 +21,10 @@ logger = get_logger(__name__)
 CURRENT_API_VERSION = "2023-05-01"
 PREVIEW_API_VERSION = "2023-05-02-preview"
 POLLING_TIMEOUT = 600  # how many seconds before exiting
-POLLING_SECONDS = 2  # how many seconds between requests
+POLLING_SECONDS = 2  # how many seconds between the first requests
+POLLING_MAX_SECONDS = 15  # how many seconds between requests at most, unless the service asks for more with Retry-After
+POLLING_BACKOFF_FACTOR = 1.5  # how much longer to wait after every request
+POLLING_JITTER = 0.2  # fraction of the wait randomly added or removed, so that concurrent operations are spread out
 POLLING_TIMEOUT_FOR_MANAGED_CERTIFICATE = 1500  # how many seconds before exiting
 POLLING_INTERVAL_FOR_MANAGED_CERTIFICATE = 4  # how many seconds between requests
 HEADER_AZURE_ASYNC_OPERATION = "azure-asyncoperation"
@@ -42,96 +48,182 @@ class PollingAnimation():
         sys.stderr.write("\r\033[K")
 
 
-def poll(cmd, request_url, poll_if_status):  # pylint: disable=inconsistent-return-statements
-    try:
-        start = time.time()
-        end = time.time() + POLLING_TIMEOUT
-        animation = PollingAnimation()
-
-        animation.tick()
-        r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-
-        while r.status_code in [200, 201] and start < end:
-            time.sleep(POLLING_SECONDS)
-            animation.tick()
-
-            r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-            r2 = r.json()
-
-            if "properties" not in r2 or "provisioningState" not in r2["properties"] or r2["properties"]["provisioningState"].lower() in ["succeeded", "failed", "canceled"]:
-                break
-            start = time.time()
-
-        animation.flush()
-        return r.json()
-    except Exception as e:  # pylint: disable=broad-except
-        animation.flush()
+class LongRunningOperation(ABC):
+    """
+    An operation which is polled with GET requests to request_url until it finishes. Subclasses decide from every
+    response whether the operation finished and what its result is. polls and elapsed tell how many requests and how
+    many seconds it took, for diagnostics.
+    """
+    def __init__(self, request_url, timeout=POLLING_TIMEOUT):
+        self.request_url = request_url
+        self.timeout = timeout
+        self.polls = 0
+        self.start_time = None
+        self.end_time = None
+        self.done = False
+        self.result = None
+        self.error = None
+
+    @property
+    def elapsed(self):
+        if self.start_time is None:
+            return 0
+        return (self.end_time or time.time()) - self.start_time
+
+    @abstractmethod
+    def update(self, response):
+        """ Decide from the response of a poll whether the operation finished, and its result """
+
+    def fail(self, error):
+        self.done = True
+        self.error = error
+
+    def time_out(self, response):
+        # same as before the operations had their own poller: stop polling and return what the last response says
+        self.done = True
+
+    def next_delay(self, response):
+        """
+        Seconds to wait before the next poll: what the service asks for with Retry-After, otherwise an exponential
+        backoff with jitter, up to POLLING_MAX_SECONDS.
+        """
+        retry_after = _extract_delay(response, None) if response is not None else None
+        if retry_after is not None:
+            return retry_after
+        delay = POLLING_SECONDS * POLLING_BACKOFF_FACTOR ** max(0, self.polls - 1)
+        delay *= random.uniform(1 - POLLING_JITTER, 1 + POLLING_JITTER)
+        return min(delay, POLLING_MAX_SECONDS)
+
+
+class ProvisioningStateOperation(LongRunningOperation):
+    """ Polls a resource until its provisioningState is final, the result is the resource """
+    def __init__(self, request_url, poll_if_status, timeout=POLLING_TIMEOUT):
+        super(ProvisioningStateOperation, self).__init__(request_url, timeout)
+        self.poll_if_status = poll_if_status
+
+    def update(self, response):
+        if response.status_code not in [200, 201]:
+            self.done = True
+            self.result = response.json()
+            return
+        self.result = response.json()
+        # the first response may still be from before the operation started
+        if self.polls == 1:
+            return
+        properties = self.result.get("properties") or {}
+        if "provisioningState" not in properties or properties["provisioningState"].lower() in ["succeeded", "failed", "canceled"]:
+            self.done = True
 
+    def fail(self, error):
         delete_statuses = ["scheduledfordelete", "cancelled"]
+        if self.poll_if_status in delete_statuses:  # Catch "not found" errors if polling for delete
+            self.done = True
+            self.result = None
+            return
+        super(ProvisioningStateOperation, self).fail(error)
 
-        if poll_if_status not in delete_statuses:  # Catch "not found" errors if polling for delete
-            raise e
-
-
-def poll_status(cmd, request_url):  # pylint: disable=inconsistent-return-statements
-    from azure.core.exceptions import HttpResponseError
-    from ._utils import safe_get
-
-    if not request_url:
-        raise AzureResponseError(f"Http response lack of necessary header: '{HEADER_AZURE_ASYNC_OPERATION}'")
-
-    start = time.time()
-    end = time.time() + POLLING_TIMEOUT
-    animation = PollingAnimation()
 
-    animation.tick()
-    r = send_raw_request(cmd.cli_ctx, "GET", request_url)
+class AsyncOperationStatus(LongRunningOperation):
+    """ Polls the Azure-AsyncOperation header URL of an operation until the status is final """
+    def update(self, response):
+        from azure.core.exceptions import HttpResponseError
+        from ._utils import safe_get
 
-    while r.status_code in [200] and start < end:
-        time.sleep(_extract_delay(r))
-        animation.tick()
-        r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-        response_body = json.loads(r.text)
+        if response.status_code not in [200]:
+            self.done = True
+            return
+        response_body = json.loads(response.text)
         status = safe_get(response_body, "status")
         if not status:
             raise AzureResponseError("Http response body lack of necessary property: status")
-        if response_body["status"].lower() in ["failed", "canceled"]:
+        if status.lower() in ["failed", "canceled"]:
             message = json.dumps(response_body["error"]) if "error" in response_body else "Operation failed or canceled"
             raise HttpResponseError(
-                response=r,
+                response=response,
                 message=message
             )
-        if response_body["status"].lower() in ["succeeded"]:
-            break
-        start = time.time()
+        if status.lower() in ["succeeded"]:
+            self.done = True
 
-    animation.flush()
-    return
 
+class OperationResult(LongRunningOperation):
+    """ Polls the Location header URL of an operation until it stops returning 202, the result is the response body """
+    def update(self, response):
+        if response.status_code in [202]:
+            return
+        self.done = True
+        self.result = json.loads(response.text) if response.text else None
 
-def poll_results(cmd, request_url):  # pylint: disable=inconsistent-return-statements
-    if not request_url:
-        raise AzureResponseError(f"Http response lack of necessary header: '{HEADER_LOCATION}'")
+    def time_out(self, response):
+        super(OperationResult, self).time_out(response)
+        self.result = json.loads(response.text) if response is not None and response.text else None
 
-    start = time.time()
-    end = time.time() + POLLING_TIMEOUT
+
+def wait_for_operations(cmd, operations):
+    """
+    Poll all the operations from the current thread until each of them finished, every operation on its own
+    schedule. Returns the results in the order of operations. If any of them failed, the first error is raised once
+    all of them finished.
+    """
     animation = PollingAnimation()
+    schedule = []
+    start = time.time()
+    for index, operation in enumerate(operations):
+        operation.start_time = start
+        heapq.heappush(schedule, (start, index))
 
-    animation.tick()
-    r = send_raw_request(cmd.cli_ctx, "GET", request_url)
+    try:
+        while schedule:
+            due, index = heapq.heappop(schedule)
+            delay = due - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            animation.tick()
+
+            operation = operations[index]
+            response = None
+            try:
+                response = send_raw_request(cmd.cli_ctx, "GET", operation.request_url)
+                operation.polls += 1
+                operation.update(response)
+            except Exception as e:  # pylint: disable=broad-except
+                operation.fail(e)
+            if not operation.done and time.time() >= operation.start_time + operation.timeout:
+                logger.info("Timed out after %d seconds waiting for %s", operation.timeout, operation.request_url)
+                operation.time_out(response)
+
+            if operation.done:
+                operation.end_time = time.time()
+                logger.info("Operation %s finished after %d polls in %.1f seconds",
+                            operation.request_url, operation.polls, operation.elapsed)
+            else:
+                heapq.heappush(schedule, (time.time() + operation.next_delay(response), index))
+    finally:
+        animation.flush()
+
+    for operation in operations:
+        if operation.error is not None:
+            raise operation.error
+    return [operation.result for operation in operations]
+
+
+def poll(cmd, request_url, poll_if_status):
+    return wait_for_operations(cmd, [ProvisioningStateOperation(request_url, poll_if_status)])[0]
 
-    while r.status_code in [202] and start < end:
-        time.sleep(_extract_delay(r))
-        animation.tick()
-        r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-        start = time.time()
 
-    animation.flush()
-    if r.text:
-        return json.loads(r.text)
+def poll_status(cmd, request_url):
+    if not request_url:
+        raise AzureResponseError(f"Http response lack of necessary header: '{HEADER_AZURE_ASYNC_OPERATION}'")
+    wait_for_operations(cmd, [AsyncOperationStatus(request_url)])
+
+
+def poll_results(cmd, request_url):
+    if not request_url:
+        raise AzureResponseError(f"Http response lack of necessary header: '{HEADER_LOCATION}'")
+    return wait_for_operations(cmd, [OperationResult(request_url)])[0]
 
 
-def _extract_delay(response):
+def _extract_delay(response, default=POLLING_SECONDS):
     try:
         retry_after = response.headers.get("retry-after")
         if retry_after:
@@ -143,7 +235,7 @@ def _extract_delay(response):
                 return parsed_retry_after / 1000.0
     except ValueError:
         pass
-    return POLLING_SECONDS
+    return default
 
 
 class ContainerAppClient():
@@ -1017,7 +1109,6 @@ class ContainerAppsJobClient():
                 cls.api_version)
 
             if r.status_code == 202:
-                from azure.cli.core.azclierror import ResourceNotFoundError
                 try:
                     poll(cmd, request_url, "cancelled")
                 except ResourceNotFoundError:
@@ -1188,7 +1279,6 @@ class GitHubActionClient():
                 cls.api_version)
 
             if r.status_code == 202:
-                from azure.cli.core.azclierror import ResourceNotFoundError
                 try:
                     poll(cmd, request_url, "cancelled")
                 except ResourceNotFoundError:
@@ -1287,7 +1377,6 @@ class DaprComponentClient():
                 cls.api_version)
 
             if r.status_code == 202:
-                from azure.cli.core.azclierror import ResourceNotFoundError
                 try:
                     poll(cmd, request_url, "cancelled")
                 except ResourceNotFoundError:
@@ -1401,7 +1490,6 @@ class StorageClient():
                 name,
                 cls.api_version)
             if r.status_code == 200:  # 200 successful delete, 204 means storage not found
-                from azure.cli.core.azclierror import ResourceNotFoundError
                 try:
                     poll(cmd, request_url, "scheduledfordelete")
                 except ResourceNotFoundError:
@@ -1494,7 +1582,6 @@ class AuthClient():
         elif r.status_code in [200, 201, 202, 204]:
             request_url = f"{management_hostname}subscriptions/{sub_id}/resourceGroups/{resource_group_name}/providers/Microsoft.App/containerApps/{container_app_name}/authConfigs/{auth_config_name}?api-version={cls.api_version}"
             if r.status_code == 200:  # 200 successful delete, 204 means storage not found
-                from azure.cli.core.azclierror import ResourceNotFoundError
                 try:
                     poll(cmd, request_url, "scheduledfordelete")
                 except ResourceNotFoundError:
@@ -4,6 +4,11 @@
 # --------------------------------------------------------------------------------------------
 # pylint: disable=line-too-long, consider-using-f-string, no-else-return, duplicate-string-formatting-argument, expression-not-assigned, too-many-locals, logging-fstring-interpolation, arguments-differ, abstract-method, logging-format-interpolation, broad-except
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import nullcontext
+
+from azure.cli.core.azclierror import InvalidArgumentValueError
 from knack.log import get_logger
 from knack.prompting import prompt, prompt_choice_list
 
@@ -48,7 +53,9 @@ def build_containerapp_from_compose_service(cmd,
                                             registry_pass,
                                             env_vars,
                                             logs_key=None,
-                                            logs_customer_id=None):
+                                            logs_customer_id=None,
+                                            quiet=False,
+                                            registry_lock=None):
 
     resource_group = ResourceGroup(cmd, name=resource_group_name, location=location)
     env = ContainerAppEnvironment(cmd,
@@ -70,15 +77,85 @@ def build_containerapp_from_compose_service(cmd,
                        env_vars,
                        ingress)
 
-    if not registry_server:
-        _get_registry_from_app(app, True)  # if the app exists, get the registry
-    _get_registry_details(cmd, app, True)  # fetch ACR creds from arguments registry arguments
+    # services built concurrently share the registry, only one of them may look for or create it at a time
+    with registry_lock or nullcontext():
+        if not registry_server:
+            _get_registry_from_app(app, True)  # if the app exists, get the registry
+        _get_registry_details(cmd, app, True)  # fetch ACR creds from arguments registry arguments
 
-    app.create_acr_if_needed()
-    app.run_acr_build(dockerfile, source, False)
+        app.create_acr_if_needed()
+    app.run_acr_build(dockerfile, source, quiet)
     return app.image, app.registry_server, app.registry_user, app.registry_pass
 
 
+def resolve_service_dependencies(parsed_compose_file):
+    """
+    Returns the services of the compose file mapped to the names of the services they depend on, in the order the
+    services would be created one by one.
+    """
+    dependencies = OrderedDict()
+    for service_name in parsed_compose_file.ordered_services.keys():
+        if service_name not in parsed_compose_file.services:
+            # pycomposefile keeps ordered_services across compose files
+            continue
+        depends_on = [str(dependency) for dependency in parsed_compose_file.services[service_name].depends_on or []]
+        for dependency in depends_on:
+            if dependency not in parsed_compose_file.services:
+                raise InvalidArgumentValueError(f"Service '{service_name}' depends on undefined service '{dependency}'.")
+        dependencies[service_name] = depends_on
+    return dependencies
+
+
+def deploy_compose_services(dependencies, deploy_service, max_workers):
+    """
+    Call deploy_service(service_name) for every service of dependencies once all the services it depends on are
+    deployed, up to max_workers services at a time. Returns the results in the order of dependencies.
+
+    After a service fails no other service is started. The services already running are waited for, a summary is
+    logged and the error of the first failed service is raised.
+    """
+    total = len(dependencies)
+    max_workers = max(1, max_workers)
+    pending = OrderedDict((name, set(depends_on)) for name, depends_on in dependencies.items())
+    results = {}
+    failures = OrderedDict()
+    running = {}
+
+    def _deploy(service_name):
+        logger.warning(f"Deploying service '{service_name}'...")
+        return deploy_service(service_name)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            # services are only submitted once a worker is free, so that they start in the order of dependencies
+            ready = [name for name, depends_on in pending.items() if depends_on.issubset(results)]
+            for name in ready[:max_workers - len(running)] if not failures else []:
+                del pending[name]
+                running[executor.submit(_deploy, name)] = name
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    failures[name] = e
+                    logger.error(f"Failed to deploy service '{name}': {e}")
+                    continue
+                logger.warning(f"Deployed service '{name}' ({len(results)}/{total}).")
+
+    if not failures and pending:
+        raise InvalidArgumentValueError(f"Services {', '.join(pending)} have circular depends_on dependencies.")
+    if failures:
+        logger.error("Deployed services: %s. Failed services: %s. Services not deployed: %s.",
+                     ', '.join(name for name in dependencies if name in results) or 'none',
+                     ', '.join(failures),
+                     ', '.join(name for name in dependencies if name in pending) or 'none')
+        raise next(iter(failures.values()))
+    return [results[name] for name in dependencies]
+
+
 def resolve_configuration_element_list(compose_service, unsupported_configuration, area=None):
     if area is not None:
         compose_service = getattr(compose_service, area)
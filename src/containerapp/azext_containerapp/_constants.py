@@ -20,6 +20,9 @@ CONTAINER_APPS_SDK_MODELS = "azext_containerapp._sdk_models"
 
 LOG_ANALYTICS_RP = "Microsoft.OperationalInsights"
 CONTAINER_APPS_RP = "Microsoft.App"
+
+PROVIDER_REGISTRATION_CACHE_KEY = "containerapp_provider_registrations"  # key of the cache in the CLI session
+PROVIDER_REGISTRATION_CACHE_TTL_SECS = 24 * 60 * 60
 SERVICE_LINKER_RP = "Microsoft.ServiceLinker"
 EXTENDED_LOCATION_RP = "Microsoft.ExtendedLocation"
 CONTAINER_APP_EXTENSION_TYPE = "microsoft.app.environment"
@@ -73,6 +76,13 @@ NAME_ALREADY_EXISTS = "AlreadyExists"
 LOG_TYPE_CONSOLE = "console"
 LOG_TYPE_SYSTEM = "system"
 
+LOG_STREAM_BUFFER_LINES = 1000  # lines of a replica read ahead of the merged output
+LOG_STREAM_MERGE_WINDOW_SECS = 1  # how long a line waits for the lines of other replicas before it's printed
+LOG_STREAM_CONNECT_TIMEOUT_SECS = 30
+LOG_STREAM_RECONNECT_ATTEMPTS = 5
+LOG_STREAM_RECONNECT_DELAY_SECS = 2
+LOG_STREAM_REPLICA_REFRESH_SECS = 30  # how often to look for new replicas when following the logs
+
 ACR_TASK_TEMPLATE = """version: v1.1.0
 steps:
   - cmd: mcr.microsoft.com/oryx/cli:debian-buster-20230222.1 oryx dockerfile --bind-port {{target_port}} --output ./Dockerfile .
@@ -86,4 +96,6 @@ DEFAULT_PORT = 8080  # used for no dockerfile scenario; not the hello world imag
 
 HELLO_WORLD_IMAGE = "mcr.microsoft.com/k8se/quickstart:latest"
 
+COMPOSE_DEFAULT_MAX_WORKERS = 4  # services of a compose file deployed concurrently
+
 LOGS_STRING = '[{"category":"ContainerAppConsoleLogs","categoryGroup":null,"enabled":true,"retentionPolicy":{"days":0,"enabled":false}},{"category":"ContainerAppSystemLogs","categoryGroup":null,"enabled":true,"retentionPolicy":{"days":0,"enabled":false}}]'  # pylint: disable=line-too-long
@@ -203,7 +203,7 @@ helps['containerapp logs'] = """
 
 helps['containerapp logs show'] = """
     type: command
-    short-summary: Show past logs and/or print logs in real time (with the --follow parameter). Note that the logs are only taken from one revision, replica, and container (for non-system logs).
+    short-summary: Show past logs and/or print logs in real time (with the --follow parameter). Note that the logs are only taken from one revision, replica, and container (for non-system logs), unless --all-replicas is used.
     examples:
     - name: Fetch the past 20 lines of logs from an app and return
       text: |
@@ -217,6 +217,9 @@ helps['containerapp logs show'] = """
     - name: Fetch logs for a particular revision, replica, and container
       text: |
           az containerapp logs show -n MyContainerapp -g MyResourceGroup --replica MyReplica --revision MyRevision --container MyContainer
+    - name: Print the logs of all the replicas of the latest revision as they come in
+      text: |
+          az containerapp logs show -n MyContainerapp -g MyResourceGroup --all-replicas --follow
 """
 
 helps['containerapp show-custom-domain-verification-id'] = """
@@ -1690,6 +1693,11 @@ helps['containerapp compose create'] = """
           az containerapp compose create -g MyResourceGroup \\
               --environment MyContainerappEnv \\
               --compose-file-path "path/to/docker-compose.yml"
+    - name: Create the container apps of a Compose configuration file one service at a time.
+      text: |
+          az containerapp compose create -g MyResourceGroup \\
+              --environment MyContainerappEnv \\
+              --max-workers 1
 """
 
 # Patch commands
@@ -0,0 +1,208 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+# pylint: disable=logging-fstring-interpolation, broad-except
+
+import json
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+import requests
+from knack.log import get_logger
+
+from ._constants import (LOG_STREAM_BUFFER_LINES, LOG_STREAM_MERGE_WINDOW_SECS, LOG_STREAM_RECONNECT_ATTEMPTS,
+                         LOG_STREAM_RECONNECT_DELAY_SECS, LOG_STREAM_CONNECT_TIMEOUT_SECS,
+                         LOG_STREAM_REPLICA_REFRESH_SECS)
+
+logger = get_logger(__name__)
+
+
+def format_log_line(line):
+    # these .replaces are needed to display color/quotations properly
+    # for some reason the API returns garbled unicode special characters (may need to add more in the future)
+    return (line.decode("utf-8").replace("\\u0022", "\u0022").replace("\\u001B", "\u001B")
+            .replace("\\u002B", "\u002B").replace("\\u0027", "\u0027"))
+
+
+def parse_log_timestamp(text, output_format):
+    """
+    Returns the time a log line was written at, or None if it has no timestamp. Lines without time zone are UTC.
+    """
+    from dateutil.parser import isoparse
+
+    value = None
+    if output_format == "json":
+        try:
+            value = json.loads(text).get("TimeStamp")
+        except (ValueError, AttributeError):
+            return None
+    elif text:
+        value = text.split(None, 1)[0]
+    if not isinstance(value, str):
+        return None
+    try:
+        timestamp = isoparse(value)
+    except ValueError:
+        try:
+            timestamp = datetime.strptime(value[:19], "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+class ReplicaLogStream(threading.Thread):
+    """
+    Reads the log stream of one replica into a queue of at most LOG_STREAM_BUFFER_LINES lines, the stream isn't read
+    any further while the queue is full. When following the logs, the stream is opened again if the connection drops.
+    The queue ends with None once the stream ended.
+    """
+    def __init__(self, replica, url, request_params, headers, follow, output_format):
+        super().__init__(daemon=True)
+        self.replica = replica
+        self.url = url
+        self.request_params = request_params
+        self.headers = headers
+        self.follow = follow
+        self.output_format = output_format
+        self.lines = queue.Queue(maxsize=LOG_STREAM_BUFFER_LINES)
+        self._last_timestamp = None
+
+    def run(self):
+        attempts = 0
+        request_params = self.request_params
+        try:
+            while True:
+                try:
+                    resp = requests.get(self.url,
+                                        timeout=(LOG_STREAM_CONNECT_TIMEOUT_SECS, None),
+                                        stream=True,
+                                        params=request_params,
+                                        headers=self.headers)
+                    if resp.status_code == 404:
+                        logger.info(f"Replica {self.replica} no longer exists")
+                        return
+                    if not resp.ok:
+                        raise requests.HTTPError(f"Got bad status from the logstream API: {resp.status_code}")
+                    attempts = 0
+                    for line in resp.iter_lines():
+                        if line:
+                            self._put(line)
+                except requests.RequestException as e:
+                    logger.info(f"Log stream of replica {self.replica} dropped: {e}")
+                    if not self.follow or attempts >= LOG_STREAM_RECONNECT_ATTEMPTS:
+                        logger.warning(f"Stopped streaming the logs of replica {self.replica}: {e}")
+                        return
+                if not self.follow:
+                    return
+                attempts += 1
+                time.sleep(LOG_STREAM_RECONNECT_DELAY_SECS * attempts)
+                # past lines were already printed
+                request_params = dict(self.request_params, tailLines=0)
+                logger.info(f"Reconnecting to the log stream of replica {self.replica}")
+        finally:
+            self.lines.put(None)
+
+    def _put(self, line):
+        logger.info("received raw log line from %s: %s", self.replica, line)
+        # the timestamp is parsed before formatting, which may turn escaped quotes of json lines into quotes
+        timestamp = parse_log_timestamp(line.decode("utf-8"), self.output_format) or self._last_timestamp
+        self._last_timestamp = timestamp
+        self.lines.put(LogLine(timestamp, time.monotonic(), self.replica, format_log_line(line)))
+
+
+class LogLine():
+    def __init__(self, timestamp, received, replica, text):
+        self.timestamp = timestamp
+        self.received = received
+        self.replica = replica
+        self.text = text
+
+    def sort_key(self):
+        return (self.timestamp or datetime.min.replace(tzinfo=timezone.utc), self.received)
+
+    def __str__(self):
+        return f"[{self.replica}] {self.text}"
+
+
+def merge_log_streams(streams, discover_streams=None, window=LOG_STREAM_MERGE_WINDOW_SECS):
+    """
+    Yields the lines of all the streams in the order they were written. A line is only held back until every stream
+    has a line to compare it with, or for at most window seconds, so that replicas without new logs don't hold back
+    the others. discover_streams is called every LOG_STREAM_REPLICA_REFRESH_SECS for the streams of new replicas.
+    """
+    active = list(streams)
+    heads = {}
+    next_discovery = time.monotonic() + LOG_STREAM_REPLICA_REFRESH_SECS
+    while active or heads:
+        if discover_streams is not None and time.monotonic() >= next_discovery:
+            active.extend(discover_streams())
+            next_discovery = time.monotonic() + LOG_STREAM_REPLICA_REFRESH_SECS
+        for stream in list(active):
+            if stream in heads:
+                continue
+            try:
+                line = stream.lines.get_nowait()
+            except queue.Empty:
+                continue
+            if line is None:
+                active.remove(stream)
+            else:
+                heads[stream] = line
+
+        if not heads:
+            time.sleep(0.05)
+            continue
+        stream, line = min(heads.items(), key=lambda item: item[1].sort_key())
+        if len(heads) < len(active) and time.monotonic() - line.received < window:
+            time.sleep(0.05)
+            continue
+        del heads[stream]
+        yield line
+
+
+def stream_replica_logs(cmd, resource_group_name, name, revision, get_replica_url, request_params, headers, follow,
+                        output_format):
+    """
+    Print the logs of all the replicas of a revision, each line prefixed with the name of its replica. When following
+    the logs, replicas which start later are streamed as well.
+    """
+    from azure.cli.core.azclierror import ResourceNotFoundError
+    from ._clients import ContainerAppClient
+
+    streams = {}
+
+    def discover_streams():
+        try:
+            replicas = ContainerAppClient.list_replicas(cmd=cmd,
+                                                        resource_group_name=resource_group_name,
+                                                        container_app_name=name,
+                                                        revision_name=revision)
+        except Exception as e:
+            if not streams:
+                raise
+            logger.info(f"Failed to list the replicas of revision {revision}: {e}")
+            return []
+        new_streams = []
+        for replica in replicas:
+            replica_name = replica["name"]
+            if replica_name in streams:
+                continue
+            stream = ReplicaLogStream(replica_name, get_replica_url(replica_name), request_params, headers, follow,
+                                      output_format)
+            streams[replica_name] = stream
+            stream.start()
+            new_streams.append(stream)
+        if streams and new_streams:
+            logger.info(f"Streaming the logs of replicas {', '.join(s.replica for s in new_streams)}")
+        return new_streams
+
+    initial_streams = discover_streams()
+    if not initial_streams:
+        raise ResourceNotFoundError(f"Could not find a replica for revision {revision}")
+    for line in merge_log_streams(initial_streams, discover_streams if follow else None):
+        print(line)
@@ -51,6 +51,7 @@ def load_arguments(self, _):
         c.argument('name', name_type, id_part=None, help="The name of the Containerapp.")
         c.argument('resource_group_name', arg_type=resource_group_name_type, id_part=None)
         c.argument('kind', options_list=["--type", "-t"], help="Type of logs to stream", arg_type=get_enum_type([LOG_TYPE_CONSOLE, LOG_TYPE_SYSTEM]), default=LOG_TYPE_CONSOLE)
+        c.argument('all_replicas', help="Stream the logs of all the replicas of the revision, merged in the order they were written and prefixed with the replica name.", arg_type=get_three_state_flag())
 
     with self.argument_context('containerapp env logs show') as c:
         c.argument('follow', help="Print logs in real time if present.", arg_type=get_three_state_flag())
@@ -454,6 +455,7 @@ def load_arguments(self, _):
         c.argument('environment', options_list=['--environment', '-e'], help='Name or resource id of the Container App environment.')
         c.argument('compose_file_path', options_list=['--compose-file-path', '-f'], help='Path to a Docker Compose file with the configuration to import to Azure Container Apps.')
         c.argument('transport_mapping', options_list=['--transport-mapping', c.deprecate(target='--transport', redirect='--transport-mapping')], action='append', nargs='+', help="Transport options per Container App instance (servicename=transportsetting).")
+        c.argument('max_workers', type=int, help="The maximum number of services deployed concurrently. Services are only deployed once the services they depend on (depends_on) are deployed. Use 1 to deploy the services one at a time.")
 
     with self.argument_context('containerapp env workload-profile') as c:
         c.argument('env_name', options_list=['--name', '-n'], help="The name of the Container App environment")
@@ -4,7 +4,10 @@
 # --------------------------------------------------------------------------------------------
 # pylint: disable=logging-fstring-interpolation
 
+import codecs
+import logging
 import os
+import select
 import sys
 import time
 import threading
@@ -48,6 +51,12 @@ SSH_BACKUP_ENCODING = "latin_1"
 
 SSH_CTRL_C_MSG = b"\x00\x00\x03"
 
+# keystrokes and pasted text read within this many seconds of each other are sent in the same message
+SSH_INPUT_BATCH_SECS = 0.005
+SSH_INPUT_MAX_BATCH_BYTES = 4096
+# output received back to back is written to the terminal at once, up to this many bytes
+SSH_OUTPUT_MAX_BATCH_BYTES = 64 * 1024
+
 
 class WebSocketConnection:
     def __init__(self, cmd, resource_group_name, name, revision, replica, container, startup_command):
@@ -102,12 +111,20 @@ class WebSocketConnection:
     def recv(self, *args, **kwargs):
         return self._socket.recv(*args, **kwargs)
 
+    def has_pending_data(self):
+        sock = self._socket.sock
+        if sock is None:
+            return False
+        # data already decrypted by the SSL layer isn't seen by select
+        if hasattr(sock, "pending") and sock.pending():
+            return True
+        return bool(select.select([sock], [], [], 0)[0])
+
 
-def _decode_and_output_to_terminal(connection: WebSocketConnection, response, encodings):
+def _decode_response(connection: WebSocketConnection, response, encodings):
     for i, encoding in enumerate(encodings):
         try:
-            print(response[2:].decode(encoding), end="", flush=True)
-            break
+            return response[2:].decode(encoding)
         except UnicodeDecodeError as e:
             if i == len(encodings) - 1:  # ran out of encodings to try
                 connection.disconnect()
@@ -118,36 +135,94 @@ def _decode_and_output_to_terminal(connection: WebSocketConnection, response, en
             logger.info("Failed to encode with encoding %s", encoding)
 
 
+class _TerminalOutput:
+    """
+    Decodes the output of the container and writes it to the terminal. The output of messages received back to back
+    is written at once, and characters split between messages are decoded once their last byte arrives.
+    """
+    def __init__(self, connection: WebSocketConnection, encodings, stream=None):
+        self._connection = connection
+        self._encodings = encodings
+        self._stream = stream
+        self._decoder = codecs.getincrementaldecoder(encodings[0])()
+        self._buffer = []
+        self.buffered_bytes = 0
+
+    def write(self, response):
+        try:
+            text = self._decoder.decode(response[2:])
+        except UnicodeDecodeError:
+            self._decoder.reset()
+            text = _decode_response(self._connection, response, self._encodings)
+        self._buffer.append(text)
+        self.buffered_bytes += len(response) - 2
+
+    def flush(self):
+        if self._buffer:
+            print("".join(self._buffer), end="", flush=True, file=self._stream or sys.stdout)
+            self._buffer = []
+            self.buffered_bytes = 0
+
+
 def read_ssh(connection: WebSocketConnection, response_encodings):
     # We just need to do resize once for the whole session
     _resize_terminal(connection)
 
     # response_encodings is the ordered list of Unicode encodings to try to decode with before raising an exception
+    output = _TerminalOutput(connection, response_encodings)
     while connection.is_connected:
         response = connection.recv()
         if not response:
+            output.flush()
             connection.disconnect()
         else:
-            logger.info("Received raw response %s", response.hex())
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Received raw response %s", response.hex())
             proxy_status = response[0]
             if proxy_status == SSH_PROXY_INFO:
+                output.flush()
                 print(f"INFO: {response[1:].decode(SSH_DEFAULT_ENCODING)}")
             elif proxy_status == SSH_PROXY_ERROR:
+                output.flush()
                 print(f"ERROR: {response[1:].decode(SSH_DEFAULT_ENCODING)}")
             elif proxy_status == SSH_PROXY_FORWARD:
                 control_byte = response[1]
                 if control_byte in (SSH_CLUSTER_STDOUT, SSH_CLUSTER_STDERR):
-                    _decode_and_output_to_terminal(connection, response, response_encodings)
+                    output.write(response)
                 else:
+                    output.flush()
                     connection.disconnect()
                     raise CLIInternalError("Unexpected message received")
+            if output.buffered_bytes >= SSH_OUTPUT_MAX_BATCH_BYTES or not connection.has_pending_data():
+                output.flush()
 
 
-def _send_stdin(connection: WebSocketConnection, getch_fn):
+def _send_stdin(connection: WebSocketConnection, getch_fn, stdin_ready_fn=None):
     while connection.is_connected:
-        ch = getch_fn()
+        data = _read_stdin_batch(getch_fn, stdin_ready_fn)
         if connection.is_connected:
-            connection.send(b"".join([SSH_INPUT_PREFIX, ch]))
+            connection.send(b"".join([SSH_INPUT_PREFIX, data]))
+
+
+def _read_stdin_batch(getch_fn, stdin_ready_fn):
+    # Waits for input, then keeps reading as long as more arrives within SSH_INPUT_BATCH_SECS. Typing only waits that
+    # long before each keystroke is sent, while pasted text is sent in a few messages instead of one per character.
+    data = getch_fn()
+    if stdin_ready_fn is None or not data:
+        return data
+    batch = [data]
+    size = len(data)
+    deadline = time.monotonic() + SSH_INPUT_BATCH_SECS
+    while size < SSH_INPUT_MAX_BATCH_BYTES:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not stdin_ready_fn(remaining):
+            break
+        data = getch_fn()
+        if not data:
+            break
+        batch.append(data)
+        size += len(data)
+    return b"".join(batch)
 
 
 def _resize_terminal(connection: WebSocketConnection):
@@ -158,8 +233,13 @@ def _resize_terminal(connection: WebSocketConnection):
                                   f'"Height": {size.lines}}}'.encode(SSH_DEFAULT_ENCODING)]))
 
 
-def _getch_unix():
-    return sys.stdin.read(1).encode(SSH_DEFAULT_ENCODING)
+def _getch_unix(fd=None):
+    # everything typed or pasted so far, rather than a single character
+    return os.read(sys.stdin.fileno() if fd is None else fd, SSH_INPUT_MAX_BATCH_BYTES)
+
+
+def _stdin_ready_unix(timeout, fd=None):
+    return bool(select.select([sys.stdin.fileno() if fd is None else fd], [], [], timeout)[0])
 
 
 def _getch_windows():
@@ -168,6 +248,15 @@ def _getch_windows():
     return msvcrt.getch()
 
 
+def _stdin_ready_windows(timeout):
+    deadline = time.monotonic() + timeout
+    while not msvcrt.kbhit():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
 def ping_container_app(app):
     site = safe_get(app, "properties", "configuration", "ingress", "fqdn")
     if site:
@@ -185,9 +274,9 @@ def get_stdin_writer(connection: WebSocketConnection):
     if not is_platform_windows():
         import tty
         tty.setcbreak(sys.stdin.fileno())  # needed to prevent printing arrow key characters
-        writer = threading.Thread(target=_send_stdin, args=(connection, _getch_unix))
+        writer = threading.Thread(target=_send_stdin, args=(connection, _getch_unix, _stdin_ready_unix))
     else:
         enable_vt_mode()  # needed for interactive commands (ie vim)
-        writer = threading.Thread(target=_send_stdin, args=(connection, _getch_windows))
+        writer = threading.Thread(target=_send_stdin, args=(connection, _getch_windows, _stdin_ready_windows))
 
     return writer
@@ -52,7 +52,8 @@ from ._constants import (MAXIMUM_CONTAINER_APP_NAME_LENGTH, SHORT_POLLING_INTERV
                          ACR_IMAGE_SUFFIX,
                          LOGS_STRING, PENDING_STATUS, SUCCEEDED_STATUS, UPDATING_STATUS, DEV_SERVICE_LIST,
                          MANAGED_ENVIRONMENT_RESOURCE_TYPE, CONTAINER_APP_EXTENSION_TYPE,
-                         CONNECTED_ENV_CHECK_CERTIFICATE_NAME_AVAILABILITY_TYPE)
+                         CONNECTED_ENV_CHECK_CERTIFICATE_NAME_AVAILABILITY_TYPE, PROVIDER_REGISTRATION_CACHE_KEY,
+                         PROVIDER_REGISTRATION_CACHE_TTL_SECS)
 from ._models import (ContainerAppCustomDomainEnvelope as ContainerAppCustomDomainEnvelopeModel,
                       ManagedCertificateEnvelop as ManagedCertificateEnvelopModel)
 from ._models import OryxMarinerRunImgTagProperty
@@ -68,7 +69,7 @@ logger = get_logger(__name__)
 
 
 def register_provider_if_needed(cmd, rp_name):
-    if not _is_resource_provider_registered(cmd, rp_name):
+    if not _is_resource_provider_registered_cached(cmd, rp_name):
         _register_resource_provider(cmd, rp_name)
 
 
@@ -312,10 +313,54 @@ def _is_resource_provider_registered(cmd, resource_provider, subscription_id=Non
     return registered
 
 
-def _validate_subscription_registered(cmd, resource_provider, subscription_id=None):
+def _get_provider_registration_cache():
+    from azure.cli.core._session import SESSION
+    return SESSION.get(PROVIDER_REGISTRATION_CACHE_KEY) or {}
+
+
+def _set_provider_registration_cache(cache):
+    from azure.cli.core._session import SESSION
+    SESSION[PROVIDER_REGISTRATION_CACHE_KEY] = cache
+
+
+def _get_provider_registration_cache_key(subscription_id, resource_provider):
+    return f"{subscription_id}/{resource_provider}".lower()
+
+
+def _is_resource_provider_registered_cached(cmd, resource_provider, subscription_id=None):
+    # Only registered providers are cached, as providers are practically never unregistered once they are registered.
+    # The entries expire after PROVIDER_REGISTRATION_CACHE_TTL_SECS, or as soon as a request fails because the
+    # provider isn't registered, see clear_provider_registration_cache.
     if not subscription_id:
         subscription_id = get_subscription_id(cmd.cli_ctx)
+    key = _get_provider_registration_cache_key(subscription_id, resource_provider)
+    cache = _get_provider_registration_cache()
+    registered_at = cache.get(key)
+    if registered_at and time.time() - registered_at < PROVIDER_REGISTRATION_CACHE_TTL_SECS:
+        logger.debug("Resource provider %s registration of subscription %s found in cache", resource_provider, subscription_id)
+        return True
+
     registered = _is_resource_provider_registered(cmd, resource_provider, subscription_id)
+    if registered:
+        now = time.time()
+        cache = {k: v for k, v in cache.items() if now - v < PROVIDER_REGISTRATION_CACHE_TTL_SECS}
+        cache[key] = now
+        _set_provider_registration_cache(cache)
+    return registered
+
+
+def clear_provider_registration_cache(resource_provider=None):
+    cache = _get_provider_registration_cache()
+    if not cache:
+        return
+    suffix = f"/{resource_provider}".lower() if resource_provider else ""
+    _set_provider_registration_cache({k: v for k, v in cache.items() if not k.endswith(suffix)})
+
+
+def _validate_subscription_registered(cmd, resource_provider, subscription_id=None):
+    if not subscription_id:
+        subscription_id = get_subscription_id(cmd.cli_ctx)
+    registered = _is_resource_provider_registered_cached(cmd, resource_provider, subscription_id)
     if registered is False:
         raise ValidationError(f'Subscription {subscription_id} is not registered for the {resource_provider} '
                               f'resource provider. Please run "az provider register -n {resource_provider} --wait" '
@@ -176,7 +176,7 @@ def _set_ssh_defaults(cmd, namespace):
         namespace.revision = app.get("properties", {}).get("latestRevisionName")
         if not namespace.revision:
             raise ResourceNotFoundError("Could not find a revision")
-    if not namespace.replica:
+    if not namespace.replica and not getattr(namespace, "all_replicas", False):
         # VVV this may not be necessary according to Anthony Chu
         try:
             ping_container_app(app)  # needed to get an alive replica
@@ -228,11 +228,15 @@ def _validate_container_exists(cmd, namespace):
 
 # also used to validate logstream
 def validate_ssh(cmd, namespace):
+    all_replicas = getattr(namespace, "all_replicas", False)
+    if all_replicas and namespace.replica:
+        raise MutuallyExclusiveArgumentError("Usage error: --all-replicas cannot be used with --replica")
     if not hasattr(namespace, "kind") or (namespace.kind and namespace.kind.lower() != LOG_TYPE_SYSTEM):
         _set_ssh_defaults(cmd, namespace)
         _validate_revision_exists(cmd, namespace)
-        _validate_replica_exists(cmd, namespace)
-        _validate_container_exists(cmd, namespace)
+        if not all_replicas:
+            _validate_replica_exists(cmd, namespace)
+            _validate_container_exists(cmd, namespace)
 
 
 def validate_cors_max_age(cmd, namespace):
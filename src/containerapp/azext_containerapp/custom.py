@@ -102,13 +102,15 @@ from ._utils import (_validate_subscription_registered,
                      format_location, connected_env_check_cert_name_availability)
 from ._ssh_utils import (SSH_DEFAULT_ENCODING, WebSocketConnection, read_ssh, get_stdin_writer, SSH_CTRL_C_MSG,
                          SSH_BACKUP_ENCODING)
+from ._log_stream_utils import format_log_line, stream_replica_logs
 from ._constants import (MAXIMUM_SECRET_LENGTH, MICROSOFT_SECRET_SETTING_NAME, FACEBOOK_SECRET_SETTING_NAME, GITHUB_SECRET_SETTING_NAME,
                          GOOGLE_SECRET_SETTING_NAME, TWITTER_SECRET_SETTING_NAME, APPLE_SECRET_SETTING_NAME, CONTAINER_APPS_RP,
                          NAME_INVALID, NAME_ALREADY_EXISTS, ACR_IMAGE_SUFFIX, HELLO_WORLD_IMAGE, LOG_TYPE_SYSTEM, LOG_TYPE_CONSOLE,
                          MANAGED_CERTIFICATE_RT, PRIVATE_CERTIFICATE_RT, PENDING_STATUS, SUCCEEDED_STATUS, DEV_POSTGRES_IMAGE, DEV_POSTGRES_SERVICE_TYPE,
                          DEV_POSTGRES_CONTAINER_NAME, DEV_REDIS_IMAGE, DEV_REDIS_SERVICE_TYPE, DEV_REDIS_CONTAINER_NAME, DEV_KAFKA_CONTAINER_NAME,
                          DEV_KAFKA_IMAGE, DEV_KAFKA_SERVICE_TYPE, DEV_MARIADB_CONTAINER_NAME, DEV_MARIADB_IMAGE, DEV_MARIADB_SERVICE_TYPE, DEV_QDRANT_IMAGE,
-                         DEV_QDRANT_CONTAINER_NAME, DEV_QDRANT_SERVICE_TYPE, DEV_SERVICE_LIST, CONTAINER_APPS_SDK_MODELS, BLOB_STORAGE_TOKEN_STORE_SECRET_SETTING_NAME)
+                         DEV_QDRANT_CONTAINER_NAME, DEV_QDRANT_SERVICE_TYPE, DEV_SERVICE_LIST, CONTAINER_APPS_SDK_MODELS, BLOB_STORAGE_TOKEN_STORE_SECRET_SETTING_NAME,
+                         COMPOSE_DEFAULT_MAX_WORKERS)
 
 logger = get_logger(__name__)
 
@@ -3394,7 +3396,7 @@ def containerapp_ssh(cmd, resource_group_name, name, container=None, revision=No
 
 
 def stream_containerapp_logs(cmd, resource_group_name, name, container=None, revision=None, replica=None, follow=False,
-                             tail=None, output_format=None, kind=None):
+                             tail=None, output_format=None, kind=None, all_replicas=False):
     if tail:
         if tail < 0 or tail > 300:
             raise ValidationError("--tail must be between 0 and 300.")
@@ -3403,6 +3405,8 @@ def stream_containerapp_logs(cmd, resource_group_name, name, container=None, rev
             raise MutuallyExclusiveArgumentError("--type: --container, --replica, and --revision not supported for system logs")
         if output_format and output_format != "json":
             raise MutuallyExclusiveArgumentError("--type: only json logs supported for system logs")
+        if all_replicas:
+            raise MutuallyExclusiveArgumentError("--type: --all-replicas not supported for system logs")
 
     sub = get_subscription_id(cmd.cli_ctx)
     token_response = ContainerAppClient.get_auth_token(cmd, resource_group_name, name)
@@ -3422,6 +3426,15 @@ def stream_containerapp_logs(cmd, resource_group_name, name, container=None, rev
                       "output": output_format,
                       "tailLines": tail}
     headers = {"Authorization": f"Bearer {token}"}
+
+    if all_replicas:
+        def get_replica_url(replica_name):
+            return (f"{base_url}/subscriptions/{sub}/resourceGroups/{resource_group_name}/containerApps/{name}"
+                    f"/revisions/{revision}/replicas/{replica_name}/containers/{container}/logstream")
+        stream_replica_logs(cmd, resource_group_name, name, revision, get_replica_url, request_params, headers, follow,
+                            output_format)
+        return
+
     resp = requests.get(url,
                         timeout=None,
                         stream=True,
@@ -3434,9 +3447,7 @@ def stream_containerapp_logs(cmd, resource_group_name, name, container=None, rev
     for line in resp.iter_lines():
         if line:
             logger.info("received raw log line: %s", line)
-            # these .replaces are needed to display color/quotations properly
-            # for some reason the API returns garbled unicode special characters (may need to add more in the future)
-            print(line.decode("utf-8").replace("\\u0022", "\u0022").replace("\\u001B", "\u001B").replace("\\u002B", "\u002B").replace("\\u0027", "\u0027"))
+            print(format_log_line(line))
 
 
 def stream_environment_logs(cmd, resource_group_name, name, follow=False, tail=None):
@@ -4700,7 +4711,8 @@ def create_containerapps_from_compose(cmd,  # pylint: disable=R0914
                                       registry_pass=None,
                                       transport_mapping=None,
                                       location=None,
-                                      tags=None):
+                                      tags=None,
+                                      max_workers=COMPOSE_DEFAULT_MAX_WORKERS):
     from pycomposefile import ComposeFile
 
     from ._compose_utils import (create_containerapps_compose_environment,
@@ -4716,7 +4728,9 @@ def create_containerapps_from_compose(cmd,  # pylint: disable=R0914
                                  resolve_memory_configuration_from_service,
                                  resolve_replicas_from_service,
                                  resolve_environment_from_service,
-                                 resolve_secret_from_service)
+                                 resolve_secret_from_service,
+                                 resolve_service_dependencies,
+                                 deploy_compose_services)
 
     # Validate managed environment
     parsed_managed_env = parse_resource_id(managed_env)
@@ -4738,36 +4752,61 @@ def create_containerapps_from_compose(cmd,  # pylint: disable=R0914
     compose_yaml = load_yaml_file(compose_file_path)
     parsed_compose_file = ComposeFile(compose_yaml)
     logger.info(parsed_compose_file)
-    containerapps_from_compose = []
-    # Using the key to iterate to get the service name
-    # pylint: disable=C0201,C0206
-    for service_name in parsed_compose_file.ordered_services.keys():
+    service_dependencies = resolve_service_dependencies(parsed_compose_file)
+    # Settings of every service are resolved up front, as resolving them may prompt
+    service_settings = {}
+    for service_name in service_dependencies:
         service = parsed_compose_file.services[service_name]
         if not check_supported_platform(service.platform):
             message = "Unsupported platform found. "
             message += "Azure Container Apps only supports linux/amd64 container images."
             raise InvalidArgumentValueError(message)
-        image = service.image
         warn_about_unsupported_elements(service)
-        logger.info(  # pylint: disable=W1203
-            f"Creating the Container Apps instance for {service_name} under {resource_group_name} in {location}.")
         ingress_type, target_port = resolve_ingress_and_target_port(service)
         registry, registry_username, registry_password = resolve_registry_from_cli_args(registry_server, registry_user, registry_pass)  # pylint: disable=C0301
-        transport_setting = resolve_transport_from_cli_args(service_name, transport_mapping)
         startup_command, startup_args = resolve_service_startup_command(service)
         cpu, memory = validate_memory_and_cpu_setting(
             resolve_cpu_configuration_from_service(service),
             resolve_memory_configuration_from_service(service)
         )
-        replicas = resolve_replicas_from_service(service)
         environment = resolve_environment_from_service(service)
         secret_vars, secret_env_ref = resolve_secret_from_service(service, parsed_compose_file.secrets)
         if environment is not None and secret_env_ref is not None:
             environment.extend(secret_env_ref)
         elif secret_env_ref is not None:
             environment = secret_env_ref
+        service_settings[service_name] = dict(
+            service=service,
+            image=service.image,
+            ingress_type=ingress_type,
+            target_port=target_port,
+            registry=registry,
+            registry_username=registry_username,
+            registry_password=registry_password,
+            transport_setting=resolve_transport_from_cli_args(service_name, transport_mapping),
+            startup_command=startup_command,
+            startup_args=startup_args,
+            cpu=cpu,
+            memory=memory,
+            replicas=resolve_replicas_from_service(service),
+            environment=environment,
+            secret_vars=secret_vars)
+
+    # Build logs of concurrent ACR builds would be interleaved, they are only streamed when deploying one at a time
+    quiet_build = max_workers > 1 and len(service_dependencies) > 1
+    registry_lock = threading.Lock()
+
+    def deploy_service(service_name):
+        settings = service_settings[service_name]
+        service = settings["service"]
+        image = settings["image"]
+        registry = settings["registry"]
+        registry_username = settings["registry_username"]
+        registry_password = settings["registry_password"]
+        logger.info(  # pylint: disable=W1203
+            f"Creating the Container Apps instance for {service_name} under {resource_group_name} in {location}.")
         if service.build is not None:
-            logger.warning("Build configuration defined for this service.")
+            logger.warning(f"Build configuration defined for service '{service_name}'.")  # pylint: disable=W1203
             logger.warning("The build will be performed by Azure Container Registry.")
             context = service.build.context
             dockerfile = "Dockerfile"
@@ -4782,35 +4821,37 @@ def create_containerapps_from_compose(cmd,  # pylint: disable=R0914
                 managed_env,
                 location,
                 image,
-                target_port,
-                ingress_type,
+                settings["target_port"],
+                settings["ingress_type"],
                 registry,
                 registry_username,
                 registry_password,
-                environment)
-        containerapps_from_compose.append(
-            create_containerapp(cmd,
-                                service_name,
-                                resource_group_name,
-                                image=image,
-                                container_name=service.container_name,
-                                managed_env=managed_environment["id"],
-                                ingress=ingress_type,
-                                target_port=target_port,
-                                registry_server=registry,
-                                registry_user=registry_username,
-                                registry_pass=registry_password,
-                                transport=transport_setting,
-                                startup_command=startup_command,
-                                args=startup_args,
-                                cpu=cpu,
-                                memory=memory,
-                                env_vars=environment,
-                                secrets=secret_vars,
-                                min_replicas=replicas,
-                                max_replicas=replicas, )
-        )
-    return containerapps_from_compose
+                settings["environment"],
+                quiet=quiet_build,
+                registry_lock=registry_lock)
+        return create_containerapp(cmd,
+                                   service_name,
+                                   resource_group_name,
+                                   image=image,
+                                   container_name=service.container_name,
+                                   managed_env=managed_environment["id"],
+                                   ingress=settings["ingress_type"],
+                                   target_port=settings["target_port"],
+                                   registry_server=registry,
+                                   registry_user=registry_username,
+                                   registry_pass=registry_password,
+                                   transport=settings["transport_setting"],
+                                   startup_command=settings["startup_command"],
+                                   args=settings["startup_args"],
+                                   cpu=settings["cpu"],
+                                   memory=settings["memory"],
+                                   env_vars=settings["environment"],
+                                   secrets=settings["secret_vars"],
+                                   min_replicas=settings["replicas"],
+                                   max_replicas=settings["replicas"], )
+
+    # Services are deployed once the services they depend on are deployed, independent ones concurrently
+    return deploy_compose_services(service_dependencies, deploy_service, max_workers)
 
 
 def list_supported_workload_profiles(cmd, location):
@@ -0,0 +1,141 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import itertools
+import threading
+import time
+import unittest
+from unittest import mock
+
+import yaml
+from azure.cli.core.azclierror import InvalidArgumentValueError
+from pycomposefile import ComposeFile
+
+from ..._compose_utils import deploy_compose_services, resolve_service_dependencies
+
+# simulated duration of creating a single container app
+DEPLOY_SECONDS = 0.2
+
+COMPOSE_FILE = """
+services:
+  frontend:
+    image: frontend
+    depends_on:
+      api:
+        condition: service_started
+  api:
+    image: api
+    depends_on: [db, cache]
+  db:
+    image: db
+  cache:
+    image: cache
+  worker:
+    image: worker
+    depends_on: [db]
+  metrics:
+    image: metrics
+"""
+
+
+class FakeDeployment(object):
+    """ Records the order services are started and finished in, deploying a service takes DEPLOY_SECONDS """
+
+    def __init__(self, failures=()):
+        self.failures = set(failures)
+        self.started = {}
+        self.finished = {}
+        self.running = 0
+        self.max_running = 0
+        self.events = itertools.count()
+        self.lock = threading.Lock()
+
+    def __call__(self, service_name):
+        with self.lock:
+            self.started[service_name] = next(self.events)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(DEPLOY_SECONDS)
+        with self.lock:
+            self.running -= 1
+            self.finished[service_name] = next(self.events)
+        if service_name in self.failures:
+            raise RuntimeError("Failed to create " + service_name)
+        return {"name": service_name}
+
+
+class ContainerappComposeSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.dependencies = resolve_service_dependencies(ComposeFile(yaml.safe_load(COMPOSE_FILE)))
+        self.logger = mock.patch('azext_containerapp._compose_utils.logger').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _deploy(self, deployment, max_workers):
+        return deploy_compose_services(self.dependencies, deployment, max_workers)
+
+    def test_resolve_service_dependencies(self):
+        self.assertEqual(['db', 'cache', 'api', 'frontend', 'worker', 'metrics'], list(self.dependencies))
+        self.assertEqual(['db', 'cache'], self.dependencies['api'])
+        self.assertEqual(['api'], self.dependencies['frontend'])
+        self.assertEqual([], self.dependencies['metrics'])
+
+    def test_undefined_dependency(self):
+        compose_file = ComposeFile(yaml.safe_load("services:\n  web:\n    image: web\n    depends_on: [db]\n"))
+        with self.assertRaises(InvalidArgumentValueError):
+            resolve_service_dependencies(compose_file)
+
+    def test_services_are_deployed_after_their_dependencies(self):
+        deployment = FakeDeployment()
+        result = self._deploy(deployment, 4)
+
+        self.assertEqual([{"name": name} for name in self.dependencies], result)
+        for name, depends_on in self.dependencies.items():
+            for dependency in depends_on:
+                self.assertLessEqual(deployment.finished[dependency], deployment.started[name])
+        self.assertLessEqual(deployment.max_running, 4)
+
+    def test_max_workers_one_deploys_in_order(self):
+        deployment = FakeDeployment()
+        result = self._deploy(deployment, 1)
+
+        self.assertEqual([{"name": name} for name in self.dependencies], result)
+        self.assertEqual(list(self.dependencies), sorted(deployment.started, key=deployment.started.get))
+        self.assertEqual(1, deployment.max_running)
+
+    def test_failure_stops_starting_services(self):
+        deployment = FakeDeployment(failures=['db'])
+        with self.assertRaisesRegex(RuntimeError, 'Failed to create db'):
+            self._deploy(deployment, 3)
+
+        # db, cache and metrics were running when db failed, no other service is started afterwards
+        self.assertEqual({'db', 'cache', 'metrics'}, set(deployment.started))
+        self.logger.error.assert_called_with(
+            "Deployed services: %s. Failed services: %s. Services not deployed: %s.",
+            'cache, metrics', 'db', 'api, frontend, worker')
+
+    def test_failure_with_one_worker(self):
+        deployment = FakeDeployment(failures=['cache'])
+        with self.assertRaises(RuntimeError):
+            self._deploy(deployment, 1)
+        self.assertEqual(['db', 'cache'], list(deployment.started))
+
+    def test_circular_dependencies(self):
+        dependencies = {'a': ['c'], 'b': ['a'], 'c': ['b'], 'd': []}
+        deployment = FakeDeployment()
+        with self.assertRaisesRegex(InvalidArgumentValueError, 'a, b, c'):
+            deploy_compose_services(dependencies, deployment, 4)
+        self.assertEqual(['d'], list(deployment.started))
+
+    def test_independent_services_are_deployed_concurrently(self):
+        deployment = FakeDeployment()
+        self._deploy(deployment, 4)
+        # db, cache and metrics don't depend on any service
+        self.assertEqual(3, deployment.max_running)
+        self.assertLess(max(deployment.started[name] for name in ['db', 'cache', 'metrics']),
+                        min(deployment.finished.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import base64
+import functools
+import hashlib
+import io
+import os
+import re
+import socket
+import struct
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+import websocket
+
+from ..._ssh_utils import (SSH_INPUT_PREFIX, WebSocketConnection, _TerminalOutput, _getch_unix, _send_stdin,
+                           _stdin_ready_unix, read_ssh)
+
+# a script pasted into the terminal
+SCRIPT = "".join("echo 'line {} of the pasted script'\n".format(i) for i in range(150)).encode()[:5 * 1024]
+
+# exec sessions read stdin from a pipe with select(), which only accepts sockets on Windows
+WINDOWS_SKIP_REASON = "needs select() on a pipe"
+
+
+class EchoServer(threading.Thread):
+    """ A websocket server which sends every input message of an exec session back as output """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(1)
+        self.port = self.sock.getsockname()[1]
+        self.frames_received = 0
+        self.frames_sent = 0
+
+    def run(self):
+        conn, _ = self.sock.accept()
+        request = b""
+        while b"\r\n\r\n" not in request:
+            request += conn.recv(4096)
+        key = re.search(rb"Sec-WebSocket-Key: (\S+)", request, re.IGNORECASE).group(1)
+        accept = base64.b64encode(hashlib.sha1(key + b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11").digest())
+        conn.sendall(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                     b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        stream = conn.makefile("rb")
+        try:
+            while True:
+                header = stream.read(2)
+                if len(header) < 2:
+                    break
+                opcode, length = header[0] & 0x0F, header[1] & 0x7F
+                if length == 126:
+                    length = struct.unpack(">H", stream.read(2))[0]
+                elif length == 127:
+                    length = struct.unpack(">Q", stream.read(8))[0]
+                mask = stream.read(4) if header[1] & 0x80 else b"\x00" * 4
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(stream.read(length)))
+                if opcode == 0x8:
+                    break
+                self.frames_received += 1
+                if payload.startswith(SSH_INPUT_PREFIX):
+                    conn.sendall(self._frame(b"\x00\x01" + payload[len(SSH_INPUT_PREFIX):]))
+                    self.frames_sent += 1
+        except OSError:
+            pass
+        finally:
+            conn.close()
+            self.sock.close()
+
+    @staticmethod
+    def _frame(payload):
+        if len(payload) < 126:
+            header = struct.pack(">BB", 0x82, len(payload))
+        elif len(payload) < 65536:
+            header = struct.pack(">BBH", 0x82, 126, len(payload))
+        else:
+            header = struct.pack(">BBQ", 0x82, 127, len(payload))
+        return header + payload
+
+
+class CountingOutput(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+class ExecSession(object):
+    """ An exec session with the echo server, stdin is a pipe """
+
+    def __init__(self, batch_input=True):
+        self.server = EchoServer()
+        self.server.start()
+        self.connection = WebSocketConnection.__new__(WebSocketConnection)
+        self.connection._socket = websocket.WebSocket(enable_multithread=True)
+        self.connection._socket.connect("ws://127.0.0.1:{}/".format(self.server.port))
+        self.connection.is_connected = True
+        self.connection._windows_conout_mode = None
+        self.connection._windows_conin_mode = None
+        self.stdin, self.stdin_writer = os.pipe()
+        self.output = CountingOutput()
+
+        if batch_input:
+            getch_fn = functools.partial(_getch_unix, fd=self.stdin)
+            stdin_ready_fn = functools.partial(_stdin_ready_unix, fd=self.stdin)
+        else:
+            # one message per character, as the input was sent before it was batched
+            getch_fn = functools.partial(os.read, self.stdin, 1)
+            stdin_ready_fn = None
+        self._stdout = mock.patch('sys.stdout', self.output)
+        self._stdout.start()
+        threading.Thread(target=self._ignore_disconnect, args=(_send_stdin, self.connection, getch_fn, stdin_ready_fn),
+                         daemon=True).start()
+        threading.Thread(target=self._ignore_disconnect, args=(read_ssh, self.connection, ["utf-8", "latin_1"]),
+                         daemon=True).start()
+
+    @staticmethod
+    def _ignore_disconnect(target, *args):
+        with mock.patch('azext_containerapp._ssh_utils._resize_terminal'):
+            try:
+                target(*args)
+            except (websocket.WebSocketException, OSError, ValueError):
+                pass
+
+    def type(self, data):
+        os.write(self.stdin_writer, data)
+
+    def wait_for_output(self, length, timeout=30):
+        deadline = time.monotonic() + timeout
+        while len(self.output.getvalue()) < length and time.monotonic() < deadline:
+            time.sleep(0.001)
+        return self.output.getvalue()
+
+    def close(self):
+        self._stdout.stop()
+        self.connection.is_connected = False
+        self.connection._socket.close()
+        os.close(self.stdin_writer)
+        os.close(self.stdin)
+
+
+class ContainerappExecBatchingTests(unittest.TestCase):
+    def _paste(self, session):
+        session.type(SCRIPT)
+        output = session.wait_for_output(len(SCRIPT))
+        session.close()
+        self.assertEqual(SCRIPT.decode(), output)
+
+    @unittest.skipIf(sys.platform == "win32", WINDOWS_SKIP_REASON)
+    def test_paste_is_batched(self):
+        per_character = ExecSession(batch_input=False)
+        self._paste(per_character)
+
+        batched = ExecSession()
+        self._paste(batched)
+
+        self.assertEqual(len(SCRIPT), per_character.server.frames_received)
+        self.assertLessEqual(batched.server.frames_received, 4)
+        # the output is buffered, the terminal is flushed far less often than once per message sent back
+        self.assertLess(per_character.output.flushes, per_character.server.frames_sent / 10)
+
+    @unittest.skipIf(sys.platform == "win32", WINDOWS_SKIP_REASON)
+    def test_keystrokes_are_sent_one_by_one(self):
+        session = ExecSession()
+        try:
+            for i, key in enumerate(b"ls\n"):
+                session.type(bytes([key]))
+                session.wait_for_output(i + 1)
+                self.assertEqual(i + 1, session.server.frames_received)
+            self.assertEqual("ls\n", session.output.getvalue())
+        finally:
+            session.close()
+
+    def test_characters_split_between_messages(self):
+        stream = io.StringIO()
+        output = _TerminalOutput(mock.Mock(), ["utf-8", "latin_1"], stream=stream)
+        data = "héllo ☃".encode()
+        for i in range(len(data)):
+            output.write(b"\x00\x01" + data[i:i + 1])
+        output.write(b"\x00\x02 \xff")  # not utf-8
+        output.flush()
+        self.assertEqual("héllo ☃ ÿ", stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import queue
+import threading
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+from ..._log_stream_utils import (ReplicaLogStream, merge_log_streams, parse_log_timestamp, stream_replica_logs)
+
+URL = "https://eastus.azurecontainerapps.dev/replicas/{}/logstream"
+
+
+def _json_line(second, message):
+    line = json.dumps({"TimeStamp": "2023-09-20T03:05:{:02d}.48275".format(second), "Log": message})
+    # the service escapes quotes as \u0022
+    return line.replace('\\"', "\\u0022").encode()
+
+
+class FakeResponse(object):
+    def __init__(self, lines, status_code=200, drop=False, delay=0):
+        self.lines = lines
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.drop = drop
+        self.delay = delay
+        self.read = 0
+
+    def iter_lines(self):
+        for line in self.lines:
+            time.sleep(self.delay)
+            self.read += 1
+            yield line
+        if self.drop:
+            raise requests.exceptions.ChunkedEncodingError("Connection broken")
+
+
+class FakeLogStreamService(object):
+    """ Answers every request for the logs of a replica with the next of its responses """
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def get(self, url, timeout=None, stream=False, params=None, headers=None):
+        replica = url.split("/")[-2]
+        with self.lock:
+            self.requests.append((replica, dict(params)))
+            responses = self.responses[replica]
+            return responses.pop(0) if responses else FakeResponse([], status_code=404)
+
+
+class ContainerappLogStreamTests(unittest.TestCase):
+    def setUp(self):
+        mock.patch('azext_containerapp._log_stream_utils.LOG_STREAM_RECONNECT_DELAY_SECS', 0).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _stream_all(self, responses, follow=False, output_format="json"):
+        service = FakeLogStreamService(responses)
+        replicas = [{"name": name} for name in responses]
+        printed = []
+        with mock.patch('azext_containerapp._log_stream_utils.requests.get', side_effect=service.get), \
+                mock.patch('azext_containerapp._clients.ContainerAppClient.list_replicas', return_value=replicas), \
+                mock.patch('builtins.print', side_effect=lambda line: printed.append(str(line))):
+            stream_replica_logs(mock.Mock(), "rg", "app", "app--rev1", URL.format,
+                                {"follow": str(follow).lower(), "output": output_format, "tailLines": 20},
+                                {"Authorization": "Bearer token"}, follow, output_format)
+        return printed, service
+
+    def test_parse_log_timestamp(self):
+        self.assertEqual(parse_log_timestamp('{"TimeStamp":"2023-09-20T03:04:42.8020739+00:00"}', "json"),
+                         parse_log_timestamp('{"TimeStamp":"2023-09-20T03:04:42.802073"}', "json"))
+        self.assertIsNotNone(parse_log_timestamp('{"TimeStamp":"2023-09-20 03:29:49 +0000 UTC"}', "json"))
+        self.assertIsNotNone(parse_log_timestamp('2023-09-20T03:04:42.8020739+00:00 Listening on :80', "text"))
+        self.assertIsNone(parse_log_timestamp('Listening on :80', "text"))
+        self.assertIsNone(parse_log_timestamp('{"Log": "no time"}', "json"))
+
+    def test_replicas_are_merged_in_time_order(self):
+        printed, _ = self._stream_all({
+            "replica-a": [FakeResponse([_json_line(1, "a1"), _json_line(4, "a4"), _json_line(5, "a5")])],
+            "replica-b": [FakeResponse([_json_line(2, "b2"), _json_line(3, 'b3 "quoted"'),
+                                        _json_line(6, "b6")], delay=0.01)],
+            "replica-c": [FakeResponse([])],
+        })
+        self.assertEqual(["a1", "b2", 'b3 "quoted"', "a4", "a5", "b6"],
+                         [line.split('"Log": "', 1)[1][:-2] for line in printed])
+        self.assertEqual(["[replica-a]", "[replica-b]", "[replica-b]", "[replica-a]", "[replica-a]", "[replica-b]"],
+                         [line.split(" ", 1)[0] for line in printed])
+
+    def test_follow_reconnects_when_stream_drops(self):
+        printed, service = self._stream_all({
+            "replica-a": [FakeResponse([_json_line(1, "a1")], drop=True),
+                          FakeResponse([_json_line(2, "a2")], status_code=503),
+                          FakeResponse([_json_line(3, "a3")])],
+        }, follow=True)
+        # until the replica is gone
+        self.assertEqual(4, len(service.requests))
+        self.assertEqual(20, service.requests[0][1]["tailLines"])
+        # lines printed before the connection dropped aren't fetched again
+        self.assertEqual(0, service.requests[1][1]["tailLines"])
+        self.assertEqual(2, len(printed))
+
+    def test_stream_buffer_is_bounded(self):
+        response = FakeResponse([_json_line(i % 60, "line") for i in range(100)])
+        service = FakeLogStreamService({"replica-a": [response]})
+        with mock.patch('azext_containerapp._log_stream_utils.LOG_STREAM_BUFFER_LINES', 10), \
+                mock.patch('azext_containerapp._log_stream_utils.requests.get', side_effect=service.get):
+            stream = ReplicaLogStream("replica-a", URL.format("replica-a"), {}, {}, False, "json")
+            stream.start()
+            time.sleep(0.2)
+            # the stream isn't read any further until the merged output catches up
+            self.assertLessEqual(response.read, 11)
+            self.assertEqual(100, len(list(merge_log_streams([stream]))))
+
+    def test_quiet_replica_does_not_hold_back_others(self):
+        quiet = mock.Mock(replica="quiet")
+        quiet.lines.get_nowait.side_effect = queue.Empty
+        busy = ReplicaLogStream("busy", URL.format("busy"), {}, {}, False, "json")
+        busy._put(_json_line(1, "b1"))
+        start = time.monotonic()
+        merged = merge_log_streams([quiet, busy], window=0.2)
+        self.assertEqual("[busy] " + _json_line(1, "b1").decode(), str(next(merged)))
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
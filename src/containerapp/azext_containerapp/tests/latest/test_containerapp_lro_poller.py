@@ -0,0 +1,153 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import unittest
+from unittest import mock
+
+from azure.core.exceptions import HttpResponseError
+
+from ..._clients import (AsyncOperationStatus, OperationResult, ProvisioningStateOperation, POLLING_MAX_SECONDS,
+                         POLLING_TIMEOUT, poll, poll_results, poll_status, wait_for_operations)
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeOperation(object):
+    """ An operation which finishes after running_seconds, polled at request_url """
+
+    def __init__(self, clock, running_seconds, kind, retry_after=None, final_status="Succeeded"):
+        self.clock = clock
+        self.finish_time = clock.now + running_seconds
+        self.kind = kind
+        self.retry_after = retry_after
+        self.final_status = final_status
+        self.requests = []
+
+    def get(self):
+        self.requests.append(self.clock.now)
+        finished = self.clock.now >= self.finish_time
+        headers = {"retry-after": str(self.retry_after)} if self.retry_after else {}
+        if self.kind == "status":
+            body = {"status": self.final_status if finished else "InProgress"}
+            return _response(200, body, headers)
+        if self.kind == "results":
+            return _response(200 if finished else 202, {"name": "app"} if finished else None, headers)
+        state = self.final_status if finished else "InProgress"
+        return _response(200, {"name": "app", "properties": {"provisioningState": state}}, headers)
+
+
+def _response(status_code, body, headers=None):
+    response = mock.Mock(status_code=status_code, headers=headers or {})
+    response.text = json.dumps(body) if body is not None else ""
+    response.json.side_effect = lambda: json.loads(response.text)
+    return response
+
+
+class ContainerappLROPollerTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.operations = {}
+        mock.patch('azext_containerapp._clients.time', self.clock).start()
+        mock.patch('azext_containerapp._clients.random.uniform', return_value=1).start()
+        mock.patch('azext_containerapp._clients.PollingAnimation').start()
+        mock.patch('azext_containerapp._clients.send_raw_request',
+                   side_effect=lambda cli_ctx, method, url: self.operations[url].get()).start()
+        self.addCleanup(mock.patch.stopall)
+        self.cmd = mock.Mock()
+
+    def test_backoff_up_to_ceiling(self):
+        self.operations["app"] = FakeOperation(self.clock, 120, "provisioning")
+        result = poll(self.cmd, "app", "inprogress")
+
+        self.assertEqual("Succeeded", result["properties"]["provisioningState"])
+        self.assertEqual([2, 3, 4.5, 6.75, 10.125, 15, 15], self.clock.sleeps[:7])
+        self.assertTrue(all(sleep <= POLLING_MAX_SECONDS for sleep in self.clock.sleeps))
+        # a fixed 2 seconds between requests would have taken 60 requests
+        self.assertLess(len(self.operations["app"].requests), 15)
+
+    def test_retry_after_is_honoured(self):
+        self.operations["status"] = FakeOperation(self.clock, 60, "status", retry_after=20)
+        poll_status(self.cmd, "status")
+        self.assertEqual([20, 20, 20], self.clock.sleeps)
+
+    def test_failed_status_raises(self):
+        self.operations["status"] = FakeOperation(self.clock, 5, "status", final_status="Failed")
+        with self.assertRaises(HttpResponseError):
+            poll_status(self.cmd, "status")
+
+    def test_results(self):
+        self.operations["results"] = FakeOperation(self.clock, 10, "results")
+        self.assertEqual({"name": "app"}, poll_results(self.cmd, "results"))
+
+    def test_timeout_returns_last_response(self):
+        self.operations["app"] = FakeOperation(self.clock, POLLING_TIMEOUT * 2, "provisioning")
+        result = poll(self.cmd, "app", "inprogress")
+        self.assertEqual("InProgress", result["properties"]["provisioningState"])
+        self.assertLess(self.clock.now - 1000, POLLING_TIMEOUT + POLLING_MAX_SECONDS)
+
+    def test_delete_not_found_is_ignored(self):
+        self.operations["app"] = mock.Mock(get=mock.Mock(side_effect=Exception("(ResourceNotFound) not found")))
+        self.assertIsNone(poll(self.cmd, "app", "cancelled"))
+        with self.assertRaises(Exception):
+            poll(self.cmd, "app", "inprogress")
+
+    def test_wait_for_many_operations(self):
+        for i in range(10):
+            self.operations["job{}".format(i)] = FakeOperation(self.clock, 30 + 10 * i, "results")
+        self.operations["revision"] = FakeOperation(self.clock, 40, "status", retry_after=5)
+        operations = [OperationResult("job{}".format(i)) for i in range(10)] + [AsyncOperationStatus("revision")]
+
+        results = wait_for_operations(self.cmd, operations)
+
+        self.assertEqual([{"name": "app"}] * 10 + [None], results)
+        # all of them were polled side by side, which takes as long as the longest one instead of their sum
+        self.assertLess(self.clock.now - 1000, 120 + POLLING_MAX_SECONDS)
+        for i, operation in enumerate(operations[:10]):
+            self.assertGreaterEqual(operation.elapsed, 30 + 10 * i)
+            self.assertLess(operation.elapsed, 30 + 10 * i + POLLING_MAX_SECONDS)
+            self.assertEqual(len(self.operations["job{}".format(i)].requests), operation.polls)
+        self.assertEqual(9, operations[10].polls)
+
+    def test_each_operation_follows_its_own_retry_after(self):
+        retry_afters = [3, 7, 11]
+        for retry_after in retry_afters:
+            self.operations["revision{}".format(retry_after)] = FakeOperation(self.clock, 30, "status",
+                                                                              retry_after=retry_after)
+        operations = [AsyncOperationStatus("revision{}".format(retry_after)) for retry_after in retry_afters]
+
+        wait_for_operations(self.cmd, operations)
+
+        for retry_after, operation in zip(retry_afters, operations):
+            requests = self.operations["revision{}".format(retry_after)].requests
+            self.assertEqual([1000 + retry_after * i for i in range(len(requests))], requests)
+            # polled until the first request after the operation finished at 30 seconds
+            self.assertEqual(-(-30 // retry_after) + 1, operation.polls)
+        # polled side by side, until the last poll of the operation polled every 7 seconds
+        self.assertEqual(1000 + 35, self.clock.now)
+
+    def test_first_error_raised_after_all_finished(self):
+        self.operations["a"] = FakeOperation(self.clock, 10, "status", final_status="Failed")
+        self.operations["b"] = FakeOperation(self.clock, 60, "provisioning")
+        operations = [AsyncOperationStatus("a"), ProvisioningStateOperation("b", "inprogress")]
+        with self.assertRaises(HttpResponseError):
+            wait_for_operations(self.cmd, operations)
+        self.assertTrue(operations[1].done)
+        self.assertGreaterEqual(operations[1].elapsed, 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
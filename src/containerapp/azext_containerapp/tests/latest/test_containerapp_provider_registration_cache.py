@@ -0,0 +1,78 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import time
+import unittest
+from unittest import mock
+
+from azure.cli.core._session import SESSION
+from azure.cli.core.azclierror import CLIInternalError, ValidationError
+
+from ..._client_factory import handle_raw_exception
+from ..._constants import CONTAINER_APPS_RP, LOG_ANALYTICS_RP, PROVIDER_REGISTRATION_CACHE_TTL_SECS
+from ..._utils import _validate_subscription_registered, register_provider_if_needed
+
+NOT_REGISTERED_ERROR = ('(MissingSubscriptionRegistration) {"error": {"code": "MissingSubscriptionRegistration", '
+                        '"message": "The subscription is not registered to use namespace \'Microsoft.App\'."}}')
+
+
+class ContainerappProviderRegistrationCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.registration_state = {CONTAINER_APPS_RP: "Registered", LOG_ANALYTICS_RP: "Registered"}
+        self.providers_client = mock.Mock()
+        self.providers_client.get.side_effect = lambda rp: mock.Mock(registration_state=self.registration_state[rp])
+        mock.patch('azext_containerapp._utils.providers_client_factory', return_value=self.providers_client).start()
+        mock.patch('azext_containerapp._utils.get_subscription_id', return_value='sub1').start()
+        mock.patch.object(SESSION, 'data', {}).start()
+        mock.patch.object(SESSION, 'filename', None).start()
+        self.addCleanup(mock.patch.stopall)
+        self.cmd = mock.Mock()
+
+    def test_registration_is_cached(self):
+        for _ in range(3):
+            _validate_subscription_registered(self.cmd, CONTAINER_APPS_RP)
+            register_provider_if_needed(self.cmd, CONTAINER_APPS_RP)
+        self.assertEqual(1, self.providers_client.get.call_count)
+
+        # each subscription and provider is cached separately
+        _validate_subscription_registered(self.cmd, CONTAINER_APPS_RP, subscription_id='sub2')
+        _validate_subscription_registered(self.cmd, LOG_ANALYTICS_RP)
+        self.assertEqual(3, self.providers_client.get.call_count)
+
+    def test_not_registered_is_not_cached(self):
+        self.registration_state[CONTAINER_APPS_RP] = "NotRegistered"
+        for _ in range(2):
+            with self.assertRaises(ValidationError):
+                _validate_subscription_registered(self.cmd, CONTAINER_APPS_RP)
+        self.assertEqual(2, self.providers_client.get.call_count)
+
+        self.registration_state[CONTAINER_APPS_RP] = "Registered"
+        _validate_subscription_registered(self.cmd, CONTAINER_APPS_RP)
+        _validate_subscription_registered(self.cmd, CONTAINER_APPS_RP)
+        self.assertEqual(3, self.providers_client.get.call_count)
+
+    def test_cache_expires(self):
+        _validate_subscription_registered(self.cmd, CONTAINER_APPS_RP)
+        with mock.patch('azext_containerapp._utils.time.time',
+                        return_value=time.time() + PROVIDER_REGISTRATION_CACHE_TTL_SECS + 1):
+            _validate_subscription_registered(self.cmd, CONTAINER_APPS_RP)
+        self.assertEqual(2, self.providers_client.get.call_count)
+
+    def test_not_registered_error_clears_cache(self):
+        _validate_subscription_registered(self.cmd, CONTAINER_APPS_RP)
+        _validate_subscription_registered(self.cmd, LOG_ANALYTICS_RP)
+
+        self.registration_state[CONTAINER_APPS_RP] = "NotRegistered"
+        with self.assertRaises(CLIInternalError):
+            handle_raw_exception(Exception(NOT_REGISTERED_ERROR))
+        with self.assertRaises(ValidationError):
+            _validate_subscription_registered(self.cmd, CONTAINER_APPS_RP)
+        # other providers stay cached
+        _validate_subscription_registered(self.cmd, LOG_ANALYTICS_RP)
+        self.assertEqual(3, self.providers_client.get.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Wall clock time of pasting a script into an exec session with a local echo server, with one message per
+character and with the input batched, and the round trip of single keystrokes. Not part of the unit tests, needs
+a Unix terminal, run it from src/containerapp with the extension installed in development mode:
+
+    python benchmarks/benchmark_exec_batching.py
+"""
+
+import time
+
+from azext_containerapp.tests.latest.test_containerapp_exec_batching import SCRIPT, ExecSession
+
+
+def _time_paste(session):
+    start = time.perf_counter()
+    session.type(SCRIPT)
+    session.wait_for_output(len(SCRIPT))
+    elapsed = time.perf_counter() - start
+    session.close()
+    return elapsed
+
+
+def main():
+    per_character = ExecSession(batch_input=False)
+    per_character_time = _time_paste(per_character)
+    batched = ExecSession()
+    batched_time = _time_paste(batched)
+    print("pasting {} bytes: {} messages in {:.3f}s per character, {} messages in {:.3f}s batched".format(
+        len(SCRIPT), per_character.server.frames_received, per_character_time, batched.server.frames_received,
+        batched_time))
+    print("{} messages received back written to the terminal {} times".format(
+        per_character.server.frames_sent, per_character.output.flushes))
+
+    # the session writes its output to sys.stdout, print once it's closed
+    latencies = []
+    session = ExecSession()
+    try:
+        for i, key in enumerate(b"ls\n"):
+            start = time.perf_counter()
+            session.type(bytes([key]))
+            session.wait_for_output(i + 1)
+            latencies.append((chr(key), time.perf_counter() - start))
+    finally:
+        session.close()
+    for key, latency in latencies:
+        print("keystroke {!r} echoed in {:.1f}ms".format(key, latency * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,10 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import hashlib
 import json
 import os
+import tempfile
 import yaml  # pylint: disable=import-error
 
 from azure.cli.core import MainCommandsLoader
@@ -16,6 +18,10 @@ from knack.log import get_logger
 
 logger = get_logger(__name__)
 
+# bump this whenever the layout of the dumped command table changes
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_SUFFIX = '.snapshot'
+
 
 class AzInteractiveCommandsLoader(MainCommandsLoader):  # pylint: disable=too-few-public-methods
 
@@ -82,6 +88,8 @@ class FreshTable(object):
 
         start_time = timeit.default_timer()
         shell_ctx = shell_ctx or self.shell_ctx
+        # taken before loading so extensions changed during the load mark the snapshot as stale
+        fingerprint = get_command_table_fingerprint()
         main_loader = AzInteractiveCommandsLoader(shell_ctx.cli_ctx)
 
         main_loader.load_command_table(None)
@@ -124,10 +132,12 @@ class FreshTable(object):
         logger.debug('Command table dumped: %s sec', elapsed)
         FreshTable.loader = main_loader
 
-        # dump into the cache file
-        command_file = shell_ctx.config.get_help_files()
-        with open(os.path.join(get_cache_dir(shell_ctx), command_file), 'w') as help_file:
+        # dump into the cache file. write to a temp file first so the shell never reads a half written table
+        command_file_path = get_command_table_path(shell_ctx)
+        with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(command_file_path), delete=False) as help_file:
             json.dump(cmd_table_data, help_file, default=lambda x: x.target or '', skipkeys=True)
+        os.replace(help_file.name, command_file_path)
+        write_command_table_snapshot(shell_ctx, fingerprint)
 
 
 def load_help_files(data):
@@ -179,3 +189,43 @@ def get_cache_dir(shell_ctx):
     if not os.path.exists(cache_path):
         os.makedirs(cache_path)
     return cache_path
+
+
+def get_command_table_path(shell_ctx):
+    """ gets the location of the cached command table """
+    return os.path.join(get_cache_dir(shell_ctx), shell_ctx.config.get_help_files())
+
+
+def get_command_table_fingerprint():
+    """ identifies everything the cached command table depends on: the CLI core and the installed extensions """
+    from azure.cli.core import __version__ as core_version
+    from azure.cli.core.extension import get_extensions
+    from . import VERSION
+
+    extensions = sorted('{}=={}'.format(ext.name, ext.version) for ext in get_extensions())
+    content = json.dumps({
+        'format': SNAPSHOT_FORMAT_VERSION,
+        'core': core_version,
+        'interactive': VERSION,
+        'extensions': extensions
+    }, sort_keys=True)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def write_command_table_snapshot(shell_ctx, fingerprint):
+    """ records which CLI core and extensions the cached command table was generated from """
+    with open(get_command_table_path(shell_ctx) + SNAPSHOT_SUFFIX, 'w') as snapshot_file:
+        json.dump({'fingerprint': fingerprint}, snapshot_file)
+
+
+def is_command_table_snapshot_current(shell_ctx):
+    """ whether the cached command table can be used as is instead of waiting for a fresh one """
+    command_file_path = get_command_table_path(shell_ctx)
+    if not os.path.exists(command_file_path):
+        return False
+    try:
+        with open(command_file_path + SNAPSHOT_SUFFIX, 'r') as snapshot_file:
+            fingerprint = json.load(snapshot_file).get('fingerprint')
+    except (OSError, ValueError, AttributeError):
+        return False
+    return fingerprint == get_command_table_fingerprint()
@@ -40,10 +40,11 @@ from prompt_toolkit.shortcuts import create_eventloop
 # pylint: enable=import-error
 
 from . import VERSION
+from ._dump_commands import is_command_table_snapshot_current
 from .az_completer import AzCompleter
 from .az_lexer import get_az_lexer, ExampleLexer, ToolbarLexer, ScenarioLexer
 from .configuration import Configuration, SELECT_SYMBOL
-from .frequency_heuristic import DISPLAY_TIME, frequency_heuristic
+from .frequency_heuristic import DISPLAY_TIME, frequency_heuristic, update_command_frequency
 from .gather_commands import add_new_lines, GatherCommands
 from .key_bindings import InteractiveKeyBindings
 from .layout import LayoutManager
@@ -51,7 +52,7 @@ from .progress import progress_view
 from . import telemetry
 from .recommendation import Recommender, _show_details_for_e2e_scenario, gen_command_in_scenario
 from .scenario_suggest import ScenarioAutoSuggest
-from .threads import LoadCommandTableThread
+from .threads import CommandTableWatchThread, LoadCommandTableThread
 from .util import get_window_dim, parse_quotes, get_os_clear_screen_word, get_yes_or_no_option, select_option
 from .scenario_search import SearchThread, show_search_item
 
@@ -946,6 +947,13 @@ class AzInteractiveShell(object):
             self.command_table_thread = LoadCommandTableThread(self.restart_completer, self)
             self.command_table_thread.start()
             return
+        if self.completer and is_command_table_snapshot_current(self):
+            # the cached command table was generated from the same CLI core and extensions,
+            # so the completer can use it right away while the full loader is built in the background
+            logger.debug("Using the cached command table")
+            self.command_table_thread = LoadCommandTableThread(self.restart_completer, self)
+            self.command_table_thread.start()
+            return
         print_styled_text([(Style.ACTION, "A command preload mechanism was added to prevent lagging and command run errors.\n"
                                           "You can skip preloading in a single pass by CTRL+C or turn it off by setting 'az config set interactive.enable_preloading=False'\n")])
         already_prompted = False
@@ -983,9 +991,19 @@ class AzInteractiveShell(object):
                 break
         progress_bar.stop()
 
+    def refresh_stale_command_table(self):
+        """ rebuilds the cached command table in the background if the installed extensions changed """
+        if self.command_table_thread and self.command_table_thread.is_alive():
+            return
+        if not is_command_table_snapshot_current(self):
+            self.command_table_thread = LoadCommandTableThread(self.restart_completer, self)
+            self.command_table_thread.start()
+
     def run(self):
         """ starts the REPL """
         self.load_command_table()
+        command_table_watcher = CommandTableWatchThread(self)
+        command_table_watcher.start()
         # init customized processing bar
         from .progress import ShellProgressView
         self.cli_ctx.get_progress_controller().init_progress(ShellProgressView())
@@ -1042,8 +1060,10 @@ class AzInteractiveShell(object):
                         telemetry.set_failure()
                     else:
                         telemetry.set_success()
+                        self.completer.update_command_frequency(update_command_frequency(self, cmd))
                     # Update execution result of previous command, fetch recommendation if command failed
                     self.recommender.update_exec_result(self.last_exit_code,
                                                         telemetry.get_error_info()['result_summary'])
                     telemetry.flush()
+        command_table_watcher.stop()
         telemetry.conclude()
@@ -18,6 +18,8 @@ from prompt_toolkit.completion import Completer, Completion  # pylint: disable=i
 
 from . import configuration
 from .argfinder import ArgsFinder
+from .completion_index import CompletionTrie, DEFAULT_MAX_COMPLETIONS
+from .frequency_heuristic import get_command_frequency
 from .util import parse_quotes
 
 SELECT_SYMBOL = configuration.SELECT_SYMBOL
@@ -91,6 +93,13 @@ class AzCompleter(Completer):
         self.argsfinder = ArgsFinder(self.parser)
         self.cmdtab = {}
 
+        # prefix tries of the completions for each command group, command and enum parameter,
+        # built the first time each one is completed
+        self.command_frequency = {}
+        self._command_indexes = {}
+        self._param_indexes = {}
+        self._enum_indexes = {}
+
         if commands:
             self.start(commands, global_params=global_params)
 
@@ -112,6 +121,45 @@ class AzCompleter(Completer):
             self.output_options = commands.output_options
             self.global_param_descriptions = commands.global_param_descriptions
 
+        self.command_frequency = get_command_frequency(self.shell_ctx)
+        self._command_indexes = {}
+        self._param_indexes = {}
+
+    def get_max_completions(self):
+        return self.shell_ctx.cli_ctx.config.getint('interactive', 'max_completions',
+                                                    fallback=DEFAULT_MAX_COMPLETIONS)
+
+    def update_command_frequency(self, command_frequency):
+        """ re-ranks command completions after the usage counts change """
+        self.command_frequency = command_frequency
+        self._command_indexes = {}
+
+    def get_command_index(self, command, subtree):
+        """ completions for the sub-commands of command, the most used first and then alphabetically """
+        index = self._command_indexes.get(command)
+        if index is None:
+            words = []
+            for child_command in subtree.children:
+                full_command = f'{command} {child_command}'.strip()
+                words.append((child_command, (-self.command_frequency.get(full_command, 0), child_command)))
+            index = CompletionTrie(words, max_results=self.get_max_completions())
+            self._command_indexes[command] = index
+        return index
+
+    def get_param_index(self, command):
+        """ completions for the parameters of command, the required ones first and then alphabetically """
+        from knack.help import REQUIRED_TAG
+
+        index = self._param_indexes.get(command)
+        if index is None:
+            words = []
+            for param in self.command_param_info.get(command, []):
+                description = self.param_description.get(command + " " + str(param), '')
+                words.append((param, (0 if description.startswith(REQUIRED_TAG) else 1, param)))
+            index = CompletionTrie(words, max_results=self.get_max_completions())
+            self._param_indexes[command] = index
+        return index
+
     def initialize_command_table_attributes(self):
         from ._dump_commands import FreshTable
         loader = FreshTable(self.shell_ctx).loader
@@ -119,6 +167,7 @@ class AzCompleter(Completer):
             self.cmdtab = loader.command_table
             self.parser.load_command_table(loader)
             self.argsfinder = ArgsFinder(self.parser)
+            self._enum_indexes = {}
 
     def validate_param_completion(self, param, leftover_args):
         """ validates that a param should be completed """
@@ -189,7 +238,8 @@ class AzCompleter(Completer):
         for comp in self.gen_recommend_completion(text):
             yield comp
 
-        for comp in sort_completions(self.gen_cmd_and_param_completions()):
+        # already ranked by the completion index
+        for comp in self.gen_cmd_and_param_completions():
             yield comp
 
         if self.scenario_recommender_enabled:
@@ -206,11 +256,16 @@ class AzCompleter(Completer):
     def gen_enum_completions(self, arg_name):
         """ generates dynamic enumeration completions """
         try:  # if enum completion
-            for choice in self.cmdtab[self.current_command].arguments[arg_name].choices:
-                if self.validate_completion(choice):
-                    yield Completion(choice, -len(self.unfinished_word))
-
-        except TypeError:  # there is no choices option
+            index = self._enum_indexes.get((self.current_command, arg_name))
+            if index is None:
+                choices = self.cmdtab[self.current_command].arguments[arg_name].choices
+                index = CompletionTrie(((choice, position) for position, choice in enumerate(choices)),
+                                       max_results=self.get_max_completions())
+                self._enum_indexes[(self.current_command, arg_name)] = index
+            for choice in index.complete(self.unfinished_word):
+                yield Completion(choice, -len(self.unfinished_word))
+
+        except (TypeError, AttributeError):  # there is no choices option
             pass
 
     def get_arg_name(self, param):
@@ -332,15 +387,16 @@ class AzCompleter(Completer):
         if not has_user_input and self.shell_ctx.recommender.enabled:
             return
         if self.complete_command:
-            for param in self.command_param_info.get(self.current_command, []):
-                if self.validate_param_completion(param, self.leftover_args):
-                    yield self.yield_param_completion(param, self.unfinished_word)
+            # aliases and parameters already on the line are filtered out before the completions are cut
+            for param in self.get_param_index(self.current_command).complete(
+                    self.unfinished_word, lambda param: self.validate_param_completion(param, self.leftover_args)):
+                yield self.yield_param_completion(param, self.unfinished_word)
         elif not self.leftover_args:
-            for child_command in self.subtree.children:
-                if self.validate_completion(child_command):
-                    full_command = f'{self.current_command} {child_command}'.strip()
-                    yield Completion(child_command, -len(self.unfinished_word),
-                                     display_meta=self.command_description.get(full_command))
+            for child_command in self.get_command_index(self.current_command, self.subtree).complete(
+                    self.unfinished_word):
+                full_command = f'{self.current_command} {child_command}'.strip()
+                yield Completion(child_command, -len(self.unfinished_word),
+                                 display_meta=self.command_description.get(full_command))
 
     def gen_global_params_and_arg_completions(self):
         # global parameters
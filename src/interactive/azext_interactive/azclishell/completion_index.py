@@ -0,0 +1,116 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import heapq
+
+DEFAULT_MAX_COMPLETIONS = 100
+
+
+class _TrieNode(object):  # pylint: disable=too-few-public-methods
+    """ a node of the compressed trie, edges are keyed by the first character of their label """
+    __slots__ = ('edges', 'entries', 'top')
+
+    def __init__(self):
+        self.edges = {}
+        self.entries = []
+        self.top = []
+
+
+class CompletionTrie(object):
+    """
+    compressed (radix) trie over completion words
+
+    matching is case insensitive, the same as AzCompleter.validate_completion. every node keeps
+    the best ranked words below it, so a prefix lookup only walks the prefix and never the words
+    """
+
+    def __init__(self, words=None, max_results=DEFAULT_MAX_COMPLETIONS):
+        """ words is an iterable of (word, rank) where a lower rank is shown first """
+        self.max_results = max_results
+        self._root = _TrieNode()
+        for word, rank in words or []:
+            self._insert(word.lower(), (rank, word))
+        self._collect_top(self._root)
+
+    def __len__(self):
+        return len(self._root.top)
+
+    def _insert(self, key, entry):
+        node = self._root
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None:
+                child = _TrieNode()
+                node.edges[key[0]] = (key, child)
+                node = child
+                key = ''
+                break
+            label, child = edge
+            common = _common_prefix_length(label, key)
+            if common < len(label):
+                # split the edge so the shared part becomes its own node
+                middle = _TrieNode()
+                middle.edges[label[common]] = (label[common:], child)
+                node.edges[key[0]] = (label[:common], middle)
+                child = middle
+            node = child
+            key = key[common:]
+        node.entries.append(entry)
+
+    def _collect_top(self, node):
+        candidates = list(node.entries)
+        for _, child in node.edges.values():
+            candidates.extend(self._collect_top(child))
+        node.top = heapq.nsmallest(self.max_results, candidates)
+        return node.top
+
+    def complete(self, prefix, predicate=None):
+        """
+        returns the best ranked words starting with prefix, best first
+
+        words that predicate rejects are dropped before the results are cut to max_results, so
+        they don't hide the words ranked below them
+        """
+        node = self._find(prefix)
+        if node is None:
+            return []
+        if predicate is None:
+            return [word for _, word in node.top]
+        words = [word for _, word in node.top if predicate(word)]
+        if len(words) == len(node.top) or len(node.top) < self.max_results:
+            # nothing was dropped, or the top words are all the words below the node
+            return words
+        return [word for _, word in heapq.nsmallest(self.max_results, (
+            entry for entry in self._entries(node) if predicate(entry[1])))]
+
+    def _find(self, prefix):
+        """ the node holding the words that start with prefix """
+        key = prefix.lower()
+        node = self._root
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None:
+                return None
+            label, child = edge
+            if len(key) <= len(label):
+                return child if label.startswith(key) else None
+            if not key.startswith(label):
+                return None
+            node = child
+            key = key[len(label):]
+        return node
+
+    def _entries(self, node):
+        yield from node.entries
+        for _, child in node.edges.values():
+            yield from self._entries(child)
+
+
+def _common_prefix_length(first, second):
+    length = min(len(first), len(second))
+    for index in range(length):
+        if first[index] != second[index]:
+            return index
+    return length
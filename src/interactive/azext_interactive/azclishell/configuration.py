@@ -60,6 +60,7 @@ class Configuration(object):
         self.config.set('Help Files', 'history', 'history.txt')
         self.config.set('Help Files', 'recommend_path', 'recommend_path.txt')
         self.config.set('Help Files', 'frequency', 'frequency.json')
+        self.config.set('Help Files', 'command_frequency', 'command_frequency.json')
         self.config.set('Layout', 'command_description', 'yes')
         self.config.set('Layout', 'param_description', 'yes')
         self.config.set('Layout', 'examples', 'yes')
@@ -95,6 +96,10 @@ class Configuration(object):
         """ returns the name of the frequency file """
         return self.config.get('Help Files', 'frequency')
 
+    def get_command_frequency(self):
+        """ returns the name of the file counting how often each command is run """
+        return self.config.get('Help Files', 'command_frequency')
+
     def load(self, path):
         """ loads the configuration settings """
         self.config.read(path)
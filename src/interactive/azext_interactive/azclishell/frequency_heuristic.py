@@ -53,3 +53,35 @@ def frequency_measurement(shell_ctx):
 def frequency_heuristic(shell_ctx):
     """ decides whether user meets requirements for frequency """
     return frequency_measurement(shell_ctx) >= ACTIVE_STATUS
+
+
+def get_command_frequency(shell_ctx):
+    """ returns how many times each command has been run in the shell """
+    frequency_path = os.path.join(shell_ctx.config.get_config_dir(), shell_ctx.config.get_command_frequency())
+    if not os.path.exists(frequency_path):
+        return {}
+    with open(frequency_path, 'r') as freq:
+        try:
+            frequency = json.load(freq)
+        except ValueError:
+            return {}
+    return frequency if isinstance(frequency, dict) else {}
+
+
+def update_command_frequency(shell_ctx, command):
+    """ counts a run of command, ignoring its parameters """
+    words = []
+    for word in command.split():
+        if word.startswith('-'):
+            break
+        words.append(word)
+    frequency = get_command_frequency(shell_ctx)
+    if not words:
+        return frequency
+
+    command = ' '.join(words)
+    frequency[command] = frequency.get(command, 0) + 1
+    frequency_path = os.path.join(shell_ctx.config.get_config_dir(), shell_ctx.config.get_command_frequency())
+    with open(frequency_path, 'w') as freq:
+        json.dump(frequency, freq)
+    return frequency
@@ -5,6 +5,13 @@
 
 import threading
 
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+# seconds between two checks of the installed extensions
+COMMAND_TABLE_CHECK_INTERVAL = 10
+
 
 class LoadCommandTableThread(threading.Thread):
     """ a thread that loads the command table """
@@ -22,3 +29,25 @@ class LoadCommandTableThread(threading.Thread):
             self.initialize_function()
         except KeyboardInterrupt:
             pass
+
+
+class CommandTableWatchThread(threading.Thread):
+    """ a thread that rebuilds the command table whenever the installed extensions change """
+    def __init__(self, shell, interval=COMMAND_TABLE_CHECK_INTERVAL):
+        super(CommandTableWatchThread, self).__init__()
+        self.shell = shell
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.daemon = True
+
+    def run(self):
+        # extensions can be changed by any command, including ones run outside of the shell
+        while not self.stopped.wait(self.interval):
+            try:
+                self.shell.refresh_stale_command_table()
+            except Exception as ex:  # pylint: disable=broad-except
+                # e.g. an extension being installed at the same time, check again next time
+                logger.debug("Unable to check the installed extensions: %s", ex)
+
+    def stop(self):
+        self.stopped.set()
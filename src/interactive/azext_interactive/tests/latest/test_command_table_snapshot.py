@@ -0,0 +1,131 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from azext_interactive.azclishell import _dump_commands
+from azext_interactive.azclishell.app import AzInteractiveShell
+from azext_interactive.azclishell.threads import CommandTableWatchThread
+
+
+class _Extension(object):
+    def __init__(self, name, version):
+        self.name = name
+        self.version = version
+
+
+class _Config(object):
+    def __init__(self, config_dir):
+        self.config_dir = config_dir
+
+    def get_config_dir(self):
+        return self.config_dir
+
+    def get_help_files(self):
+        return 'help_dump.json'
+
+
+class _ShellCtx(object):
+    def __init__(self, config_dir):
+        self.config = _Config(config_dir)
+
+
+class CommandTableSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.shell_ctx = _ShellCtx(self.config_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.config_dir)
+
+    def _write_command_table(self):
+        with open(_dump_commands.get_command_table_path(self.shell_ctx), 'w') as f:
+            f.write('{}')
+
+    @mock.patch('azure.cli.core.extension.get_extensions')
+    def test_fingerprint_tracks_extensions(self, get_extensions):
+        get_extensions.return_value = [_Extension('alias', '0.5.2'), _Extension('ssh', '1.1.6')]
+        original = _dump_commands.get_command_table_fingerprint()
+
+        get_extensions.return_value = [_Extension('ssh', '1.1.6'), _Extension('alias', '0.5.2')]
+        self.assertEqual(original, _dump_commands.get_command_table_fingerprint())
+
+        get_extensions.return_value = [_Extension('alias', '0.5.2'), _Extension('ssh', '2.0.0')]
+        self.assertNotEqual(original, _dump_commands.get_command_table_fingerprint())
+
+        get_extensions.return_value = [_Extension('alias', '0.5.2')]
+        self.assertNotEqual(original, _dump_commands.get_command_table_fingerprint())
+
+    @mock.patch.object(_dump_commands, 'get_command_table_fingerprint', return_value='abc')
+    def test_snapshot_is_current(self, _):
+        self.assertFalse(_dump_commands.is_command_table_snapshot_current(self.shell_ctx))
+
+        # a command table without a snapshot record is from an older version of the shell
+        self._write_command_table()
+        self.assertFalse(_dump_commands.is_command_table_snapshot_current(self.shell_ctx))
+
+        _dump_commands.write_command_table_snapshot(self.shell_ctx, 'abc')
+        self.assertTrue(_dump_commands.is_command_table_snapshot_current(self.shell_ctx))
+
+        _dump_commands.write_command_table_snapshot(self.shell_ctx, 'def')
+        self.assertFalse(_dump_commands.is_command_table_snapshot_current(self.shell_ctx))
+
+    @mock.patch.object(_dump_commands, 'get_command_table_fingerprint', return_value='abc')
+    def test_corrupted_snapshot_is_stale(self, _):
+        self._write_command_table()
+        with open(_dump_commands.get_command_table_path(self.shell_ctx) + _dump_commands.SNAPSHOT_SUFFIX, 'w') as f:
+            f.write('not json')
+        self.assertFalse(_dump_commands.is_command_table_snapshot_current(self.shell_ctx))
+
+        os.remove(_dump_commands.get_command_table_path(self.shell_ctx))
+        _dump_commands.write_command_table_snapshot(self.shell_ctx, 'abc')
+        self.assertFalse(_dump_commands.is_command_table_snapshot_current(self.shell_ctx))
+
+
+class CommandTableWatchTest(unittest.TestCase):
+    @mock.patch('azext_interactive.azclishell.app.LoadCommandTableThread')
+    @mock.patch('azext_interactive.azclishell.app.is_command_table_snapshot_current')
+    def test_refresh_stale_command_table(self, is_current, load_thread):
+        shell = SimpleNamespace(command_table_thread=None, restart_completer=None)
+        is_current.return_value = True
+        AzInteractiveShell.refresh_stale_command_table(shell)
+        load_thread.assert_not_called()
+
+        # an extension was installed, updated or removed, whichever command did it
+        is_current.return_value = False
+        AzInteractiveShell.refresh_stale_command_table(shell)
+        load_thread.return_value.start.assert_called_once_with()
+        self.assertIs(load_thread.return_value, shell.command_table_thread)
+
+        # not again while the command table is still being rebuilt
+        load_thread.return_value.is_alive.return_value = True
+        AzInteractiveShell.refresh_stale_command_table(shell)
+        load_thread.return_value.start.assert_called_once_with()
+
+    def test_watcher_checks_until_stopped(self):
+        checked = threading.Semaphore(0)
+
+        def refresh():
+            checked.release()
+            # a failed check doesn't stop the watcher
+            raise OSError('extension being installed')
+
+        watcher = CommandTableWatchThread(SimpleNamespace(refresh_stale_command_table=refresh), interval=0.01)
+        watcher.start()
+        for _ in range(3):
+            self.assertTrue(checked.acquire(timeout=5))
+        watcher.stop()
+        watcher.join(5)
+        self.assertFalse(watcher.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import unittest
+from unittest import mock
+
+from azure.cli.core.mock import DummyCli
+from knack.help import REQUIRED_TAG
+from prompt_toolkit.document import Document
+
+from azext_interactive.azclishell.app import AzInteractiveShell
+from azext_interactive.azclishell.command_tree import CommandBranch, CommandHead
+from azext_interactive.azclishell.completion_index import CompletionTrie
+from azext_interactive.azclishell.configuration import Configuration
+from azext_interactive.azclishell.recommendation import Recommender
+
+TEST_DIR = os.path.abspath(os.path.join(os.path.abspath(__file__), '..'))
+
+
+class CompletionTrieTest(unittest.TestCase):
+    def test_prefix_lookup(self):
+        trie = CompletionTrie([(word, word) for word in ['vm', 'vmss', 'vnet', 'storage', 'sql', 'Src']])
+        self.assertEqual(trie.complete(''), ['Src', 'sql', 'storage', 'vm', 'vmss', 'vnet'])
+        self.assertEqual(trie.complete('v'), ['vm', 'vmss', 'vnet'])
+        self.assertEqual(trie.complete('vm'), ['vm', 'vmss'])
+        self.assertEqual(trie.complete('vms'), ['vmss'])
+        self.assertEqual(trie.complete('vmssx'), [])
+        self.assertEqual(trie.complete('x'), [])
+        # matching ignores case, the same as the completer
+        self.assertEqual(trie.complete('S'), ['Src', 'sql', 'storage'])
+        self.assertEqual(trie.complete('sR'), ['Src'])
+
+    def test_rank_and_limit(self):
+        words = [('--name', (0, '--name')), ('--tags', (1, '--tags')), ('--location', (1, '--location')),
+                 ('--resource-group', (0, '--resource-group'))]
+        trie = CompletionTrie(words, max_results=3)
+        self.assertEqual(trie.complete('--'), ['--name', '--resource-group', '--location'])
+        self.assertEqual(trie.complete('--t'), ['--tags'])
+        self.assertEqual(len(trie), 3)
+
+    def test_predicate_before_limit(self):
+        trie = CompletionTrie([(word, word) for word in ['-a', '-b', '--aa', '--bb', '--cc']], max_results=2)
+        self.assertEqual(trie.complete('-'), ['--aa', '--bb'])
+        # the words dropped by the predicate don't count towards the limit
+        self.assertEqual(trie.complete('-', lambda word: word not in ('--aa', '--bb')), ['--cc', '-a'])
+        self.assertEqual(trie.complete('--', lambda word: word != '--bb'), ['--aa', '--cc'])
+        self.assertEqual(trie.complete('--c', lambda word: False), [])
+        self.assertEqual(trie.complete('x', lambda word: True), [])
+
+    def test_shared_prefixes_split_edges(self):
+        trie = CompletionTrie([(word, word) for word in ['--subnet-address-prefix', '--subnet', '--sub']])
+        self.assertEqual(trie.complete('--subn'), ['--subnet', '--subnet-address-prefix'])
+        self.assertEqual(trie.complete('--sub'), ['--sub', '--subnet', '--subnet-address-prefix'])
+        self.assertEqual(trie.complete('--subnet-'), ['--subnet-address-prefix'])
+
+
+class _Commands(object):  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """ stands in for GatherCommands with a generated command table """
+
+    def __init__(self, group_count, commands_per_group, params_per_command):
+        self.command_tree = CommandHead()
+        self.descrip = {}
+        self.completable_param = []
+        self.param_descript = {}
+        self.command_example = {}
+        self.command_param_info = {}
+        self.global_param = []
+        self.output_choices = []
+        self.output_options = []
+        self.global_param_descriptions = {}
+        for group in range(group_count):
+            group_name = 'group{}'.format(group)
+            group_branch = CommandBranch(group_name)
+            self.command_tree.add_child(group_branch)
+            for command in range(commands_per_group):
+                command_name = 'command{}'.format(command)
+                group_branch.add_child(CommandBranch(command_name))
+                full_command = '{} {}'.format(group_name, command_name)
+                self.descrip[full_command] = 'a command'
+                params = {}
+                for param in range(params_per_command):
+                    param_name = '--param-{}'.format(param)
+                    params[param_name] = {param_name}
+                    self.param_descript[full_command + ' ' + param_name] = \
+                        (REQUIRED_TAG + ' ' if param % 7 == 0 else '') + 'a parameter'
+                self.command_param_info[full_command] = params
+
+
+class CompletionLatencyTest(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.object(Configuration, 'get_help_files', lambda _: 'help_dump_test.json'):
+            with mock.patch.object(Configuration, 'get_config_dir', lambda _: TEST_DIR):
+                self.completer = AzInteractiveShell(DummyCli(), None).completer
+                # 200 groups * 50 commands * 30 parameters is 300,000 command/parameter pairs
+                self.completer.start(_Commands(200, 50, 30))
+
+    def _complete(self, text):
+        return [c.text for c in self.completer.get_completions(Document(text), None)]
+
+    def test_ranking(self):
+        with mock.patch.object(Recommender, 'enabled', property(lambda _: False)):
+            self.completer.update_command_frequency({'group1 command42': 3, 'group1 command7': 1})
+            completions = self._complete('group1 ')
+            self.assertEqual(completions[:3], ['command42', 'command7', 'command0'])
+
+            completions = self._complete('group1 command1 --param-1')
+            self.assertEqual(completions[:2], ['--param-14', '--param-1'])
+
+    def test_params_beyond_the_limit(self):
+        with mock.patch.object(Recommender, 'enabled', property(lambda _: False)), \
+                mock.patch.object(self.completer, 'get_max_completions', return_value=10):
+            # the parameters used already make room for the ones ranked after them
+            used = ' '.join('--param-{} x'.format(param) for param in range(20))
+            completions = self._complete('group1 command1 {} --'.format(used))
+            self.assertEqual(10, len(completions))
+            self.assertNotIn('--param-0', completions)
+            self.assertIn('--param-29', completions)
+
+    def test_indexes_are_built_once(self):
+        keystrokes = 'group123 command45 --param-3'
+        with mock.patch.object(Recommender, 'enabled', property(lambda _: False)), \
+                mock.patch('azext_interactive.azclishell.az_completer.CompletionTrie',
+                           side_effect=CompletionTrie) as trie:
+            # the first completion at each level builds that level's index
+            for end in range(1, len(keystrokes) + 1):
+                self._complete(keystrokes[:end])
+            # the command groups, the commands of group123 and the parameters of group123 command45
+            self.assertEqual(3, trie.call_count)
+
+            completions = [self._complete(keystrokes[:end]) for end in range(1, len(keystrokes) + 1)]
+            self.assertEqual(3, trie.call_count)
+        self.assertIn('--param-3', completions[-1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Average completion latency per keystroke while typing a command of a generated command table with 300,000
+command/parameter pairs. Not part of the unit tests, run it from src/interactive with the extension installed in
+development mode:
+
+    python benchmarks/benchmark_keystroke_latency.py
+"""
+
+import timeit
+from unittest import mock
+
+from azure.cli.core.mock import DummyCli
+from prompt_toolkit.document import Document
+
+from azext_interactive.azclishell.app import AzInteractiveShell
+from azext_interactive.azclishell.configuration import Configuration
+from azext_interactive.azclishell.recommendation import Recommender
+from azext_interactive.tests.latest.test_completion_index import TEST_DIR, _Commands
+
+KEYSTROKES = 'group123 command45 --param-3'
+RUNS = 20
+
+
+def main():
+    with mock.patch.object(Configuration, 'get_help_files', lambda _: 'help_dump_test.json'):
+        with mock.patch.object(Configuration, 'get_config_dir', lambda _: TEST_DIR):
+            completer = AzInteractiveShell(DummyCli(), None).completer
+            completer.start(_Commands(200, 50, 30))
+
+    def type_command():
+        for end in range(1, len(KEYSTROKES) + 1):
+            list(completer.get_completions(Document(KEYSTROKES[:end]), None))
+
+    with mock.patch.object(Recommender, 'enabled', property(lambda _: False)):
+        # the first completion at each level builds that level's index
+        first = timeit.timeit(type_command, number=1)
+        elapsed = timeit.timeit(type_command, number=RUNS)
+    print('first time typed: {:.3f} ms per keystroke'.format(first / len(KEYSTROKES) * 1000))
+    print('average completion latency per keystroke: {:.3f} ms'.format(elapsed / (RUNS * len(KEYSTROKES)) * 1000))
+
+
+if __name__ == '__main__':
+    main()
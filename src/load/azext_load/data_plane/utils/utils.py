@@ -3,14 +3,19 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import hashlib
+import json
 import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from enum import EnumMeta
+from urllib.parse import urlparse
 
 import requests
 import yaml
 from azext_load.data_plane.utils import validators
 from azext_load.vendored_sdks.loadtesting_mgmt import LoadTestMgmtClient
+from azure.cli.core._environment import get_config_dir
 from azure.cli.core.azclierror import (
     FileOperationError,
     InvalidArgumentValueError,
@@ -24,6 +29,9 @@ from .models import IdentityType, AllowedFileTypes
 
 logger = get_logger(__name__)
 
+MAX_CONCURRENT_FILE_UPLOADS = 5
+FILE_HASH_CHUNK_SIZE = 1024 * 1024
+
 
 def get_load_test_resource_endpoint(
     cred, load_test_resource, resource_group=None, subscription_id=None
@@ -473,60 +481,36 @@ def create_or_update_test_run_body(
 def upload_files_helper(
     client, test_id, yaml_data, test_plan, load_test_config_file, wait
 ):
-    files = client.list_test_files(test_id)
+    files = list(client.list_test_files(test_id))
+    manifest_path = _get_uploaded_files_manifest_path(client, test_id)
+    manifest = _load_uploaded_files_manifest(manifest_path)
+    uploads = []
     if yaml_data:
         user_prop_file = yaml_data.get("properties", {}).get("userPropertyFile")
         if user_prop_file is not None:
-            logger.info("Uploading user property file %s", user_prop_file)
-            file_name = os.path.basename(user_prop_file)
-            for file in files:
-                if AllowedFileTypes.USER_PROPERTIES.value == file["fileType"]:
-                    client.delete_test_file(test_id, file["fileName"])
-                    logger.info(
-                        "File of type '%s' already exists in test %s. Deleting it!",
-                        AllowedFileTypes.USER_PROPERTIES,
-                        test_id,
-                    )
-                    break
-            file_response = upload_file_to_test(
-                client,
-                test_id,
-                user_prop_file,
-                file_type=AllowedFileTypes.USER_PROPERTIES,
-                wait=wait,
-            )
-            logger.info(
-                "Uploaded file '%s' of type %s to test %s",
-                file_name,
-                AllowedFileTypes.USER_PROPERTIES,
-                test_id,
+            existing_file_names = [
+                file["fileName"]
+                for file in files
+                if AllowedFileTypes.USER_PROPERTIES.value == file["fileType"]
+            ]
+            uploads.append(
+                (user_prop_file, AllowedFileTypes.USER_PROPERTIES, existing_file_names[:1])
             )
 
     if yaml_data and yaml_data.get("configurationFiles") is not None:
-        logger.info("Uploading additional artifacts")
         for config_file in yaml_data.get("configurationFiles"):
             file_name = os.path.basename(config_file)
-            if file_name in [file["fileName"] for file in files]:
-                client.delete_test_file(test_id, file_name)
-                logger.info(
-                    "File with name '%s' already exists in test %s. Deleting it!",
-                    file_name,
-                    test_id,
-                )
-            upload_file_to_test(
-                client,
-                test_id,
-                config_file,
-                file_type=AllowedFileTypes.ADDITIONAL_ARTIFACTS,
-                wait=wait,
-            )
-            logger.info(
-                "Uploaded file '%s' of type %s to test %s",
-                file_name,
-                AllowedFileTypes.ADDITIONAL_ARTIFACTS,
-                test_id,
+            existing_file_names = [
+                file["fileName"] for file in files if file["fileName"] == file_name
+            ]
+            uploads.append(
+                (config_file, AllowedFileTypes.ADDITIONAL_ARTIFACTS, existing_file_names)
             )
 
+    if uploads:
+        logger.info("Uploading user property file and additional artifacts")
+    _upload_changed_files(client, test_id, uploads, files, manifest, manifest_path, wait)
+
     if test_plan is None and yaml_data is not None and yaml_data.get("testPlan"):
         test_plan = yaml_data.get("testPlan")
         if not os.path.isabs(test_plan) and load_test_config_file:
@@ -534,29 +518,168 @@ def upload_files_helper(
             test_plan = os.path.join(yaml_dir, test_plan)
     if test_plan:
         logger.info("Uploading test plan file %s", test_plan)
-        file_name = os.path.basename(test_plan)
-        for file in files:
-            if validators.AllowedFileTypes.JMX_FILE.value == file["fileType"]:
-                client.delete_test_file(test_id, file["fileName"])
-                logger.info(
-                    "File with name '%s' already exists in test %s. Deleting it!",
-                    file_name,
-                    test_id,
-                )
-                break
-        file_response = upload_file_to_test(
+        existing_file_names = [
+            file["fileName"]
+            for file in files
+            if validators.AllowedFileTypes.JMX_FILE.value == file["fileType"]
+        ]
+        file_response = _upload_changed_files(
             client,
             test_id,
-            test_plan,
-            file_type=validators.AllowedFileTypes.JMX_FILE,
-            wait=wait,
-        )
+            [(test_plan, validators.AllowedFileTypes.JMX_FILE, existing_file_names[:1])],
+            files,
+            manifest,
+            manifest_path,
+            wait,
+        )[0]
         if wait and file_response.get("validationStatus") != "VALIDATION_SUCCESS":
             raise FileOperationError(
                 f"Test plan file {test_plan} is not valid. Please check the file and try again."
             )
 
 
+def _upload_changed_files(client, test_id, uploads, files, manifest, manifest_path, wait):
+    """Upload the files whose content changed since they were uploaded to the test, a few at a time.
+
+    Returns the file info of each file, as uploaded or as it already is on the test.
+    """
+    responses = [None] * len(uploads)
+    pending = []
+    for index, (file_path, file_type, existing_file_names) in enumerate(uploads):
+        file_name = os.path.basename(file_path)
+        file_hash = _get_file_hash(file_path)
+        existing_file = _get_unchanged_file(files, manifest, file_name, file_type, file_hash, wait)
+        if existing_file is not None:
+            logger.info(
+                "File '%s' of type %s is unchanged in test %s. Skipping it!",
+                file_name,
+                file_type,
+                test_id,
+            )
+            responses[index] = existing_file
+        else:
+            pending.append((index, file_path, file_type, existing_file_names, file_hash))
+
+    def upload(pending_upload):
+        _, file_path, file_type, existing_file_names, _ = pending_upload
+        for existing_file_name in existing_file_names:
+            client.delete_test_file(test_id, existing_file_name)
+            logger.info(
+                "File with name '%s' already exists in test %s. Deleting it!",
+                existing_file_name,
+                test_id,
+            )
+        response = upload_file_to_test(
+            client, test_id, file_path, file_type=file_type, wait=wait
+        )
+        logger.info(
+            "Uploaded file '%s' of type %s to test %s",
+            os.path.basename(file_path),
+            file_type,
+            test_id,
+        )
+        return response
+
+    if not pending:
+        return responses
+
+    for _, _, _, existing_file_names, _ in pending:
+        for existing_file_name in existing_file_names:
+            manifest.pop(existing_file_name, None)
+    try:
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_CONCURRENT_FILE_UPLOADS, len(pending))
+        ) as executor:
+            for pending_upload, response in zip(pending, executor.map(upload, pending)):
+                index, file_path, file_type, _, file_hash = pending_upload
+                responses[index] = response
+                if response.get("validationStatus") != "VALIDATION_FAILURE":
+                    manifest[os.path.basename(file_path)] = {
+                        "fileType": file_type.value,
+                        "hash": file_hash,
+                        "location": _get_file_location(response),
+                    }
+    finally:
+        _save_uploaded_files_manifest(manifest_path, manifest)
+    return responses
+
+
+def _get_unchanged_file(files, manifest, file_name, file_type, file_hash, wait):
+    # The service doesn't keep a hash of the files, the manifest records the hash of each file uploaded from here,
+    # and where the service stored it, so that a file replaced from another machine since is uploaded again
+    uploaded_file = manifest.get(file_name)
+    if (
+        not isinstance(uploaded_file, dict)
+        or uploaded_file.get("hash") != file_hash
+        or uploaded_file.get("fileType") != file_type.value
+        or not uploaded_file.get("location")
+    ):
+        return None
+    for file in files:
+        if (
+            file["fileName"] == file_name
+            and file["fileType"] == file_type.value
+            and _get_file_location(file) == uploaded_file["location"]
+        ):
+            validation_status = file.get("validationStatus")
+            # A file that failed validation is uploaded again, and so is one still being validated when waiting
+            if validation_status == "VALIDATION_FAILURE" or (
+                wait and validation_status == "VALIDATION_INITIATED"
+            ):
+                return None
+            return file
+    return None
+
+
+def _get_file_location(file):
+    # The url of a file is a SAS url, the token changes every time the file is listed but the blob doesn't
+    url = urlparse(file.get("url") or "")
+    return f"{url.netloc}{url.path}" if url.netloc else None
+
+
+def _get_file_hash(file_path):
+    # pylint: disable-next=protected-access
+    file_path = validators._validate_path(file_path, is_dir=False)
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(FILE_HASH_CHUNK_SIZE), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _get_uploaded_files_manifest_path(client, test_id):
+    # pylint: disable-next=protected-access
+    key = f"{client._config.endpoint}/{test_id}"
+    return os.path.join(
+        get_config_dir(),
+        "load",
+        "uploaded-files",
+        hashlib.sha256(key.encode()).hexdigest() + ".json",
+    )
+
+
+def _load_uploaded_files_manifest(manifest_path):
+    try:
+        with open(manifest_path, encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _save_uploaded_files_manifest(manifest_path, manifest):
+    temp_path = f"{manifest_path}.{get_random_uuid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(temp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(temp_path, manifest_path)
+    except OSError as e:
+        logger.debug("Failed to save the uploaded files of the test in %s: %s", manifest_path, e)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
 def validate_failure_criteria(failure_criteria):
     parts = failure_criteria.split("(")
     if len(parts) != 2:
@@ -0,0 +1,121 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+
+from azext_load.data_plane.utils.utils import upload_files_helper
+
+
+class FakeAdministrationClient(object):
+    """ Keeps the files of a test, uploading and validating a file takes a while """
+
+    def __init__(self):
+        self._config = SimpleNamespace(endpoint="https://endpoint.cnt-prod.loadtesting.azure.com")
+        self.files = {}
+        self.uploads = []
+        self.deletes = []
+        self.listings = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def list_test_files(self, test_id):
+        # every listing signs the urls with a new SAS token
+        self.listings += 1
+        return iter([dict(file, url=f"{file['url']}?sig={self.listings}") for file in self.files.values()])
+
+    def delete_test_file(self, test_id, file_name):
+        self.deletes.append(file_name)
+        del self.files[file_name]
+
+    def begin_upload_test_file(self, test_id, file_name, file_type, body):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        body.read()
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+            self.uploads.append(file_name)
+        self.files[file_name] = {"fileName": file_name, "fileType": file_type.value,
+                                 "url": self._get_blob_url(file_name), "validationStatus": "VALIDATION_SUCCESS"}
+        return SimpleNamespace(result=lambda: dict(self.files[file_name], url=self.files[file_name]["url"] + "?sig=0"))
+
+    def _get_blob_url(self, file_name):
+        return f"https://account.blob.core.windows.net/{uuid.uuid4()}/{file_name}"
+
+
+class TestLoadFileUpload(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+        config_dir = os.path.join(self.test_dir, "config")
+        patcher = mock.patch("azext_load.data_plane.utils.utils.get_config_dir", return_value=config_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.yaml_data = {"properties": {"userPropertyFile": self._write("user.properties", "a=1")},
+                          "configurationFiles": [self._write(f"data{i}.csv", f"row {i}") for i in range(10)]}
+        self.test_plan = self._write("plan.jmx", "<jmeterTestPlan/>")
+
+    def _write(self, file_name, content):
+        path = os.path.join(self.test_dir, file_name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def _upload(self, client):
+        client.uploads, client.deletes = [], []
+        upload_files_helper(client, "test-id", self.yaml_data, self.test_plan, None, True)
+
+    def test_unchanged_files_are_skipped(self):
+        client = FakeAdministrationClient()
+        self._upload(client)
+        self.assertEqual(12, len(client.uploads))
+        self.assertGreater(client.max_in_flight, 1)
+        # the test plan is uploaded after the files it may use
+        self.assertEqual("plan.jmx", client.uploads[-1])
+
+        self._upload(client)
+        self.assertEqual([], client.uploads)
+        self.assertEqual([], client.deletes)
+
+        self._write("data3.csv", "row 3 changed")
+        self._write("plan.jmx", "<jmeterTestPlan></jmeterTestPlan>")
+        self._upload(client)
+        self.assertEqual(["data3.csv", "plan.jmx"], client.uploads)
+        self.assertEqual(["data3.csv", "plan.jmx"], client.deletes)
+
+    def test_files_missing_or_invalid_on_the_test_are_uploaded(self):
+        client = FakeAdministrationClient()
+        self._upload(client)
+
+        del client.files["data0.csv"]
+        client.files["plan.jmx"]["validationStatus"] = "VALIDATION_FAILURE"
+        self._upload(client)
+        self.assertEqual(["data0.csv", "plan.jmx"], client.uploads)
+
+        # another machine replaced the file on the test
+        client.files["data1.csv"]["url"] = client._get_blob_url("data1.csv")
+        self._upload(client)
+        self.assertEqual(["data1.csv"], client.uploads)
+
+        # the same test id on another resource has none of the files
+        other_client = FakeAdministrationClient()
+        other_client._config.endpoint = "https://other.cnt-prod.loadtesting.azure.com"
+        self._upload(other_client)
+        self.assertEqual(12, len(other_client.uploads))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -104,6 +104,11 @@ helps['quantum job submit'] = """
             az quantum job submit -g MyResourceGroup -w MyWorkspace -l MyLocation -t MyTarget \\
                 --job-name MyJob --job-input-format qir.v1 --job-input-file MyQirBitcode.bc \\
                 --entry-point MyQirEntryPoint
+      - name: Submit a job for each of several QIR bitcode files, uploading them concurrently.
+        text: |-
+            az quantum job submit -g MyResourceGroup -w MyWorkspace -l MyLocation -t MyTarget \\
+                --job-name MyJob --job-input-format qir.v1 --job-input-file MyQirBitcode1.bc MyQirBitcode2.bc \\
+                --entry-point MyQirEntryPoint
 """
 
 helps['quantum job wait'] = """
@@ -114,6 +119,10 @@ helps['quantum job wait'] = """
         text: |-
             az quantum job wait -g MyResourceGroup -w MyWorkspace -l MyLocation \\
                 -j yyyyyyyy-yyyy-yyyy-yyyy-yyyyyyyyyyyy --max-poll-wait-secs 60 -o table
+      - name: Wait for completion of several jobs, polling them together.
+        text: |-
+            az quantum job wait -g MyResourceGroup -w MyWorkspace -l MyLocation \\
+                -j yyyyyyyy-yyyy-yyyy-yyyy-yyyyyyyyyyyy zzzzzzzz-zzzz-zzzz-zzzz-zzzzzzzzzzzz -o table
 """
 
 helps['quantum job cancel'] = """
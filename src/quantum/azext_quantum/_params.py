@@ -91,12 +91,15 @@ def load_arguments(self, _):
     with self.argument_context('quantum job submit') as c:
         c.argument('job_params', job_params_type)
         c.argument('target_capability', target_capability_type)
-        c.argument('job_input_file', job_input_file_type)
+        c.argument('job_input_file', job_input_file_type, nargs='+', help='The location of the input file to submit. Required for QIR, QIO, and pass-through jobs. Ignored on Q# jobs. A job is submitted for each of several space-separated input files.')
         c.argument('job_input_format', job_input_format_type)
         c.argument('job_output_format', job_output_format_type)
         c.argument('entry_point', entry_point_type)
         c.positional('program_args', program_args_type)
 
+    with self.argument_context('quantum job wait') as c:
+        c.argument('job_id', job_id_type, nargs='+', help='Job unique identifier in GUID format. Several space-separated job ids are waited for together.')
+
     with self.argument_context('quantum execute') as c:
         c.argument('workspace_name', workspace_name_type)
         c.argument('target_id', target_id_type)
@@ -23,11 +23,9 @@ from azure.storage.blob import (
 logger = logging.getLogger(__name__)
 
 
-def create_container(
-    connection_string: str, container_name: str
-) -> ContainerClient:
+def create_blob_service_client(connection_string: str) -> BlobServiceClient:
     """
-    Creates and initialize a container; returns the client needed to access it.
+    Creates a client for the storage account; the containers it creates share its connection pool.
     """
     blob_service_client = BlobServiceClient.from_connection_string(
         connection_string
@@ -36,7 +34,26 @@ def create_container(
         f'{"Initializing storage client for account:"}'
         + f"{blob_service_client.account_name}"
     )
+    return blob_service_client
+
 
+def create_container(
+    connection_string: str, container_name: str
+) -> ContainerClient:
+    """
+    Creates and initialize a container; returns the client needed to access it.
+    """
+    return create_container_using_service_client(
+        create_blob_service_client(connection_string), container_name
+    )
+
+
+def create_container_using_service_client(
+    blob_service_client: BlobServiceClient, container_name: str
+) -> ContainerClient:
+    """
+    Creates and initialize a container with an existing storage client; returns the client needed to access it.
+    """
     container_client = blob_service_client.get_container_client(container_name)
     create_container_using_client(container_client)
     return container_client
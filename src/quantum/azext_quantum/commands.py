@@ -31,6 +31,10 @@ def transform_targets(providers):
 
 
 def transform_job(result):
+    # Several jobs are returned when they're submitted or waited for together
+    if isinstance(result, list):
+        return [transform_job(job) for job in result]
+
     transformed_result = OrderedDict([
         ('Name', result['name']),
         ('Id', result['id']),
@@ -5,12 +5,16 @@
 
 # pylint: disable=line-too-long,redefined-builtin,bare-except,inconsistent-return-statements,too-many-locals,too-many-branches,too-many-statements
 
+import builtins
 import gzip
 import io
 import json
 import logging
 import os
+import re
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 import knack.log
 
 from azure.cli.command_modules.storage.operations.account import show_storage_account_connection_string
@@ -18,7 +22,7 @@ from azure.cli.core.azclierror import (FileOperationError, AzureInternalError,
                                        InvalidArgumentValueError, AzureResponseError,
                                        RequiredArgumentMissingError)
 
-from .._storage import create_container, upload_blob
+from .._storage import create_blob_service_client, create_container_using_service_client, upload_blob
 
 from .._client_factory import cf_jobs, _get_data_credentials
 from .workspace import WorkspaceInfo
@@ -26,9 +30,19 @@ from .target import TargetInfo, get_provider
 
 
 MINIMUM_MAX_POLL_WAIT_SECS = 1
+INITIAL_POLL_WAIT_SECS = 0.2
+MAX_CONCURRENT_JOB_REQUESTS = 8
 DEFAULT_SHOTS = 500
 QIO_DEFAULT_TIMEOUT = 100
 
+# Job results are cached on disk, the least recently used ones are evicted beyond these limits
+RESULTS_CACHE_DIR_NAME = "azure-quantum-results"
+RESULTS_CACHE_MAX_FILES = 64
+RESULTS_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+RESULTS_CACHE_PARTIAL_SUFFIX = ".partial"
+RESULTS_CACHE_PARTIAL_MAX_AGE_SECS = 60 * 60
+RESULTS_CHUNK_SIZE = 1024 * 1024
+
 ERROR_MSG_MISSING_INPUT_FORMAT = "The following argument is required: --job-input-format"  # NOTE: The Azure CLI core generates a similar error message, but "the" is lowercase and "arguments" is always plural.
 ERROR_MSG_MISSING_OUTPUT_FORMAT = "The following argument is required: --job-output-format"
 ERROR_MSG_MISSING_ENTRY_POINT = "The following argument is required on QIR jobs: --entry-point"
@@ -214,7 +228,7 @@ def submit(cmd, program_args, resource_group_name, workspace_name, location, tar
     """
     Submit a quantum program to run on Azure Quantum.
     """
-    if job_input_file is None:
+    if not job_input_file:
         return _submit_qsharp(cmd, program_args, resource_group_name, workspace_name, location, target_id,
                               project, job_name, shots, storage, no_build, job_params, target_capability)
 
@@ -228,7 +242,10 @@ def _submit_directly_to_service(cmd, resource_group_name, workspace_name, locati
                                 job_input_file, job_input_format, job_output_format, entry_point):
     """
     Submit QIR bitcode, QIO problem JSON, or a pass-through job to run on Azure Quantum.
+    A job is submitted for each input file, several input files are uploaded and submitted concurrently.
     """
+    job_input_files = job_input_file if isinstance(job_input_file, builtins.list) else [job_input_file]
+
     if job_input_format is None:
         raise RequiredArgumentMissingError(ERROR_MSG_MISSING_INPUT_FORMAT, JOB_SUBMIT_DOC_LINK_MSG)
 
@@ -332,73 +349,33 @@ def _submit_directly_to_service(cmd, resource_group_name, workspace_name, locati
             content_encoding = job_params["contentEncoding"]
             del job_params["contentEncoding"]
 
-    # Prepare for input file upload according to job type
+    # Supply the default content settings of the input files according to job type
     if job_type == QIO_JOB:
         if content_type is None:
             content_type = "application/json"
         if content_encoding is None:
             content_encoding = "gzip"
-        try:
-            with open(job_input_file, encoding="utf-8") as qio_file:
-                uncompressed_blob_data = qio_file.read()
-        except (IOError, OSError) as e:
-            raise FileOperationError(f"An error occurred opening the input file: {job_input_file}") from e
-
-        if ("content_type" in uncompressed_blob_data and "application/x-protobuf" in uncompressed_blob_data) or (content_type.lower() == "application/x-protobuf"):
-            raise InvalidArgumentValueError('Content type "application/x-protobuf" is not supported.')
-
-        # Compress the input data (This code is based on to_blob in qdk-python\azure-quantum\azure\quantum\optimization\problem.py)
-        data = io.BytesIO()
-        with gzip.GzipFile(fileobj=data, mode="w") as fo:
-            fo.write(uncompressed_blob_data.encode())
-        blob_data = data.getvalue()
-
-    else:
-        if job_type == QIR_JOB:
-            if content_type is None:
-                if provider_id.lower() == "rigetti":
-                    content_type = "application/octet-stream"
-                else:
-                    # MAINTENANCE NOTE: The following value is valid for QCI and Quantinuum.
-                    # Make sure it's correct for new providers when they are added. If not,
-                    # modify this logic.
-                    content_type = "application/x-qir.v1"
-            content_encoding = None
-        try:
-            with open(job_input_file, "rb") as input_file:
-                blob_data = input_file.read()
-        except (IOError, OSError) as e:
-            raise FileOperationError(f"An error occurred opening the input file: {job_input_file}") from e
+    elif job_type == QIR_JOB:
+        if content_type is None:
+            if provider_id.lower() == "rigetti":
+                content_type = "application/octet-stream"
+            else:
+                # MAINTENANCE NOTE: The following value is valid for QCI and Quantinuum.
+                # Make sure it's correct for new providers when they are added. If not,
+                # modify this logic.
+                content_type = "application/x-qir.v1"
+        content_encoding = None
 
-    # Upload the input file to the workspace's storage account
+    # The input files are uploaded to the workspace's storage account, with one client for all of them
     if storage is None:
         from .workspace import get as ws_get
         ws = ws_get(cmd)
         if ws.storage_account is None:
             raise RequiredArgumentMissingError("No storage account specified or linked with workspace.")
         storage = ws.storage_account.split('/')[-1]
-    job_id = str(uuid.uuid4())
-    container_name = "quantum-job-" + job_id
     connection_string_dict = show_storage_account_connection_string(cmd, resource_group_name, storage)
     connection_string = connection_string_dict["connectionString"]
-    container_client = create_container(connection_string, container_name)
-    blob_name = "inputData"
-
-    knack_logger.warning("Uploading input data...")
-    try:
-        blob_uri = upload_blob(container_client, blob_name, content_type, content_encoding, blob_data, False)
-    except Exception as e:
-        # Unexplained behavior:
-        #    QIR bitcode input and QIO (gzip) input data get UnicodeDecodeError on jobs run in tests using
-        #    "azdev test --live", but the same commands are successful when run interactively.
-        #    See commented-out tests in test_submit in test_quantum_jobs.py
-        error_msg = f"Input file upload failed.\nError type: {type(e)}"
-        if isinstance(e, UnicodeDecodeError):
-            error_msg += f"\nReason: {e.reason}"
-        raise AzureResponseError(error_msg) from e
-
-    start_of_blob_name = blob_uri.find(blob_name)
-    container_uri = blob_uri[0:start_of_blob_name - 1]
+    blob_service_client = create_blob_service_client(connection_string)
 
     # Combine separate command-line parameters (like shots, target_capability, and entry_point) with job_params
     if job_params is None:
@@ -441,10 +418,9 @@ def _submit_directly_to_service(cmd, resource_group_name, workspace_name, locati
                 job_params["timeout"] = QIO_DEFAULT_TIMEOUT
             job_params = {"params": job_params}
 
-    # Submit the job
+    # Submit the jobs
     client = cf_jobs(cmd.cli_ctx, ws_info.subscription, ws_info.resource_group, ws_info.name, ws_info.location)
     job_details = {'name': job_name,
-                   'container_uri': container_uri,
                    'input_data_format': job_input_format,
                    'output_data_format': job_output_format,
                    'inputParams': job_params,
@@ -453,8 +429,93 @@ def _submit_directly_to_service(cmd, resource_group_name, workspace_name, locati
                    'metadata': metadata,
                    'tags': tags}
 
-    knack_logger.warning("Submitting job...")
-    return client.create(job_id, job_details)
+    # Every input file is read before any job is created, so an invalid one doesn't leave a part of the jobs submitted
+    blob_data_list = [_read_job_input(job_type, job_input_file, content_type) for job_input_file in job_input_files]
+
+    def upload_input(blob_data):
+        return _upload_job_input(blob_service_client, blob_data, content_type, content_encoding)
+
+    if len(job_input_files) == 1:
+        knack_logger.warning("Uploading input data...")
+        job_id, container_uri = upload_input(blob_data_list[0])
+        knack_logger.warning("Submitting job...")
+        return client.create(job_id, dict(job_details, container_uri=container_uri))
+
+    def upload_input_and_submit(blob_data):
+        job_id, container_uri = upload_input(blob_data)
+        return client.create(job_id, dict(job_details, container_uri=container_uri))
+
+    knack_logger.warning("Uploading input data and submitting %s jobs...", len(job_input_files))
+    jobs = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_JOB_REQUESTS, len(job_input_files))) as executor:
+        futures = [executor.submit(upload_input_and_submit, blob_data) for blob_data in blob_data_list]
+        for job_input_file, future in zip(job_input_files, futures):
+            try:
+                jobs.append(future.result())
+                logger.info("Submitted job %s with input data from %s", jobs[-1].id, job_input_file)
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append(e)
+                knack_logger.error("Failed to submit the job with input data from %s: %s", job_input_file, e)
+
+    if errors:
+        # The jobs that were submitted run anyway, their ids are needed to wait for them or cancel them
+        knack_logger.warning("%s of %s jobs were submitted: %s", len(jobs), len(job_input_files),
+                             " ".join(job.id for job in jobs))
+        raise errors[0]
+    return jobs
+
+
+def _read_job_input(job_type, job_input_file, content_type):
+    """
+    Read the input file of a job, QIO problems are compressed.
+    """
+    if job_type == QIO_JOB:
+        try:
+            with open(job_input_file, encoding="utf-8") as qio_file:
+                uncompressed_blob_data = qio_file.read()
+        except (IOError, OSError) as e:
+            raise FileOperationError(f"An error occurred opening the input file: {job_input_file}") from e
+
+        if ("content_type" in uncompressed_blob_data and "application/x-protobuf" in uncompressed_blob_data) or (content_type.lower() == "application/x-protobuf"):
+            raise InvalidArgumentValueError('Content type "application/x-protobuf" is not supported.')
+
+        # Compress the input data (This code is based on to_blob in qdk-python\azure-quantum\azure\quantum\optimization\problem.py)
+        data = io.BytesIO()
+        with gzip.GzipFile(fileobj=data, mode="w") as fo:
+            fo.write(uncompressed_blob_data.encode())
+        return data.getvalue()
+
+    try:
+        with open(job_input_file, "rb") as input_file:
+            return input_file.read()
+    except (IOError, OSError) as e:
+        raise FileOperationError(f"An error occurred opening the input file: {job_input_file}") from e
+
+
+def _upload_job_input(blob_service_client, blob_data, content_type, content_encoding):
+    """
+    Upload the input data of a new job to a container of its own. Returns the job id and the container URI.
+    """
+    job_id = str(uuid.uuid4())
+    container_name = "quantum-job-" + job_id
+    container_client = create_container_using_service_client(blob_service_client, container_name)
+    blob_name = "inputData"
+
+    try:
+        blob_uri = upload_blob(container_client, blob_name, content_type, content_encoding, blob_data, False)
+    except Exception as e:
+        # Unexplained behavior:
+        #    QIR bitcode input and QIO (gzip) input data get UnicodeDecodeError on jobs run in tests using
+        #    "azdev test --live", but the same commands are successful when run interactively.
+        #    See commented-out tests in test_submit in test_quantum_jobs.py
+        error_msg = f"Input file upload failed.\nError type: {type(e)}"
+        if isinstance(e, UnicodeDecodeError):
+            error_msg += f"\nReason: {e.reason}"
+        raise AzureResponseError(error_msg) from e
+
+    start_of_blob_name = blob_uri.find(blob_name)
+    return job_id, blob_uri[0:start_of_blob_name - 1]
 
 
 def _submit_qsharp(cmd, program_args, resource_group_name, workspace_name, location, target_id,
@@ -533,20 +594,251 @@ def _validate_item(provided_value, num_items):
     return valid_item
 
 
-def output(cmd, job_id, resource_group_name, workspace_name, location, item=None):
+def _get_results_cache_dir():
+    import tempfile
+    cache_dir = os.path.join(tempfile.gettempdir(), RESULTS_CACHE_DIR_NAME)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def _evict_results_cache(cache_dir, keep=None):
     """
-    Get the results of running a Q# job.
+    Remove the least recently used results until the cache is within its limits.
+    """
+    entries = []
+    now = time.time()
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if name.endswith(RESULTS_CACHE_PARTIAL_SUFFIX):
+            # A download in progress, or left behind by an interrupted one
+            if now - stat.st_mtime > RESULTS_CACHE_PARTIAL_MAX_AGE_SECS:
+                _remove_file(path)
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    num_files = len(entries)
+    total_size = sum(size for _, size, _ in entries)
+    entries.sort()  # least recently used first
+    for _, size, path in entries:
+        if num_files <= RESULTS_CACHE_MAX_FILES and total_size <= RESULTS_CACHE_MAX_BYTES:
+            break
+        if path == keep:
+            continue
+        logger.debug("Evicting cached job results %s", path)
+        _remove_file(path)
+        num_files -= 1
+        total_size -= size
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _download_results(cmd, job, path):
+    """
+    Download the job results blob to the cache, where it's only visible once complete.
     """
-    import tempfile
     from azure.cli.command_modules.storage._client_factory import blob_data_service_factory
 
-    path = os.path.join(tempfile.gettempdir(), job_id)
+    args = _parse_blob_url(job.output_data_uri)
+    blob_service = blob_data_service_factory(cmd.cli_ctx, args)
+    partial_path = f"{path}.{uuid.uuid4()}{RESULTS_CACHE_PARTIAL_SUFFIX}"
+    try:
+        blob_service.get_blob_to_path(args['container'], args['blob'], partial_path)
+        os.replace(partial_path, path)
+    finally:
+        _remove_file(partial_path)
+
+
+def _reversed_lines(results_file):
+    """
+    Yield the lines of a binary file from the last one, with the offsets they start at.
+    """
+    results_file.seek(0, os.SEEK_END)
+    position = results_file.tell()
+    buffer = b''
+    at_end = True
+    while position > 0:
+        size = min(RESULTS_CHUNK_SIZE, position)
+        position -= size
+        results_file.seek(position)
+        buffer = results_file.read(size) + buffer
+        lines = buffer.split(b'\n')
+        # The first line may carry on before this chunk, unless it's the beginning of the file
+        complete_lines = lines if position == 0 else lines[1:]
+        line_end = position + len(buffer)
+        for line in reversed(complete_lines):
+            line_start = line_end - len(line)
+            # Nothing follows the newline at the end of the file
+            if not (at_end and line == b''):
+                yield line_start, line
+            at_end = False
+            line_end = line_start - 1
+        buffer = lines[0]
+
+
+def _find_simulator_result(results_file):
+    """
+    Find where the result starts at the end of the simulator output: it's either the last line, or a quoted string
+    that can span several lines. Returns the offset of the result and whether it's a string, or None if empty.
+    """
+    is_result_string = None
+    for line_start, line in _reversed_lines(results_file):
+        line = line.strip()
+        if is_result_string is None:
+            is_result_string = line.endswith(b'"')
+            if not is_result_string:
+                return line_start, False
+        if line.startswith(b'"'):
+            return line_start, True
+
+    if is_result_string is None:
+        return None
+    raise AzureResponseError("Job output is malformed, mismatched quote characters.")
+
+
+def _read_simulator_result(results_file):
+    """
+    Print the output of a simulator job line by line, then return its result as a histogram.
+    """
+    result_start = _find_simulator_result(results_file)
+
+    # Receiving an empty response is valid.
+    if result_start is None:
+        return
+    result_start, is_result_string = result_start
+
+    # Print the job output and then the result of the operation as a histogram.
+    # If the result is a string, trim the quotation marks.
+    results_file.seek(0)
+    if result_start == 0:
+        print()
+    while results_file.tell() < result_start:
+        print(results_file.readline().decode().strip())
+    raw_result = ' '.join(line.decode().strip() for line in results_file)
+    result = raw_result[1:-1] if is_result_string else raw_result
+    print('_' * len(result) + '\n')
+
+    json_string = '{ "histogram" : { "' + result + '" : 1 } }'
+    return json.loads(json_string)
+
+
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def _iter_json_array(results_file):
+    """
+    Yield the items of the JSON array in a text file one at a time, so only one of them is in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    at_eof = False
+
+    def read_more(min_size=0):
+        nonlocal buffer, position, at_eof
+        chunk = results_file.read(max(RESULTS_CHUNK_SIZE, min_size))
+        at_eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def next_char():
+        nonlocal position
+        while True:
+            position = JSON_WHITESPACE.match(buffer, position).end()
+            if position < len(buffer):
+                return buffer[position]
+            if at_eof:
+                raise AzureResponseError("Job output is malformed, the results end unexpectedly.")
+            read_more()
+
+    if next_char() != '[':
+        raise AzureResponseError("Job output is malformed, the results of a batch job aren't a list.")
+    position += 1
+    if next_char() == ']':
+        return
+    while True:
+        next_char()
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            if at_eof:
+                raise AzureResponseError("Job output is malformed, the results aren't valid JSON.") from e
+            # Reading at least as much again as what's pending keeps the retries linear
+            read_more(len(buffer) - position)
+            continue
+        if end == len(buffer) and not at_eof:
+            # A number may carry on in the next chunk
+            read_more(len(buffer) - position)
+            continue
+        yield value
+        position = end
+        separator = next_char()
+        position += 1
+        if separator == ']':
+            return
+        if separator != ',':
+            raise AzureResponseError("Job output is malformed, the results aren't valid JSON.")
+
+
+def _starts_with_array(results_file):
+    start = results_file.read(RESULTS_CHUNK_SIZE).lstrip(' \t\n\r')
+    while not start:
+        chunk = results_file.read(RESULTS_CHUNK_SIZE)
+        if not chunk:
+            break
+        start = chunk.lstrip(' \t\n\r')
+    results_file.seek(0)
+    return start.startswith('[')
+
+
+def _read_json_item(results_file, item):
+    """
+    Return an item of the results of a batch job, without keeping the other items in memory.
+    """
+    from collections import deque
+
+    try:
+        index = int(item)
+    except ValueError:
+        index = None
+
+    num_items = 0
+    last_items = deque(maxlen=-index) if index is not None and index < 0 else None
+    for value in _iter_json_array(results_file):
+        if num_items == index:
+            return value
+        if last_items is not None:
+            last_items.append(value)
+        num_items += 1
+
+    if last_items is not None and len(last_items) == -index:
+        return last_items[0]
+    _validate_item(item, num_items)
+    raise InvalidArgumentValueError(f"--item parameter is not valid: {item}",
+                                    f"Must be a non-negative number less than {num_items}")
+
+
+def output(cmd, job_id, resource_group_name, workspace_name, location, item=None):
+    """
+    Get the results of running a Q# job.
+    """
+    cache_dir = _get_results_cache_dir()
+    path = os.path.join(cache_dir, job_id)
     info = WorkspaceInfo(cmd, resource_group_name, workspace_name, location)
     client = cf_jobs(cmd.cli_ctx, info.subscription, info.resource_group, info.name, info.location)
     job = client.get(job_id)
 
     if os.path.exists(path):
         logger.debug("Using existing blob from %s", path)
+        os.utime(path)  # Keep the results that are used in the cache
     else:
         logger.debug("Downloading job results blob into %s", path)
 
@@ -556,46 +848,23 @@ def output(cmd, job_id, resource_group_name, workspace_name, location, item=None
             #             parameter is specified, then the full JSON job output is displayed, being
             #             consistent with other commands.
 
-        args = _parse_blob_url(job.output_data_uri)
-        blob_service = blob_data_service_factory(cmd.cli_ctx, args)
-        blob_service.get_blob_to_path(args['container'], args['blob'], path)
+        _download_results(cmd, job, path)
+        _evict_results_cache(cache_dir, keep=path)
 
-    with open(path) as json_file:
-        lines = [line.strip() for line in json_file.readlines()]
+    if job.target.startswith("microsoft.simulator") and job.target != "microsoft.simulator.resources-estimator":
+        with open(path, 'rb') as results_file:
+            return _read_simulator_result(results_file)
 
-        # Receiving an empty response is valid.
-        if len(lines) == 0:
-            return
-
-        if job.target.startswith("microsoft.simulator") and job.target != "microsoft.simulator.resources-estimator":
-            result_start_line = len(lines) - 1
-            is_result_string = lines[-1].endswith('"')
-            if is_result_string:
-                while result_start_line >= 0 and not lines[result_start_line].startswith('"'):
-                    result_start_line -= 1
-            if result_start_line < 0:
-                raise AzureResponseError("Job output is malformed, mismatched quote characters.")
-
-            # Print the job output and then the result of the operation as a histogram.
-            # If the result is a string, trim the quotation marks.
-            print('\n'.join(lines[:result_start_line]))
-            raw_result = ' '.join(lines[result_start_line:])
-            result = raw_result[1:-1] if is_result_string else raw_result
-            print('_' * len(result) + '\n')
-
-            json_string = '{ "histogram" : { "' + result + '" : 1 } }'
-            data = json.loads(json_string)
-        else:
-            json_file.seek(0)  # Reset the file pointer before loading
-            data = json.load(json_file)
+    # Receiving an empty response is valid.
+    if os.path.getsize(path) == 0:
+        return
 
+    with open(path, encoding='utf-8') as results_file:
         # Consider item if it's a batch job, otherwise ignore
-        import builtins  # list has been overriden as a function above
-        if item and isinstance(data, builtins.list):
-            item = _validate_item(item, len(data))
-            return data[item]
+        if item and _starts_with_array(results_file):
+            return _read_json_item(results_file, item)
 
-        return data
+        return json.load(results_file)
 
 
 def _validate_max_poll_wait_secs(max_poll_wait_secs):
@@ -616,31 +885,63 @@ def _validate_max_poll_wait_secs(max_poll_wait_secs):
 
 def wait(cmd, job_id, resource_group_name, workspace_name, location, max_poll_wait_secs=5):
     """
-    Place the CLI in a waiting state until the job finishes running.
+    Place the CLI in a waiting state until the job finishes running, or until all of them finish when several are given.
     """
-    import time
-
     info = WorkspaceInfo(cmd, resource_group_name, workspace_name, location)
     client = cf_jobs(cmd.cli_ctx, info.subscription, info.resource_group, info.name, info.location)
 
     # TODO: LROPoller...
-    wait_indicators_used = False
-    poll_wait = 0.2
     max_poll_wait_secs = _validate_max_poll_wait_secs(max_poll_wait_secs)
-    job = client.get(job_id)
+    job_ids = job_id if isinstance(job_id, builtins.list) else [job_id]
+    jobs = {}
+    for completed_job_id, job in _wait_for_jobs(client, job_ids, max_poll_wait_secs):
+        jobs[completed_job_id] = job
+        if len(job_ids) > 1:
+            knack_logger.warning("Job %s has completed with status: %s. (%s of %s)", completed_job_id, job.status,
+                                 len(jobs), len(job_ids))
 
-    while not _has_completed(job):
-        print('.', end='', flush=True)
-        wait_indicators_used = True
-        time.sleep(poll_wait)
-        job = client.get(job_id)
-        poll_wait = max_poll_wait_secs if poll_wait >= max_poll_wait_secs else poll_wait * 1.5
+    if len(job_ids) == 1:
+        return jobs[job_ids[0]]
+    return [jobs[job_id] for job_id in job_ids]
 
-    if wait_indicators_used:
-        # Insert a new line if we had to display wait indicators.
-        print()
 
-    return job
+def _wait_for_jobs(client, job_ids, max_poll_wait_secs):
+    """
+    Poll the jobs together and yield each job id and job as soon as the job has completed.
+    """
+    wait_indicators_used = False
+    poll_wait = INITIAL_POLL_WAIT_SECS
+    pending_job_ids = job_ids
+
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_JOB_REQUESTS, len(job_ids))) as executor:
+        while True:
+            completed = []
+            still_pending_job_ids = []
+            for job_id, job in zip(pending_job_ids, executor.map(client.get, pending_job_ids)):
+                if _has_completed(job):
+                    completed.append((job_id, job))
+                else:
+                    still_pending_job_ids.append(job_id)
+
+            if completed and wait_indicators_used:
+                # Insert a new line if we had to display wait indicators.
+                print()
+                wait_indicators_used = False
+            yield from completed
+
+            pending_job_ids = still_pending_job_ids
+            if not pending_job_ids:
+                return
+
+            print('.', end='', flush=True)
+            wait_indicators_used = True
+            time.sleep(poll_wait)
+            # All the jobs share the schedule: it backs off while none of them completes, and
+            # steps back towards polling sooner when some do, since jobs of a sweep finish together.
+            if completed:
+                poll_wait = max(INITIAL_POLL_WAIT_SECS, poll_wait / 1.5)
+            else:
+                poll_wait = min(max_poll_wait_secs, poll_wait * 1.5)
 
 
 def job_show(cmd, job_id, resource_group_name, workspace_name, location):
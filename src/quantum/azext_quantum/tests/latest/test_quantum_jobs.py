@@ -3,21 +3,30 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import contextlib
+import io
 import json
 import os
 import pytest
+import tempfile
+import threading
+import time
+import tracemalloc
 import unittest
+from types import SimpleNamespace
+from unittest import mock
 
 from azure.cli.testsdk.scenario_tests import AllowLargeResponse, live_only
 from azure.cli.testsdk import ScenarioTest
-from azure.cli.core.azclierror import InvalidArgumentValueError, AzureInternalError
+from azure.cli.core.azclierror import InvalidArgumentValueError, AzureInternalError, AzureResponseError, FileOperationError
 
 from .utils import get_test_subscription_id, get_test_resource_group, get_test_workspace, get_test_workspace_location, issue_cmd_with_param_missing, get_test_workspace_storage, get_test_workspace_random_name
 from ..._client_factory import _get_data_credentials
 from ...commands import transform_output
 from ...operations.workspace import WorkspaceInfo, DEPLOYMENT_NAME_PREFIX
 from ...operations.target import TargetInfo
-from ...operations.job import _generate_submit_args, _parse_blob_url, _validate_max_poll_wait_secs, build, _convert_numeric_params
+from ...operations.job import _generate_submit_args, _parse_blob_url, _validate_max_poll_wait_secs, build, _convert_numeric_params, \
+    _evict_results_cache, _read_json_item, _read_simulator_result, output, _wait_for_jobs, submit, wait
 
 TEST_DIR = os.path.abspath(os.path.join(os.path.abspath(__file__), '..'))
 
@@ -259,6 +268,214 @@ class QuantumJobsScenarioTest(ScenarioTest):
         _convert_numeric_params(test_job_params)
         assert test_job_params == {"string1": "string_value1", "metadata": {"meta1": "meta_value1", "meta2": "2"}, "integer1": 1}
 
+    def test_simulator_result(self):
+        cases = [
+            (b'Hello\nWorld\n"[0,1]"\n', "Hello\nWorld\n_____\n\n", "[0,1]"),
+            (b'out 1\n"line a\n  line b"', "out 1\n_____________\n\n", "line a line b"),
+            (b'out 1\n"ignored"\nout 2\n42\n', 'out 1\n"ignored"\nout 2\n__\n\n', "42"),
+            (b'"only the result"\n', "\n_______________\n\n", "only the result"),
+        ]
+        # Small chunks to read across their boundaries
+        with mock.patch('azext_quantum.operations.job.RESULTS_CHUNK_SIZE', 3):
+            for content, expected_output, expected_result in cases:
+                printed = io.StringIO()
+                with contextlib.redirect_stdout(printed):
+                    data = _read_simulator_result(io.BytesIO(content))
+                self.assertEqual(expected_output, printed.getvalue())
+                self.assertEqual({"histogram": {expected_result: 1}}, data)
+
+            self.assertIsNone(_read_simulator_result(io.BytesIO(b'')))
+            with self.assertRaises(AzureResponseError):
+                _read_simulator_result(io.BytesIO(b'out\nresult"\n'))
+
+    def test_batch_item(self):
+        items = [{"index": i, "estimate": 12345.678 * i, "name": "item \\ \"" + str(i)} for i in range(10)] + [1234567, []]
+        results = json.dumps(items, indent=2)
+        with mock.patch('azext_quantum.operations.job.RESULTS_CHUNK_SIZE', 7):
+            for index, expected in enumerate(items):
+                self.assertEqual(expected, _read_json_item(io.StringIO(results), str(index)))
+            self.assertEqual(items[-3], _read_json_item(io.StringIO(results), "-3"))
+            for item in ["12", "-13", "foobar"]:
+                with self.assertRaises(InvalidArgumentValueError):
+                    _read_json_item(io.StringIO(results), item)
+            with self.assertRaises(AzureResponseError):
+                _read_json_item(io.StringIO(results[:-20]), "11")
+
+    def test_batch_item_memory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "results")
+            with open(path, 'w') as results_file:
+                results_file.write('[')
+                for i in range(30):
+                    results_file.write(('' if i == 0 else ',') + json.dumps({"index": i, "data": "x" * 1024 * 1024}))
+                results_file.write(']')
+
+            tracemalloc.start()
+            with open(path, encoding='utf-8') as results_file:
+                data = _read_json_item(results_file, "29")
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        self.assertEqual(29, data["index"])
+        # A few items at a time rather than the 30MB of results
+        self.assertLess(peak, 10 * 1024 * 1024)
+
+    def test_results_cache_eviction(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            now = time.time()
+            for i in range(5):
+                path = os.path.join(cache_dir, f"job{i}")
+                with open(path, 'wb') as f:
+                    f.write(b"x" * 100)
+                os.utime(path, (now - 100 + i, now - 100 + i))
+            for name, age in [("job5.1.partial", 7200), ("job6.2.partial", 10)]:
+                path = os.path.join(cache_dir, name)
+                open(path, 'wb').close()
+                os.utime(path, (now - age, now - age))
+
+            with mock.patch('azext_quantum.operations.job.RESULTS_CACHE_MAX_FILES', 3):
+                # job0 was just downloaded again
+                _evict_results_cache(cache_dir, keep=os.path.join(cache_dir, "job0"))
+            self.assertEqual(["job0", "job3", "job4", "job6.2.partial"], sorted(os.listdir(cache_dir)))
+
+            with mock.patch('azext_quantum.operations.job.RESULTS_CACHE_MAX_BYTES', 150):
+                _evict_results_cache(cache_dir)
+            self.assertEqual(["job4", "job6.2.partial"], sorted(os.listdir(cache_dir)))
+
+    def test_output_is_cached(self):
+        downloads = []
+
+        def download_results(cmd, job, path):
+            downloads.append(job.output_data_uri)
+            with open(path, 'w') as f:
+                json.dump([{"histogram": {"0": 0.5}}, {"histogram": {"1": 0.5}}], f)
+
+        job = SimpleNamespace(status="Succeeded", target="microsoft.estimator",
+                              output_data_uri="https://account.blob.core.windows.net/container/rawOutputData?sig=sig")
+        client = mock.Mock()
+        client.get.return_value = job
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                mock.patch('azext_quantum.operations.job._get_results_cache_dir', return_value=cache_dir), \
+                mock.patch('azext_quantum.operations.job.WorkspaceInfo'), \
+                mock.patch('azext_quantum.operations.job.cf_jobs', return_value=client), \
+                mock.patch('azext_quantum.operations.job._download_results', side_effect=download_results):
+            self.assertEqual({"histogram": {"1": 0.5}}, output(mock.Mock(), "job-id", "rg", "ws", "location", item="1"))
+            self.assertEqual(2, len(output(mock.Mock(), "job-id", "rg", "ws", "location")))
+            self.assertEqual(["job-id"], os.listdir(cache_dir))
+        self.assertEqual([job.output_data_uri], downloads)
+
+    def test_wait_for_jobs(self):
+        # The number of polls after which each job completes
+        polls_to_complete = {"job-a": 2, "job-b": 6, "job-c": 1}
+        polls = {job_id: 0 for job_id in polls_to_complete}
+
+        def get(job_id):
+            polls[job_id] += 1
+            status = "Succeeded" if polls[job_id] >= polls_to_complete[job_id] else "Executing"
+            return SimpleNamespace(id=job_id, status=status)
+
+        client = SimpleNamespace(get=get)
+        with mock.patch('azext_quantum.operations.job.time.sleep') as sleep, \
+                contextlib.redirect_stdout(io.StringIO()):
+            completed = [job_id for job_id, _ in _wait_for_jobs(client, ["job-a", "job-b", "job-c"], 0.5)]
+        self.assertEqual(["job-c", "job-a", "job-b"], completed)
+        # Each round polls the pending jobs only
+        self.assertEqual({"job-a": 2, "job-b": 6, "job-c": 1}, polls)
+        # One shared schedule, backing off while no job completes
+        self.assertEqual([0.2, 0.2, 0.2, 0.3, 0.45], [round(c.args[0], 2) for c in sleep.call_args_list])
+
+        polls = {job_id: 0 for job_id in polls_to_complete}
+        with mock.patch('azext_quantum.operations.job.time.sleep'), \
+                mock.patch('azext_quantum.operations.job.WorkspaceInfo'), \
+                mock.patch('azext_quantum.operations.job.cf_jobs', return_value=client), \
+                contextlib.redirect_stdout(io.StringIO()):
+            jobs = wait(mock.Mock(), ["job-b", "job-a"], "rg", "ws", "location")
+            self.assertEqual(["job-b", "job-a"], [job.id for job in jobs])
+            self.assertEqual("job-c", wait(mock.Mock(), "job-c", "rg", "ws", "location").id)
+
+    @contextlib.contextmanager
+    def _mock_submit_services(self, upload_blob, client):
+        with mock.patch('azext_quantum.operations.job.WorkspaceInfo'), \
+                mock.patch('azext_quantum.operations.job.TargetInfo'), \
+                mock.patch('azext_quantum.operations.job.get_provider', return_value="provider"), \
+                mock.patch('azext_quantum.operations.job.show_storage_account_connection_string',
+                           return_value={"connectionString": "connection string"}) as show_connection_string, \
+                mock.patch('azext_quantum.operations.job.create_blob_service_client') as create_blob_service_client, \
+                mock.patch('azext_quantum.operations.job.create_container_using_service_client',
+                           side_effect=lambda blob_service_client, container_name: container_name), \
+                mock.patch('azext_quantum.operations.job.upload_blob', side_effect=upload_blob), \
+                mock.patch('azext_quantum.operations.job.cf_jobs', return_value=client):
+            yield show_connection_string, create_blob_service_client
+
+    def _write_job_inputs(self, tmpdir, count):
+        job_input_files = []
+        for i in range(count):
+            job_input_files.append(os.path.join(tmpdir, f"input{i}"))
+            with open(job_input_files[-1], 'wb') as f:
+                f.write(b"input %d" % i)
+        return job_input_files
+
+    def test_submit_batch(self):
+        in_flight = 0
+        max_in_flight = 0
+        uploads = {}
+        lock = threading.Lock()
+
+        def upload_blob(container_client, blob_name, content_type, content_encoding, data, return_sas_token):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+                uploads[container_client] = data
+            return f"https://account.blob.core.windows.net/{container_client}/{blob_name}"
+
+        client = mock.Mock()
+        client.create.side_effect = lambda job_id, job_details: SimpleNamespace(id=job_id, **job_details)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            job_input_files = self._write_job_inputs(tmpdir, 16)
+            with self._mock_submit_services(upload_blob, client) as (show_connection_string, create_blob_service_client):
+                jobs = submit(mock.Mock(), [], "rg", "ws", "location", "target", storage="account", job_params={},
+                              job_input_file=job_input_files, job_input_format="custom.v1", job_output_format="custom.v1")
+
+        # One storage client and connection string for all the jobs
+        self.assertEqual(1, show_connection_string.call_count)
+        self.assertEqual(1, create_blob_service_client.call_count)
+        self.assertGreater(max_in_flight, 1)
+        # The jobs are returned in the order of their input files, each with its own container
+        self.assertEqual(16, len({job.container_uri for job in jobs}))
+        for i, job in enumerate(jobs):
+            self.assertEqual(f"https://account.blob.core.windows.net/quantum-job-{job.id}", job.container_uri)
+            self.assertEqual(b"input %d" % i, uploads["quantum-job-" + job.id])
+
+    def test_submit_batch_failures(self):
+        def upload_blob(container_client, blob_name, content_type, content_encoding, data, return_sas_token):
+            if data == b"input 2":
+                raise ValueError("upload failed")
+            return f"https://account.blob.core.windows.net/{container_client}/{blob_name}"
+
+        client = mock.Mock()
+        client.create.side_effect = lambda job_id, job_details: SimpleNamespace(id=job_id, **job_details)
+        submit_args = dict(storage="account", job_params={}, job_input_format="custom.v1", job_output_format="custom.v1")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            job_input_files = self._write_job_inputs(tmpdir, 4)
+            with self._mock_submit_services(upload_blob, client), \
+                    mock.patch('azext_quantum.operations.job.knack_logger') as knack_logger:
+                # No job is created when an input file can't be read
+                with self.assertRaises(FileOperationError):
+                    submit(mock.Mock(), [], "rg", "ws", "location", "target",
+                           job_input_file=job_input_files + [os.path.join(tmpdir, "missing")], **submit_args)
+                self.assertEqual(0, client.create.call_count)
+
+                # The ids of the jobs submitted are reported along with the error
+                with self.assertRaises(AzureResponseError):
+                    submit(mock.Mock(), [], "rg", "ws", "location", "target", job_input_file=job_input_files, **submit_args)
+        submitted = [c.args[0] for c in client.create.call_args_list]
+        self.assertEqual(3, len(submitted))
+        knack_logger.warning.assert_called_with("%s of %s jobs were submitted: %s", 3, 4, mock.ANY)
+        self.assertEqual(set(submitted), set(knack_logger.warning.call_args.args[3].split()))
+
     @live_only()
     def test_submit(self):
         test_location = get_test_workspace_location()
@@ -15,6 +15,7 @@ from azure.cli.core.commands.client_factory import get_subscription_id
 from msrestazure.azure_exceptions import CloudError
 from .vendored_sdks.appplatform.v2023_09_01_preview import models
 from ._deployment_uploadable_factory import uploader_selector
+from ._source_manifest import get_source_manifest
 from ._log_stream import LogStream
 
 logger = get_logger(__name__)
@@ -35,20 +36,37 @@ class BuildService:
         return 4
 
     def build_and_get_result(self, total_steps, **kwargs):
-        logger.warning("[1/{}] Requesting for upload URL.".format(total_steps))
-        upload_info = self._get_upload_info()
-        logger.warning("[2/{}] Uploading package to blob.".format(total_steps))
-        uploader_selector(cli_ctx=self.cmd.cli_ctx, upload_url=upload_info.upload_url, **kwargs).upload_and_build(**kwargs)
+        relative_path = self._upload(total_steps, **kwargs)
         if 'app' in kwargs:
             build_name = kwargs['app']
         else:
             build_name = kwargs['build_name']
         logger.warning("[3/{}] Creating or Updating build '{}'.".format(total_steps, build_name))
-        build_result_id = self._queue_build(upload_info.relative_path, **kwargs)
+        build_result_id = self._queue_build(relative_path, **kwargs)
         logger.warning("[4/{}] Waiting for building container image to finish. This may take a few minutes.".format(total_steps))
         self._wait_build_finished(build_result_id)
         return build_result_id
 
+    def _upload(self, total_steps, source_path=None, **kwargs):
+        source_manifest = None
+        if source_path:
+            scope = '/subscriptions/{}/resourceGroups/{}/providers/Microsoft.AppPlatform/Spring/{}/buildServices/{}' \
+                .format(get_subscription_id(self.cmd.cli_ctx), self.resource_group, self.service, self.name)
+            source_manifest = get_source_manifest(self.cmd.cli_ctx, scope, source_path)
+            relative_path = source_manifest.get_unchanged_upload() if source_manifest else None
+            if relative_path:
+                logger.warning("[2/{}] Source code is unchanged since the last upload, skip uploading."
+                               .format(total_steps))
+                return relative_path
+        logger.warning("[1/{}] Requesting for upload URL.".format(total_steps))
+        upload_info = self._get_upload_info()
+        logger.warning("[2/{}] Uploading package to blob.".format(total_steps))
+        uploader_selector(cli_ctx=self.cmd.cli_ctx, upload_url=upload_info.upload_url, source_path=source_path,
+                          **kwargs).upload_and_build(source_path=source_path, source_manifest=source_manifest, **kwargs)
+        if source_manifest:
+            source_manifest.save(upload_info.relative_path, upload_info.upload_url)
+        return upload_info.relative_path
+
     def _get_upload_info(self):
         try:
             response = self.client.build_service.get_resource_upload_url(self.resource_group, self.service, self.name)
@@ -6,7 +6,24 @@
 # pylint: disable=wrong-import-order
 # pylint: disable=unused-argument, logging-format-interpolation, protected-access, wrong-import-order, too-many-lines
 
+import os
+
 MARKETPLACE_OFFER_ID = 'azure-spring-cloud-vmware-tanzu-2'
 MARKETPLACE_PUBLISHER_ID = 'vmware-inc'
 MARKETPLACE_PLAN_ID = 'asa-ent-hr-mtr'
 AKS_RP = 'Microsoft.ContainerService'
+
+# Source code archives are compressed in chunks of this size on multiple threads
+SOURCE_ARCHIVE_CHUNK_SIZE = 1024 * 1024
+SOURCE_ARCHIVE_COMPRESS_WORKERS = min(8, os.cpu_count() or 1)
+# Number of ranges of the archive uploaded at the same time
+SOURCE_ARCHIVE_UPLOAD_WORKERS = 4
+# Modification time of every file in source code archives, timestamps before 1980 can't be stored in zip files
+SOURCE_ARCHIVE_MTIME = 315619200
+
+# Content hashes of the last uploaded source code of each app, unchanged source code isn't uploaded again
+SOURCE_MANIFEST_FOLDER_NAME = 'spring_source_manifests'
+SOURCE_MANIFEST_FORMAT_VERSION = 1
+# Uploaded source code is only reused for this long, uploads are not kept forever
+SOURCE_MANIFEST_MAX_AGE_IN_SECONDS = 24 * 60 * 60
+SOURCE_MANIFEST_HASH_WORKERS = min(8, os.cpu_count() or 1)
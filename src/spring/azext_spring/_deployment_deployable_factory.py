@@ -6,7 +6,9 @@
 # pylint: disable=wrong-import-order
 from knack.log import get_logger
 from azure.cli.core.azclierror import InvalidArgumentValueError
+from azure.cli.core.commands.client_factory import get_subscription_id
 from ._deployment_uploadable_factory import FileUpload, FolderUpload
+from ._source_manifest import get_source_manifest
 from azure.core.exceptions import HttpResponseError
 from time import sleep
 from ._stream_utils import stream_logs
@@ -70,6 +72,9 @@ class UploadDeployableBuilder(EmptyDeployableBuilder):
             raise InvalidArgumentValueError('Failed to get a SAS URL to upload context.')
         logger.warning('[2/{}] Uploading package to blob.'.format(kwargs['total_steps']))
         self._get_uploader(upload_url=upload_info.upload_url).upload_and_build(**kwargs)
+        source_manifest = kwargs.get('source_manifest')
+        if source_manifest:
+            source_manifest.save(upload_info.relative_path, upload_info.upload_url)
         return upload_info.relative_path
 
     def _get_uploader(self, upload_url=None):
@@ -78,7 +83,13 @@ class UploadDeployableBuilder(EmptyDeployableBuilder):
 
 class SourceBuildDeployableBuilder(UploadDeployableBuilder):
     def build_deployable_path(self, **kwargs):
-        relative_path = super().build_deployable_path(**kwargs)
+        source_manifest = get_source_manifest(self.cmd.cli_ctx, self._get_upload_scope(), kwargs['source_path'])
+        relative_path = source_manifest.get_unchanged_upload() if source_manifest else None
+        if relative_path:
+            logger.warning('[2/{}] Source code is unchanged since the last upload, skip uploading.'
+                           .format(kwargs['total_steps']))
+        else:
+            relative_path = super().build_deployable_path(source_manifest=source_manifest, **kwargs)
         if not kwargs.get('no_wait'):
             self.retrieve_log(**kwargs)
         return relative_path
@@ -89,6 +100,10 @@ class SourceBuildDeployableBuilder(UploadDeployableBuilder):
     def get_source_type(self, **_):
         return 'Source'
 
+    def _get_upload_scope(self):
+        return '/subscriptions/{}/resourceGroups/{}/providers/Microsoft.AppPlatform/Spring/{}/apps/{}'.format(
+            get_subscription_id(self.cmd.cli_ctx), self.resource_group, self.service, self.app)
+
     def retrieve_log(self, client, resource_group, service, app, deployment, **_):
         def get_log_url():
             try:
@@ -5,12 +5,16 @@
 
 # pylint: disable=wrong-import-order
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from re import L
-import tempfile
-import uuid
+from knack.log import get_logger
 from azure.cli.core.azclierror import InvalidArgumentValueError
 from azure.cli.core.profiles import ResourceType, get_sdk
-from ._utils import (get_azure_files_info, _pack_source_code)
+from ._constant import SOURCE_ARCHIVE_UPLOAD_WORKERS
+from ._utils import (get_azure_files_info, _write_source_archive)
+
+logger = get_logger(__name__)
 
 
 class Empty:
@@ -40,26 +44,103 @@ class FileUpload:
         else:
             raise InvalidArgumentValueError('Unexpected artifact file type, must be one of .zip, .tar.gz, .tar, .jar, .war.')
 
+    def exists(self):
+        '''
+        Whether the file at the upload url can still be found
+        '''
+        try:
+            return self._get_file_service().exists(self.share_name, None, self.relative_name)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug('Failed to check the file at the upload url: {}'.format(str(e)))
+            return False
+
     def _upload(self, artifact_path):
-        FileService = get_sdk(self.cli_ctx, ResourceType.DATA_STORAGE, 'file#FileService')
-        file_service = FileService(self.account_name, sas_token=self.sas_token, endpoint_suffix=self.endpoint_suffix)
+        file_service = self._get_file_service()
         file_service.create_file_from_path(self.share_name, None, self.relative_name, artifact_path)
 
+    def _get_file_service(self):
+        FileService = get_sdk(self.cli_ctx, ResourceType.DATA_STORAGE, 'file#FileService')
+        return FileService(self.account_name, sas_token=self.sas_token, endpoint_suffix=self.endpoint_suffix)
+
 
 class FolderUpload(FileUpload):
     '''
     Compress and upload a folder in local file system to upload url
     '''
-    def upload_and_build(self, source_path, **kwargs):
+    def upload_and_build(self, source_path, source_manifest=None, **kwargs):
         if not source_path:
             raise InvalidArgumentValueError('--source-path is not set.')
-        artifact_path = self._compress_folder(source_path)
-        self._upload(artifact_path)
+        entries = None
+        if source_manifest:
+            # list and hash the files once, the same entries are archived
+            source_manifest.update()
+            entries = source_manifest.entries
+        # the archive is uploaded while it is being produced, it is never written to the local disk
+        with FileRangeWriter(self._get_file_service(), self.share_name, self.relative_name) as upload_stream:
+            _write_source_archive(os.path.abspath(source_path), upload_stream, entries)
+
+
+class FileRangeWriter:
+    '''
+    Write-only file object which uploads the data written to it to a file in Azure Files, one range at a time on
+    a thread pool. The file is created before its final size is known, it is grown as needed and truncated to the
+    written size on close.
+    '''
+    def __init__(self, file_service, share_name, file_name, max_workers=SOURCE_ARCHIVE_UPLOAD_WORKERS,
+                 range_size=None):
+        self.file_service = file_service
+        self.share_name = share_name
+        self.file_name = file_name
+        self.range_size = range_size or file_service.MAX_RANGE_SIZE
+        self.max_workers = max_workers
+        self.size = 0
+        self._capacity = self.range_size * max_workers
+        self._buffer = bytearray()
+        self._pending = deque()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.file_service.create_file(self.share_name, None, self.file_name, self._capacity)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self.range_size:
+            self._submit(bytes(self._buffer[:self.range_size]))
+            del self._buffer[:self.range_size]
+        return len(data)
+
+    def close(self):
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer = bytearray()
+            while self._pending:
+                self._pending.popleft().result()
+            self.file_service.resize_file(self.share_name, None, self.file_name, self.size)
+        finally:
+            self._executor.shutdown(wait=True)
 
-    def _compress_folder(self, folder):
-        file_path = os.path.join(tempfile.gettempdir(), 'build_archive_{}.tar.gz'.format(uuid.uuid4().hex))
-        _pack_source_code(os.path.abspath(folder), file_path)
-        return file_path
+    def _submit(self, data):
+        start = self.size
+        self.size += len(data)
+        if self.size > self._capacity:
+            # double the capacity so the number of resize requests grows with the log of the archive size
+            self._capacity = max(self.size, self._capacity * 2)
+            self.file_service.resize_file(self.share_name, None, self.file_name, self._capacity)
+        self._pending.append(self._executor.submit(self.file_service.update_range, self.share_name, None,
+                                                   self.file_name, data, start, self.size - 1))
+        # bound the memory held by ranges waiting to be uploaded, and surface upload errors early
+        while len(self._pending) > self.max_workers * 2:
+            self._pending.popleft().result()
 
 
 def uploader_selector(cli_ctx, source_path=None, artifact_path=None, upload_url=None, **_):
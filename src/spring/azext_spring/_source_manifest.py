@@ -0,0 +1,154 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+# pylint: disable=wrong-import-order
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from knack.log import get_logger
+from ._constant import (SOURCE_MANIFEST_FOLDER_NAME, SOURCE_MANIFEST_FORMAT_VERSION,
+                        SOURCE_MANIFEST_MAX_AGE_IN_SECONDS, SOURCE_MANIFEST_HASH_WORKERS)
+from ._deployment_uploadable_factory import FileUpload
+from ._utils import _list_source_entries
+
+logger = get_logger(__name__)
+
+
+def get_source_manifest(cli_ctx, scope, source_path):
+    '''
+    Returns the manifest of source_path for the app or build service identified by scope, or None if unchanged
+    source code should always be uploaded again ("az config set spring.skip_unchanged_source=false").
+    '''
+    if not cli_ctx.config.getboolean('spring', 'skip_unchanged_source', fallback=True):
+        return None
+    return SourceManifest(cli_ctx, scope, source_path)
+
+
+class SourceManifest:
+    '''
+    The content hash of every file of a source code folder, and the relative path its archive was last uploaded
+    to. Archives are reproducible, so source code with the same hashes doesn't need to be uploaded again. Files
+    whose size and modification time didn't change since the last upload are not hashed again.
+    '''
+    def __init__(self, cli_ctx, scope, source_path):
+        self.cli_ctx = cli_ctx
+        self.source_path = os.path.abspath(source_path)
+        self.entries = None
+        self.digest = None
+        self._files = {}
+        self._scanned_at = 0
+        key = hashlib.sha256('\n'.join([scope.lower(), self.source_path]).encode('utf-8')).hexdigest()
+        self.path = os.path.join(cli_ctx.config.config_dir, SOURCE_MANIFEST_FOLDER_NAME, key + '.json')
+        self._previous = self._load()
+
+    def get_unchanged_upload(self):
+        '''
+        Returns the relative path the source code was last uploaded to if it didn't change since and the service
+        still has the upload, otherwise None.
+        '''
+        relative_path = self._previous.get('relative_path')
+        upload_url = self._previous.get('upload_url')
+        if not relative_path or not upload_url or not os.path.isdir(self.source_path):
+            return None
+        if time.time() - self._previous.get('uploaded_at', 0) > SOURCE_MANIFEST_MAX_AGE_IN_SECONDS:
+            return None
+        self.update()
+        if self.digest != self._previous.get('digest'):
+            logger.info("Source code changed since it was last uploaded to %s", relative_path)
+            return None
+        # the service may have removed the upload, or its SAS token expired
+        if not FileUpload(upload_url=upload_url, cli_ctx=self.cli_ctx).exists():
+            logger.info("The source code uploaded to %s is no longer available", relative_path)
+            return None
+        return relative_path
+
+    def update(self):
+        '''
+        List the files to upload and compute the digest of the source code.
+        '''
+        if self.entries is not None:
+            return
+        scanned_at = time.time_ns()
+        entries = _list_source_entries(self.source_path)
+        previous_files = self._previous.get('files', {})
+        previous_scanned_at = self._previous.get('scanned_at', 0)
+
+        files = {}
+        changed = []
+        for name, tarinfo, mtime_ns in entries:
+            if not tarinfo.isreg():
+                continue
+            known = previous_files.get(tarinfo.name)
+            # a file modified while it was hashed may have changed again without getting a newer modification time
+            if known and known[0] == tarinfo.size and known[1] == mtime_ns and mtime_ns < previous_scanned_at:
+                files[tarinfo.name] = known
+            else:
+                changed.append((name, tarinfo, mtime_ns))
+        logger.info("Hashing %d new or modified files of %s", len(changed), self.source_path)
+        if changed:
+            with ThreadPoolExecutor(max_workers=SOURCE_MANIFEST_HASH_WORKERS) as executor:
+                hashes = executor.map(_hash_file, [name for name, _, _ in changed])
+                for (_, tarinfo, mtime_ns), content_hash in zip(changed, hashes):
+                    files[tarinfo.name] = [tarinfo.size, mtime_ns, content_hash]
+
+        digest = hashlib.sha256(str(SOURCE_MANIFEST_FORMAT_VERSION).encode('utf-8'))
+        for _, tarinfo, _ in entries:
+            content = files[tarinfo.name][2] if tarinfo.isreg() else tarinfo.linkname
+            digest.update('{}\0{}\0{:o}\0{}\n'.format(tarinfo.name, tarinfo.type.decode('ascii'), tarinfo.mode,
+                                                      content).encode('utf-8', 'surrogateescape'))
+        self.entries = entries
+        self.digest = digest.hexdigest()
+        self._files = files
+        self._scanned_at = scanned_at
+
+    def save(self, relative_path, upload_url):
+        '''
+        Record that the source code was uploaded to relative_path through upload_url.
+        '''
+        if self.digest is None:
+            # the source code was never listed, there is nothing to record
+            return
+        manifest = {
+            'version': SOURCE_MANIFEST_FORMAT_VERSION,
+            'digest': self.digest,
+            'relative_path': relative_path,
+            'upload_url': upload_url,
+            'uploaded_at': time.time(),
+            'scanned_at': self._scanned_at,
+            'files': self._files
+        }
+        folder = os.path.dirname(self.path)
+        temp_file = None
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fd, temp_file = tempfile.mkstemp(dir=folder, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            os.replace(temp_file, self.path)
+        except OSError as e:
+            logger.warning("Failed to save the source code manifest %s: %s", self.path, e)
+            if temp_file and os.path.exists(temp_file):
+                os.remove(temp_file)
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get('version') != SOURCE_MANIFEST_FORMAT_VERSION:
+            return {}
+        return manifest
+
+
+def _hash_file(path):
+    content_hash = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            content_hash.update(chunk)
+    return content_hash.hexdigest()
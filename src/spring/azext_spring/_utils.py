@@ -3,17 +3,21 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
 import os
+import stat
 from time import sleep
 import codecs
 import requests
 import tarfile
 import tempfile
 import uuid
+import zlib
 from io import open
-from re import (search, match, compile)
+from re import (search, compile)
 from json import dumps
 
 from azure.cli.core.commands.client_factory import get_subscription_id, get_mgmt_service_client
@@ -23,6 +27,7 @@ from knack.log import get_logger
 from azure.cli.core.azclierror import ValidationError, CLIInternalError
 from .vendored_sdks.appplatform.v2023_09_01_preview.models._app_platform_management_client_enums import SupportedRuntimeValue
 from ._client_factory import cf_resource_groups
+from ._constant import (SOURCE_ARCHIVE_CHUNK_SIZE, SOURCE_ARCHIVE_COMPRESS_WORKERS, SOURCE_ARCHIVE_MTIME)
 
 
 logger = get_logger(__name__)
@@ -74,9 +79,38 @@ def _java_runtime_in_number():
 
 
 def _pack_source_code(source_location, tar_file_path):
-    logger.info("Packing source code into tar to upload...")
+    with open(tar_file_path, "wb") as f:
+        _write_source_archive(source_location, f)
+
+
+def _write_source_archive(source_location, fileobj, entries=None):
+    """
+    Write the source code under source_location as a tar.gz archive to fileobj, which only needs to support write.
+    The archive is compressed in chunks on multiple threads and written to fileobj while it is still being produced.
+    entries are the files to archive as returned by _list_source_entries, they are listed if not given.
+    """
+    if entries is None:
+        entries = _list_source_entries(source_location)
 
+    logger.info("Packing source code into tar to upload...")
+    with ParallelGzipWriter(fileobj) as gzip_writer:
+        with tarfile.open(fileobj=gzip_writer, mode="w|") as tar:
+            for name, tarinfo, _ in entries:
+                if tarinfo.isreg():
+                    with open(name, "rb") as f:
+                        tar.addfile(tarinfo, f)
+                else:
+                    tar.addfile(tarinfo)
+
+
+def _list_source_entries(source_location):
+    """
+    Returns (path, tarinfo, mtime_ns) of the files and folders under source_location which are not ignored. The
+    entries are sorted and their metadata is normalized, so the same source code always produces the same archive.
+    mtime_ns is the modification time in the file system, which isn't written to the archive.
+    """
     ignore_list, ignore_list_size = _load_gitignore_file(source_location)
+    ignore_matcher = IgnoreMatcher(ignore_list) if ignore_list is not None else None
     common_vcs_ignore_list = {'.git', '.gitignore', 'bzrignore', '.hg',
                               '.hgignore', '.svn', '.circleci', 'target', 'docker', 'mvnw', 'mvnw.cmd'}
 
@@ -87,34 +121,115 @@ def _pack_source_code(source_location, tar_file_path):
                 "Excluding '%s' based on default ignore rules", tarinfo.name)
             return True, parent_matching_rule_index
 
-        if ignore_list is None:
+        if ignore_matcher is None:
             # if .dockerignore doesn't exists, inherit from parent
             # eg, it will ignore the files under .git folder.
             return parent_ignored, parent_matching_rule_index
 
-        for index, item in enumerate(ignore_list):
-            # stop checking the remaining rules whose priorities are lower than the parent matching rule
-            # at this point, current item should just inherit from parent
-            if index >= parent_matching_rule_index:
-                break
-            if match(item.pattern, tarinfo.name):
-                logger.debug(".gitignore: rule '%s' matches '%s'.",
-                             item.rule, tarinfo.name)
-                return item.ignore, index
+        index = ignore_matcher.match(tarinfo.name)
+        # rules whose priorities are lower than the parent matching rule are not checked,
+        # current item should just inherit from parent
+        if index is not None and index < parent_matching_rule_index:
+            item = ignore_list[index]
+            logger.debug(".gitignore: rule '%s' matches '%s'.",
+                         item.rule, tarinfo.name)
+            return item.ignore, index
 
         logger.debug(".gitignore: no rule for '%s'. parent ignore '%s'",
                      tarinfo.name, parent_ignored)
         # inherit from parent
         return parent_ignored, parent_matching_rule_index
 
-    with tarfile.open(tar_file_path, "w:gz") as tar:
-        # need to set arcname to empty string as the archive root path
-        _archive_file_recursively(tar,
-                                  source_location,
-                                  arcname="",
-                                  parent_ignored=False,
-                                  parent_matching_rule_index=ignore_list_size,
-                                  ignore_check=_ignore_check)
+    entries = []
+    # need to set arcname to empty string as the archive root path
+    _list_file_recursively(entries,
+                           source_location,
+                           arcname="",
+                           parent_ignored=False,
+                           parent_matching_rule_index=ignore_list_size,
+                           ignore_check=_ignore_check)
+    return entries
+
+
+class ParallelGzipWriter(object):
+    """
+    Write-only file object which gzip compresses the data written to it. Data is compressed in chunks on a thread
+    pool, each chunk becomes a gzip member of its own and the members are written to fileobj in order. A stream of
+    concatenated gzip members is a valid gzip file (RFC 1952).
+    """
+
+    def __init__(self, fileobj, chunk_size=SOURCE_ARCHIVE_CHUNK_SIZE, max_workers=SOURCE_ARCHIVE_COMPRESS_WORKERS,
+                 compresslevel=9):
+        self._fileobj = fileobj
+        self._chunk_size = chunk_size
+        self._max_workers = max_workers
+        self._compresslevel = compresslevel
+        self._buffer = bytearray()
+        self._pending = deque()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+
+    def write(self, data):
+        self._buffer += data
+        if len(self._buffer) >= self._chunk_size:
+            self._submit()
+        return len(data)
+
+    def close(self):
+        try:
+            if self._buffer:
+                self._submit()
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def _submit(self):
+        chunk = bytes(self._buffer)
+        self._buffer = bytearray()
+        self._pending.append(self._executor.submit(self._compress, chunk))
+        # bound the memory held by chunks waiting to be compressed or written
+        while len(self._pending) > self._max_workers * 2:
+            self._fileobj.write(self._pending.popleft().result())
+
+    def _compress(self, chunk):
+        # zlib releases the GIL while compressing, wbits 31 writes a gzip header and trailer
+        compressor = zlib.compressobj(self._compresslevel, zlib.DEFLATED, 31)
+        return compressor.compress(chunk) + compressor.flush()
+
+
+class IgnoreMatcher(object):  # pylint: disable=too-few-public-methods
+    """
+    All the rules of a .gitignore file compiled into a single regular expression, so a path is matched against
+    every rule with one call instead of one call per rule.
+    """
+
+    def __init__(self, ignore_list):
+        # alternatives are tried in order and every rule pattern is anchored at both ends,
+        # so the first group that matches belongs to the rule with the highest priority
+        self._regex = compile("|".join("(?P<r{}>{})".format(index, item.pattern)
+                                       for index, item in enumerate(ignore_list))) if ignore_list else None
+
+    def match(self, name):
+        """
+        Returns the index of the highest priority rule matching name, or None if no rule matches.
+        """
+        if self._regex is None:
+            return None
+        match_obj = self._regex.match(name)
+        if match_obj is None:
+            return None
+        return int(match_obj.lastgroup[1:])
 
 
 class IgnoreRule(object):  # pylint: disable=too-few-public-methods
@@ -171,31 +286,50 @@ def _load_gitignore_file(source_location):
     return ignore_list, len(ignore_list)
 
 
-def _archive_file_recursively(tar, name, arcname, parent_ignored, parent_matching_rule_index, ignore_check):
-    # create a TarInfo object from the file
-    tarinfo = tar.gettarinfo(name, arcname)
-
-    if tarinfo is None:
-        raise CLIError("tarfile: unsupported type {}".format(name))
+def _list_file_recursively(entries, name, arcname, parent_ignored, parent_matching_rule_index, ignore_check):
+    statres = os.lstat(name)
+    tarinfo = _get_source_tarinfo(name, arcname, statres)
 
     # check if the file/dir is ignored
     ignored, matching_rule_index = ignore_check(
-        tarinfo, parent_ignored, parent_matching_rule_index)
+        tarinfo or tarfile.TarInfo(arcname.replace(os.sep, "/")), parent_ignored, parent_matching_rule_index)
+
+    if tarinfo is None:
+        # sockets, pipes and devices can't be archived
+        if not ignored:
+            logger.warning("Skipping '%s', only files, folders and symbolic links are uploaded", name)
+        return
 
     if not ignored:
-        # append the tar header and data to the archive
-        if tarinfo.isreg():
-            with open(name, "rb") as f:
-                tar.addfile(tarinfo, f)
-        else:
-            tar.addfile(tarinfo)
+        entries.append((name, tarinfo, statres.st_mtime_ns))
 
     # even the dir is ignored, its child items can still be included, so continue to scan
     if tarinfo.isdir():
-        for f in os.listdir(name):
-            _archive_file_recursively(tar, os.path.join(name, f), os.path.join(arcname, f),
-                                      parent_ignored=ignored, parent_matching_rule_index=matching_rule_index,
-                                      ignore_check=ignore_check)
+        for f in sorted(os.listdir(name)):
+            _list_file_recursively(entries, os.path.join(name, f), os.path.join(arcname, f),
+                                   parent_ignored=ignored, parent_matching_rule_index=matching_rule_index,
+                                   ignore_check=ignore_check)
+
+
+def _get_source_tarinfo(name, arcname, statres):
+    """
+    Create the TarInfo of a file, folder or symbolic link. Only the permission bits and the size are kept from the
+    file system, owner and modification time are the same for every file so archives are reproducible.
+    """
+    tarinfo = tarfile.TarInfo(arcname.replace(os.sep, "/"))
+    if stat.S_ISREG(statres.st_mode):
+        tarinfo.type = tarfile.REGTYPE
+        tarinfo.size = statres.st_size
+    elif stat.S_ISDIR(statres.st_mode):
+        tarinfo.type = tarfile.DIRTYPE
+    elif stat.S_ISLNK(statres.st_mode):
+        tarinfo.type = tarfile.SYMTYPE
+        tarinfo.linkname = os.readlink(name)
+    else:
+        return None
+    tarinfo.mode = stat.S_IMODE(statres.st_mode)
+    tarinfo.mtime = SOURCE_ARCHIVE_MTIME
+    return tarinfo
 
 
 def get_blob_info(blob_sas_url):
@@ -0,0 +1,206 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import gzip
+import io
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import unittest
+import zlib
+from unittest import mock
+
+from ..._deployment_uploadable_factory import FileRangeWriter, FolderUpload
+from ..._utils import (IgnoreMatcher, ParallelGzipWriter, _list_source_entries, _load_gitignore_file,
+                       _pack_source_code)
+
+GITIGNORE = '''
+# build output
+**/*.class
+build/**
+**/generated/*.java
+docs/*
+!docs/keep.md
+!src/**/Keep.class
+logs/?.log
+'''
+
+
+class FakeFileService(object):
+    '''
+    Records what is uploaded to a single file, the same way the Azure Files REST API applies it
+    '''
+    MAX_RANGE_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, latency=0):
+        self.latency = latency
+        self.content = bytearray()
+        self.files = set()
+        self.ranges = []
+        self.resizes = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def create_file(self, share_name, directory_name, file_name, content_length, **_):
+        self.content = bytearray(content_length)
+        self.files.add(file_name)
+
+    def exists(self, share_name, directory_name=None, file_name=None, **_):
+        return file_name in self.files
+
+    def resize_file(self, share_name, directory_name, file_name, content_length, **_):
+        with self.lock:
+            self.resizes.append(content_length)
+            self.content = self.content[:content_length] + bytearray(max(0, content_length - len(self.content)))
+
+    def update_range(self, share_name, directory_name, file_name, data, start_range, end_range, **_):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self.lock:
+            self.in_flight -= 1
+            assert end_range < len(self.content)
+            assert end_range - start_range + 1 == len(data) <= self.MAX_RANGE_SIZE
+            self.ranges.append((start_range, end_range))
+            self.content[start_range:end_range + 1] = data
+
+    def create_file_from_path(self, share_name, directory_name, file_name, local_file_path, **_):
+        with open(local_file_path, 'rb') as f:
+            data = f.read()
+        self.create_file(share_name, directory_name, file_name, len(data))
+        for start in range(0, len(data), self.MAX_RANGE_SIZE):
+            chunk = data[start:start + self.MAX_RANGE_SIZE]
+            self.update_range(share_name, directory_name, file_name, chunk, start, start + len(chunk) - 1)
+
+
+def _archive_names(content):
+    with tarfile.open(fileobj=io.BytesIO(bytes(content)), mode='r:gz') as tar:
+        return sorted(m.name for m in tar.getmembers() if m.isfile())
+
+
+def _write_tree(root, files):
+    for path, data in files.items():
+        path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+
+def _rule_by_rule(ignore_list, name):
+    # what matching did before the rules were compiled into a single expression
+    for index, item in enumerate(ignore_list):
+        if re.match(item.pattern, name):
+            return index
+    return None
+
+
+class TestSourceArchive(unittest.TestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        _write_tree(self.source, {
+            '.gitignore': GITIGNORE.encode(),
+            'pom.xml': b'<project/>',
+            'src/main/App.java': b'class App {}',
+            'src/main/App.class': b'\xca\xfe',
+            'src/main/Keep.class': b'\xca\xfe',
+            'src/main/generated/Model.java': b'class Model {}',
+            'build/out.jar': b'jar',
+            'docs/index.md': b'# index',
+            'docs/keep.md': b'# keep',
+            'logs/a.log': b'log',
+            'logs/ab.log': b'log',
+            'target/app.jar': b'jar',
+            '.git/HEAD': b'ref',
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.source)
+
+    def test_ignore_matcher_same_as_rule_by_rule(self):
+        ignore_list, _ = _load_gitignore_file(self.source)
+        matcher = IgnoreMatcher(ignore_list)
+        names = ['a.class', 'src/A.class', 'src/x/Keep.class', 'build', 'build/x', 'a/generated/B.java',
+                 'generated/B.java', 'docs/keep.md', 'docs/other.md', 'logs/a.log', 'logs/ab.log', 'pom.xml']
+        for name in names:
+            self.assertEqual(_rule_by_rule(ignore_list, name), matcher.match(name), name)
+        self.assertIsNone(IgnoreMatcher([]).match('pom.xml'))
+
+    def test_archive_respects_ignore_rules(self):
+        archive = os.path.join(tempfile.mkdtemp(), 'archive.tar.gz')
+        try:
+            _pack_source_code(self.source, archive)
+            with open(archive, 'rb') as f:
+                names = _archive_names(f.read())
+        finally:
+            shutil.rmtree(os.path.dirname(archive))
+        self.assertEqual(['docs/keep.md', 'logs/ab.log', 'pom.xml', 'src/main/App.java', 'src/main/Keep.class'],
+                         names)
+
+    @unittest.skipUnless(hasattr(os, 'mkfifo'), 'named pipes are not supported')
+    def test_special_files_are_skipped(self):
+        os.mkfifo(os.path.join(self.source, 'build', 'pipe'))
+        os.mkfifo(os.path.join(self.source, 'src', 'main', 'pipe'))
+        with self.assertLogs('cli.azext_spring._utils', 'WARNING') as logs:
+            names = [tarinfo.name for _, tarinfo, _ in _list_source_entries(self.source)]
+        self.assertNotIn('src/main/pipe', names)
+        self.assertIn('src/main/App.java', names)
+        # only the pipe which isn't ignored is reported
+        self.assertEqual(1, len(logs.output))
+        self.assertIn(os.path.join(self.source, 'src', 'main', 'pipe'), logs.output[0])
+
+    def test_parallel_gzip_writes_members_in_order(self):
+        data = bytes(range(256)) * 4096
+        output = io.BytesIO()
+        with ParallelGzipWriter(output, chunk_size=10000, max_workers=4) as writer:
+            for start in range(0, len(data), 2500):
+                writer.write(data[start:start + 2500])
+        self.assertEqual(data, gzip.decompress(output.getvalue()))
+        # every chunk is a gzip member of its own
+        members, compressed = 0, output.getvalue()
+        while compressed:
+            decompressor = zlib.decompressobj(31)
+            decompressor.decompress(compressed)
+            compressed = decompressor.unused_data
+            members += 1
+        self.assertEqual(len(data) // 10000 + 1, members)
+
+    def test_file_range_writer_grows_and_truncates(self):
+        file_service = FakeFileService()
+        file_service.MAX_RANGE_SIZE = 1000
+        data = os.urandom(12345)
+        with FileRangeWriter(file_service, 'share', 'file', max_workers=2) as writer:
+            for start in range(0, len(data), 777):
+                writer.write(data[start:start + 777])
+        self.assertEqual(data, bytes(file_service.content))
+        self.assertEqual(13, len(file_service.ranges))
+        self.assertEqual([4000, 8000, 16000, 12345], file_service.resizes)
+
+    def test_file_range_writer_uploads_ranges_concurrently(self):
+        file_service = FakeFileService(latency=0.02)
+        file_service.MAX_RANGE_SIZE = 1000
+        data = os.urandom(20000)
+        with FileRangeWriter(file_service, 'share', 'file', max_workers=4) as writer:
+            writer.write(data)
+        self.assertEqual(data, bytes(file_service.content))
+        self.assertGreater(file_service.max_in_flight, 1)
+        self.assertLessEqual(file_service.max_in_flight, 4)
+
+    def test_folder_upload_streams_archive(self):
+        file_service = FakeFileService()
+        uploader = FolderUpload('https://account.file.core.windows.net/share/dir/file.tar.gz?sv=token', None)
+        with mock.patch.object(FolderUpload, '_get_file_service', return_value=file_service):
+            uploader.upload_and_build(source_path=self.source)
+        self.assertEqual(['docs/keep.md', 'logs/ab.log', 'pom.xml', 'src/main/App.java', 'src/main/Keep.class'],
+                         _archive_names(file_service.content))
+
+
+if __name__ == '__main__':
+    unittest.main()
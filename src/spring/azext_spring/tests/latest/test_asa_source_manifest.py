@@ -0,0 +1,187 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from ..._buildservices_factory import BuildService
+from ..._deployment_deployable_factory import SourceBuildDeployableBuilder
+from ..._source_manifest import SourceManifest, get_source_manifest
+from ..._utils import _write_source_archive
+from .test_asa_source_archive import FakeFileService, _archive_names, _write_tree
+
+SCOPE = '/subscriptions/sub/resourceGroups/rg/providers/Microsoft.AppPlatform/Spring/asc/apps/app'
+UPLOAD_URL = 'https://account.file.core.windows.net/share/{}?sv=token'
+
+
+def _get_cli_ctx(config_dir, skip_unchanged_source=True):
+    cli_ctx = mock.MagicMock()
+    cli_ctx.config.config_dir = config_dir
+    cli_ctx.config.getboolean.return_value = skip_unchanged_source
+    return cli_ctx
+
+
+def _touch(path, content=None):
+    if content is not None:
+        with open(path, 'w') as f:
+            f.write(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5 * 10 ** 9))
+
+
+class TestSourceManifest(unittest.TestCase):
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.source = tempfile.mkdtemp()
+        _write_tree(self.source, {
+            '.gitignore': b'build/**\n',
+            'pom.xml': b'<project/>',
+            'src/App.java': b'class App {}',
+            'src/Util.java': b'class Util {}',
+            'build/out.jar': b'jar',
+        })
+        self.cli_ctx = _get_cli_ctx(self.config_dir)
+        self.file_service = FakeFileService()
+        mock.patch('azext_spring._deployment_uploadable_factory.FileUpload._get_file_service',
+                   return_value=self.file_service).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def tearDown(self):
+        shutil.rmtree(self.config_dir)
+        shutil.rmtree(self.source)
+
+    def _upload(self, relative_path='resources/1'):
+        manifest = SourceManifest(self.cli_ctx, SCOPE, self.source)
+        manifest.update()
+        self.file_service.files.add(relative_path)
+        manifest.save(relative_path, UPLOAD_URL.format(relative_path))
+        return manifest
+
+    def test_archive_is_reproducible(self):
+        first, second = io.BytesIO(), io.BytesIO()
+        _write_source_archive(self.source, first)
+        _touch(os.path.join(self.source, 'src', 'App.java'))
+        _write_source_archive(self.source, second)
+        self.assertEqual(first.getvalue(), second.getvalue())
+
+    def test_unchanged_source_is_not_uploaded_again(self):
+        self.assertIsNone(SourceManifest(self.cli_ctx, SCOPE, self.source).get_unchanged_upload())
+        self._upload()
+        self.assertEqual('resources/1', SourceManifest(self.cli_ctx, SCOPE, self.source).get_unchanged_upload())
+        # touched but not modified
+        _touch(os.path.join(self.source, 'src', 'App.java'))
+        self.assertEqual('resources/1', SourceManifest(self.cli_ctx, SCOPE, self.source).get_unchanged_upload())
+        # ignored files don't matter
+        _touch(os.path.join(self.source, 'build', 'out.jar'), 'new jar')
+        self.assertEqual('resources/1', SourceManifest(self.cli_ctx, SCOPE, self.source).get_unchanged_upload())
+        # each app has its own manifest
+        self.assertIsNone(SourceManifest(self.cli_ctx, SCOPE + '2', self.source).get_unchanged_upload())
+
+    def test_changed_source_is_uploaded(self):
+        self._upload()
+        _touch(os.path.join(self.source, 'src', 'App.java'), 'class App { }')
+        self.assertIsNone(SourceManifest(self.cli_ctx, SCOPE, self.source).get_unchanged_upload())
+
+        self._upload('resources/2')
+        os.chmod(os.path.join(self.source, 'src', 'App.java'), 0o755)
+        self.assertIsNone(SourceManifest(self.cli_ctx, SCOPE, self.source).get_unchanged_upload())
+
+        self._upload('resources/3')
+        os.remove(os.path.join(self.source, 'src', 'Util.java'))
+        self.assertIsNone(SourceManifest(self.cli_ctx, SCOPE, self.source).get_unchanged_upload())
+
+    def test_only_modified_files_are_hashed(self):
+        self._upload()
+        _touch(os.path.join(self.source, 'src', 'App.java'), 'class App { }')
+        with mock.patch('azext_spring._source_manifest._hash_file', wraps=lambda path: path) as hash_mock:
+            manifest = SourceManifest(self.cli_ctx, SCOPE, self.source)
+            manifest.update()
+        self.assertEqual([mock.call(os.path.join(self.source, 'src', 'App.java'))], hash_mock.call_args_list)
+
+    def test_unchanged_source_is_not_hashed_again(self):
+        self._upload()
+        with mock.patch('azext_spring._source_manifest._hash_file') as hash_mock:
+            self.assertEqual('resources/1', SourceManifest(self.cli_ctx, SCOPE, self.source).get_unchanged_upload())
+        hash_mock.assert_not_called()
+
+    def test_removed_upload_is_not_reused(self):
+        self._upload()
+        self.file_service.files.clear()
+        self.assertIsNone(SourceManifest(self.cli_ctx, SCOPE, self.source).get_unchanged_upload())
+
+        # the upload can't be checked, e.g. because its SAS token expired
+        self._upload()
+        with mock.patch.object(self.file_service, 'exists', side_effect=Exception('AuthenticationFailed')):
+            self.assertIsNone(SourceManifest(self.cli_ctx, SCOPE, self.source).get_unchanged_upload())
+
+    def test_old_upload_is_not_reused(self):
+        self._upload()
+        with mock.patch('azext_spring._source_manifest.time.time', return_value=time.time() + 2 * 24 * 60 * 60):
+            self.assertIsNone(SourceManifest(self.cli_ctx, SCOPE, self.source).get_unchanged_upload())
+
+    def test_corrupted_manifest_is_ignored(self):
+        manifest = self._upload()
+        with open(manifest.path, 'w') as f:
+            f.write('{"version": 1, "digest": ')
+        self.assertIsNone(SourceManifest(self.cli_ctx, SCOPE, self.source).get_unchanged_upload())
+
+    def test_disabled_by_config(self):
+        self.assertIsNone(get_source_manifest(_get_cli_ctx(self.config_dir, False), SCOPE, self.source))
+
+    @mock.patch('azext_spring._deployment_deployable_factory.get_subscription_id', return_value='sub')
+    def test_deploy_skips_upload_of_unchanged_source(self, _):
+        client = mock.MagicMock()
+        client.apps.get_resource_upload_url.return_value = mock.MagicMock(
+            relative_path='resources/1', upload_url=UPLOAD_URL.format('resources/1'))
+        cmd = mock.MagicMock(cli_ctx=self.cli_ctx)
+
+        def deploy():
+            builder = SourceBuildDeployableBuilder(cmd, client, 'rg', 'asc', 'app', 'default', mock.MagicMock())
+            return builder.build_deployable_path(source_path=self.source, total_steps=3, no_wait=True)
+
+        self.assertEqual('resources/1', deploy())
+        self.assertEqual(['pom.xml', 'src/App.java', 'src/Util.java'], _archive_names(self.file_service.content))
+        self.assertEqual('resources/1', deploy())
+        self.assertEqual(1, client.apps.get_resource_upload_url.call_count)
+
+        # the service no longer has the upload
+        self.file_service.files.clear()
+        deploy()
+        self.assertEqual(2, client.apps.get_resource_upload_url.call_count)
+
+        _touch(os.path.join(self.source, 'pom.xml'), '<project></project>')
+        deploy()
+        self.assertEqual(3, client.apps.get_resource_upload_url.call_count)
+
+    @mock.patch('azext_spring._buildservices_factory.get_subscription_id', return_value='sub')
+    def test_build_skips_upload_of_unchanged_source(self, _):
+        client = mock.MagicMock()
+        build_service = BuildService(mock.MagicMock(cli_ctx=self.cli_ctx), client, 'rg', 'asc')
+
+        def build(relative_path):
+            client.build_service.get_resource_upload_url.return_value = mock.MagicMock(
+                relative_path=relative_path, upload_url=UPLOAD_URL.format(relative_path))
+            with mock.patch.object(build_service, '_queue_build', return_value='build-result-id') as queue_build, \
+                    mock.patch.object(build_service, '_wait_build_finished'):
+                self.assertEqual('build-result-id',
+                                 build_service.build_and_get_result(4, source_path=self.source, app='app'))
+            return queue_build.call_args.args[0]
+
+        self.assertEqual('resources/1', build('resources/1'))
+        self.assertEqual('resources/1', build('resources/2'))
+        self.assertEqual(1, client.build_service.get_resource_upload_url.call_count)
+
+        self.file_service.files.clear()
+        self.assertEqual('resources/2', build('resources/2'))
+        self.assertEqual(2, client.build_service.get_resource_upload_url.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+'''
+Wall clock time of packing and uploading a large source code folder by streaming the archive to the file share,
+compared to a single-threaded tar.gz matching every .gitignore rule one by one and uploaded once it's complete.
+Not part of the unit tests, run it from src/spring with the extension installed in development mode:
+
+    python benchmarks/benchmark_source_archive.py
+'''
+
+import gzip
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from azext_spring._deployment_uploadable_factory import FileRangeWriter
+from azext_spring._utils import _load_gitignore_file, _write_source_archive
+from azext_spring.tests.latest.test_asa_source_archive import FakeFileService, _archive_names, _rule_by_rule
+
+FILE_COUNT = 50000
+RULE_COUNT = 200
+# simulated round trip of a single request to the file service
+LATENCY = 0.05
+
+
+class _SerialGzipWriter(object):
+    '''
+    The tar.gz stream as tarfile.open(mode="w:gz") writes it, compressed on the calling thread
+    '''
+    def __init__(self, fileobj):
+        self._gzip = gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=9)
+
+    def __enter__(self):
+        return self._gzip
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._gzip.close()
+
+
+def _create_source(source):
+    rules = ['*.tmp{}'.format(i) for i in range(RULE_COUNT - 2)] + ['**/out/', '!**/out/keep.txt']
+    with open(os.path.join(source, '.gitignore'), 'w') as f:
+        f.write('\n'.join(rules))
+    for i in range(FILE_COUNT):
+        folder = os.path.join(source, 'module{}'.format(i % 50), 'pkg{}'.format(i % 20))
+        if i < 1000:
+            os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, 'File{}.java'.format(i)), 'wb') as f:
+            f.write('class File{0} {{ int value = {0}; }}\n'.format(i).encode() * 16 + os.urandom(256))
+
+
+def _serial_upload(source, file_service):
+    ignore_list, _ = _load_gitignore_file(source)
+    archive = os.path.join(tempfile.gettempdir(), 'benchmark.tar')
+    try:
+        with open(archive, 'wb') as f, \
+                mock.patch('azext_spring._utils.ParallelGzipWriter', _SerialGzipWriter), \
+                mock.patch('azext_spring._utils.IgnoreMatcher.match', autospec=True,
+                           side_effect=lambda _, name: _rule_by_rule(ignore_list, name)):
+            _write_source_archive(source, f)
+        file_service.create_file_from_path('share', None, 'file', archive)
+    finally:
+        os.remove(archive)
+
+
+def main():
+    source = tempfile.mkdtemp()
+    try:
+        _create_source(source)
+        serial_service, streaming_service = FakeFileService(latency=LATENCY), FakeFileService(latency=LATENCY)
+
+        start = time.perf_counter()
+        _serial_upload(source, serial_service)
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with FileRangeWriter(streaming_service, 'share', 'file') as writer:
+            _write_source_archive(source, writer)
+        streaming = time.perf_counter() - start
+
+        same = _archive_names(serial_service.content) == _archive_names(streaming_service.content)
+        print('{} files: serial {:.2f}s, streaming {:.2f}s, same archive content: {}'.format(
+            FILE_COUNT, serial, streaming, same))
+    finally:
+        shutil.rmtree(source)
+
+
+if __name__ == '__main__':
+    main()
@@ -56,6 +56,10 @@ helps['ssh vm'] = """
         - name: Open RDP connection over SSH. Useful for connecting via RDP to Arc Servers with no public IP address. Currently only supported for Windows clients.
           text: |
             az ssh vm --resource-group myResourceGroup --name myVM --local-user username --rdp
+
+        - name: Reuse the AAD SSH certificate from a previous connection while it is still valid, instead of requesting a new certificate for every connection.
+          text: |
+            az ssh vm --resource-group myResourceGroup --name myVM --cache-credentials
 """
 
 helps['ssh config'] = """
@@ -153,4 +157,8 @@ helps['ssh arc'] = """
         - name: Open RDP connection over SSH. Useful for connecting via RDP to Arc Servers with no public IP address. Currently only supported for Windows clients.
           text: |
             az ssh arc --resource-group myResourceGroup --name myVM --local-user username --rdp
+
+        - name: Reuse the AAD SSH certificate from a previous connection while it is still valid, instead of requesting a new certificate for every connection.
+          text: |
+            az ssh arc --resource-group myResourceGroup --name myMachine --cache-credentials
 """
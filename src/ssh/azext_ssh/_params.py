@@ -41,6 +41,11 @@ def load_arguments(self, _):
         c.argument('yes_without_prompt', options_list=['--yes-without-prompt', '--yes', '-y'],
                    help='Update service configuration without prompting user')
         c.positional('ssh_args', nargs='*', help='Additional arguments passed to OpenSSH')
+        c.argument('cache_credentials', options_list=['--cache-credentials'], action='store_true',
+                   help=('Keep the generated AAD SSH certificate and key pair in the Azure CLI configuration folder '
+                         'and reuse them for later connections while the certificate is valid, instead of '
+                         'requesting a new certificate for every connection. Credentials are cached per cloud, '
+                         'tenant and user.'))
 
     with self.argument_context('ssh config') as c:
         c.argument('config_path', options_list=['--file', '-f'], help='The file path to write the SSH config to')
@@ -111,3 +116,8 @@ def load_arguments(self, _):
         c.argument('yes_without_prompt', options_list=['--yes-without-prompt', '--yes', '-y'],
                    help='Update service configuration without prompting user')
         c.positional('ssh_args', nargs='*', help='Additional arguments passed to OpenSSH')
+        c.argument('cache_credentials', options_list=['--cache-credentials'], action='store_true',
+                   help=('Keep the generated AAD SSH certificate and key pair in the Azure CLI configuration folder '
+                         'and reuse them for later connections while the certificate is valid, instead of '
+                         'requesting a new certificate for every connection. Credentials are cached per cloud, '
+                         'tenant and user.'))
@@ -22,6 +22,8 @@ RECOMMENDATION_SSH_CLIENT_NOT_FOUND = (Fore.YELLOW + "Ensure OpenSSH is installe
 RECOMMENDATION_RESOURCE_NOT_FOUND = (Fore.YELLOW + "Please ensure the active subscription is set properly "
                                      "and resource exists." + Style.RESET_ALL)
 RDP_TERMINATE_SSH_WAIT_TIME_IN_SECONDS = 30
+CREDENTIALS_CACHE_FOLDER_NAME = "ssh_credentials_cache"
+CREDENTIALS_CACHE_EXPIRY_MARGIN_IN_SECONDS = 300
 
 ARC_RESOURCE_TYPE_PLACEHOLDER = "arc_resource_type_placeholder"
 
@@ -0,0 +1,126 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+# Opt-in cache of AAD SSH certificates (and the key pairs generated for them) used by
+# az ssh vm/arc --cache-credentials.
+#
+# Each cloud/tenant/user (and user provided public key, if any) gets its own entry folder. Every time a
+# new certificate is requested it is written, together with a newly generated key pair, to a new
+# generation folder, and the "current" file is atomically updated to point to it. Concurrent connections
+# never modify a generation that someone else may be using, they only prune generations that expired.
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import oschmod
+
+from knack import log
+from azure.cli.core import azclierror
+
+from . import rsa_parser
+from . import ssh_utils
+from . import constants as const
+
+logger = log.get_logger(__name__)
+
+CURRENT_GENERATION_FILE_NAME = "current"
+PRIVATE_KEY_FILE_NAME = "id_rsa"
+PUBLIC_KEY_FILE_NAME = "id_rsa.pub"
+CERT_FILE_NAME = "id_rsa.pub-aadcert.pub"
+
+
+def get_entry_folder(cmd, public_key_file=None):
+    from azure.cli.core._profile import Profile
+    account = Profile(cli_ctx=cmd.cli_ctx).get_subscription()
+    key_parts = [cmd.cli_ctx.cloud.name.lower(), account.get("tenantId", ""), account.get("user", {}).get("name", "")]
+    if public_key_file:
+        # Certificates are bound to a public key, user provided keys get an entry of their own
+        with open(public_key_file, 'r', encoding='utf-8') as f:
+            key_parts.append(f.read().strip())
+    entry_name = hashlib.sha256("\n".join(key_parts).encode('utf-8')).hexdigest()
+
+    cache_folder = os.path.join(cmd.cli_ctx.config.config_dir, const.CREDENTIALS_CACHE_FOLDER_NAME)
+    entry_folder = os.path.join(cache_folder, entry_name)
+    try:
+        for folder in [cache_folder, entry_folder]:
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            # The cache contains private keys, only the current user can access it
+            oschmod.set_mode(folder, 0o700)
+    except OSError as e:
+        raise azclierror.FileOperationError(f"Couldn't create credentials cache folder {entry_folder}. "
+                                            f"Error: {str(e)}") from e
+    return entry_folder
+
+
+def get_valid_generation(entry_folder, public_key_file=None):
+    """
+    Returns the current generation folder if its certificate can still be used, otherwise None.
+    """
+    try:
+        with open(os.path.join(entry_folder, CURRENT_GENERATION_FILE_NAME), 'r', encoding='utf-8') as f:
+            generation_folder = os.path.join(entry_folder, f.read().strip())
+    except OSError:
+        return None
+
+    cert = ssh_utils.parse_ssh_cert(os.path.join(generation_folder, CERT_FILE_NAME))
+    if not cert or not cert.principals or not _is_valid(cert):
+        return None
+
+    public_key_file = public_key_file or os.path.join(generation_folder, PUBLIC_KEY_FILE_NAME)
+    # pylint: disable=broad-except
+    try:
+        with open(public_key_file, 'r', encoding='utf-8') as f:
+            public_key = rsa_parser.RSAParser()
+            public_key.parse(f.read())
+    except Exception as e:
+        logger.debug("Couldn't read cached public key %s. Error: %s", public_key_file, str(e))
+        return None
+    if (public_key.modulus, public_key.exponent) != (cert.modulus, cert.exponent):
+        return None
+    return generation_folder
+
+
+def create_generation(entry_folder):
+    return tempfile.mkdtemp(prefix="gen", dir=entry_folder)
+
+
+def set_current_generation(entry_folder, generation_folder):
+    current_file = os.path.join(entry_folder, CURRENT_GENERATION_FILE_NAME)
+    fd, temp_file = tempfile.mkstemp(dir=entry_folder, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(os.path.basename(generation_folder))
+        os.replace(temp_file, current_file)
+    except OSError as e:
+        logger.warning("Couldn't update credentials cache %s. Error: %s", entry_folder, str(e))
+        if os.path.isfile(temp_file):
+            os.remove(temp_file)
+        return
+    _prune_generations(entry_folder, generation_folder)
+
+
+def _is_valid(cert):
+    # Leave enough time before expiration for the connection to be established
+    now = time.time()
+    return cert.valid_after <= now and cert.valid_before > now + const.CREDENTIALS_CACHE_EXPIRY_MARGIN_IN_SECONDS
+
+
+def _prune_generations(entry_folder, current_generation):
+    now = time.time()
+    for entry in os.scandir(entry_folder):
+        if not entry.is_dir() or entry.path == current_generation:
+            continue
+        cert = ssh_utils.parse_ssh_cert(os.path.join(entry.path, CERT_FILE_NAME))
+        if cert:
+            expired = cert.valid_before <= now
+        else:
+            # A generation without a certificate may still be written by a concurrent connection
+            expired = entry.stat().st_mtime < now - const.CLEANUP_TOTAL_TIME_LIMIT_IN_SECONDS
+        if expired:
+            logger.debug("Deleting expired cached credentials %s", entry.path)
+            shutil.rmtree(entry.path, ignore_errors=True)
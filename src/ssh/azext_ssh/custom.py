@@ -21,6 +21,7 @@ from . import rdp_utils
 from . import rsa_parser
 from . import ssh_utils
 from . import connectivity_utils
+from . import credentials_cache
 from . import ssh_info
 from . import file_utils
 from . import constants as const
@@ -33,12 +34,16 @@ logger = log.get_logger(__name__)
 def ssh_vm(cmd, resource_group_name=None, vm_name=None, ssh_ip=None, public_key_file=None,
            private_key_file=None, use_private_ip=False, local_user=None, cert_file=None, port=None,
            ssh_client_folder=None, delete_credentials=False, resource_type=None, ssh_proxy_folder=None,
-           winrdp=False, yes_without_prompt=False, ssh_args=None):
+           winrdp=False, yes_without_prompt=False, ssh_args=None, cache_credentials=False):
 
     # delete_credentials can only be used by Azure Portal to provide one-click experience on CloudShell.
     if delete_credentials and os.environ.get("AZUREPS_HOST_ENVIRONMENT") != "cloud-shell/1.0":
         raise azclierror.ArgumentUsageError("Can't use --delete-private-key outside an Azure Cloud Shell session.")
 
+    if cache_credentials and (delete_credentials or local_user):
+        raise azclierror.MutuallyExclusiveArgumentError(
+            "--cache-credentials can't be used with --local-user or --delete-private-key")
+
     # include openssh client logs to --debug output to make it easier to users to debug connection issued.
     if '--debug' in cmd.cli_ctx.data['safe_params'] and set(['-v', '-vv', '-vvv']).isdisjoint(ssh_args):
         ssh_args = ['-vvv'] if not ssh_args else ['-vvv'] + ssh_args
@@ -59,7 +64,8 @@ def ssh_vm(cmd, resource_group_name=None, vm_name=None, ssh_ip=None, public_key_
     ssh_session = ssh_info.SSHSession(resource_group_name, vm_name, ssh_ip, public_key_file,
                                       private_key_file, use_private_ip, local_user, cert_file, port,
                                       ssh_client_folder, ssh_args, delete_credentials, resource_type,
-                                      ssh_proxy_folder, credentials_folder, winrdp, yes_without_prompt)
+                                      ssh_proxy_folder, credentials_folder, winrdp, yes_without_prompt,
+                                      cache_credentials)
     ssh_session.resource_type = resource_type_utils.decide_resource_type(cmd, ssh_session)
     target_os_utils.handle_target_os_type(cmd, ssh_session)
 
@@ -143,14 +149,15 @@ def ssh_cert(cmd, cert_path=None, public_key_file=None, ssh_client_folder=None):
 
 def ssh_arc(cmd, resource_group_name=None, vm_name=None, public_key_file=None, private_key_file=None,
             local_user=None, cert_file=None, port=None, resource_type=None, ssh_client_folder=None,
-            delete_credentials=False, ssh_proxy_folder=None, winrdp=False, yes_without_prompt=False, ssh_args=None):
+            delete_credentials=False, ssh_proxy_folder=None, winrdp=False, yes_without_prompt=False, ssh_args=None,
+            cache_credentials=False):
 
     if not resource_type:
         resource_type = const.ARC_RESOURCE_TYPE_PLACEHOLDER
 
     ssh_vm(cmd, resource_group_name, vm_name, None, public_key_file, private_key_file,
            False, local_user, cert_file, port, ssh_client_folder, delete_credentials,
-           resource_type, ssh_proxy_folder, winrdp, yes_without_prompt, ssh_args)
+           resource_type, ssh_proxy_folder, winrdp, yes_without_prompt, ssh_args, cache_credentials)
 
 
 def _do_ssh_op(cmd, op_info, op_call):
@@ -172,12 +179,16 @@ def _do_ssh_op(cmd, op_info, op_call):
     cert_lifetime = None
     # If user provides a local user, use the provided credentials for authentication
     if not op_info.local_user:
-        delete_cert = True
-        op_info.public_key_file, op_info.private_key_file, delete_keys = \
-            _check_or_create_public_private_files(op_info.public_key_file, op_info.private_key_file,
-                                                  op_info.credentials_folder, op_info.ssh_client_folder)
-        op_info.cert_file, op_info.local_user = _get_and_write_certificate(cmd, op_info.public_key_file,
-                                                                           None, op_info.ssh_client_folder)
+        if getattr(op_info, "cache_credentials", False):
+            # Cached credentials are kept after the connection, so they are never deleted here.
+            _get_cached_credentials(cmd, op_info)
+        else:
+            delete_cert = True
+            op_info.public_key_file, op_info.private_key_file, delete_keys = \
+                _check_or_create_public_private_files(op_info.public_key_file, op_info.private_key_file,
+                                                      op_info.credentials_folder, op_info.ssh_client_folder)
+            op_info.cert_file, op_info.local_user = _get_and_write_certificate(cmd, op_info.public_key_file,
+                                                                               None, op_info.ssh_client_folder)
         if op_info.is_arc():
             # pylint: disable=broad-except
             try:
@@ -205,6 +216,34 @@ def _do_ssh_op(cmd, op_info, op_call):
     op_call(op_info, delete_keys, delete_cert)
 
 
+def _get_cached_credentials(cmd, op_info):
+    user_provided_keys = op_info.public_key_file or op_info.private_key_file
+    if user_provided_keys:
+        op_info.public_key_file, op_info.private_key_file, _ = \
+            _check_or_create_public_private_files(op_info.public_key_file, op_info.private_key_file, None,
+                                                  op_info.ssh_client_folder)
+
+    entry_folder = credentials_cache.get_entry_folder(cmd, op_info.public_key_file)
+    generation_folder = credentials_cache.get_valid_generation(entry_folder, op_info.public_key_file)
+    if generation_folder:
+        logger.debug("Reusing cached SSH certificate in %s", generation_folder)
+        op_info.cert_file = os.path.join(generation_folder, credentials_cache.CERT_FILE_NAME)
+        op_info.local_user = ssh_utils.get_ssh_cert_principals(op_info.cert_file)[0].lower()
+    else:
+        generation_folder = credentials_cache.create_generation(entry_folder)
+        if not user_provided_keys:
+            op_info.public_key_file, op_info.private_key_file, _ = \
+                _check_or_create_public_private_files(None, None, generation_folder, op_info.ssh_client_folder)
+        op_info.cert_file, op_info.local_user = _get_and_write_certificate(
+            cmd, op_info.public_key_file, os.path.join(generation_folder, credentials_cache.CERT_FILE_NAME),
+            op_info.ssh_client_folder)
+        credentials_cache.set_current_generation(entry_folder, generation_folder)
+
+    if not user_provided_keys:
+        op_info.public_key_file = os.path.join(generation_folder, credentials_cache.PUBLIC_KEY_FILE_NAME)
+        op_info.private_key_file = os.path.join(generation_folder, credentials_cache.PRIVATE_KEY_FILE_NAME)
+
+
 def _get_and_write_certificate(cmd, public_key_file, cert_file, ssh_client_folder):
     cloudtoscope = {
         "azurecloud": "https://pas.windows.net/CheckMyAccess/Linux/.default",
@@ -0,0 +1,101 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import base64
+import datetime
+import struct
+
+# valid_before value that OpenSSH uses for certificates that never expire
+CERT_VALID_FOREVER = 0xFFFFFFFFFFFFFFFF
+
+
+class SSHCertParser():
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """
+    Parses OpenSSH RSA certificates (PROTOCOL.certkeys in the OpenSSH source tree) in process,
+    so reading the principals and validity of a certificate doesn't require running ssh-keygen -L.
+    """
+    RSACertAlgorithm = 'ssh-rsa-cert-v01@openssh.com'
+
+    def __init__(self):
+        self.algorithm = ''
+        self.modulus = ''
+        self.exponent = ''
+        self.serial = 0
+        self.cert_type = 0
+        self.key_id = ''
+        self.principals = []
+        self.valid_after = 0
+        self.valid_before = 0
+        self._read = 0
+        self._cert_bytes = b''
+
+    def parse(self, cert_text):
+        text_parts = cert_text.split()
+
+        if len(text_parts) < 2:
+            error_str = ("Incorrectly formatted certificate. "
+                         "Certificate must be format '<algorithm> <base64_certificate>'")
+            raise ValueError(error_str)
+
+        algorithm = text_parts[0]
+        if algorithm != SSHCertParser.RSACertAlgorithm:
+            raise ValueError(f"Certificate is not {SSHCertParser.RSACertAlgorithm} algorithm ({algorithm})")
+
+        self._cert_bytes = base64.b64decode(text_parts[1])
+        self._read = 0
+
+        encoded_algorithm = self._read_string().decode("ascii")
+        if encoded_algorithm != SSHCertParser.RSACertAlgorithm:
+            raise ValueError(f"Encoded certificate is not {SSHCertParser.RSACertAlgorithm} "
+                             f"algorithm ({encoded_algorithm})")
+
+        self._read_string()  # nonce
+        exponent = self._read_string()
+        modulus = self._read_string()
+        self.serial = self._read_uint64()
+        self.cert_type = self._read_uint32()
+        self.key_id = self._read_string().decode("utf-8")
+        principals = self._read_string()
+        self.valid_after = self._read_uint64()
+        self.valid_before = self._read_uint64()
+
+        self.principals = []
+        principals_read = 0
+        while principals_read < len(principals):
+            length = struct.unpack(">L", principals[principals_read:principals_read + 4])[0]
+            principals_read += 4
+            self.principals.append(principals[principals_read:principals_read + length].decode("utf-8"))
+            principals_read += length
+
+        self.algorithm = encoded_algorithm
+        # Same encoding as RSAParser so the key of a certificate can be compared with a public key
+        self.exponent = base64.urlsafe_b64encode(exponent).decode("ascii")
+        self.modulus = base64.urlsafe_b64encode(modulus).decode("ascii")
+
+    def get_validity(self):
+        """
+        Start and end of the validity period in local time, same as what ssh-keygen -L prints.
+        """
+        start = datetime.datetime.fromtimestamp(self.valid_after)
+        if self.valid_before == CERT_VALID_FOREVER:
+            return start, datetime.datetime.max
+        return start, datetime.datetime.fromtimestamp(self.valid_before)
+
+    def _read_bytes(self, length):
+        if self._read + length > len(self._cert_bytes):
+            raise ValueError("Incorrectly encoded certificate. Certificate is truncated")
+        data = self._cert_bytes[self._read:self._read + length]
+        self._read += length
+        return data
+
+    def _read_uint32(self):
+        return struct.unpack(">L", self._read_bytes(4))[0]
+
+    def _read_uint64(self):
+        return struct.unpack(">Q", self._read_bytes(8))[0]
+
+    def _read_string(self):
+        return self._read_bytes(self._read_uint32())
@@ -21,7 +21,7 @@ class SSHSession():
     def __init__(self, resource_group_name, vm_name, ssh_ip, public_key_file,
                  private_key_file, use_private_ip, local_user, cert_file, port,
                  ssh_client_folder, ssh_args, delete_credentials, resource_type,
-                 ssh_proxy_folder, credentials_folder, winrdp, yes_without_prompt):
+                 ssh_proxy_folder, credentials_folder, winrdp, yes_without_prompt, cache_credentials=False):
         self.resource_group_name = resource_group_name
         self.vm_name = vm_name
         self.ip = ssh_ip
@@ -32,6 +32,7 @@ class SSHSession():
         self.delete_credentials = delete_credentials
         self.resource_type = resource_type
         self.winrdp = winrdp
+        self.cache_credentials = cache_credentials
         self.proxy_path = None
         self.relay_info = None
         self.new_service_config = False
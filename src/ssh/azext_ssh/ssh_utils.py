@@ -8,6 +8,7 @@ import subprocess
 import time
 import datetime
 import re
+import struct
 import sys
 import colorama
 
@@ -18,6 +19,7 @@ from azure.cli.core.style import Style, print_styled_text
 
 from . import file_utils
 from . import connectivity_utils
+from . import ssh_cert_parser
 from . import constants as const
 
 logger = log.get_logger(__name__)
@@ -184,6 +186,22 @@ def get_ssh_cert_info(cert_file, ssh_client_folder=None):
                                          const.RECOMMENDATION_SSH_CLIENT_NOT_FOUND)
 
 
+def parse_ssh_cert(cert_file):
+    """
+    Parse an RSA certificate in process. Returns None if the certificate can't be read or parsed,
+    in which case callers fall back to ssh-keygen -L.
+    """
+    try:
+        with open(cert_file, 'r', encoding='utf-8') as f:
+            cert_text = f.read()
+        parser = ssh_cert_parser.SSHCertParser()
+        parser.parse(cert_text)
+        return parser
+    except (OSError, ValueError, struct.error) as e:
+        logger.debug("Couldn't parse certificate %s in process. Error: %s", cert_file, str(e))
+        return None
+
+
 def _get_ssh_cert_validity(cert_file, ssh_client_folder=None):
     if cert_file:
         info = get_ssh_cert_info(cert_file, ssh_client_folder)
@@ -194,6 +212,10 @@ def _get_ssh_cert_validity(cert_file, ssh_client_folder=None):
 
 
 def get_certificate_start_and_end_times(cert_file, ssh_client_folder=None):
+    cert = parse_ssh_cert(cert_file) if cert_file else None
+    if cert:
+        return cert.get_validity()
+
     validity_str = _get_ssh_cert_validity(cert_file, ssh_client_folder)
     times = None
     if validity_str and "Valid: from " in validity_str and " to " in validity_str:
@@ -213,6 +235,10 @@ def get_certificate_lifetime(cert_file, ssh_client_folder=None):
 
 
 def get_ssh_cert_principals(cert_file, ssh_client_folder=None):
+    cert = parse_ssh_cert(cert_file)
+    if cert:
+        return cert.principals
+
     info = get_ssh_cert_info(cert_file, ssh_client_folder)
     principals = []
     in_principal = False
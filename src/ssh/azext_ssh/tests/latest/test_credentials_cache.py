@@ -0,0 +1,123 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import base64
+import os
+import shutil
+import struct
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from azext_ssh import custom
+from azext_ssh import credentials_cache
+from azext_ssh import ssh_info
+from azext_ssh.tests.latest.test_ssh_cert_parser import build_cert_text
+
+EXPONENT = b'\x01\x00\x01'
+
+
+def _string(data):
+    return struct.pack(">L", len(data)) + data
+
+
+class CredentialsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.cmd = mock.Mock()
+        self.cmd.cli_ctx.config.config_dir = self.config_dir
+        self.cmd.cli_ctx.cloud.name = "AzureCloud"
+        self.account = {"tenantId": "tenant", "user": {"name": "user@contoso.com"}}
+        self.valid_before = int(time.time()) + 3600
+        self.key_count = 0
+        self.cert_requests = 0
+        patchers = [
+            mock.patch('azure.cli.core._profile.Profile', return_value=mock.Mock(get_subscription=lambda: self.account)),
+            mock.patch('azext_ssh.ssh_utils.create_ssh_keyfile', side_effect=self._create_keys),
+            mock.patch('azext_ssh.custom._get_and_write_certificate', side_effect=self._write_cert)
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.config_dir)
+
+    def _create_keys(self, private_key_file, ssh_client_folder=None):
+        # every generated key pair gets a different modulus
+        self.key_count += 1
+        modulus = b'\x00' + self.key_count.to_bytes(4, 'big')
+        key = _string(b'ssh-rsa') + _string(EXPONENT) + _string(modulus)
+        with open(private_key_file + ".pub", 'w', encoding='utf-8') as f:
+            f.write('ssh-rsa ' + base64.b64encode(key).decode('ascii'))
+        with open(private_key_file, 'w', encoding='utf-8') as f:
+            f.write('private')
+
+    def _write_cert(self, cmd, public_key_file, cert_file, ssh_client_folder):
+        self.cert_requests += 1
+        with open(public_key_file, 'r', encoding='utf-8') as f:
+            key = base64.b64decode(f.read().split()[1])
+        modulus = key[-5:]
+        with open(cert_file, 'w', encoding='utf-8') as f:
+            f.write(build_cert_text(['User@contoso.com'], int(time.time()) - 60, self.valid_before,
+                                    EXPONENT, modulus))
+        return cert_file, 'user@contoso.com'
+
+    def _connect(self):
+        op_info = ssh_info.SSHSession("rg", "vm", "1.2.3.4", None, None, False, None, None, None, None, [], False,
+                                      "Microsoft.Compute/virtualMachines", None, None, False, False, True)
+        custom._get_cached_credentials(self.cmd, op_info)
+        return op_info
+
+    def test_reuse_valid_certificate(self):
+        first = self._connect()
+        second = self._connect()
+
+        self.assertEqual(1, self.cert_requests)
+        self.assertEqual(first.cert_file, second.cert_file)
+        self.assertEqual(first.private_key_file, second.private_key_file)
+        self.assertEqual('user@contoso.com', second.local_user)
+        self.assertTrue(os.path.isfile(second.private_key_file))
+        self.assertTrue(second.cert_file.startswith(self.config_dir))
+
+    def test_refresh_certificate_close_to_expiration(self):
+        self.valid_before = int(time.time()) + 60
+        first = self._connect()
+        self.valid_before = int(time.time()) + 3600
+        second = self._connect()
+
+        self.assertEqual(2, self.cert_requests)
+        self.assertNotEqual(first.cert_file, second.cert_file)
+
+    def test_certificate_not_matching_key_is_not_reused(self):
+        first = self._connect()
+        self._create_keys(first.private_key_file)
+        self._connect()
+
+        self.assertEqual(2, self.cert_requests)
+
+    def test_cache_per_user(self):
+        first = self._connect()
+        self.account["user"]["name"] = "other@contoso.com"
+        second = self._connect()
+
+        self.assertEqual(2, self.cert_requests)
+        self.assertNotEqual(os.path.dirname(os.path.dirname(first.cert_file)),
+                            os.path.dirname(os.path.dirname(second.cert_file)))
+
+    def test_expired_generations_are_pruned(self):
+        self.valid_before = int(time.time()) - 1
+        first = self._connect()
+        self.valid_before = int(time.time()) + 3600
+        second = self._connect()
+
+        self.assertFalse(os.path.isdir(os.path.dirname(first.cert_file)))
+        self.assertTrue(os.path.isfile(second.cert_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import base64
+import datetime
+import struct
+import unittest
+
+from azext_ssh import ssh_cert_parser
+
+
+def _string(data):
+    return struct.pack(">L", len(data)) + data
+
+
+def build_cert_text(principals, valid_after, valid_before, exponent=b'\x01\x00\x01', modulus=b'\x00\xc3\x9a'):
+    cert = _string(b'ssh-rsa-cert-v01@openssh.com')
+    cert += _string(b'nonce')
+    cert += _string(exponent)
+    cert += _string(modulus)
+    cert += struct.pack(">Q", 7)
+    cert += struct.pack(">L", 1)
+    cert += _string(b'key-id')
+    cert += _string(b''.join(_string(p.encode('utf-8')) for p in principals))
+    cert += struct.pack(">Q", valid_after)
+    cert += struct.pack(">Q", valid_before)
+    cert += _string(b'') + _string(b'') + _string(b'') + _string(b'signature-key') + _string(b'signature')
+    return 'ssh-rsa-cert-v01@openssh.com ' + base64.b64encode(cert).decode('ascii')
+
+
+class SSHCertParserTest(unittest.TestCase):
+    def test_ssh_cert_parser_success(self):
+        parser = ssh_cert_parser.SSHCertParser()
+
+        parser.parse(build_cert_text(['user@contoso.com', 'other'], 1000, 4600))
+
+        self.assertEqual('ssh-rsa-cert-v01@openssh.com', parser.algorithm)
+        self.assertEqual(['user@contoso.com', 'other'], parser.principals)
+        self.assertEqual(7, parser.serial)
+        self.assertEqual(1, parser.cert_type)
+        self.assertEqual('key-id', parser.key_id)
+        self.assertEqual(base64.urlsafe_b64encode(b'\x01\x00\x01').decode('ascii'), parser.exponent)
+        self.assertEqual(base64.urlsafe_b64encode(b'\x00\xc3\x9a').decode('ascii'), parser.modulus)
+        self.assertEqual((datetime.datetime.fromtimestamp(1000), datetime.datetime.fromtimestamp(4600)),
+                         parser.get_validity())
+
+    def test_ssh_cert_parser_valid_forever(self):
+        parser = ssh_cert_parser.SSHCertParser()
+
+        parser.parse(build_cert_text(['user'], 0, ssh_cert_parser.CERT_VALID_FOREVER))
+
+        self.assertEqual(datetime.datetime.max, parser.get_validity()[1])
+
+    def test_ssh_cert_parser_too_few_fields(self):
+        parser = ssh_cert_parser.SSHCertParser()
+
+        self.assertRaises(ValueError, parser.parse, 'ssh-rsa-cert-v01@openssh.com')
+
+    def test_ssh_cert_parser_wrong_algorithm(self):
+        parser = ssh_cert_parser.SSHCertParser()
+
+        self.assertRaises(ValueError, parser.parse, 'ssh-rsa ' + build_cert_text(['user'], 0, 1).split()[1])
+
+    def test_ssh_cert_parser_truncated(self):
+        parser = ssh_cert_parser.SSHCertParser()
+        cert_bytes = base64.b64decode(build_cert_text(['user'], 0, 1).split()[1])
+        truncated = 'ssh-rsa-cert-v01@openssh.com ' + base64.b64encode(cert_bytes[:60]).decode('ascii')
+
+        self.assertRaises(ValueError, parser.parse, truncated)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -698,6 +698,9 @@ examples:
   - name: Upload files from a local directory to an Azure Storage File Share with url in a batch operation.
     text: |
         az storage file upload-batch --destination https://myaccount.file.core.windows.net/myshare --source . --account-key 00000000
+  - name: Upload files from a local directory to an Azure Storage File Share, transferring up to 16 files in parallel.
+    text: |
+        az storage file upload-batch --destination myshare --source . --account-name myaccount --account-key 00000000 --max-workers 16
 """
 
 helps['storage file url'] = """
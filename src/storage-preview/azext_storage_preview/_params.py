@@ -18,6 +18,7 @@ from ._validators import (get_datetime_type, validate_metadata, validate_bypass,
                           add_progress_callback, validate_share_close_handle)
 
 from .profiles import CUSTOM_MGMT_STORAGE, CUSTOM_DATA_STORAGE_FILESHARE
+from .transfer_util import DEFAULT_BATCH_WORKERS
 
 
 def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statements
@@ -726,6 +727,10 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
 
     progress_type = CLIArgumentType(help='Include this flag to disable progress reporting for the command.',
                                     action='store_true', validator=add_progress_callback)
+    max_workers_type = CLIArgumentType(
+        type=int, options_list=['--max-workers'],
+        help='The maximum number of files transferred in parallel. Each file can use up to --max-connections '
+             'connections of its own. Default to {}.'.format(DEFAULT_BATCH_WORKERS))
 
     with self.argument_context('storage file download') as c:
         c.register_path_argument()
@@ -872,6 +877,7 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.argument('validate_content', action='store_true', min_api='2016-05-31')
         c.register_content_settings_argument(t_file_content_settings, update=False, arg_group='Content Settings')
         c.extra('no_progress', progress_type, validator=add_progress_callback)
+        c.argument('max_workers', max_workers_type)
 
     with self.argument_context('storage file download-batch') as c:
         from ._validators import process_file_download_batch_parameters
@@ -882,10 +888,13 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.extra('no_progress', progress_type, validator=add_progress_callback)
         c.extra('snapshot', help='The snapshot parameter is an opaque DateTime value that, when present, '
                                  'specifies the snapshot.')
+        c.argument('max_workers', max_workers_type)
 
     with self.argument_context('storage file delete-batch') as c:
         from ._validators import process_file_batch_source_parameters
         c.argument('source', options_list=('--source', '-s'), validator=process_file_batch_source_parameters)
+        c.argument('max_workers', max_workers_type,
+                   help='The maximum number of files deleted in parallel. Default to {}.'.format(DEFAULT_BATCH_WORKERS))
 
     for cmd in ['list-handle', 'close-handle']:
         with self.argument_context('storage share ' + cmd) as c:
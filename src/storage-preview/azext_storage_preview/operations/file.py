@@ -15,6 +15,7 @@ from azure.cli.command_modules.storage.util import (filter_none, collect_blobs,
 from azure.cli.core.profiles import get_sdk
 from azure.core.exceptions import HttpResponseError, ResourceNotFoundError, ResourceExistsError
 from ..profiles import CUSTOM_DATA_STORAGE_FILESHARE, CUSTOM_DATA_STORAGE_BLOB
+from ..transfer_util import BatchProgress, DirectoryCache, run_batch
 
 logger = get_logger(__name__)
 
@@ -101,7 +102,7 @@ def storage_file_upload(client, local_file_path, content_settings=None,
 
 def storage_file_upload_batch(cmd, client, destination, source, destination_path=None, pattern=None, dryrun=False,
                               validate_content=False, content_settings=None, max_connections=1, metadata=None,
-                              progress_callback=None):
+                              progress_callback=None, max_workers=None):
     """ Upload local files to Azure Storage File Share in batch """
 
     from azure.cli.command_modules.storage.util import glob_files_locally, normalize_blob_file_path
@@ -126,18 +127,23 @@ def storage_file_upload_batch(cmd, client, destination, source, destination_path
             res.append({'File': file, 'Type': guessed_type})
         return res
 
-    # TODO: Performance improvement
-    # 1. Upload files in parallel
-    def _upload_action(src, dst2):
+    existing_dirs = DirectoryCache()
+    file_sizes = {src: os.path.getsize(src) for src, _ in source_files}
+    progress = BatchProgress(progress_callback, len(source_files), sum(file_sizes.values()),
+                             'Uploading {} files'.format(len(source_files)))
+
+    def _upload_action(pair):
+        src, dst2 = pair
         dst2 = normalize_blob_file_path(destination_path, dst2)
         dir_name = os.path.dirname(dst2)
         file_name = os.path.basename(dst2)
 
-        _make_directory_in_files_share(client, destination, dir_name, V2=True)
+        _make_directory_in_files_share(client, destination, dir_name, existing_dirs, V2=True)
 
         logger.warning('uploading %s', src)
         storage_file_upload(client.get_file_client(dst2), src, content_settings, metadata, validate_content,
-                            progress_callback, max_connections)
+                            progress.file_callback(src), max_connections)
+        progress.file_done(src, file_sizes[src])
 
         args = {
             'directory_name': dir_name,
@@ -145,7 +151,7 @@ def storage_file_upload_batch(cmd, client, destination, source, destination_path
         }
         return create_file_url(client, **args)
 
-    return list(_upload_action(src, dst) for src, dst in source_files)
+    return run_batch(_upload_action, source_files, max_workers)
 
 
 def download_file(client, destination_path=None, timeout=None, max_connections=2, open_mode='wb', **kwargs):
@@ -175,7 +181,7 @@ def download_file(client, destination_path=None, timeout=None, max_connections=2
 
 
 def storage_file_download_batch(client, source, destination, pattern=None, dryrun=False, validate_content=False,
-                                max_connections=1, progress_callback=None):
+                                max_connections=1, progress_callback=None, max_workers=None):
     """
     Download files from file share to local directory in batch
     """
@@ -199,17 +205,22 @@ def storage_file_download_batch(client, source, destination, pattern=None, dryru
 
         return []
 
+    source_files = list(source_files)
+    progress = BatchProgress(progress_callback, len(source_files),
+                             message='Downloading {} files'.format(len(source_files)))
+
     def _download_action(pair):
         path = os.path.join(*pair)
         local_path = os.path.join(destination, *pair)
         file_client = client.get_file_client(path)
 
         download_file(file_client, destination_path=local_path, max_connections=max_connections,
-                      progress_callback=progress_callback, validate_content=validate_content)
+                      validate_content=validate_content)
+        progress.file_done(path)
 
         return file_client.url.replace('%5C', '/')
 
-    return list(_download_action(f) for f in source_files)
+    return run_batch(_download_action, source_files, max_workers)
 
 
 def storage_file_copy(client, copy_source, **kwargs):
@@ -243,7 +254,7 @@ def storage_file_copy_batch(cmd, client, source_client, share_name=None, destina
 
         # the cache of existing directories in the destination file share. the cache helps to avoid
         # repeatedly create existing directory so as to optimize the performance.
-        existing_dirs = set([])
+        existing_dirs = DirectoryCache()
 
         # pylint: disable=inconsistent-return-statements
         def action_blob_copy(blob_name):
@@ -263,7 +274,7 @@ def storage_file_copy_batch(cmd, client, source_client, share_name=None, destina
 
         # the cache of existing directories in the destination file share. the cache helps to avoid
         # repeatedly create existing directory so as to optimize the performance.
-        existing_dirs = set([])
+        existing_dirs = DirectoryCache()
 
         # pylint: disable=inconsistent-return-statements
         def action_file_copy(file_info):
@@ -282,7 +293,7 @@ def storage_file_copy_batch(cmd, client, source_client, share_name=None, destina
     raise ValueError('Fail to find source. Neither blob container or file share is specified.')
 
 
-def storage_file_delete_batch(client, source, pattern=None, dryrun=False, timeout=None):
+def storage_file_delete_batch(client, source, pattern=None, dryrun=False, timeout=None, max_workers=None):
     """
     Delete files from file share in batch
     """
@@ -305,8 +316,7 @@ def storage_file_delete_batch(client, source, pattern=None, dryrun=False, timeou
             logger.warning('  - %s/%s', f[0], f[1])
         return []
 
-    for f in source_files:
-        delete_action(f)
+    run_batch(delete_action, source_files, max_workers)
 
 
 def _create_file_and_directory_from_blob(cmd, file_service, blob_service, share, container, sas, blob_name,
@@ -373,9 +383,8 @@ def _create_file_and_directory_from_file(cmd, file_service, source_file_service,
 def _make_directory_in_files_share(file_service, file_share, directory_path, existing_dirs=None, V2=False):
     """
     Create directories recursively.
-    This method accept a existing_dirs set which serves as the cache of existing directory. If the
-    parameter is given, the method will search the set first to avoid repeatedly create directory
-    which already exists.
+    This method accept a existing_dirs DirectoryCache which serves as the cache of existing directory. If the
+    parameter is given, every directory is only created once, even if the cache is shared by concurrent workers.
     """
     from azure.common import AzureHttpError
 
@@ -388,10 +397,7 @@ def _make_directory_in_files_share(file_service, file_share, directory_path, exi
         parents.append(p)
         p = os.path.dirname(p)
 
-    for dir_name in reversed(parents):
-        if existing_dirs and (dir_name in existing_dirs):
-            continue
-
+    def _create_directory(dir_name):
         try:
             if V2:
                 file_service.create_directory(directory_name=dir_name)
@@ -403,8 +409,11 @@ def _make_directory_in_files_share(file_service, file_share, directory_path, exi
             from knack.util import CLIError
             raise CLIError('Failed to create directory {}'.format(dir_name))
 
-        if existing_dirs:
-            existing_dirs.add(directory_path)
+    for dir_name in reversed(parents):
+        if existing_dirs is None:
+            _create_directory(dir_name)
+        else:
+            existing_dirs.create_once(dir_name, _create_directory)
 
 
 def _file_share_exists(client, resource_group_name, account_name, share_name):
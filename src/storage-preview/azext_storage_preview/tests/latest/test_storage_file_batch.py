@@ -0,0 +1,199 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from azure.core.exceptions import HttpResponseError, ResourceExistsError
+
+from ...operations.file import (storage_file_upload_batch, storage_file_download_batch,
+                                storage_file_delete_batch)
+
+# simulated round trip of a single request to the file service
+LATENCY = 0.02
+
+
+class FakeFileClient(object):
+    def __init__(self, share, path):
+        self.share = share
+        self.path = path
+        self.url = 'https://myaccount.file.core.windows.net/myshare/' + path
+        self.share_name = 'myshare'
+
+    def exists(self):
+        return False
+
+    def get_file_client(self, file_name):
+        return FakeFileClient(self.share, self.path + '/' + file_name if self.path else file_name)
+
+    def upload_file(self, data, length, progress_hook=None, **kwargs):
+        self.share.request('upload', self.path)
+        content = data.read()
+        if progress_hook:
+            progress_hook(length, length)
+        with self.share.lock:
+            self.share.files[self.path] = content
+        return {'etag': 'etag'}
+
+    def download_file(self, **kwargs):
+        self.share.request('download', self.path)
+        content = self.share.files[self.path]
+        return mock.Mock(readinto=lambda stream: stream.write(content))
+
+    def get_file_properties(self, **kwargs):
+        return mock.Mock()
+
+    def delete_file(self, timeout=None):
+        self.share.request('delete', self.path)
+        with self.share.lock:
+            del self.share.files[self.path]
+
+
+class FakeShareClient(object):
+    """ An in-memory stand-in for ShareClient, every request takes LATENCY seconds """
+
+    def __init__(self, failures=None):
+        self.account_name = 'myaccount'
+        self.share_name = 'myshare'
+        self.url = 'https://myaccount.file.core.windows.net/myshare'
+        self.files = {}
+        self.directories = set()
+        self.requests = []
+        self.failures = dict(failures or {})
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def request(self, operation, path):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(LATENCY)
+        with self.lock:
+            self.in_flight -= 1
+            self.requests.append((operation, path))
+            if self.failures.get(path):
+                self.failures[path] -= 1
+                error = HttpResponseError(message='Server busy')
+                error.status_code = 503
+                raise error
+
+    def create_directory(self, directory_name):
+        self.request('create_directory', directory_name)
+        with self.lock:
+            if directory_name in self.directories:
+                raise ResourceExistsError('exists')
+            self.directories.add(directory_name)
+
+    def get_directory_client(self, directory_path=None):
+        return FakeFileClient(self, directory_path or '')
+
+    def get_file_client(self, path):
+        return FakeFileClient(self, path.replace('\\', '/'))
+
+    def list_directories_and_files(self, directory_name):
+        prefix = directory_name + '/' if directory_name else ''
+        names = {p[len(prefix):].split('/')[0] for p in self.files if p.startswith(prefix)}
+        return [{'name': n, 'is_directory': prefix + n not in self.files} for n in sorted(names)]
+
+
+class StorageFileBatchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.source = tempfile.mkdtemp()
+        for i in range(24):
+            folder = os.path.join(cls.source, 'dir{}'.format(i % 3), 'sub{}'.format(i % 2))
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, 'file{}.txt'.format(i)), 'w') as f:
+                f.write('content {}'.format(i) * 100)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.source)
+
+    def setUp(self):
+        self.cmd = mock.Mock()
+        self.patcher = mock.patch('azext_storage_preview.transfer_util.RETRY_BACKOFF_SECONDS', 0)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def _upload(self, client, max_workers, progress_callback=None):
+        with mock.patch('azext_storage_preview.operations.file.logger'):
+            return storage_file_upload_batch(self.cmd, client, 'myshare', self.source, max_workers=max_workers,
+                                             progress_callback=progress_callback)
+
+    def test_upload_creates_each_directory_once(self):
+        client = FakeShareClient()
+        result = self._upload(client, 8)
+
+        self.assertEqual(24, len(client.files))
+        self.assertEqual(24, len(result))
+        self.assertEqual({'dir0', 'dir1', 'dir2', 'dir0/sub0', 'dir0/sub1', 'dir1/sub0', 'dir1/sub1',
+                          'dir2/sub0', 'dir2/sub1'}, client.directories)
+        created = [path for operation, path in client.requests if operation == 'create_directory']
+        self.assertEqual(len(client.directories), len(created))
+
+    def test_upload_results_are_in_source_order(self):
+        serial = self._upload(FakeShareClient(), 1)
+        parallel = self._upload(FakeShareClient(), 8)
+        self.assertEqual(serial, parallel)
+
+    def test_upload_retries_transient_failures(self):
+        client = FakeShareClient(failures={'dir0/sub0/file0.txt': 2})
+        self._upload(client, 4)
+        self.assertEqual(24, len(client.files))
+        self.assertEqual(3, client.requests.count(('upload', 'dir0/sub0/file0.txt')))
+
+    def test_upload_gives_up_after_retries(self):
+        client = FakeShareClient(failures={'dir0/sub0/file0.txt': 10})
+        with self.assertRaises(HttpResponseError):
+            self._upload(client, 4)
+
+    def test_upload_progress_is_aggregated(self):
+        progress = []
+        callback = mock.Mock(side_effect=lambda current, total: progress.append((current, total)))
+        self._upload(FakeShareClient(), 8, callback)
+
+        total = sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(self.source) for f in files)
+        self.assertEqual((total, total), progress[-1])
+        self.assertTrue(all(current < total for current, _ in progress[:-1]))
+        self.assertEqual('Uploading 24 files', callback.message)
+
+    def test_download_and_delete(self):
+        client = FakeShareClient()
+        self._upload(client, 8)
+        destination = tempfile.mkdtemp()
+        try:
+            result = storage_file_download_batch(client, 'myshare', destination, max_workers=8)
+            self.assertEqual(24, len(result))
+            with open(os.path.join(destination, 'dir1', 'sub1', 'file7.txt')) as f:
+                self.assertEqual('content 7' * 100, f.read())
+        finally:
+            shutil.rmtree(destination)
+
+        storage_file_delete_batch(client, 'myshare', max_workers=8)
+        self.assertEqual({}, client.files)
+
+    def test_parallel_requests_are_bounded(self):
+        serial = FakeShareClient()
+        self._upload(serial, 1)
+        self.assertEqual(1, serial.max_in_flight)
+
+        parallel = FakeShareClient()
+        self._upload(parallel, 4)
+        self.assertGreater(parallel.max_in_flight, 1)
+        self.assertLessEqual(parallel.max_in_flight, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Helpers to run storage batch operations (one operation per file) concurrently.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_WORKERS = min(8, (os.cpu_count() or 1) * 4)
+DEFAULT_BATCH_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 1
+# status codes worth retrying a whole file for, the SDK pipeline already retried the individual requests
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+
+def is_retryable_error(ex):
+    from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+    if isinstance(ex, (ServiceRequestError, ServiceResponseError, ConnectionError)):
+        return True
+    if isinstance(ex, HttpResponseError):
+        return ex.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def run_with_retries(action, item, max_retries=DEFAULT_BATCH_RETRIES, backoff=None):
+    backoff = RETRY_BACKOFF_SECONDS if backoff is None else backoff
+    attempt = 0
+    while True:
+        try:
+            return action(item)
+        except Exception as ex:  # pylint: disable=broad-except
+            if attempt >= max_retries or not is_retryable_error(ex):
+                raise
+            attempt += 1
+            logger.warning('retrying %s after error (attempt %d of %d): %s', item, attempt, max_retries, ex)
+            time.sleep(backoff * (2 ** (attempt - 1)))
+
+
+def run_batch(action, items, max_workers=None, max_retries=DEFAULT_BATCH_RETRIES, backoff=None):
+    """
+    Run action for every item with up to max_workers threads, retrying transient failures of each item.
+    Results are returned in the order of items. If any item fails, the items which haven't started yet are
+    cancelled and the error is raised once the running ones finish, the same as a sequential loop would stop
+    at the first failure.
+    """
+    items = list(items)
+    max_workers = max(1, min(max_workers or DEFAULT_BATCH_WORKERS, len(items) or 1))
+    if max_workers == 1:
+        return [run_with_retries(action, item, max_retries, backoff) for item in items]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_with_retries, action, item, max_retries, backoff) for item in items]
+        done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in not_done:
+            future.cancel()
+        errors = [f for f in futures if f in done and not f.cancelled() and f.exception() is not None]
+        if errors:
+            wait(not_done)
+            raise errors[0].exception()
+        return [future.result() for future in futures]
+
+
+class DirectoryCache:
+    """
+    The directories that already exist in the destination file share. It is shared between concurrent workers,
+    so every directory is created once no matter how many files are uploaded into it.
+    """
+
+    def __init__(self):
+        self._created = set()
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, directory_path):
+        return directory_path in self._created
+
+    def create_once(self, directory_path, create_directory):
+        if directory_path in self._created:
+            return
+        with self._lock:
+            directory_lock = self._locks.setdefault(directory_path, threading.Lock())
+        with directory_lock:
+            if directory_path not in self._created:
+                create_directory(directory_path)
+                self._created.add(directory_path)
+
+
+class BatchProgress:
+    """
+    Aggregates the progress of all the files of a batch operation into a single progress bar. Reports bytes if the
+    size of every file is known in advance, otherwise the number of files which are done.
+    """
+
+    def __init__(self, progress_callback, total_files, total_bytes=None, message=None):
+        self._progress_callback = progress_callback
+        self._total_files = total_files
+        self._total_bytes = total_bytes
+        self._done_files = 0
+        self._file_bytes = {}
+        self._lock = threading.Lock()
+        if progress_callback and message:
+            try:
+                progress_callback.message = message
+            except AttributeError:
+                pass
+
+    def _report(self):
+        if self._total_bytes:
+            current = sum(self._file_bytes.values())
+            if self._done_files < self._total_files:
+                # the progress bar ends once current reaches total, which must wait for the last file
+                current = min(current, self._total_bytes - 1)
+            self._progress_callback(current, self._total_bytes)
+        elif self._total_files:
+            self._progress_callback(self._done_files, self._total_files)
+
+    def file_callback(self, key):
+        """ The progress callback to give to the transfer of a single file """
+        if not self._progress_callback or not self._total_bytes:
+            return None
+
+        def _update(current, total):  # pylint: disable=unused-argument
+            with self._lock:
+                self._file_bytes[key] = current
+                self._report()
+        return _update
+
+    def file_done(self, key, size=None):
+        if not self._progress_callback:
+            return
+        with self._lock:
+            self._done_files += 1
+            if size is not None:
+                self._file_bytes[key] = size
+            self._report()
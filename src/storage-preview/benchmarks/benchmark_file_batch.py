@@ -0,0 +1,51 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Wall clock time of uploading a folder of 24 files to an in-memory file share with one and with several workers,
+with every request to the file service simulated by a sleep. Not part of the unit tests, run it from
+src/storage-preview with the extension installed in development mode:
+
+    python benchmarks/benchmark_file_batch.py
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from azext_storage_preview.operations.file import storage_file_upload_batch
+from azext_storage_preview.tests.latest.test_storage_file_batch import FakeShareClient
+
+FILE_COUNT = 24
+
+
+def _time_upload(source, max_workers):
+    start = time.perf_counter()
+    with mock.patch('azext_storage_preview.operations.file.logger'):
+        storage_file_upload_batch(mock.Mock(), FakeShareClient(), 'myshare', source, max_workers=max_workers)
+    return time.perf_counter() - start
+
+
+def main():
+    source = tempfile.mkdtemp()
+    try:
+        for i in range(FILE_COUNT):
+            folder = os.path.join(source, 'dir{}'.format(i % 3), 'sub{}'.format(i % 2))
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, 'file{}.txt'.format(i)), 'w') as f:
+                f.write('content {}'.format(i) * 100)
+
+        serial = _time_upload(source, 1)
+        for max_workers in [4, 8, 16]:
+            parallel = _time_upload(source, max_workers)
+            print('{} files: serial {:.2f}s, {} workers {:.2f}s'.format(FILE_COUNT, serial, max_workers, parallel))
+    finally:
+        shutil.rmtree(source)
+
+
+if __name__ == '__main__':
+    main()